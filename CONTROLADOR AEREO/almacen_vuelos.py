@@ -0,0 +1,525 @@
+import heapq
+from itertools import compress
+
+# Constantes para índices de la tupla de vuelo (mismas que en sistema_vuelos.py)
+ID = 0
+TIPO = 1
+PRIORIDAD = 3
+COMBUSTIBLE = 4
+ESTADO = 5
+
+# Constantes para índices de la tupla de pista
+PISTA_ID = 0
+PISTA_CATEGORIA = 1
+PISTA_HABILITADA = 3
+PISTA_ESTADO = 4
+PISTA_VUELO_ACTUAL = 5
+PISTA_TIEMPO_LIBERACION = 6
+
+# Minutos de combustible que gasta cada minuto de espera
+CONSUMO_POR_MINUTO = 1
+
+# Clases de vuelo a efectos de compatibilidad con las pistas
+CLASE_ATERRIZAJE = "ATERRIZAJE"   # Aterrizaje normal (prioridad 0 o 1)
+CLASE_EMERGENCIA = "EMERGENCIA"   # Aterrizaje con prioridad 2
+CLASE_DESPEGUE = "DESPEGUE"
+
+# Categorías de pista que admite cada clase (None = cualquiera)
+CATEGORIAS_COMPATIBLES = {
+    CLASE_ATERRIZAJE: None,
+    CLASE_EMERGENCIA: frozenset(["larga", "estandar"]),
+    CLASE_DESPEGUE: frozenset(["estandar", "larga"]),
+}
+
+def clase_de_vuelo(vuelo):
+    """Devuelve la clase de compatibilidad de un vuelo (None si el tipo no es válido)"""
+    if vuelo[TIPO] == "DESPEGUE":
+        return CLASE_DESPEGUE
+    if vuelo[TIPO] == "ATERRIZAJE":
+        return CLASE_EMERGENCIA if vuelo[PRIORIDAD] == 2 else CLASE_ATERRIZAJE
+    return None
+
+def categoria_compatible(categoria, clase):
+    """Indica si una categoría de pista sirve para una clase de vuelo"""
+    permitidas = CATEGORIAS_COMPATIBLES[clase]
+    return permitidas is None or categoria in permitidas
+
+def pista_es_compatible(pista, vuelo):
+    """Verifica si una pista es compatible con un tipo de vuelo"""
+    if pista[PISTA_HABILITADA] == 0:
+        return False
+    clase = clase_de_vuelo(vuelo)
+    return clase is not None and categoria_compatible(pista[PISTA_CATEGORIA], clase)
+
+class ConjuntoPorOrden:
+    """Conjunto de IDs que devuelve el de menor orden sin recorrerlos
+
+    Cada ID tiene un orden fijo (orden_de). El heap guarda como mucho una
+    entrada por ID: si sale del conjunto y vuelve a entrar se reutiliza.
+    """
+
+    def __init__(self, orden_de):
+        self.orden_de = orden_de
+        self.ids = {}
+        self.heap = []
+        self.en_heap = set()
+
+    def __contains__(self, id_elemento):
+        return id_elemento in self.ids
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __iter__(self):
+        return iter(sorted(self.ids, key=self.orden_de.__getitem__))
+
+    def agregar(self, id_elemento):
+        """Añade un ID al conjunto"""
+        self.ids[id_elemento] = None
+        if id_elemento not in self.en_heap:
+            self.en_heap.add(id_elemento)
+            heapq.heappush(self.heap, (self.orden_de[id_elemento], id_elemento))
+
+    def quitar(self, id_elemento):
+        """Quita un ID del conjunto (su entrada del heap se limpia al llegar arriba)"""
+        self.ids.pop(id_elemento, None)
+
+    def primero(self):
+        """Devuelve el ID de menor orden o None"""
+        while self.heap:
+            id_elemento = self.heap[0][1]
+            if id_elemento in self.ids:
+                return id_elemento
+            heapq.heappop(self.heap)
+            self.en_heap.discard(id_elemento)
+        return None
+
+    def limpiar(self):
+        """Vacía el conjunto"""
+        self.ids.clear()
+        self.heap.clear()
+        self.en_heap.clear()
+
+class VistaVuelos:
+    """Vista de solo lectura de todos los vuelos del almacén"""
+
+    def __init__(self, almacen):
+        self.almacen = almacen
+
+    def __iter__(self):
+        return map(self.almacen._materializar, self.almacen.vuelos_por_id.values())
+
+    def __len__(self):
+        return len(self.almacen.vuelos_por_id)
+
+class VistaFlujo:
+    """Vista de solo lectura de los vuelos EN_COLA de un tipo, en orden de llegada"""
+
+    def __init__(self, almacen, tipo):
+        self.almacen = almacen
+        self.tipo = tipo
+
+    def __iter__(self):
+        almacen = self.almacen
+        return map(almacen._materializar, map(almacen.vuelos_por_id.__getitem__, list(almacen.en_cola[self.tipo])))
+
+    def __len__(self):
+        return len(self.almacen.en_cola[self.tipo])
+
+    def __contains__(self, id_vuelo):
+        return id_vuelo in self.almacen.en_cola[self.tipo]
+
+class AlmacenVuelos:
+    """Almacén central de vuelos y pistas indexado por ID
+
+    Los vuelos y pistas siguen siendo tuplas, pero se guardan en diccionarios
+    por ID para que buscar, actualizar o comprobar duplicados sea O(1).
+    Las listas que usan los menús (vuelos, pistas y los flujos de aterrizaje
+    y despegue) son vistas vivas sobre estos diccionarios.
+
+    El combustible de los aterrizajes en estados_consumo no se descuenta
+    minuto a minuto: la tupla guarda el combustible en un minuto de
+    referencia y el valor actual se calcula al leerla. Las reglas
+    (umbral, prioridad) de reglas_prioridad se disparan desde un índice de
+    vencimientos con el minuto en que cada vuelo cruza el umbral.
+    """
+
+    def __init__(self, estados_consumo=("EN_COLA",), reglas_prioridad=((5, 2),)):
+        self.estados_consumo = estados_consumo
+        self.reglas_prioridad = tuple(reglas_prioridad)
+        self.vuelos_por_id = {}
+        self.pistas_por_id = {}
+        # Vuelos EN_COLA por tipo: id_vuelo -> turno de llegada a la cola
+        # (el dict mantiene el orden de llegada)
+        self.en_cola = {"ATERRIZAJE": {}, "DESPEGUE": {}}
+        self.contador_cola = 0
+        # Pista que ocupa cada vuelo
+        self.pista_de_vuelo = {}
+        # Orden de alta de cada pista (el mismo que el de la lista de pistas)
+        self.orden_pista = {}
+        self.contador_pistas = 0
+        # Pistas LIBRE y habilitadas, en total y por clase de vuelo compatible
+        self.libres = ConjuntoPorOrden(self.orden_pista)
+        self.libres_por_clase = {clase: ConjuntoPorOrden(self.orden_pista)
+                                 for clase in CATEGORIAS_COMPATIBLES}
+        # Heap de (minuto de liberación, orden, id_pista) de las pistas OCUPADA
+        self.liberaciones = []
+
+        # Minutos de consumo transcurridos (reloj propio del almacén)
+        self.reloj = 0
+        # id_vuelo -> (minuto de referencia del combustible, orden de llegada)
+        self.consumo = {}
+        self.contador_consumo = 0
+        # Un heap de (minuto, orden, id_vuelo) por cada regla de prioridad
+        self.vencimientos = [[] for _ in self.reglas_prioridad]
+
+        # Seguimiento de cambios para el historial de versiones (ver
+        # historial.py): None = desactivado; si no, IDs modificados desde la
+        # última versión (dict como conjunto ordenado). reemplazos cuenta las
+        # veces que se sustituyeron todos los vuelos o todas las pistas.
+        self.vuelos_modificados = None
+        self.pistas_modificadas = None
+        self.reemplazos = 0
+
+        # Vistas
+        self.vuelos = VistaVuelos(self)
+        self.pistas = self.pistas_por_id.values()
+        self.flujo_aterrizaje = VistaFlujo(self, "ATERRIZAJE")
+        self.flujo_despegue = VistaFlujo(self, "DESPEGUE")
+
+    # ---------- Seguimiento de cambios ----------
+
+    def seguir_cambios(self, activo=True):
+        """Empieza (o deja) de apuntar los IDs de los vuelos y pistas modificados"""
+        self.vuelos_modificados = {} if activo else None
+        self.pistas_modificadas = {} if activo else None
+
+    # ---------- Combustible ----------
+
+    def consume_combustible(self, vuelo):
+        """Indica si un vuelo gasta combustible en su estado actual"""
+        return vuelo[TIPO] == "ATERRIZAJE" and vuelo[ESTADO] in self.estados_consumo
+
+    def _materializar(self, vuelo):
+        """Devuelve la tupla con el combustible calculado para el reloj actual"""
+        datos = self.consumo.get(vuelo[ID])
+        if datos is None or datos[0] == self.reloj:
+            return vuelo
+        combustible = max(0, vuelo[COMBUSTIBLE] - CONSUMO_POR_MINUTO * (self.reloj - datos[0]))
+        return vuelo[:COMBUSTIBLE] + (combustible,) + vuelo[ESTADO:]
+
+    def _vencimiento(self, id_vuelo, regla):
+        """Minuto del almacén en que un vuelo cumple una regla, o None si no aplica"""
+        datos = self.consumo.get(id_vuelo)
+        if datos is None:
+            return None
+        umbral, prioridad = self.reglas_prioridad[regla]
+        vuelo = self.vuelos_por_id[id_vuelo]
+        if vuelo[PRIORIDAD] >= prioridad:
+            return None
+        # Primer minuto con combustible <= umbral (división redondeando hacia arriba)
+        return datos[0] + max(0, -(-(vuelo[COMBUSTIBLE] - umbral) // CONSUMO_POR_MINUTO))
+
+    def _indexar_consumo(self, vuelo):
+        """Fija el minuto de referencia y programa los vencimientos de un vuelo"""
+        if not self.consume_combustible(vuelo):
+            self.consumo.pop(vuelo[ID], None)
+            return
+        datos = self.consumo.get(vuelo[ID])
+        if datos is None:
+            orden = self.contador_consumo
+            self.contador_consumo += 1
+        else:
+            orden = datos[1]
+        # La tupla recién guardada trae el combustible de este minuto
+        self.consumo[vuelo[ID]] = (self.reloj, orden)
+        for regla in range(len(self.reglas_prioridad)):
+            minuto = self._vencimiento(vuelo[ID], regla)
+            if minuto is not None:
+                heapq.heappush(self.vencimientos[regla], (minuto, orden, vuelo[ID]))
+
+    def avanzar_reloj(self, minutos=1):
+        """Hace pasar minutos de consumo para todos los vuelos en espera (O(1))"""
+        self.reloj += minutos
+
+    def promover_por_combustible(self):
+        """Aplica las reglas de prioridad cuyo vencimiento ya llegó
+
+        Devuelve los IDs promovidos, regla a regla y en orden de llegada,
+        igual que si se recorriera el flujo comprobando el combustible.
+        """
+        promovidos = []
+        for regla, (_, prioridad) in enumerate(self.reglas_prioridad):
+            heap = self.vencimientos[regla]
+            vencidos = set()
+            while heap and heap[0][0] <= self.reloj:
+                minuto, orden, id_vuelo = heapq.heappop(heap)
+                # Las entradas obsoletas ya no coinciden con el vencimiento actual
+                if self._vencimiento(id_vuelo, regla) == minuto:
+                    vencidos.add((orden, id_vuelo))
+            for _, id_vuelo in sorted(vencidos):
+                vuelo = self.obtener_vuelo(id_vuelo)
+                self.actualizar_vuelo(vuelo[:PRIORIDAD] + (prioridad,) + vuelo[COMBUSTIBLE:])
+                promovidos.append(id_vuelo)
+        return promovidos
+
+    def proximo_vencimiento(self):
+        """Minuto del almacén de la próxima regla pendiente, o None"""
+        proximo = None
+        for regla, heap in enumerate(self.vencimientos):
+            while heap:
+                minuto, _, id_vuelo = heap[0]
+                if self._vencimiento(id_vuelo, regla) == minuto:
+                    break
+                heapq.heappop(heap)
+            if heap and (proximo is None or heap[0][0] < proximo):
+                proximo = heap[0][0]
+        return proximo
+
+    # ---------- Vuelos ----------
+
+    def _indexar_cola(self, vuelo, anterior=None):
+        """Mantiene el índice de vuelos EN_COLA al insertar o actualizar"""
+        if anterior is not None and anterior[ESTADO] == "EN_COLA":
+            if vuelo[ESTADO] == "EN_COLA" and vuelo[TIPO] == anterior[TIPO]:
+                return
+            self.en_cola.get(anterior[TIPO], {}).pop(anterior[ID], None)
+        if vuelo[ESTADO] == "EN_COLA" and vuelo[TIPO] in self.en_cola:
+            self.en_cola[vuelo[TIPO]][vuelo[ID]] = self.contador_cola
+            self.contador_cola += 1
+
+    def existe_vuelo(self, id_vuelo):
+        """Indica si ya hay un vuelo con ese ID"""
+        return id_vuelo in self.vuelos_por_id
+
+    def obtener_vuelo(self, id_vuelo):
+        """Devuelve la tupla del vuelo o None si no existe"""
+        vuelo = self.vuelos_por_id.get(id_vuelo)
+        if vuelo is None:
+            return None
+        return self._materializar(vuelo)
+
+    def agregar_vuelo(self, vuelo):
+        """Agrega un vuelo nuevo; devuelve False si el ID ya existe"""
+        if vuelo[ID] in self.vuelos_por_id:
+            return False
+        self.vuelos_por_id[vuelo[ID]] = vuelo
+        self._indexar_cola(vuelo)
+        self._indexar_consumo(vuelo)
+        if self.vuelos_modificados is not None:
+            self.vuelos_modificados[vuelo[ID]] = None
+        return True
+
+    def actualizar_vuelo(self, vuelo):
+        """Sustituye la tupla de un vuelo existente (mismo ID)
+
+        La tupla nueva debe traer el combustible del minuto actual, como la
+        que devuelve obtener_vuelo.
+        """
+        anterior = self.vuelos_por_id.get(vuelo[ID])
+        if anterior is None:
+            return False
+        self.vuelos_por_id[vuelo[ID]] = vuelo
+        self._indexar_cola(vuelo, anterior)
+        self._indexar_consumo(vuelo)
+        if self.vuelos_modificados is not None:
+            self.vuelos_modificados[vuelo[ID]] = None
+        return True
+
+    def cambiar_estado_vuelo(self, id_vuelo, nuevo_estado):
+        """Cambia solo el estado de un vuelo"""
+        vuelo = self.obtener_vuelo(id_vuelo)
+        if vuelo is None:
+            return False
+        return self.actualizar_vuelo(vuelo[:ESTADO] + (nuevo_estado,) + vuelo[ESTADO + 1:])
+
+    def reemplazar_vuelos(self, lista_vuelos):
+        """Sustituye todos los vuelos; devuelve los que se descartaron por ID repetido"""
+        self.reemplazos += 1
+        self.vuelos_por_id.clear()
+        for cola in self.en_cola.values():
+            cola.clear()
+        self.consumo.clear()
+        for heap in self.vencimientos:
+            heap.clear()
+        duplicados = []
+        for vuelo in lista_vuelos:
+            if not self.agregar_vuelo(vuelo):
+                duplicados.append(vuelo)
+        return duplicados
+
+    def exportar_vuelos(self):
+        """Estado completo de los vuelos para guardarlo y restaurarlo tal cual
+
+        Devuelve (vuelos, referencias, ordenes, en_cola): las tuplas tal
+        como están guardadas, en orden de alta; para cada vuelo, el minuto
+        del almacén al que corresponde su combustible y su orden de llegada
+        al consumo (-1 en ambos si no consume); y los IDs EN_COLA de cada
+        tipo en orden de llegada a la cola.
+        """
+        vuelos = list(self.vuelos_por_id.values())
+        consumo = self.consumo
+        sin_consumo = (-1, -1)
+        datos = [consumo.get(vuelo[ID], sin_consumo) for vuelo in vuelos]
+        referencias = [referencia for referencia, _ in datos]
+        ordenes = [orden for _, orden in datos]
+        en_cola = {tipo: list(cola) for tipo, cola in self.en_cola.items()}
+        return vuelos, referencias, ordenes, en_cola
+
+    def restaurar_vuelos(self, vuelos, referencias, ordenes, en_cola, reloj, contador_consumo):
+        """Sustituye los vuelos por los de exportar_vuelos y fija el reloj del almacén
+
+        A diferencia de reemplazar_vuelos conserva el orden de llegada al
+        consumo y a las colas, que deciden los empates de las reglas de
+        prioridad y el orden de los flujos.
+        """
+        self.reemplazar_vuelos([])
+        self.reloj = reloj
+        ids = [vuelo[ID] for vuelo in vuelos]
+        self.vuelos_por_id.update(zip(ids, vuelos))
+        if len(self.vuelos_por_id) != len(vuelos):
+            self.reemplazar_vuelos([])
+            raise ValueError("Hay vuelos con el ID repetido")
+        # Solo los que consumen (orden >= 0)
+        self.consumo.update(compress(zip(ids, zip(referencias, ordenes)), map((0).__le__, ordenes)))
+        for tipo, ids in en_cola.items():
+            if not all(map(self.vuelos_por_id.__contains__, ids)):
+                self.reemplazar_vuelos([])
+                raise ValueError(f"La cola de {tipo} tiene vuelos que no existen")
+            self.en_cola.setdefault(tipo, {}).update(zip(ids, range(self.contador_cola,
+                                                                    self.contador_cola + len(ids))))
+            self.contador_cola += len(ids)
+        self.contador_consumo = contador_consumo
+
+        # Vencimientos de todas las reglas (el cálculo de _vencimiento, en bloque)
+        vuelos_por_id = self.vuelos_por_id
+        for regla, (umbral, prioridad) in enumerate(self.reglas_prioridad):
+            heap = [(referencia + max(0, -(-(vuelo[COMBUSTIBLE] - umbral) // CONSUMO_POR_MINUTO)), orden, id_vuelo)
+                    for id_vuelo, (referencia, orden), vuelo
+                    in zip(self.consumo, self.consumo.values(), map(vuelos_por_id.__getitem__, self.consumo))
+                    if vuelo[PRIORIDAD] < prioridad]
+            heapq.heapify(heap)
+            self.vencimientos[regla] = heap
+
+    # ---------- Pistas ----------
+
+    def existe_pista(self, id_pista):
+        """Indica si ya hay una pista con ese ID"""
+        return id_pista in self.pistas_por_id
+
+    def obtener_pista(self, id_pista):
+        """Devuelve la tupla de la pista o None si no existe"""
+        return self.pistas_por_id.get(id_pista)
+
+    def pista_del_vuelo(self, id_vuelo):
+        """Devuelve la pista que ocupa un vuelo o None"""
+        id_pista = self.pista_de_vuelo.get(id_vuelo)
+        return self.pistas_por_id.get(id_pista) if id_pista is not None else None
+
+    def _indexar_pista(self, pista, anterior=None):
+        """Mantiene los índices vuelo -> pista, pistas libres y liberaciones"""
+        if anterior is not None and anterior[PISTA_VUELO_ACTUAL] is not None:
+            if self.pista_de_vuelo.get(anterior[PISTA_VUELO_ACTUAL]) == anterior[PISTA_ID]:
+                del self.pista_de_vuelo[anterior[PISTA_VUELO_ACTUAL]]
+        if pista[PISTA_VUELO_ACTUAL] is not None:
+            self.pista_de_vuelo[pista[PISTA_VUELO_ACTUAL]] = pista[PISTA_ID]
+
+        libre = pista[PISTA_ESTADO] == "LIBRE" and pista[PISTA_HABILITADA] == 1
+        if libre:
+            self.libres.agregar(pista[PISTA_ID])
+        else:
+            self.libres.quitar(pista[PISTA_ID])
+        for clase, conjunto in self.libres_por_clase.items():
+            if libre and categoria_compatible(pista[PISTA_CATEGORIA], clase):
+                conjunto.agregar(pista[PISTA_ID])
+            else:
+                conjunto.quitar(pista[PISTA_ID])
+
+        liberacion = pista[PISTA_TIEMPO_LIBERACION]
+        if pista[PISTA_ESTADO] == "OCUPADA" and liberacion is not None:
+            if (anterior is None or anterior[PISTA_ESTADO] != "OCUPADA"
+                    or anterior[PISTA_TIEMPO_LIBERACION] != liberacion):
+                heapq.heappush(self.liberaciones, (liberacion, self.orden_pista[pista[PISTA_ID]], pista[PISTA_ID]))
+
+    def _liberacion_vigente(self, minuto, id_pista):
+        """Indica si una entrada del heap de liberaciones sigue siendo válida"""
+        pista = self.pistas_por_id.get(id_pista)
+        return (pista is not None and pista[PISTA_ESTADO] == "OCUPADA"
+                and pista[PISTA_TIEMPO_LIBERACION] == minuto)
+
+    def pistas_libres(self):
+        """Devuelve las pistas LIBRE y habilitadas en el orden de la lista de pistas"""
+        return [self.pistas_por_id[id_pista] for id_pista in self.libres]
+
+    def hay_pistas_libres(self):
+        """Indica si hay alguna pista LIBRE y habilitada"""
+        return len(self.libres) > 0
+
+    def pista_libre_para(self, vuelo):
+        """Devuelve el ID de la primera pista libre compatible con el vuelo, o None"""
+        clase = clase_de_vuelo(vuelo)
+        if clase is None:
+            return None
+        return self.libres_por_clase[clase].primero()
+
+    def pistas_a_liberar(self, minuto):
+        """Devuelve las pistas OCUPADA cuya liberación es <= minuto, en orden de lista"""
+        vencidas = set()
+        while self.liberaciones and self.liberaciones[0][0] <= minuto:
+            liberacion, orden, id_pista = heapq.heappop(self.liberaciones)
+            if self._liberacion_vigente(liberacion, id_pista):
+                vencidas.add((orden, id_pista))
+        return [self.pistas_por_id[id_pista] for _, id_pista in sorted(vencidas)]
+
+    def proxima_liberacion(self):
+        """Minuto de la próxima liberación de pista pendiente, o None"""
+        while self.liberaciones:
+            liberacion, _, id_pista = self.liberaciones[0]
+            if self._liberacion_vigente(liberacion, id_pista):
+                return liberacion
+            heapq.heappop(self.liberaciones)
+        return None
+
+    def agregar_pista(self, pista):
+        """Agrega una pista nueva; devuelve False si el ID ya existe"""
+        if pista[PISTA_ID] in self.pistas_por_id:
+            return False
+        self.pistas_por_id[pista[PISTA_ID]] = pista
+        self.orden_pista[pista[PISTA_ID]] = self.contador_pistas
+        self.contador_pistas += 1
+        self._indexar_pista(pista)
+        if self.pistas_modificadas is not None:
+            self.pistas_modificadas[pista[PISTA_ID]] = None
+        return True
+
+    def actualizar_pista(self, pista):
+        """Sustituye la tupla de una pista existente (mismo ID)"""
+        anterior = self.pistas_por_id.get(pista[PISTA_ID])
+        if anterior is None:
+            return False
+        self.pistas_por_id[pista[PISTA_ID]] = pista
+        self._indexar_pista(pista, anterior)
+        if self.pistas_modificadas is not None:
+            self.pistas_modificadas[pista[PISTA_ID]] = None
+        return True
+
+    def reemplazar_pistas(self, lista_pistas):
+        """Sustituye todas las pistas; devuelve las que se descartaron por ID repetido"""
+        self.reemplazos += 1
+        self.pistas_por_id.clear()
+        self.pista_de_vuelo.clear()
+        self.orden_pista.clear()
+        self.libres.limpiar()
+        for conjunto in self.libres_por_clase.values():
+            conjunto.limpiar()
+        self.liberaciones.clear()
+        duplicadas = []
+        for pista in lista_pistas:
+            if not self.agregar_pista(pista):
+                duplicadas.append(pista)
+        return duplicadas
+
+    def limpiar(self):
+        """Elimina todos los vuelos y pistas"""
+        self.reemplazar_vuelos([])
+        self.reemplazar_pistas([])
@@ -0,0 +1,167 @@
+import heapq
+
+from almacen_vuelos import CATEGORIAS_COMPATIBLES, clase_de_vuelo, categoria_compatible
+
+# Constantes para índices de la tupla de vuelo (mismas que en sistema_vuelos.py)
+ID = 0
+TIEMPO = 2
+PRIORIDAD = 3
+COMBUSTIBLE = 4
+
+# Constantes para índices de la tupla de pista
+PISTA_ID = 0
+PISTA_CATEGORIA = 1
+PISTA_TIEMPO_USO = 2
+
+# Peso de cada minuto de espera según la prioridad (0=normal, 1=alta, 2=emergencia)
+PESOS_PRIORIDAD = {0: 1, 1: 3, 2: 10}
+
+INFINITO = float("inf")
+
+def peso_espera(vuelo, reloj):
+    """Coste de dejar al vuelo esperando un minuto más: prioridad x (1 + atraso)"""
+    atraso = max(0, reloj - vuelo[TIEMPO])
+    return PESOS_PRIORIDAD.get(vuelo[PRIORIDAD], 1) * (1 + atraso)
+
+def resolver_reparto(pesos_por_clase, grupos):
+    """Reparto óptimo de pistas libres entre clases de vuelo
+
+    pesos_por_clase: clase -> pesos de sus candidatos, de mayor a menor.
+    grupos: lista de (categoria, tiempo_uso, pistas_libres) con pistas
+    intercambiables entre sí.
+
+    Es un emparejamiento bipartito de coste mínimo resuelto con caminos
+    mínimos sucesivos. Como la compatibilidad solo depende de la clase del
+    vuelo y de la categoría de la pista, basta un grafo de clases y grupos
+    (pocos nodos) aunque haya cientos de pistas y miles de candidatos.
+    Primero maximiza la suma de pesos atendidos; a igualdad, minimiza el
+    tiempo de uso total de las pistas.
+
+    Devuelve (usados, flujo): cuántos candidatos de cada clase se atienden
+    y un dict (clase, índice de grupo) -> número de vuelos.
+    """
+    clases = list(pesos_por_clase)
+    # Escala para que el tiempo de uso solo desempate entre repartos de igual peso
+    escala = 1 + sum(uso * capacidad for _, uso, capacidad in grupos)
+    compatibles = {clase: [g for g, (categoria, _, _) in enumerate(grupos)
+                           if categoria_compatible(categoria, clase)]
+                   for clase in clases}
+    usados = {clase: 0 for clase in clases}
+    ocupacion = [0] * len(grupos)
+    flujo = {}
+
+    while True:
+        # Bellman-Ford desde el origen: clase <- origen (siguiente candidato),
+        # grupo <- clase (arco directo), clase <- grupo (deshacer una asignación)
+        dist_clase = {}
+        previo_clase = {}
+        for clase in clases:
+            pesos = pesos_por_clase[clase]
+            dist_clase[clase] = -pesos[usados[clase]] * escala if usados[clase] < len(pesos) else INFINITO
+            previo_clase[clase] = None
+        dist_grupo = [INFINITO] * len(grupos)
+        previo_grupo = [None] * len(grupos)
+
+        for _ in range(len(clases) + len(grupos)):
+            cambio = False
+            for clase in clases:
+                if dist_clase[clase] == INFINITO:
+                    continue
+                for g in compatibles[clase]:
+                    if dist_clase[clase] < dist_grupo[g]:
+                        dist_grupo[g] = dist_clase[clase]
+                        previo_grupo[g] = clase
+                        cambio = True
+            for g in range(len(grupos)):
+                if dist_grupo[g] == INFINITO:
+                    continue
+                for clase in clases:
+                    if flujo.get((clase, g), 0) > 0 and dist_grupo[g] < dist_clase[clase]:
+                        dist_clase[clase] = dist_grupo[g]
+                        previo_clase[clase] = g
+                        cambio = True
+            if not cambio:
+                break
+
+        # Grupo con hueco que cierra el camino más barato
+        mejor = None
+        mejor_coste = 0
+        for g, (_, uso, capacidad) in enumerate(grupos):
+            if ocupacion[g] < capacidad and dist_grupo[g] != INFINITO:
+                coste = dist_grupo[g] + uso
+                if coste < mejor_coste:
+                    mejor, mejor_coste = g, coste
+        if mejor is None:
+            break
+
+        # Aumentar una unidad a lo largo del camino
+        ocupacion[mejor] += 1
+        g = mejor
+        while True:
+            clase = previo_grupo[g]
+            flujo[(clase, g)] = flujo.get((clase, g), 0) + 1
+            if previo_clase[clase] is None:
+                usados[clase] += 1
+                break
+            g = previo_clase[clase]
+            flujo[(clase, g)] -= 1
+
+    return usados, flujo
+
+def planificar_asignacion(pistas_libres, candidatos, reloj):
+    """Empareja pistas libres y vuelos en cola minimizando la espera ponderada
+
+    pistas_libres: tuplas de pista en el orden de la lista de pistas.
+    candidatos: tuplas de vuelo EN_COLA (con el combustible actual).
+    Devuelve una lista de (vuelo, id_pista).
+    """
+    if not pistas_libres:
+        return []
+
+    # Pistas intercambiables: misma categoría y mismo tiempo de uso
+    grupos = []
+    pistas_por_grupo = []
+    indice_grupo = {}
+    for pista in pistas_libres:
+        clave = (pista[PISTA_CATEGORIA], pista[PISTA_TIEMPO_USO])
+        if clave not in indice_grupo:
+            indice_grupo[clave] = len(grupos)
+            grupos.append([clave[0], clave[1], 0])
+            pistas_por_grupo.append([])
+        g = indice_grupo[clave]
+        grupos[g][2] += 1
+        pistas_por_grupo[g].append(pista[PISTA_ID])
+
+    # Por clase solo pueden entrar tantos vuelos como pistas libres haya. Las
+    # clases van en un orden fijo, que decide los empates del reparto, para
+    # que el plan no dependa del orden de los candidatos
+    por_clase = {clase: [] for clase in CATEGORIAS_COMPATIBLES}
+    for vuelo in candidatos:
+        clase = clase_de_vuelo(vuelo)
+        if clase is not None:
+            por_clase[clase].append(vuelo)
+    mejores = {}
+    for clase, vuelos_clase in por_clase.items():
+        if not vuelos_clase:
+            continue
+        mejores[clase] = heapq.nsmallest(
+            len(pistas_libres), vuelos_clase,
+            key=lambda v: (-peso_espera(v, reloj), v[COMBUSTIBLE], v[ID]))
+
+    pesos_por_clase = {clase: [peso_espera(v, reloj) for v in vuelos_clase]
+                       for clase, vuelos_clase in mejores.items()}
+    usados, flujo = resolver_reparto(pesos_por_clase, [tuple(g) for g in grupos])
+
+    # Dentro de una clase los vuelos son intercambiables: se reparten por orden
+    asignaciones = []
+    siguiente_vuelo = {clase: 0 for clase in mejores}
+    siguiente_pista = [0] * len(grupos)
+    for g in range(len(grupos)):
+        for clase in mejores:
+            for _ in range(flujo.get((clase, g), 0)):
+                vuelo = mejores[clase][siguiente_vuelo[clase]]
+                siguiente_vuelo[clase] += 1
+                id_pista = pistas_por_grupo[g][siguiente_pista[g]]
+                siguiente_pista[g] += 1
+                asignaciones.append((vuelo, id_pista))
+    return asignaciones
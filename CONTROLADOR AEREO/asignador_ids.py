@@ -0,0 +1,69 @@
+import math
+import random
+
+AEROLINEAS = ["IB", "UX", "VY", "AF", "BA", "LH", "AA", "DL", "TK", "EK"]
+# Números de vuelo de cada aerolínea
+NUMERO_MINIMO = 100
+NUMERO_MAXIMO = 9999
+
+class AsignadorIds:
+    """Asigna IDs de vuelo sin repetir en O(1) por ID
+
+    El espacio es aerolínea + número de vuelo (con los valores por defecto
+    10 x 9900 = 99000 IDs). Un contador recorre el espacio en un orden
+    barajado con una biyección (multiplicador * posición + desplazamiento)
+    mod tamaño, con multiplicador primo con el tamaño: cada posición da un
+    ID distinto y nunca hay que sortear otra vez. Cuando se agota el
+    espacio se empieza una nueva ronda con el sufijo -2, -3, ... (como la
+    numeración de vuelos de otro día), así que no hay límite de IDs.
+
+    existe(id_vuelo), si se indica, permite saltar los IDs que ya están en
+    uso (vuelos cargados de CSV o dados de alta a mano). Con la misma
+    semilla se asignan los mismos IDs.
+    """
+
+    def __init__(self, semilla=None, aerolineas=AEROLINEAS, numero_minimo=NUMERO_MINIMO,
+                 numero_maximo=NUMERO_MAXIMO, existe=None):
+        if not aerolineas or numero_minimo > numero_maximo:
+            raise ValueError("Se necesita al menos una aerolínea y un rango de números válido")
+        self.aerolineas = list(aerolineas)
+        self.numero_minimo = numero_minimo
+        self.tamano = len(self.aerolineas) * (numero_maximo - numero_minimo + 1)
+        self.existe = existe
+
+        rng = random.Random(semilla)
+        self.multiplicador = 1
+        if self.tamano > 2:
+            self.multiplicador = rng.randrange(1, self.tamano)
+            while math.gcd(self.multiplicador, self.tamano) != 1:
+                self.multiplicador = rng.randrange(1, self.tamano)
+        self.desplazamiento = rng.randrange(self.tamano)
+        self.asignados = 0
+
+    def id_de_posicion(self, posicion):
+        """ID que corresponde a la posición posicion del contador"""
+        ronda, indice = divmod(posicion, self.tamano)
+        indice = (self.multiplicador * indice + self.desplazamiento) % self.tamano
+        numero, aerolinea = divmod(indice, len(self.aerolineas))
+        id_vuelo = f"{self.aerolineas[aerolinea]}{self.numero_minimo + numero}"
+        return f"{id_vuelo}-{ronda + 1}" if ronda else id_vuelo
+
+    def siguiente(self):
+        """Un ID nuevo (salta los que ya existen)"""
+        return self.asignar(1)[0]
+
+    def asignar(self, cantidad):
+        """Lista de cantidad IDs nuevos, distintos entre sí y de los existentes"""
+        inicio = self.asignados
+        self.asignados += cantidad
+        ids = [self.id_de_posicion(posicion) for posicion in range(inicio, self.asignados)]
+        if self.existe is None:
+            return ids
+        libres = [id_vuelo for id_vuelo in ids if not self.existe(id_vuelo)]
+        # Reponer los que estaban en uso (pocos: solo los vuelos que no salieron de aquí)
+        while len(libres) < cantidad:
+            id_vuelo = self.id_de_posicion(self.asignados)
+            self.asignados += 1
+            if not self.existe(id_vuelo):
+                libres.append(id_vuelo)
+        return libres
@@ -0,0 +1,6 @@
+"""Benchmarks de la simulación
+
+Se ejecutan como módulos desde la carpeta CONTROLADOR AEREO, por ejemplo
+python -m benchmarks.benchmark_despacho 1000 10000. Los escenarios
+(motor, pistas y vuelos sintéticos) son los de escenarios.py.
+"""
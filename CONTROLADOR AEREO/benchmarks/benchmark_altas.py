@@ -0,0 +1,72 @@
+import sys
+import time
+
+import motor_simulacion as ms
+from benchmarks.escenarios import crear_motor, crear_generador, crear_vuelos, cargar
+
+# Altas a medir en streaming (se puede pasar por línea de comandos)
+TOTAL_ALTAS = 1000000
+TRAMO = 100000
+# Tamaños para la versión que reconstruye la cola en cada alta (cuadrática)
+TAMANOS_RECONSTRUYENDO = [500, 1000, 2000]
+# Despachos usados para comprobar que ambas versiones dan el mismo orden
+DESPACHOS_COMPROBADOS = 500
+# Minutos en que se reparten las ETA/ETD
+VENTANA = 600
+
+def alta_reconstruyendo(motor, vuelo):
+    """Versión original: cada alta reconstruye la cola de despacho entera"""
+    motor.almacen.agregar_vuelo(vuelo)
+    motor.inicializar_flujos()
+
+def orden_de_despacho(motor, cantidad):
+    """Devuelve los primeros vuelos que saldrían de la cola, sin tocar el almacén"""
+    elegidos = []
+    for _ in range(cantidad):
+        vuelo = motor.obtener_siguiente_vuelo()
+        if vuelo is None:
+            break
+        elegidos.append(vuelo[ms.ID])
+        motor.almacen.cambiar_estado_vuelo(vuelo[ms.ID], "ASIGNADO")
+    return elegidos
+
+def medir_altas(motor, vuelos, dar_de_alta):
+    """Tiempo total de dar de alta los vuelos uno a uno y orden de despacho resultante"""
+    cargar(motor, [])
+    inicio = time.perf_counter()
+    for vuelo in vuelos:
+        dar_de_alta(vuelo)
+    total = time.perf_counter() - inicio
+    return total, orden_de_despacho(motor, DESPACHOS_COMPROBADOS)
+
+def main():
+    """Compara altas reconstruyendo la cola con altas incrementales"""
+    total_altas = int(sys.argv[1]) if len(sys.argv) > 1 else TOTAL_ALTAS
+    motor = crear_motor()
+
+    print("Altas una a una")
+    print(f"{'VUELOS':>10} {'RECONSTRUYENDO (ms)':>20} {'INCREMENTAL (ms)':>17} {'MISMO ORDEN':>12}")
+    for cantidad in TAMANOS_RECONSTRUYENDO:
+        vuelos = crear_vuelos(cantidad, semilla=cantidad, ventana=VENTANA)
+        t_rec, orden_rec = medir_altas(motor, vuelos, lambda vuelo: alta_reconstruyendo(motor, vuelo))
+        t_inc, orden_inc = medir_altas(motor, vuelos, motor.dar_de_alta_vuelo)
+        iguales = "SÍ" if orden_rec == orden_inc else "NO"
+        print(f"{cantidad:>10} {t_rec * 1000:>20.1f} {t_inc * 1000:>17.1f} {iguales:>12}")
+
+    print(f"\nStreaming de {total_altas} altas incrementales")
+    print(f"{'ALTAS':>10} {'TRAMO (ms)':>11} {'µs/ALTA':>8}")
+    cargar(motor, [])
+    tramo = min(TRAMO, total_altas)
+    # Los vuelos se generan por tramos, fuera de la medida
+    generador = crear_generador(dispersion_eta=VENTANA).generar(total_altas, tamano_lote=tramo)
+    altas = 0
+    for lote in generador:
+        inicio = time.perf_counter()
+        for vuelo in lote:
+            motor.dar_de_alta_vuelo(vuelo)
+        duracion = time.perf_counter() - inicio
+        altas += len(lote)
+        print(f"{altas:>10} {duracion * 1000:>11.1f} {duracion / len(lote) * 1e6:>8.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+import sys
+
+import motor_simulacion as ms
+from benchmarks.escenarios import crear_motor, crear_pistas, pistas_libres, crear_vuelos, cargar
+
+# Escenarios: (nombre, pistas, vuelos, minutos en que llegan, horizonte simulado)
+ESCENARIOS = [
+    ("aeropuerto", 3, 300, 120, 240),
+    ("red", 200, 6000, 60, 120),
+]
+# Pistas del escenario pequeño, como las del pistas.csv de ejemplo
+PISTAS_AEROPUERTO = [("P001", "larga", 3), ("P002", "estandar", 2), ("P003", "corta", 1)]
+# Autonomía de los aterrizajes
+COMBUSTIBLE_MINIMO = 10
+COMBUSTIBLE_MAXIMO = 60
+
+# Ancho de la columna MODO: el del modo con el nombre más largo
+ANCHO_MODO = max(len(modo) for modo in ms.MODOS_ASIGNACION)
+
+def simular(motor, pistas, vuelos, horizonte, modo):
+    """Ejecuta el escenario desde cero con el modo de asignación indicado"""
+    motor.modo_asignacion = modo
+    cargar(motor, vuelos, pistas)
+    return motor.ejecutar(minutos=horizonte)
+
+def main():
+    """Compara la asignación voraz con la óptima en cada escenario"""
+    semilla = int(sys.argv[1]) if len(sys.argv) > 1 else 1
+    motor = crear_motor()
+
+    print(f"{'ESCENARIO':<12} {'MODO':<{ANCHO_MODO}} {'COMPLETADOS':>11} {'ESPERA MEDIA':>13} "
+          f"{'PONDERADA':>10} {'P95':>5} {'MS/MINUTO':>10}")
+    for nombre, n_pistas, n_vuelos, ventana, horizonte in ESCENARIOS:
+        if n_pistas == len(PISTAS_AEROPUERTO):
+            pistas = pistas_libres(PISTAS_AEROPUERTO)
+        else:
+            pistas = crear_pistas(n_pistas, semilla)
+        vuelos = crear_vuelos(n_vuelos, semilla, ventana=ventana, combustible_minimo=COMBUSTIBLE_MINIMO,
+                              combustible_maximo=COMBUSTIBLE_MAXIMO)
+        for modo in ms.MODOS_ASIGNACION:
+            r = simular(motor, pistas, vuelos, horizonte, modo)
+            ms_minuto = r["segundos"] * 1000 / max(1, r["minutos_con_eventos"])
+            print(f"{nombre:<12} {modo:<{ANCHO_MODO}} {r['completados']:>11} {r['espera_media']:>13.2f} "
+                  f"{r['espera_ponderada_media']:>10.2f} {r['espera_p95']:>5} {ms_minuto:>10.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+import os
+import sys
+import tempfile
+import tracemalloc
+
+import motor_simulacion as ms
+from lector_vuelos import leer_lotes_vuelos
+from benchmarks.escenarios import crear_motor, escribir_vuelos_csv, medir
+
+VUELOS = 1000000
+# Minutos simulados en el modo en flujo
+MINUTOS = 1000
+
+def cargar_leyendo_todo(archivo):
+    """Versión original: readlines() y una lista con todos los vuelos antes de pasarlos al almacén"""
+    with open(archivo, "r", encoding="utf-8") as f:
+        lineas = f.readlines()
+    return [vuelo for lote in leer_lotes_vuelos(lineas) for vuelo in lote]
+
+def leer_por_lotes(archivo):
+    """Solo leer y validar por lotes, sin guardar los vuelos"""
+    with open(archivo, "r", encoding="utf-8") as f:
+        return sum(len(lote) for lote in leer_lotes_vuelos(f))
+
+def en_flujo(archivo):
+    """Simular MINUTOS minutos con los vuelos entrando a medida que avanza el reloj"""
+    motor = crear_motor()
+    motor.almacen.reemplazar_pistas(ms.PISTAS_EJEMPLO)
+    motor.abrir_vuelos_desde_csv(archivo)
+    motor.ejecutar(minutos=MINUTOS)
+    return motor
+
+def cargar_en_motor(archivo):
+    motor = crear_motor()
+    motor.cargar_vuelos_desde_csv(archivo)
+    return motor
+
+def medir_con_memoria(funcion, archivo):
+    """(segundos, pico de memoria en MB); cada medida se hace en una pasada distinta"""
+    segundos = medir(funcion, archivo)
+    # tracemalloc frena las reservas de memoria: se mide en otra pasada
+    tracemalloc.start()
+    resultado = funcion(archivo)
+    pico = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    del resultado
+    return segundos, pico / 1e6
+
+def main():
+    """Compara memoria y tiempo de cargar vuelos.csv entero, por lotes y en flujo"""
+    vuelos = int(sys.argv[1]) if len(sys.argv) > 1 else VUELOS
+    carpeta = tempfile.TemporaryDirectory()
+    archivo = os.path.join(carpeta.name, "vuelos.csv")
+    escribir_vuelos_csv(archivo, vuelos)
+
+    print(f"{vuelos} vuelos, CSV de {os.path.getsize(archivo) / 1e6:.0f} MB")
+    print(f"{'CARGA':<34} {'TIEMPO (s)':>10} {'PICO (MB)':>10}")
+    for nombre, funcion in (("readlines + lista (original)", cargar_leyendo_todo),
+                            ("leer por lotes sin guardar", leer_por_lotes),
+                            ("cargar_vuelos_desde_csv", cargar_en_motor),
+                            (f"en flujo, {MINUTOS} minutos", en_flujo)):
+        segundos, pico = medir_con_memoria(funcion, archivo)
+        print(f"{nombre:<34} {segundos:>10.2f} {pico:>10.1f}")
+
+    carpeta.cleanup()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+import os
+import sys
+import time
+import tempfile
+
+import motor_simulacion as ms
+from benchmarks.escenarios import crear_motor, crear_vuelos, cargar
+
+# Tamaños de cola a medir (se pueden pasar por línea de comandos)
+TAMANOS = [10000, 100000, 1000000]
+TICKS = 5
+# Autonomías largas: pocas emergencias por minuto, como en una espera real
+COMBUSTIBLE_MINIMO = 6
+COMBUSTIBLE_MAXIMO = 3000
+# Minutos en que se reparten las ETA
+VENTANA = 60
+
+def consumir_combustible_barriendo(motor, minutos=1):
+    """Versión original: reescribe la tupla de cada aterrizaje en cola"""
+    for vuelo in motor.flujo_aterrizaje:
+        nuevo_combustible = max(0, vuelo[ms.COMBUSTIBLE] - minutos)
+        motor.almacen.actualizar_vuelo((vuelo[ms.ID], vuelo[ms.TIPO], vuelo[ms.TIEMPO],
+                                        vuelo[ms.PRIORIDAD], nuevo_combustible, vuelo[ms.ESTADO]))
+
+def actualizar_prioridades_barriendo(motor):
+    """Versión original: recorre la cola buscando combustible <= 5"""
+    for vuelo in motor.flujo_aterrizaje:
+        if vuelo[ms.COMBUSTIBLE] <= 5 and vuelo[ms.PRIORIDAD] < 2:
+            motor.almacen.actualizar_vuelo((vuelo[ms.ID], vuelo[ms.TIPO], vuelo[ms.TIEMPO],
+                                            2, vuelo[ms.COMBUSTIBLE], vuelo[ms.ESTADO]))
+            motor.encolar_en_despacho(vuelo[ms.ID])
+            motor.registrar_evento("EMERGENCIA", vuelo[ms.ID], prioridad=2, motivo="combustible<=5")
+
+def medir_combustible(motor, vuelos, archivo_log, consumir, actualizar):
+    """Devuelve el tiempo medio por tick, el estado final y el log generado"""
+    # Cada medición escribe su propio log
+    motor.archivo_log = archivo_log
+    cargar(motor, vuelos)
+
+    total = 0.0
+    for _ in range(TICKS):
+        motor.reloj_simulado += 1
+        inicio = time.perf_counter()
+        consumir()
+        actualizar()
+        total += time.perf_counter() - inicio
+
+    estado = list(motor.flujo_aterrizaje)
+    motor.vaciar_log()
+    with open(archivo_log, encoding="utf-8") as f:
+        log = [linea.split("] ", 1)[1] for linea in f]
+    return total / TICKS, estado, log
+
+def main():
+    """Compara el barrido por minuto con el combustible calculado por tiempo"""
+    tamanos = [int(x) for x in sys.argv[1:]] or TAMANOS
+    # Se mide con el log de eventos activado: el barrido también lo escribe
+    carpeta = tempfile.TemporaryDirectory()
+    motor = crear_motor(registro_activo=True)
+
+    print(f"Combustible y emergencias por tick, media de {TICKS} ticks")
+    print(f"{'VUELOS':>10} {'BARRIENDO (ms)':>15} {'POR TIEMPO (ms)':>16} {'IDÉNTICO':>9}")
+    for cantidad in tamanos:
+        vuelos = crear_vuelos(cantidad, ventana=VENTANA, proporcion_aterrizajes=1,
+                              combustible_minimo=COMBUSTIBLE_MINIMO, combustible_maximo=COMBUSTIBLE_MAXIMO)
+        t_barrido, estado_barrido, log_barrido = medir_combustible(
+            motor, vuelos, os.path.join(carpeta.name, f"barriendo_{cantidad}.log"),
+            lambda: consumir_combustible_barriendo(motor), lambda: actualizar_prioridades_barriendo(motor))
+        t_tiempo, estado_tiempo, log_tiempo = medir_combustible(
+            motor, vuelos, os.path.join(carpeta.name, f"por_tiempo_{cantidad}.log"),
+            motor.consumir_combustible, motor.actualizar_prioridades_combustible)
+        iguales = "SÍ" if estado_barrido == estado_tiempo and log_barrido == log_tiempo else "NO"
+        print(f"{cantidad:>10} {t_barrido * 1000:>15.3f} {t_tiempo * 1000:>16.3f} {iguales:>9}")
+
+    motor.cerrar_log()
+    carpeta.cleanup()
+
+if __name__ == "__main__":
+    main()
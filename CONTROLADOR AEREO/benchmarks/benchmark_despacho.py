@@ -0,0 +1,70 @@
+import sys
+import time
+
+import motor_simulacion as ms
+from benchmarks.escenarios import crear_motor, crear_vuelos, cargar
+
+# Tamaños de cola a medir (se pueden pasar por línea de comandos)
+TAMANOS = [1000, 10000, 100000]
+PISTAS_POR_TICK = 20
+TICKS = 10
+# Vuelos programados por minuto: la cola crece con el horizonte, no con el ritmo
+VUELOS_POR_MINUTO = 50
+
+def obtener_siguiente_vuelo_ordenando(motor):
+    """Versión original: reordena todos los candidatos en cada llamada"""
+    candidatos = []
+    for vuelo in motor.flujo_aterrizaje:
+        if vuelo[ms.ESTADO] == "EN_COLA":
+            atraso = max(0, motor.reloj_simulado - vuelo[ms.TIEMPO])
+            candidatos.append((vuelo, -vuelo[ms.PRIORIDAD], vuelo[ms.COMBUSTIBLE], atraso, vuelo[ms.ID]))
+    for vuelo in motor.flujo_despegue:
+        if vuelo[ms.ESTADO] == "EN_COLA":
+            atraso = max(0, motor.reloj_simulado - vuelo[ms.TIEMPO])
+            candidatos.append((vuelo, -vuelo[ms.PRIORIDAD], 999, atraso, vuelo[ms.ID]))
+    if not candidatos:
+        return None
+    candidatos.sort(key=lambda x: (x[1], x[2], -x[3], x[4]))
+    return candidatos[0][0]
+
+def crear_cola(cantidad, semilla=1):
+    """Cola sintética de vuelos; los aterrizajes tienen 5-45 minutos de autonomía al llegar a la ETA"""
+    vuelos = crear_vuelos(cantidad, semilla, ventana=max(1, cantidad // VUELOS_POR_MINUTO))
+    return [(id_vuelo, tipo, tiempo, prioridad, tiempo + combustible if tipo == "ATERRIZAJE" else 0, estado)
+            for id_vuelo, tipo, tiempo, prioridad, combustible, estado in vuelos]
+
+def medir_despacho(motor, vuelos, seleccionar):
+    """Devuelve el tiempo medio de despacho por tick y los vuelos elegidos"""
+    cargar(motor, vuelos)
+    elegidos = []
+    total = 0.0
+    for _ in range(TICKS):
+        motor.reloj_simulado += 1
+        motor.consumir_combustible()
+
+        inicio = time.perf_counter()
+        for _ in range(PISTAS_POR_TICK):
+            vuelo = seleccionar()
+            if vuelo is None:
+                break
+            motor.almacen.cambiar_estado_vuelo(vuelo[ms.ID], "ASIGNADO")
+            elegidos.append(vuelo[ms.ID])
+        total += time.perf_counter() - inicio
+    return total / TICKS, elegidos
+
+def main():
+    """Compara el despacho por heap con el reordenado completo"""
+    tamanos = [int(x) for x in sys.argv[1:]] or TAMANOS
+    motor = crear_motor()
+
+    print(f"Despacho de {PISTAS_POR_TICK} pistas por tick, media de {TICKS} ticks")
+    print(f"{'VUELOS':>10} {'ORDENANDO (ms)':>16} {'HEAP (ms)':>12} {'MISMO ORDEN':>12}")
+    for cantidad in tamanos:
+        vuelos = crear_cola(cantidad)
+        t_orden, elegidos_orden = medir_despacho(motor, vuelos, lambda: obtener_siguiente_vuelo_ordenando(motor))
+        t_heap, elegidos_heap = medir_despacho(motor, vuelos, motor.obtener_siguiente_vuelo)
+        iguales = "SÍ" if elegidos_orden == elegidos_heap else "NO"
+        print(f"{cantidad:>10} {t_orden * 1000:>16.3f} {t_heap * 1000:>12.3f} {iguales:>12}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+import os
+import sys
+import tempfile
+
+from benchmarks.escenarios import motor_con_vuelos, crear_generador, medir
+
+VUELOS = 200000
+# Minutos simulados en la sesión (cada uno con algunos cambios de estado)
+MINUTOS = 60
+# Vuelos dados de alta a mano en cada minuto
+ALTAS_POR_MINUTO = 5
+
+def simular(motor, generador, guardar):
+    """Simula MINUTOS minutos con altas a mano y devuelve los segundos que tardó guardar() tras cada uno"""
+    segundos = 0.0
+    for _ in range(MINUTOS):
+        for vuelo in generador.generar_lote(ALTAS_POR_MINUTO, motor.reloj_simulado):
+            motor.dar_de_alta_vuelo(vuelo)
+        motor.avanzar_minuto()
+        segundos += medir(guardar)
+    return segundos
+
+def main():
+    """Compara guardar_estado tras cada minuto con el diario de cambios"""
+    vuelos = int(sys.argv[1]) if len(sys.argv) > 1 else VUELOS
+    carpeta = tempfile.TemporaryDirectory()
+    archivo_diario = os.path.join(carpeta.name, "benchmark.diario")
+    archivo_vuelos = os.path.join(carpeta.name, "vuelos.csv")
+    archivo_pistas = os.path.join(carpeta.name, "pistas.csv")
+
+    print(f"{vuelos} vuelos, {MINUTOS} minutos con {ALTAS_POR_MINUTO} altas por minuto")
+    print(f"{'PERSISTENCIA':<14} {'INICIO (s)':>10} {'POR MINUTO (ms)':>15} {'ESCRITO (MB)':>12}")
+
+    motor = motor_con_vuelos(vuelos)
+    guardar = simular(motor, crear_generador(2, "BA"),
+                      lambda: motor.guardar_estado(archivo_vuelos, archivo_pistas))
+    escrito = (os.path.getsize(archivo_vuelos) + os.path.getsize(archivo_pistas)) * MINUTOS / 1e6
+    print(f"{'CSV':<14} {0:>10.2f} {guardar / MINUTOS * 1000:>15.2f} {escrito:>12.1f}")
+
+    motor = motor_con_vuelos(vuelos)
+    inicio = medir(motor.activar_diario, archivo_diario)
+    base = os.path.getsize(archivo_diario + ".inst")
+    # Un fsync por minuto: lo más caro que puede pedir el diario
+    guardar = simular(motor, crear_generador(2, "BA"), motor.sincronizar_diario)
+    motor.cerrar_diario()
+    escrito = (base + os.path.getsize(archivo_diario)) / 1e6
+    print(f"{'diario':<14} {inicio:>10.2f} {guardar / MINUTOS * 1000:>15.2f} {escrito:>12.1f}")
+
+    carpeta.cleanup()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+import sys
+import random
+
+from benchmarks.escenarios import crear_generador, medir
+
+VUELOS = 1000000
+
+def generar_uno_a_uno(cantidad, semilla):
+    """Generación anterior: un sorteo por campo y vuelo (sin imprimir ni registrar)"""
+    rng = random.Random(semilla)
+    lista = []
+    for i in range(cantidad):
+        tipo = rng.choice(["ATERRIZAJE", "DESPEGUE"])
+        tiempo = rng.randint(0, 10)
+        prioridad = rng.choices([0, 1, 2], weights=[80, 15, 5])[0]
+        combustible = rng.randint(5, 45) if tipo == "ATERRIZAJE" else 0
+        lista.append((f"GV{i:06d}", tipo, tiempo, prioridad, combustible, "EN_COLA"))
+    return lista
+
+def generar_por_lotes(cantidad, semilla):
+    """GeneradorVuelos: muestreo por columnas en lotes"""
+    lista = []
+    for lote in crear_generador(semilla, "GV").generar(cantidad):
+        lista.extend(lote)
+    return lista
+
+def main():
+    """Compara la generación vuelo a vuelo con la generación por lotes"""
+    vuelos = int(sys.argv[1]) if len(sys.argv) > 1 else VUELOS
+    print(f"{vuelos} vuelos")
+    print(f"{'MÉTODO':<12} {'SEGUNDOS':>9} {'VUELOS/S':>12}")
+    for nombre, funcion in (("uno a uno", generar_uno_a_uno), ("por lotes", generar_por_lotes)):
+        segundos = medir(funcion, vuelos, 1)
+        print(f"{nombre:<12} {segundos:>9.2f} {vuelos / segundos:>12.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+import sys
+import time
+import random
+import tracemalloc
+
+import motor_simulacion as ms
+from benchmarks.escenarios import motor_con_vuelos, crear_generador
+
+VUELOS = 100000
+# Minutos simulados (cada uno con algunas altas y asignaciones)
+MINUTOS = 120
+# Vuelos dados de alta a mano en cada minuto
+ALTAS_POR_MINUTO = 5
+# Consultas de minutos pasados
+CONSULTAS = 1000
+
+def simular(motor, guardar):
+    """Simula MINUTOS minutos llamando a guardar() tras cada uno; devuelve los segundos"""
+    generador = crear_generador(2, "BA")
+    inicio = time.perf_counter()
+    for _ in range(MINUTOS):
+        for vuelo in generador.generar_lote(ALTAS_POR_MINUTO, motor.reloj_simulado):
+            motor.dar_de_alta_vuelo(vuelo)
+        motor.avanzar_minuto()
+        guardar()
+    return time.perf_counter() - inicio
+
+def sin_versiones(motor):
+    return lambda: None
+
+def copias(motor):
+    """Una copia completa del estado por minuto"""
+    guardadas = []
+    return lambda: guardadas.append(motor.estado_completo())
+
+def historial(motor):
+    motor.activar_historial()
+    return lambda: None
+
+def main():
+    """Compara el historial de versiones con guardar una copia del estado por minuto"""
+    vuelos = int(sys.argv[1]) if len(sys.argv) > 1 else VUELOS
+    print(f"{vuelos} vuelos, {MINUTOS} minutos con {ALTAS_POR_MINUTO} altas por minuto")
+    print(f"{'VERSIONES':<12} {'POR MINUTO (ms)':>15} {'MEMORIA (MB)':>12}")
+
+    # Cada variante se simula dos veces: tracemalloc frena las reservas de memoria
+    for nombre, variante in (("ninguna", sin_versiones), ("copias", copias), ("historial", historial)):
+        motor = motor_con_vuelos(vuelos)
+        segundos = simular(motor, variante(motor))
+        motor = motor_con_vuelos(vuelos)
+        # La memoria incluye la primera versión del historial (el estado completo)
+        tracemalloc.start()
+        guardar = variante(motor)
+        simular(motor, guardar)
+        memoria = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        print(f"{nombre:<12} {segundos / MINUTOS * 1000:>15.2f} {memoria / 1e6:>12.1f}")
+
+    # Consultar un vuelo en un minuto pasado cualquiera
+    aleatorio = random.Random(1)
+    ids = [vuelo[ms.ID] for vuelo in aleatorio.sample(list(motor.vuelos), CONSULTAS)]
+    inicio = time.perf_counter()
+    for id_vuelo in ids:
+        motor.version_en(aleatorio.randint(0, motor.reloj_simulado)).obtener_vuelo(id_vuelo)
+    consulta = (time.perf_counter() - inicio) / CONSULTAS
+    inicio = time.perf_counter()
+    motor.bifurcar(motor.reloj_simulado // 2)
+    bifurcar = time.perf_counter() - inicio
+    print(f"consulta de un vuelo en un minuto pasado: {consulta * 1e6:.1f} µs; "
+          f"bifurcar en el minuto {motor.reloj_simulado // 2}: {bifurcar:.2f} s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+import sys
+
+import motor_simulacion as ms
+from benchmarks.escenarios import (crear_motor, crear_pistas, crear_vuelos, cargar, altas_por_minuto,
+                                   simular_minutos, percentil)
+
+VUELOS = 5000
+PISTAS = 20
+# Minutos en que llegan los vuelos (carga por encima de la capacidad)
+VENTANA = 350
+# Minutos de antelación con que se da de alta cada vuelo respecto a su ETA
+AVISO = 20
+# Minutos extra para vaciar la cola
+MARGEN = 200
+# Presupuesto de tiempo por minuto simulado para poder mover la GUI
+PRESUPUESTO_MS = 50
+# Pistas lentas y aterrizajes con poca autonomía
+TIEMPO_USO_MAXIMO = 4
+COMBUSTIBLE_MINIMO = 8
+COMBUSTIBLE_MAXIMO = 40
+
+def simular(motor, pistas, vuelos, minutos, modo, en_directo):
+    """Simula minuto a minuto y devuelve el resumen y los ms de cada minuto
+
+    Con en_directo cada vuelo se da de alta AVISO minutos antes de su ETA;
+    si no, todos están en cola desde el principio (peor caso de latencia).
+    """
+    motor.modo_asignacion = modo
+    cargar(motor, [] if en_directo else vuelos, pistas)
+    tiempos, _ = simular_minutos(motor, minutos, altas_por_minuto(vuelos, AVISO) if en_directo else None)
+
+    esperas = motor.metricas["esperas"]
+    asignaciones = motor.metricas["asignaciones"]
+    resumen = {
+        "completados": motor.metricas["completados"],
+        "espera_media": (sum(e * n for e, n in esperas.items()) / asignaciones) if asignaciones else 0.0,
+        "ponderada": (motor.metricas["espera_ponderada"] / asignaciones) if asignaciones else 0.0,
+        "emergencias": motor.metricas["emergencias"],
+        "sin_combustible": motor.metricas["sin_combustible"],
+    }
+    return resumen, tiempos
+
+def main():
+    """Compara los modos de asignación en calidad y en tiempo por minuto"""
+    vuelos = int(sys.argv[1]) if len(sys.argv) > 1 else VUELOS
+    n_pistas = int(sys.argv[2]) if len(sys.argv) > 2 else PISTAS
+
+    motor = crear_motor()
+    pistas = crear_pistas(n_pistas, tiempo_uso_maximo=TIEMPO_USO_MAXIMO)
+    lista = crear_vuelos(vuelos, desde=AVISO, ventana=VENTANA, combustible_minimo=COMBUSTIBLE_MINIMO,
+                         combustible_maximo=COMBUSTIBLE_MAXIMO)
+    minutos = AVISO + VENTANA + MARGEN
+
+    print(f"{vuelos} vuelos, {n_pistas} pistas, {minutos} minutos "
+          f"(horizonte {motor.horizonte_planificacion} min, presupuesto {PRESUPUESTO_MS} ms/minuto)")
+    for en_directo, titulo in ((True, f"Altas {AVISO} min antes de la ETA"),
+                               (False, "Todos los vuelos en cola desde el minuto 0")):
+        print(f"\n{titulo}")
+        print(f"{'MODO':<10} {'COMPLETADOS':>11} {'ESPERA':>7} {'PONDERADA':>10} {'EMERG.':>7} "
+              f"{'SIN COMB.':>9} {'MS MEDIO':>9} {'MS P95':>7} {'MS MÁX':>7}")
+        for modo in ms.MODOS_ASIGNACION:
+            r, tiempos = simular(motor, pistas, lista, minutos, modo, en_directo)
+            print(f"{modo:<10} {r['completados']:>11} {r['espera_media']:>7.2f} {r['ponderada']:>10.2f} "
+                  f"{r['emergencias']:>7} {r['sin_combustible']:>9} {sum(tiempos) / len(tiempos):>9.2f} "
+                  f"{percentil(tiempos, 95):>7.2f} {max(tiempos):>7.2f}")
+
+if __name__ == "__main__":
+    main()
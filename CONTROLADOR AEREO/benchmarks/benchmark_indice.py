@@ -0,0 +1,87 @@
+import os
+import sys
+import time
+import random
+import tempfile
+
+from reproductor_log import leer_evento
+from benchmarks.escenarios import crear_motor
+
+EVENTOS = 2000000
+VUELOS = 200000
+PISTAS = 8
+# Eventos por minuto simulado
+EVENTOS_POR_MINUTO = 500
+CONSULTAS = 100
+
+def escribir_log(carpeta, nombre, eventos, indexar):
+    """Escribe el log con el motor; devuelve (ruta, eventos por segundo hasta disco)"""
+    motor = crear_motor(registro_activo=True, archivo_log=os.path.join(carpeta, nombre))
+    motor.indexar_log = indexar
+    aleatorio = random.Random(1)
+    inicio = time.perf_counter()
+    for i in range(eventos):
+        motor.reloj_simulado = i // EVENTOS_POR_MINUTO
+        motor.registrar_evento("ASIGNACION", f"GV{aleatorio.randrange(VUELOS):07d}",
+                               f"R{aleatorio.randrange(PISTAS)}", tipo="ATERRIZAJE")
+    motor.cerrar_log()
+    return motor.archivo_log, eventos / (time.perf_counter() - inicio)
+
+def buscar_leyendo_todo(archivo, id_vuelo=None, id_pista=None, desde=None, hasta=None):
+    """Lo que había que hacer sin índice: leer el log entero"""
+    encontrados = []
+    with open(archivo, encoding="utf-8") as f:
+        for linea in f:
+            minuto, tipo, campos, texto = leer_evento(linea)
+            if id_vuelo is not None and campos.get("id_vuelo") != id_vuelo:
+                continue
+            if id_pista is not None and campos.get("pista") != id_pista:
+                continue
+            if (desde is None or minuto >= desde) and (hasta is None or minuto <= hasta):
+                encontrados.append((0, linea.rstrip("\n")))
+    return encontrados
+
+def main():
+    """Compara consultas al log por vuelo, pista y minutos con el índice y leyendo todo el log"""
+    eventos = int(sys.argv[1]) if len(sys.argv) > 1 else EVENTOS
+    carpeta = tempfile.TemporaryDirectory()
+
+    sin_indexar, sin_indice = escribir_log(carpeta.name, "sin_indice.log", eventos, False)
+    archivo, con_indice = escribir_log(carpeta.name, "eventos.log", eventos, True)
+    tamano_log = os.path.getsize(archivo)
+    print(f"{eventos} eventos, log de {tamano_log / 1e6:.0f} MB, índice de "
+          f"{os.path.getsize(archivo + '.idx') / 1e6:.0f} MB")
+    print(f"escritura: {sin_indice:.0f} ev/s sin índice, {con_indice:.0f} ev/s con índice")
+    # Con indexar_log apagado (por defecto) la primera consulta indexa todo el log
+    inicio = time.perf_counter()
+    crear_motor(archivo_log=sin_indexar).consultar_log(id_vuelo="GV0000000")
+    print(f"primera consulta de un log sin índice: {time.perf_counter() - inicio:.1f} s")
+
+    motor = crear_motor(archivo_log=archivo)
+    ultimo = (eventos - 1) // EVENTOS_POR_MINUTO
+    aleatorio = random.Random(2)
+    consultas = [("vuelo", {"id_vuelo": f"GV{aleatorio.randrange(VUELOS):07d}"}) for _ in range(CONSULTAS)]
+    for _ in range(CONSULTAS):
+        desde = aleatorio.randint(0, ultimo)
+        consultas.append(("pista y minutos", {"id_pista": f"R{aleatorio.randrange(PISTAS)}",
+                                              "desde": desde, "hasta": desde + 100}))
+        consultas.append(("minutos", {"desde": desde, "hasta": desde + 10}))
+
+    print(f"{'CONSULTA':<16} {'ÍNDICE (ms)':>12} {'LEYENDO TODO (ms)':>18}")
+    for tipo in ("vuelo", "pista y minutos", "minutos"):
+        de_este_tipo = [parametros for nombre, parametros in consultas if nombre == tipo]
+        inicio = time.perf_counter()
+        resultados = [motor.consultar_log(**parametros) for parametros in de_este_tipo]
+        indice = (time.perf_counter() - inicio) / len(de_este_tipo)
+        # Leer todo el log es lento: se mide (y se comprueba) con una sola consulta
+        inicio = time.perf_counter()
+        referencia = buscar_leyendo_todo(archivo, **de_este_tipo[0])
+        completo = time.perf_counter() - inicio
+        if referencia != resultados[0]:
+            print(f"La consulta por {tipo} no coincide con leer todo el log")
+        print(f"{tipo:<16} {indice * 1000:>12.2f} {completo * 1000:>18.0f}")
+
+    carpeta.cleanup()
+
+if __name__ == "__main__":
+    main()
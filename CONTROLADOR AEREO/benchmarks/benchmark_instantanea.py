@@ -0,0 +1,43 @@
+import os
+import sys
+import tempfile
+
+from benchmarks.escenarios import crear_motor, motor_con_vuelos, medir
+
+VUELOS = 1000000
+# Minutos simulados antes de guardar (pistas ocupadas y combustible gastado)
+MINUTOS = 5
+
+def cargar_csv(motor, archivo_vuelos, archivo_pistas):
+    """Carga los CSV de guardar_estado como al arrancar la consola"""
+    motor.cargar_pistas_desde_csv(archivo_pistas)
+    motor.cargar_vuelos_desde_csv(archivo_vuelos)
+    motor.inicializar_flujos()
+
+def main():
+    """Compara la instantánea binaria con los CSV de guardar_estado"""
+    vuelos = int(sys.argv[1]) if len(sys.argv) > 1 else VUELOS
+    motor = motor_con_vuelos(vuelos)
+    for _ in range(MINUTOS):
+        motor.avanzar_minuto()
+    carpeta = tempfile.TemporaryDirectory()
+    archivo = os.path.join(carpeta.name, "benchmark.inst")
+    archivo_vuelos = os.path.join(carpeta.name, "vuelos.csv")
+    archivo_pistas = os.path.join(carpeta.name, "pistas.csv")
+
+    print(f"{vuelos} vuelos, minuto {motor.reloj_simulado}")
+    print(f"{'FORMATO':<12} {'GUARDAR (s)':>11} {'CARGAR (s)':>10} {'TAMAÑO (MB)':>11}")
+
+    guardar = medir(motor.guardar_instantanea, archivo)
+    cargar = medir(crear_motor().cargar_instantanea, archivo)
+    print(f"{'instantánea':<12} {guardar:>11.2f} {cargar:>10.2f} {os.path.getsize(archivo) / 1e6:>11.1f}")
+
+    guardar = medir(motor.guardar_estado, archivo_vuelos, archivo_pistas)
+    cargar = medir(cargar_csv, crear_motor(), archivo_vuelos, archivo_pistas)
+    tamano = (os.path.getsize(archivo_vuelos) + os.path.getsize(archivo_pistas)) / 1e6
+    print(f"{'CSV':<12} {guardar:>11.2f} {cargar:>10.2f} {tamano:>11.1f}")
+
+    carpeta.cleanup()
+
+if __name__ == "__main__":
+    main()
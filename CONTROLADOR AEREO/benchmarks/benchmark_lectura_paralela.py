@@ -0,0 +1,60 @@
+import os
+import sys
+import time
+import tempfile
+
+from lector_vuelos import leer_lotes_vuelos, leer_lotes_vuelos_en_paralelo
+from benchmarks.escenarios import crear_motor, escribir_vuelos_csv, medir
+
+VUELOS = 1000000
+
+def leer_en_serie(archivo):
+    with open(archivo, "r", encoding="utf-8") as f:
+        return [vuelo for lote in leer_lotes_vuelos(f) for vuelo in lote]
+
+def leer_en_paralelo(archivo, procesos):
+    return [vuelo for lote in leer_lotes_vuelos_en_paralelo(archivo, procesos=procesos) for vuelo in lote]
+
+def cargar_en_motor(archivo, procesos):
+    motor = crear_motor()
+    motor.procesos_carga = procesos
+    motor.cargar_vuelos_desde_csv(archivo)
+    return motor
+
+def main():
+    """Compara vuelos por segundo leyendo vuelos.csv en un proceso y repartido entre varios"""
+    vuelos = int(sys.argv[1]) if len(sys.argv) > 1 else VUELOS
+    nucleos = os.cpu_count() or 1
+    carpeta = tempfile.TemporaryDirectory()
+    archivo = os.path.join(carpeta.name, "vuelos.csv")
+    escribir_vuelos_csv(archivo, vuelos)
+
+    print(f"{vuelos} vuelos, CSV de {os.path.getsize(archivo) / 1e6:.0f} MB, {nucleos} núcleos")
+    print(f"{'LECTURA':<30} {'TIEMPO (s)':>10} {'VUELOS/S':>10} {'ACELERACIÓN':>12}")
+    inicio = time.perf_counter()
+    referencia = leer_en_serie(archivo)
+    serie = time.perf_counter() - inicio
+    print(f"{'leer_lotes_vuelos':<30} {serie:>10.2f} {vuelos / serie:>10.0f} {1:>12.2f}")
+
+    procesos = 1
+    while True:
+        inicio = time.perf_counter()
+        leidos = leer_en_paralelo(archivo, procesos)
+        segundos = time.perf_counter() - inicio
+        if leidos != referencia:
+            print(f"Con {procesos} procesos no se leen los mismos vuelos")
+        print(f"{f'en paralelo, {procesos} procesos':<30} {segundos:>10.2f} {vuelos / segundos:>10.0f} "
+              f"{serie / segundos:>12.2f}")
+        if procesos >= nucleos:
+            break
+        procesos = min(procesos * 2, nucleos)
+
+    # La carga completa incluye dar de alta en el almacén, que sigue siendo en serie
+    for procesos in sorted({1, nucleos}):
+        segundos = medir(cargar_en_motor, archivo, procesos)
+        print(f"{f'cargar_vuelos_desde_csv, {procesos} p.':<30} {segundos:>10.2f} {vuelos / segundos:>10.0f}")
+
+    carpeta.cleanup()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+import sys
+
+import motor_simulacion as ms
+from politicas_despacho import POLITICAS
+from benchmarks.escenarios import (crear_motor, pistas_libres, crear_vuelos, cargar, altas_por_minuto,
+                                   simular_minutos, percentil)
+
+VUELOS = 1000
+# Minutos en que llegan los vuelos (carga por encima de la capacidad)
+VENTANA = 240
+# Minutos de antelación con que se da de alta cada vuelo respecto a su ETA
+AVISO = 20
+# Minutos extra para vaciar la cola
+MARGEN = 300
+# Proporción de aterrizajes en el tráfico (carga de llegadas)
+PROPORCION_ATERRIZAJES = 0.7
+COMBUSTIBLE_MINIMO = 10
+COMBUSTIBLE_MAXIMO = 60
+PISTAS = [("P01", "larga", 2), ("P02", "larga", 3), ("P03", "estandar", 2),
+          ("P04", "estandar", 2), ("P05", "estandar", 3), ("P06", "corta", 1),
+          ("P07", "corta", 1), ("P08", "larga", 2)]
+
+def simular(motor, vuelos, politica):
+    """Simula minuto a minuto con la política indicada
+
+    Cada vuelo se da de alta AVISO minutos antes de su ETA. Devuelve las
+    métricas del motor, el minuto de la última operación completada y los
+    ms que tardó cada minuto (coste de decisión).
+    """
+    motor.modo_asignacion = ms.ASIGNACION_VORAZ
+    motor.cambiar_politica_despacho(politica)
+    cargar(motor, [], pistas_libres(PISTAS))
+    tiempos, ultimo = simular_minutos(motor, AVISO + VENTANA + MARGEN, altas_por_minuto(vuelos, AVISO))
+    return motor.metricas, ultimo, tiempos
+
+def main():
+    """Compara todas las políticas de despacho sobre el mismo tráfico"""
+    vuelos = int(sys.argv[1]) if len(sys.argv) > 1 else VUELOS
+    semilla = int(sys.argv[2]) if len(sys.argv) > 2 else 1
+    motor = crear_motor()
+    # El mismo tráfico para todas las políticas
+    lista = crear_vuelos(vuelos, semilla, desde=AVISO, ventana=VENTANA,
+                         proporcion_aterrizajes=PROPORCION_ATERRIZAJES,
+                         combustible_minimo=COMBUSTIBLE_MINIMO, combustible_maximo=COMBUSTIBLE_MAXIMO)
+    minutos = AVISO + VENTANA + MARGEN
+
+    print(f"{vuelos} vuelos ({PROPORCION_ATERRIZAJES:.0%} aterrizajes), {len(PISTAS)} pistas, "
+          f"{minutos} minutos, modo voraz")
+    total_despegues = sum(1 for vuelo in lista if vuelo[ms.TIPO] == "DESPEGUE")
+    print(f"{'POLÍTICA':<17} {'OPS/HORA':>8} {'P50':>4} {'P95':>4} {'P99':>4} {'DESPEGUES':>10} {'DESP. P95':>9} "
+          f"{'DESP. MÁX':>9} {'SIN COMB.':>9} {'MS/MINUTO':>9} {'MS P95':>7}")
+    for politica in POLITICAS:
+        metricas, ultimo, tiempos = simular(motor, lista, politica)
+        esperas = metricas["esperas"]
+        despegues = metricas["esperas_por_tipo"]["DESPEGUE"]
+        # Operaciones completadas por hora hasta la última
+        print(f"{politica:<17} {metricas['completados'] * 60 / ultimo:>8.1f} "
+              f"{ms.percentil_espera(esperas, 50):>4} {ms.percentil_espera(esperas, 95):>4} "
+              f"{ms.percentil_espera(esperas, 99):>4} "
+              f"{f'{sum(despegues.values())}/{total_despegues}':>10} {ms.percentil_espera(despegues, 95):>9} "
+              f"{max(despegues) if despegues else 0:>9} {metricas['sin_combustible']:>9} "
+              f"{sum(tiempos) / len(tiempos):>9.3f} {percentil(tiempos, 95):>7.3f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+import os
+import sys
+import time
+import tempfile
+
+import motor_simulacion as ms
+from registro_eventos import leer_eventos, EVENTO_VUELO, EVENTO_PISTA
+from benchmarks.escenarios import crear_motor
+
+EVENTOS = 200000
+# Segmentos pequeños para que el benchmark rote y comprima varias veces
+TAMANO_SEGMENTO = 4 * 1024 * 1024
+
+def registrar_abriendo(archivo, reloj, mensaje):
+    """Versión original de registrar_log: abre, añade una línea y cierra"""
+    try:
+        with open(archivo, "a", encoding="utf-8") as f:
+            f.write(f"[t={reloj}] {mensaje}\n")
+    except Exception as e:
+        print(f"Error al escribir en log: {e}")
+
+def tamano_en_disco(carpeta, prefijo):
+    """Bytes de todos los archivos de la carpeta que empiezan por prefijo"""
+    return sum(os.path.getsize(os.path.join(carpeta, nombre))
+               for nombre in os.listdir(carpeta) if nombre.startswith(prefijo))
+
+def main():
+    """Compara eventos por segundo y tamaño del log abierto por línea, en segundo plano y en JSON"""
+    eventos = int(sys.argv[1]) if len(sys.argv) > 1 else EVENTOS
+    carpeta = tempfile.TemporaryDirectory()
+    ids = [(f"GV{i:07d}", f"R{i % 8}") for i in range(eventos)]
+
+    print(f"{eventos} eventos")
+    print(f"{'LOG':<22} {'LLAMADAS (ev/s)':>15} {'HASTA DISCO (ev/s)':>18} {'DISCO (MB)':>10}")
+
+    archivo = os.path.join(carpeta.name, "abriendo.log")
+    inicio = time.perf_counter()
+    for id_vuelo, id_pista in ids:
+        registrar_abriendo(archivo, 0, f"ASIGNACION id_vuelo={id_vuelo} pista={id_pista} tipo=ATERRIZAJE")
+    segundos = time.perf_counter() - inicio
+    print(f"{'abrir por línea':<22} {eventos / segundos:>15.0f} {eventos / segundos:>18.0f} "
+          f"{os.path.getsize(archivo) / 1e6:>10.1f}")
+
+    # Llamadas: lo que tarda la simulación; hasta disco: además vaciar el búfer
+    variantes = (("texto", [ms.LOG_TEXTO], "texto"), ("json (rotación+gzip)", [ms.LOG_JSON], "json"),
+                 ("texto y json", [ms.LOG_TEXTO, ms.LOG_JSON], "ambos"))
+    for nombre, destinos, prefijo in variantes:
+        motor = crear_motor(registro_activo=True, archivo_log=os.path.join(carpeta.name, prefijo + ".log"),
+                            destinos_log=destinos, archivo_log_json=os.path.join(carpeta.name, prefijo + ".jsonl"))
+        motor.tamano_segmento_log = TAMANO_SEGMENTO
+        inicio = time.perf_counter()
+        for id_vuelo, id_pista in ids:
+            motor.registrar_evento("ASIGNACION", id_vuelo, id_pista, tipo="ATERRIZAJE")
+        llamadas = time.perf_counter() - inicio
+        motor.cerrar_log()
+        total = time.perf_counter() - inicio
+        print(f"{nombre:<22} {eventos / llamadas:>15.0f} {eventos / total:>18.0f} "
+              f"{tamano_en_disco(carpeta.name, prefijo + '.') / 1e6:>10.1f}")
+
+    with open(archivo, encoding="utf-8") as f, open(os.path.join(carpeta.name, "texto.log"), encoding="utf-8") as g:
+        if f.read() != g.read():
+            print("Los logs de texto no coinciden")
+    leidos = [(evento[EVENTO_VUELO], evento[EVENTO_PISTA])
+              for evento in leer_eventos(os.path.join(carpeta.name, "json.jsonl"))]
+    if leidos != ids:
+        print("El log JSON no trae los mismos eventos")
+
+    carpeta.cleanup()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+import os
+import sys
+import time
+import random
+import tempfile
+
+import motor_simulacion as ms
+from reproductor_log import ReproductorLog
+from benchmarks.escenarios import crear_motor, pistas_libres, crear_vuelos, cargar
+
+VUELOS = 100000
+PISTAS = pistas_libres((f"R{i}", "larga", 2) for i in range(1, 9))
+# Minutos consultados en cada prueba
+CONSULTAS = 20
+
+def escribir_log(archivo, vuelos):
+    """Simula hasta vaciar con el log activado y devuelve los vuelos cargados"""
+    motor = crear_motor(registro_activo=True, archivo_log=archivo)
+    cargados = crear_vuelos(vuelos)
+    cargar(motor, cargados, PISTAS)
+    for vuelo in cargados:
+        motor.registrar_evento("EN_COLA", vuelo[ms.ID], tipo=vuelo[ms.TIPO])
+    motor.registrar_evento("CARGA_INICIAL", vuelos=len(cargados), pistas=len(PISTAS))
+    motor.ejecutar(hasta_vaciar=True)
+    motor.cerrar_log()
+    return cargados, motor.reloj_simulado
+
+def main():
+    """Compara reproducir el log desde el principio con partir de puntos de control"""
+    vuelos = int(sys.argv[1]) if len(sys.argv) > 1 else VUELOS
+    carpeta = tempfile.TemporaryDirectory()
+    archivo = os.path.join(carpeta.name, "eventos.log")
+    cargados, ultimo = escribir_log(archivo, vuelos)
+    minutos = random.Random(1).sample(range(ultimo + 1), min(CONSULTAS, ultimo + 1))
+    print(f"{vuelos} vuelos, {ultimo} minutos, log de {os.path.getsize(archivo) / 1e6:.1f} MB")
+    print(f"{'MÉTODO':<22} {'ÍNDICE (s)':>10} {'PUNTOS':>7} {'POR CONSULTA (s)':>16}")
+
+    # Sin puntos intermedios cada consulta lee el log desde el principio
+    for nombre, eventos_por_punto in (("desde el principio", float("inf")), ("puntos de control", None)):
+        if eventos_por_punto is None:
+            reproductor = ReproductorLog(archivo, cargados, PISTAS)
+        else:
+            reproductor = ReproductorLog(archivo, cargados, PISTAS, eventos_por_punto=eventos_por_punto)
+        inicio = time.perf_counter()
+        reproductor.indexar()
+        indice = time.perf_counter() - inicio
+        inicio = time.perf_counter()
+        for minuto in minutos:
+            reproductor.estado_en(minuto)
+        consulta = (time.perf_counter() - inicio) / len(minutos)
+        print(f"{nombre:<22} {indice:>10.2f} {len(reproductor.puntos):>7} {consulta:>16.3f}")
+
+    carpeta.cleanup()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+import time
+import random
+
+import motor_simulacion as ms
+from generador_vuelos import GeneradorVuelos, ids_correlativos
+
+# Categorías y tiempo de uso máximo de las pistas sintéticas
+CATEGORIAS = ["corta", "estandar", "larga"]
+TIEMPO_USO_MAXIMO = 6
+
+# Minutos de cada bloque de vuelos al escribir un vuelos.csv ordenado
+MINUTOS_POR_BLOQUE = 1000
+
+def sin_avisos(mensaje, nivel="info"):
+    """avisar que no muestra nada: los avisos no cuentan en las medidas"""
+
+def crear_motor(registro_activo=False, **opciones):
+    """Motor de simulación para medir: sin avisos y, si no se pide, sin log de eventos
+
+    opciones se pasan a MotorSimulacion (archivo_log, destinos_log...).
+    """
+    return ms.MotorSimulacion(avisar=sin_avisos, registro_activo=registro_activo, **opciones)
+
+def pistas_libres(definicion):
+    """Tuplas de pista libres y habilitadas a partir de (id, categoría, tiempo de uso)"""
+    return [(id_pista, categoria, uso, 1, "LIBRE", None, 0) for id_pista, categoria, uso in definicion]
+
+def crear_pistas(cantidad, semilla=1, tiempo_uso_maximo=TIEMPO_USO_MAXIMO):
+    """Pistas P000, P001... con una de cada categoría como mínimo y el resto al azar"""
+    rng = random.Random(semilla)
+    return pistas_libres((f"P{i:03d}", CATEGORIAS[i] if i < len(CATEGORIAS) else rng.choice(CATEGORIAS),
+                          rng.randint(1, tiempo_uso_maximo))
+                         for i in range(cantidad))
+
+def crear_generador(semilla=1, prefijo="BV", **opciones):
+    """GeneradorVuelos con IDs prefijo + número; opciones se pasan a GeneradorVuelos
+
+    Cada generador de un mismo benchmark debe llevar su prefijo para que
+    sus IDs no choquen.
+    """
+    return GeneradorVuelos(semilla=semilla, asignar_ids=ids_correlativos(prefijo), **opciones)
+
+def crear_vuelos(cantidad, semilla=1, desde=0, ventana=None, prefijo="BV", **opciones):
+    """Lista de vuelos EN_COLA con ETA/ETD entre desde y desde + ventana
+
+    Sin ventana se usa la dispersión por defecto de GeneradorVuelos.
+    opciones se pasan a GeneradorVuelos (proporcion_aterrizajes,
+    combustible_minimo, combustible_maximo...).
+    """
+    if ventana is not None:
+        opciones["dispersion_eta"] = ventana
+    generador = crear_generador(semilla, prefijo, **opciones)
+    return [vuelo for lote in generador.generar(cantidad, desde) for vuelo in lote]
+
+def cargar(motor, vuelos, pistas=None):
+    """Deja el motor en el minuto 0 con esos vuelos en cola (y esas pistas) y las métricas a cero"""
+    motor.reloj_simulado = 0
+    if pistas is not None:
+        motor.almacen.reemplazar_pistas(pistas)
+    motor.almacen.reemplazar_vuelos(vuelos)
+    motor.inicializar_flujos()
+    motor.reiniciar_metricas()
+    return motor
+
+def motor_con_vuelos(cantidad, pistas=ms.PISTAS_EJEMPLO):
+    """Motor nuevo con cantidad vuelos generados en cola"""
+    return cargar(crear_motor(), crear_vuelos(cantidad), pistas)
+
+def altas_por_minuto(vuelos, aviso):
+    """{minuto: vuelos} para dar de alta cada vuelo aviso minutos antes de su ETA/ETD"""
+    altas = {}
+    for vuelo in vuelos:
+        altas.setdefault(vuelo[ms.TIEMPO] - aviso, []).append(vuelo)
+    return altas
+
+def simular_minutos(motor, minutos, altas=None):
+    """Avanza minutos minutos uno a uno dando de alta los vuelos de altas (ver altas_por_minuto)
+
+    Devuelve los ms que tardó cada minuto y el minuto de la última
+    operación completada.
+    """
+    altas = altas or {}
+    tiempos = []
+    ultimo = 1
+    for minuto in range(minutos):
+        for vuelo in altas.get(minuto, []):
+            motor.dar_de_alta_vuelo(vuelo)
+        inicio = time.perf_counter()
+        completados, _ = motor.avanzar_minuto()
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+        if completados:
+            ultimo = motor.reloj_simulado
+    return tiempos, ultimo
+
+def percentil(valores, porcentaje):
+    """Percentil de una lista de valores (ms de cada minuto, por ejemplo)"""
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, len(ordenados) * porcentaje // 100)]
+
+def medir(funcion, *argumentos):
+    """Segundos que tarda funcion(*argumentos)"""
+    inicio = time.perf_counter()
+    funcion(*argumentos)
+    return time.perf_counter() - inicio
+
+def escribir_vuelos_csv(archivo, cantidad, vuelos_por_minuto=3, semilla=1):
+    """vuelos.csv ordenado por ETA/ETD con unos vuelos_por_minuto vuelos por minuto
+
+    Los vuelos se generan y ordenan por bloques de MINUTOS_POR_BLOQUE
+    minutos, así que sirve para archivos de millones de vuelos.
+    """
+    generador = crear_generador(semilla, "GV", dispersion_eta=MINUTOS_POR_BLOQUE - 1)
+    por_bloque = MINUTOS_POR_BLOQUE * vuelos_por_minuto
+    with open(archivo, "w", encoding="utf-8") as f:
+        f.write("id_vuelo,tipo,eta,etd,prioridad,combustible,estado\n")
+        for primero in range(0, cantidad, por_bloque):
+            lote = generador.generar_lote(min(por_bloque, cantidad - primero),
+                                          primero // vuelos_por_minuto)
+            lote.sort(key=lambda vuelo: vuelo[ms.TIEMPO])
+            for id_vuelo, tipo, tiempo, prioridad, combustible, estado in lote:
+                if tipo == "ATERRIZAJE":
+                    f.write(f"{id_vuelo},{tipo},{tiempo},,{prioridad},{combustible},{estado}\n")
+                else:
+                    f.write(f"{id_vuelo},{tipo},,{tiempo},{prioridad},,{estado}\n")
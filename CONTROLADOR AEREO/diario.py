@@ -0,0 +1,156 @@
+import os
+import json
+import time
+import threading
+
+import instantanea
+
+# Formato del diario: un registro JSON (lista) por línea. La primera línea
+# es ["BASE", generación] y enlaza el diario con su instantánea base, que
+# guarda la misma generación en general["generacion_diario"]. Al compactar
+# se escribe primero la base nueva y después el diario vacío: si el proceso
+# se corta entre las dos, el diario viejo no coincide con la base y se
+# descarta (sus cambios ya están en la base).
+REGISTRO_BASE = "BASE"
+# Registros acumulados antes de escribirlos con un solo fsync
+REGISTROS_POR_LOTE = 1000
+# Segundos máximos que un registro espera en memoria antes del fsync
+SEGUNDOS_POR_LOTE = 1.0
+# Se compacta cuando el diario tiene más registros que vuelos hay en el almacén
+# (y al menos este mínimo): la compactación cuesta lo que la base, así que
+# repartida entre los registros sale a un coste constante por cambio
+COMPACTACION_MINIMA = 10000
+
+def archivo_base(archivo):
+    """Instantánea base del diario archivo (se puede cargar como cualquier instantánea)"""
+    return f"{archivo}.inst"
+
+def _linea(registro):
+    return json.dumps(registro, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+def leer(archivo):
+    """Generación y lista de registros de un diario
+
+    Una última línea incompleta (el proceso se cortó a mitad de escritura)
+    se descarta, igual que cualquier línea que no se pueda leer y todo lo
+    que venga detrás. Lanza ValueError si falta la cabecera.
+    """
+    with open(archivo, "r", encoding="utf-8", newline="\n") as f:
+        lineas = f.readlines()
+    if not lineas or not lineas[0].endswith("\n"):
+        raise ValueError("El diario no tiene cabecera")
+    try:
+        cabecera = json.loads(lineas[0])
+    except ValueError:
+        raise ValueError("Cabecera del diario dañada")
+    if not isinstance(cabecera, list) or len(cabecera) != 2 or cabecera[0] != REGISTRO_BASE:
+        raise ValueError("El archivo no es un diario de la simulación")
+
+    registros = []
+    for linea in lineas[1:]:
+        if not linea.endswith("\n"):
+            break
+        try:
+            registros.append(json.loads(linea))
+        except ValueError:
+            break
+    return cabecera[1], registros
+
+def recuperar(archivo):
+    """Estado de la instantánea base y registros del diario que faltan por aplicar
+
+    Si el diario es de otra generación que la base (se cortó una
+    compactación) o no existe, no hay registros que aplicar.
+    """
+    estado = instantanea.leer(archivo_base(archivo))
+    try:
+        generacion, registros = leer(archivo)
+    except FileNotFoundError:
+        return estado, []
+    if generacion != estado["general"].get("generacion_diario"):
+        return estado, []
+    return estado, registros
+
+class Diario:
+    """Diario de cambios del estado (write-ahead log) sobre una instantánea base
+
+    anotar() guarda cada cambio en memoria y los escribe por lotes, con un
+    solo fsync cada REGISTROS_POR_LOTE registros o SEGUNDOS_POR_LOTE
+    segundos; cerrar() y sincronizar() escriben lo pendiente. compactar()
+    sustituye la base por el estado actual y empieza un diario vacío. Así
+    el coste de guardar depende de los cambios y no del total de vuelos.
+    Se puede usar desde dos hilos (simulación y GUI).
+    """
+
+    def __init__(self, archivo, registros_por_lote=REGISTROS_POR_LOTE,
+                 segundos_por_lote=SEGUNDOS_POR_LOTE):
+        self.archivo = archivo
+        self.registros_por_lote = registros_por_lote
+        self.segundos_por_lote = segundos_por_lote
+        # Distinta en cada sesión, para no confundir el diario de una sesión
+        # anterior con la base nueva si se corta la primera compactación
+        self.generacion = time.time_ns()
+        self.registros = 0          # registros anotados desde la última compactación
+        self.pendientes = []        # registros aún sin escribir
+        self.ultimo_fsync = time.monotonic()
+        self.f = None
+        self.cerrojo = threading.Lock()
+
+    def anotar(self, registro):
+        """Añade un registro; escribe el lote si está lleno o lleva tiempo esperando"""
+        # Con el cerrojo: sincronizar y compactar sustituyen la lista de pendientes
+        with self.cerrojo:
+            self.pendientes.append(registro)
+            self.registros += 1
+            toca = (len(self.pendientes) >= self.registros_por_lote
+                    or time.monotonic() - self.ultimo_fsync >= self.segundos_por_lote)
+        if toca:
+            self.sincronizar()
+
+    def sincronizar_si_toca(self):
+        """Escribe lo pendiente si pasaron SEGUNDOS_POR_LOTE desde el último fsync"""
+        if self.pendientes and time.monotonic() - self.ultimo_fsync >= self.segundos_por_lote:
+            self.sincronizar()
+
+    def sincronizar(self):
+        """Escribe los registros pendientes con un solo fsync"""
+        with self.cerrojo:
+            pendientes, self.pendientes = self.pendientes, []
+            self.ultimo_fsync = time.monotonic()
+            if not pendientes or self.f is None:
+                return
+            self.f.write("".join(map(_linea, pendientes)))
+            self.f.flush()
+            os.fsync(self.f.fileno())
+
+    def compactar(self, estado):
+        """Guarda estado como base nueva y deja el diario vacío
+
+        Los registros pendientes se descartan: ya están incluidos en estado.
+        """
+        with self.cerrojo:
+            self.generacion += 1
+            estado["general"]["generacion_diario"] = self.generacion
+            instantanea.escribir(archivo_base(self.archivo), estado)
+
+            if self.f is not None:
+                self.f.close()
+            temporal = f"{self.archivo}.tmp"
+            with open(temporal, "w", encoding="utf-8", newline="\n") as f:
+                f.write(_linea([REGISTRO_BASE, self.generacion]))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temporal, self.archivo)
+            self.f = open(self.archivo, "a", encoding="utf-8", newline="\n")
+
+            self.pendientes = []
+            self.registros = 0
+            self.ultimo_fsync = time.monotonic()
+
+    def cerrar(self):
+        """Escribe lo pendiente y cierra el archivo"""
+        self.sincronizar()
+        with self.cerrojo:
+            if self.f is not None:
+                self.f.close()
+                self.f = None
@@ -0,0 +1,80 @@
+import random
+from itertools import accumulate
+
+# Reparto por defecto (el de generar_vuelos_automaticos)
+PROPORCION_ATERRIZAJES = 0.5
+PESOS_PRIORIDAD_GENERADOS = (80, 15, 5)   # prioridad 0, 1 y 2
+COMBUSTIBLE_MINIMO = 5
+COMBUSTIBLE_MAXIMO = 45
+# Minutos tras el reloj en que se reparten las ETA/ETD
+DISPERSION_ETA = 10
+
+# Vuelos por lote en generar()
+TAMANO_LOTE = 10000
+
+def ids_correlativos(prefijo="GV"):
+    """Devuelve asignar_ids(cantidad) con IDs prefijo + número correlativo"""
+    siguiente = [0]
+
+    def asignar_ids(cantidad):
+        inicio = siguiente[0]
+        siguiente[0] += cantidad
+        return [f"{prefijo}{numero:06d}" for numero in range(inicio, inicio + cantidad)]
+
+    return asignar_ids
+
+class GeneradorVuelos:
+    """Generador de vuelos aleatorios reproducible y por lotes
+
+    Cada lote se muestrea por columnas (tipo, ETA/ETD, prioridad y
+    combustible de todos los vuelos con una llamada a choices de un
+    random.Random propio), sin tocar el módulo random ni escribir nada:
+    con la misma semilla, configuración y tamaños de lote se obtienen los
+    mismos vuelos.
+
+    asignar_ids(cantidad) devuelve los IDs de un lote; por defecto
+    ids_correlativos().
+    """
+
+    def __init__(self, semilla=None, proporcion_aterrizajes=PROPORCION_ATERRIZAJES,
+                 pesos_prioridad=PESOS_PRIORIDAD_GENERADOS, combustible_minimo=COMBUSTIBLE_MINIMO,
+                 combustible_maximo=COMBUSTIBLE_MAXIMO, dispersion_eta=DISPERSION_ETA,
+                 asignar_ids=None):
+        if not 0 <= proporcion_aterrizajes <= 1:
+            raise ValueError("La proporción de aterrizajes debe estar entre 0 y 1")
+        if combustible_minimo > combustible_maximo or dispersion_eta < 0:
+            raise ValueError("Rango de combustible o dispersión de ETA no válidos")
+        if not pesos_prioridad or min(pesos_prioridad) < 0 or sum(pesos_prioridad) <= 0:
+            raise ValueError("Los pesos de prioridad deben ser no negativos y sumar más de 0")
+
+        self.semilla = semilla
+        self.rng = random.Random(semilla)
+        self.asignar_ids = asignar_ids or ids_correlativos()
+
+        # Pesos acumulados: choices no los recalcula en cada lote
+        self.tipos = ("ATERRIZAJE", "DESPEGUE")
+        self.pesos_tipo = (proporcion_aterrizajes, 1.0)
+        self.prioridades = range(len(pesos_prioridad))
+        self.pesos_prioridad = list(accumulate(pesos_prioridad))
+        self.combustibles = range(combustible_minimo, combustible_maximo + 1)
+        self.dispersion_eta = dispersion_eta
+
+    def generar_lote(self, cantidad, reloj=0):
+        """Lista de cantidad vuelos EN_COLA con ETA/ETD entre reloj y reloj + dispersion_eta"""
+        rng = self.rng
+        tipos = rng.choices(self.tipos, cum_weights=self.pesos_tipo, k=cantidad)
+        tiempos = rng.choices(range(reloj, reloj + self.dispersion_eta + 1), k=cantidad)
+        prioridades = rng.choices(self.prioridades, cum_weights=self.pesos_prioridad, k=cantidad)
+        # Se sortea combustible para todos (el flujo aleatorio no depende del
+        # reparto de tipos) y los despegues se quedan con 0
+        combustibles = rng.choices(self.combustibles, k=cantidad)
+        return [(id_vuelo, tipo, tiempo, prioridad, combustible if tipo == "ATERRIZAJE" else 0, "EN_COLA")
+                for id_vuelo, tipo, tiempo, prioridad, combustible
+                in zip(self.asignar_ids(cantidad), tipos, tiempos, prioridades, combustibles)]
+
+    def generar(self, cantidad, reloj=0, tamano_lote=TAMANO_LOTE):
+        """Genera cantidad vuelos en lotes de como mucho tamano_lote (iterador de listas)"""
+        while cantidad > 0:
+            lote = min(cantidad, tamano_lote)
+            yield self.generar_lote(lote, reloj)
+            cantidad -= lote
@@ -0,0 +1,346 @@
+import bisect
+import threading
+from itertools import groupby
+
+from almacen_vuelos import CONSUMO_POR_MINUTO
+
+# Constantes para índices de la tupla de vuelo (mismas que en sistema_vuelos.py)
+ID = 0
+TIPO = 1
+COMBUSTIBLE = 4
+ESTADO = 5
+
+# Constantes para índices de la tupla de pista
+PISTA_VUELO_ACTUAL = 5
+
+# Ramas de cada nodo del vector persistente (2 ** BITS_POR_NIVEL)
+BITS_POR_NIVEL = 5
+RAMAS = 1 << BITS_POR_NIVEL
+MASCARA = RAMAS - 1
+
+def _asignar(nodo, nivel, cambios):
+    """Copia de nodo con los cambios (lista de (posición, valor) ordenada)"""
+    nuevo = list(nodo)
+    if nivel == 0:
+        for posicion, valor in cambios:
+            rama = posicion & MASCARA
+            if rama >= len(nuevo):
+                nuevo.extend([None] * (rama + 1 - len(nuevo)))
+            nuevo[rama] = valor
+        return nuevo
+    for rama, grupo in groupby(cambios, key=lambda cambio: (cambio[0] >> nivel) & MASCARA):
+        if rama >= len(nuevo):
+            nuevo.extend([None] * (rama + 1 - len(nuevo)))
+        hijo = nuevo[rama] if nuevo[rama] is not None else []
+        nuevo[rama] = _asignar(hijo, nivel - BITS_POR_NIVEL, list(grupo))
+    return nuevo
+
+def _recorrer(nodo, nivel):
+    if nivel == 0:
+        yield from nodo
+    else:
+        for hijo in nodo:
+            yield from _recorrer(hijo, nivel - BITS_POR_NIVEL)
+
+class VectorPersistente:
+    """Vector inmutable que comparte su estructura con las versiones anteriores
+
+    Es un árbol de RAMAS hijos por nodo con los valores en las hojas.
+    asignar() no modifica el vector: devuelve otro que copia solo los nodos
+    del camino a las posiciones cambiadas (O(log n) por cambio) y comparte
+    todos los demás con el original.
+    """
+
+    __slots__ = ("tamano", "nivel", "raiz")
+
+    def __init__(self, tamano=0, nivel=0, raiz=()):
+        self.tamano = tamano
+        # Bits que quedan por debajo de la raíz (0 = la raíz es una hoja)
+        self.nivel = nivel
+        self.raiz = raiz
+
+    @classmethod
+    def desde_lista(cls, valores):
+        """Vector con los valores dados, construido de abajo arriba en O(n)"""
+        nodos = [valores[i:i + RAMAS] for i in range(0, len(valores), RAMAS)]
+        nivel = 0
+        while len(nodos) > 1:
+            nodos = [nodos[i:i + RAMAS] for i in range(0, len(nodos), RAMAS)]
+            nivel += BITS_POR_NIVEL
+        return cls(len(valores), nivel, nodos[0] if nodos else [])
+
+    def __len__(self):
+        return self.tamano
+
+    def __getitem__(self, posicion):
+        if not 0 <= posicion < self.tamano:
+            raise IndexError("Posición fuera del vector")
+        nodo = self.raiz
+        nivel = self.nivel
+        while nivel > 0:
+            nodo = nodo[(posicion >> nivel) & MASCARA]
+            nivel -= BITS_POR_NIVEL
+        return nodo[posicion & MASCARA]
+
+    def __iter__(self):
+        return _recorrer(self.raiz, self.nivel)
+
+    def asignar(self, cambios):
+        """Vector nuevo con los valores de cambios (posición -> valor)
+
+        Las posiciones a partir de len(self) añaden valores al final.
+        """
+        if not cambios:
+            return self
+        tamano = max(self.tamano, max(cambios) + 1)
+        nivel, raiz = self.nivel, self.raiz
+        # Añadir niveles por arriba hasta que quepan todas las posiciones
+        while tamano > 1 << (nivel + BITS_POR_NIVEL):
+            raiz = [raiz]
+            nivel += BITS_POR_NIVEL
+        return VectorPersistente(tamano, nivel, _asignar(raiz, nivel, sorted(cambios.items())))
+
+class Version:
+    """Estado de la simulación al terminar un minuto, de solo lectura
+
+    Los vuelos se guardan como (tupla, consumo, turno) en un
+    VectorPersistente, en orden de alta: la tupla tal como está en el
+    almacén, el (minuto de referencia, orden) de su combustible o None si
+    no consume, y su turno de llegada a la cola o None si no está EN_COLA.
+    Las versiones de un mismo tramo comparten los nodos que no cambiaron.
+    """
+
+    def __init__(self, tramo, minuto, reloj_almacen, contador_consumo, configuracion,
+                 vuelos, posiciones, pistas, posiciones_pistas, conteo):
+        self.tramo = tramo
+        self.minuto = minuto
+        self.reloj_almacen = reloj_almacen
+        self.contador_consumo = contador_consumo
+        # (modo_asignacion, politica_despacho, horizonte_planificacion)
+        self.configuracion = configuracion
+        self.vuelos = vuelos
+        # id -> posición en el vector; el dict es del tramo y solo crece, así
+        # que una versión solo ve las posiciones menores que su len(vuelos)
+        self.posiciones = posiciones
+        self.pistas = pistas
+        self.posiciones_pistas = posiciones_pistas
+        # estado -> número de vuelos
+        self.conteo = conteo
+
+    def desplazar(self, minutos):
+        """La misma versión minutos más tarde (un salto sin eventos: solo gasta combustible)"""
+        return Version(self.tramo, self.minuto + minutos, self.reloj_almacen + minutos,
+                       self.contador_consumo, self.configuracion, self.vuelos, self.posiciones,
+                       self.pistas, self.posiciones_pistas, self.conteo)
+
+    def _materializar(self, entrada):
+        """Tupla del vuelo con el combustible de este minuto (como obtener_vuelo)"""
+        vuelo, consumo, _ = entrada
+        if consumo is None or consumo[0] == self.reloj_almacen:
+            return vuelo
+        combustible = max(0, vuelo[COMBUSTIBLE] - CONSUMO_POR_MINUTO * (self.reloj_almacen - consumo[0]))
+        return vuelo[:COMBUSTIBLE] + (combustible,) + vuelo[ESTADO:]
+
+    def obtener_vuelo(self, id_vuelo):
+        """Tupla del vuelo en este minuto o None si no existía (O(log n))"""
+        posicion = self.posiciones.get(id_vuelo)
+        if posicion is None or posicion >= len(self.vuelos):
+            return None
+        return self._materializar(self.vuelos[posicion])
+
+    def obtener_pista(self, id_pista):
+        """Tupla de la pista en este minuto o None si no existía"""
+        posicion = self.posiciones_pistas.get(id_pista)
+        if posicion is None or posicion >= len(self.pistas):
+            return None
+        return self.pistas[posicion]
+
+    def vuelo_de_pista(self, id_pista):
+        """Vuelo que ocupaba la pista en este minuto, o None"""
+        pista = self.obtener_pista(id_pista)
+        if pista is None or pista[PISTA_VUELO_ACTUAL] is None:
+            return None
+        return self.obtener_vuelo(pista[PISTA_VUELO_ACTUAL])
+
+    def tuplas(self):
+        """(vuelos, pistas) de este minuto en el orden del almacén (O(n))"""
+        return [self._materializar(entrada) for entrada in self.vuelos], list(self.pistas)
+
+    def flujo(self, tipo):
+        """Vuelos EN_COLA de un tipo en orden de llegada a la cola (O(n log n))"""
+        en_cola = sorted((entrada[2], entrada) for entrada in self.vuelos
+                         if entrada[2] is not None and entrada[0][TIPO] == tipo)
+        return [self._materializar(entrada) for _, entrada in en_cola]
+
+    def estado_completo(self):
+        """El estado de esta versión con el formato de MotorSimulacion.estado_completo
+
+        Las métricas no se guardan en el historial: salen a cero.
+        """
+        entradas = list(self.vuelos)
+        en_cola = {}
+        for tipo in ("ATERRIZAJE", "DESPEGUE"):
+            turnos = sorted((turno, vuelo[ID]) for vuelo, _, turno in entradas
+                            if turno is not None and vuelo[TIPO] == tipo)
+            en_cola[tipo] = [id_vuelo for _, id_vuelo in turnos]
+        sin_consumo = (-1, -1)
+        consumos = [consumo or sin_consumo for _, consumo, _ in entradas]
+        modo_asignacion, politica_despacho, horizonte_planificacion = self.configuracion
+        return {
+            "general": {
+                "reloj_simulado": self.minuto,
+                "reloj_almacen": self.reloj_almacen,
+                "contador_consumo": self.contador_consumo,
+                "modo_asignacion": modo_asignacion,
+                "politica_despacho": politica_despacho,
+                "horizonte_planificacion": horizonte_planificacion,
+                "pistas": [list(pista) for pista in self.pistas],
+                "metricas": {"esperas": [], "esperas_por_tipo": {"ATERRIZAJE": [], "DESPEGUE": []}},
+            },
+            "vuelos": [vuelo for vuelo, _, _ in entradas],
+            "referencias": [referencia for referencia, _ in consumos],
+            "ordenes": [orden for _, orden in consumos],
+            "en_cola": en_cola,
+        }
+
+class Historial:
+    """Versiones del estado de la simulación, una por minuto simulado
+
+    Cada versión nueva parte de la anterior y solo copia los vuelos y
+    pistas que el almacén marcó como modificados, así que la memoria crece
+    con los cambios y no con vuelos x minutos. Un tramo es una ejecución
+    continua: empieza otro cuando el reloj vuelve atrás (detener) o cuando
+    se sustituyen todos los vuelos o pistas (carga de CSV, instantánea...).
+    Se puede consultar desde otro hilo mientras la simulación avanza.
+    """
+
+    def __init__(self):
+        self.versiones = []
+        # Minuto de cada versión (para bisect) y primera versión de cada tramo
+        self.minutos = []
+        self.tramos = []
+        self.reemplazos = None
+        self.cerrojo = threading.Lock()
+
+    def registrar(self, motor):
+        """Añade la versión del estado actual del motor
+
+        Si el último minuto registrado es el actual, la versión nueva lo
+        sustituye (cambios hechos a mano después del minuto).
+        """
+        almacen = motor.almacen
+        with self.cerrojo:
+            anterior = self.versiones[-1] if self.versiones else None
+            if (anterior is None or almacen.reemplazos != self.reemplazos
+                    or motor.reloj_simulado < anterior.minuto):
+                version = self._version_completa(motor, len(self.tramos))
+                self.tramos.append(len(self.versiones))
+                self.versiones.append(version)
+                self.minutos.append(version.minuto)
+            else:
+                version = self._version_incremental(motor, anterior)
+                if version.minuto == anterior.minuto:
+                    self.versiones[-1] = version
+                else:
+                    self.versiones.append(version)
+                    self.minutos.append(version.minuto)
+            self.reemplazos = almacen.reemplazos
+            almacen.vuelos_modificados.clear()
+            almacen.pistas_modificadas.clear()
+        return version
+
+    def hay_cambios(self, motor):
+        """Si el estado del motor cambió desde la última versión registrada"""
+        almacen = motor.almacen
+        if almacen.vuelos_modificados or almacen.pistas_modificadas:
+            return True
+        with self.cerrojo:
+            if not self.versiones or almacen.reemplazos != self.reemplazos:
+                return True
+            return self.versiones[-1].configuracion != self._configuracion(motor)
+
+    def _entrada(self, almacen, id_vuelo):
+        vuelo = almacen.vuelos_por_id[id_vuelo]
+        return vuelo, almacen.consumo.get(id_vuelo), almacen.en_cola.get(vuelo[TIPO], {}).get(id_vuelo)
+
+    def _configuracion(self, motor):
+        return motor.modo_asignacion, motor.politica_despacho, motor.horizonte_planificacion
+
+    def _version_completa(self, motor, tramo):
+        """Versión que no comparte nada con las anteriores (principio de tramo, O(n))"""
+        almacen = motor.almacen
+        entradas = [self._entrada(almacen, id_vuelo) for id_vuelo in almacen.vuelos_por_id]
+        posiciones = {id_vuelo: posicion for posicion, id_vuelo in enumerate(almacen.vuelos_por_id)}
+        pistas = list(almacen.pistas_por_id.values())
+        posiciones_pistas = {id_pista: posicion for posicion, id_pista in enumerate(almacen.pistas_por_id)}
+        conteo = {}
+        for vuelo, _, _ in entradas:
+            conteo[vuelo[ESTADO]] = conteo.get(vuelo[ESTADO], 0) + 1
+        return Version(tramo, motor.reloj_simulado, almacen.reloj, almacen.contador_consumo,
+                       self._configuracion(motor), VectorPersistente.desde_lista(entradas), posiciones,
+                       VectorPersistente.desde_lista(pistas), posiciones_pistas, conteo)
+
+    def _version_incremental(self, motor, anterior):
+        """Versión que copia de anterior solo lo modificado (O(cambios x log n))"""
+        almacen = motor.almacen
+        posiciones = anterior.posiciones
+        conteo = dict(anterior.conteo)
+        cambios = {}
+        for id_vuelo in almacen.vuelos_modificados:
+            posicion = posiciones.get(id_vuelo)
+            if posicion is None:
+                # Vuelo nuevo: las altas llegan en orden, así que va al final
+                posicion = posiciones[id_vuelo] = len(posiciones)
+            else:
+                estado = anterior.vuelos[posicion][0][ESTADO]
+                conteo[estado] -= 1
+            entrada = cambios[posicion] = self._entrada(almacen, id_vuelo)
+            conteo[entrada[0][ESTADO]] = conteo.get(entrada[0][ESTADO], 0) + 1
+
+        posiciones_pistas = anterior.posiciones_pistas
+        cambios_pistas = {}
+        for id_pista in almacen.pistas_modificadas:
+            posicion = posiciones_pistas.get(id_pista)
+            if posicion is None:
+                posicion = posiciones_pistas[id_pista] = len(posiciones_pistas)
+            cambios_pistas[posicion] = almacen.pistas_por_id[id_pista]
+
+        return Version(anterior.tramo, motor.reloj_simulado, almacen.reloj, almacen.contador_consumo,
+                       self._configuracion(motor), anterior.vuelos.asignar(cambios), posiciones,
+                       anterior.pistas.asignar(cambios_pistas), posiciones_pistas, conteo)
+
+    def _limites(self, tramo):
+        """(primera, última + 1) versión de un tramo"""
+        if not 0 <= tramo < len(self.tramos):
+            raise ValueError(f"No hay tramo {tramo} en el historial")
+        fin = self.tramos[tramo + 1] if tramo + 1 < len(self.tramos) else len(self.versiones)
+        return self.tramos[tramo], fin
+
+    def minutos_del_tramo(self, tramo=None):
+        """(primer minuto, último minuto) registrados de un tramo (por defecto el último)"""
+        with self.cerrojo:
+            if not self.tramos:
+                raise ValueError("El historial está vacío")
+            inicio, fin = self._limites(len(self.tramos) - 1 if tramo is None else tramo)
+            return self.minutos[inicio], self.minutos[fin - 1]
+
+    def version_en(self, minuto=None, tramo=None):
+        """Versión de un minuto de un tramo (por defecto el último de cada uno)
+
+        Busca con bisect la última versión registrada hasta ese minuto
+        (O(log minutos)); si el minuto cae dentro de un salto sin eventos,
+        la desplaza hasta él. Lanza ValueError si el minuto no está en el tramo.
+        """
+        with self.cerrojo:
+            if not self.tramos:
+                raise ValueError("El historial está vacío")
+            inicio, fin = self._limites(len(self.tramos) - 1 if tramo is None else tramo)
+            if minuto is None:
+                return self.versiones[fin - 1]
+            if not self.minutos[inicio] <= minuto <= self.minutos[fin - 1]:
+                raise ValueError(f"El minuto {minuto} no está en el tramo {self.versiones[inicio].tramo} "
+                                 f"(minutos {self.minutos[inicio]} a {self.minutos[fin - 1]})")
+            version = self.versiones[bisect.bisect_right(self.minutos, minuto, inicio, fin) - 1]
+        if version.minuto < minuto:
+            version = version.desplazar(minuto - version.minuto)
+        return version
@@ -0,0 +1,256 @@
+import os
+import sys
+import sqlite3
+import argparse
+
+from reproductor_log import leer_evento, PATRON_CANCELACION, PATRON_PISTA_MODIFICADA
+
+# Índice de eventos.log en una base SQLite al lado del log (eventos.log.idx):
+#   vuelos:  posición y longitud en el log y tramo de cada evento de un vuelo
+#   pistas:  lo mismo para los eventos de una pista, ordenados por tramo y minuto
+#   minutos: posición de la primera línea de cada minuto de cada tramo
+#   estado:  bytes del log ya indexados y último minuto y tramo vistos
+# El índice siempre se puede rehacer desde el log: si le faltan líneas
+# (se escribieron con el índice apagado) las indexa al abrirse o en el
+# siguiente lote, y si el log es más corto que lo indexado, empieza de cero.
+EXTENSION_INDICE = ".idx"
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS vuelos (vuelo TEXT, posicion INTEGER, longitud INTEGER, tramo INTEGER,
+                                   PRIMARY KEY (vuelo, posicion)) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS pistas (pista TEXT, tramo INTEGER, minuto INTEGER, posicion INTEGER, longitud INTEGER,
+                                   PRIMARY KEY (pista, tramo, minuto, posicion)) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS minutos (tramo INTEGER, minuto INTEGER, posicion INTEGER,
+                                    PRIMARY KEY (tramo, minuto));
+CREATE INDEX IF NOT EXISTS minutos_posicion ON minutos (posicion);
+CREATE TABLE IF NOT EXISTS estado (id INTEGER PRIMARY KEY CHECK (id = 0),
+                                   tamano INTEGER, tramo INTEGER, minuto INTEGER);
+INSERT OR IGNORE INTO estado VALUES (0, 0, 0, NULL);
+"""
+# Bytes del log leídos de una vez al indexar líneas que faltan
+BLOQUE_LECTURA = 1024 * 1024
+
+# Una entrada del índice es (posición, longitud, minuto, vuelo, pista)
+ENTRADA_POSICION = 0
+
+def entrada_de_linea(posicion, linea):
+    """Entrada del índice de una línea del log (bytes), o None si no es un evento"""
+    evento = leer_evento(linea.decode("utf-8", errors="replace"))
+    if evento is None:
+        return None
+    minuto, tipo, campos, texto = evento
+    id_vuelo = campos.get("id_vuelo")
+    if id_vuelo is None and tipo == "CANCELACION":
+        coincidencia = PATRON_CANCELACION.search(texto)
+        id_vuelo = coincidencia.group(1) if coincidencia else None
+    id_pista = campos.get("pista")
+    if id_pista is None and tipo in ("PISTA_AGREGADA", "PISTA_MODIFICADA"):
+        coincidencia = PATRON_PISTA_MODIFICADA.search(texto)
+        id_pista = campos.get("id") or (coincidencia.group(1) if coincidencia else None)
+    return (posicion, len(linea), minuto, id_vuelo, id_pista)
+
+class IndiceLog:
+    """Índice de eventos.log por vuelo, pista y minuto para consultarlo sin leerlo entero
+
+    Con motor.indexar_log, DestinoTexto llama a anotar() con la posición
+    de cada línea que escribe, así que el índice crece a la vez que el
+    log; si no, ponerse_al_dia() indexa el log al consultarlo. Las consultas
+    (eventos_de_vuelo, eventos_de_pista, eventos_entre) buscan en el
+    índice y leen del log solo las líneas pedidas. Como en
+    ReproductorLog, cada vez que el reloj vuelve atrás empieza un tramo.
+    """
+
+    def __init__(self, archivo_log, archivo_indice=None):
+        self.archivo_log = archivo_log
+        # anotar() se llama desde el hilo escritor: las rutas se resuelven ahora
+        self.ruta_log = os.path.abspath(archivo_log)
+        self.ruta = os.path.abspath(archivo_indice or archivo_log + EXTENSION_INDICE)
+        try:
+            self.conexion = sqlite3.connect(self.ruta, isolation_level=None, check_same_thread=False)
+            # El índice se puede rehacer desde el log: no hace falta esperar al disco
+            self.conexion.execute("PRAGMA synchronous = OFF")
+            self.conexion.executescript(ESQUEMA)
+        except sqlite3.Error as e:
+            raise OSError(f"No se pudo abrir el índice {self.ruta}: {e}") from e
+
+    def anotar(self, entradas):
+        """Añade al índice las entradas de líneas recién escritas en el log"""
+        try:
+            self._indexar(entradas)
+        except sqlite3.Error as e:
+            raise OSError(f"Error en el índice {self.ruta}: {e}") from e
+
+    def ponerse_al_dia(self):
+        """Indexa las líneas del log que aún no están en el índice; devuelve cuántas"""
+        try:
+            return self._indexar([])
+        except sqlite3.Error as e:
+            raise OSError(f"Error en el índice {self.ruta}: {e}") from e
+
+    def _indexar(self, entradas):
+        cursor = self.conexion.cursor()
+        # IMMEDIATE: otro proceso que indexe el mismo log espera a que acabemos
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            tamano, tramo, ultimo = cursor.execute("SELECT tamano, tramo, minuto FROM estado").fetchone()
+            tamano_log = os.path.getsize(self.ruta_log) if os.path.exists(self.ruta_log) else 0
+            if tamano_log < tamano:
+                # El log se borró o se sustituyó: el índice no vale
+                cursor.execute("DELETE FROM vuelos")
+                cursor.execute("DELETE FROM pistas")
+                cursor.execute("DELETE FROM minutos")
+                tamano, tramo, ultimo = 0, 0, None
+            # Líneas escritas sin índice antes de estas (o todas, si no hay entradas)
+            hasta = entradas[0][ENTRADA_POSICION] if entradas else tamano_log
+            pendientes = list(self._entradas_del_log(tamano, hasta))
+            pendientes.extend(entrada for entrada in entradas if entrada[ENTRADA_POSICION] >= tamano)
+
+            vuelos, pistas, minutos = [], [], []
+            for posicion, longitud, minuto, id_vuelo, id_pista in pendientes:
+                if ultimo is not None and minuto < ultimo:
+                    tramo += 1
+                if minuto != ultimo:
+                    minutos.append((tramo, minuto, posicion))
+                ultimo = minuto
+                if id_vuelo is not None:
+                    vuelos.append((id_vuelo, posicion, longitud, tramo))
+                if id_pista is not None:
+                    pistas.append((id_pista, tramo, minuto, posicion, longitud))
+                tamano = posicion + longitud
+            cursor.executemany("INSERT OR IGNORE INTO vuelos VALUES (?, ?, ?, ?)", vuelos)
+            cursor.executemany("INSERT OR IGNORE INTO pistas VALUES (?, ?, ?, ?, ?)", pistas)
+            cursor.executemany("INSERT OR IGNORE INTO minutos VALUES (?, ?, ?)", minutos)
+            cursor.execute("UPDATE estado SET tamano = ?, tramo = ?, minuto = ?", (tamano, tramo, ultimo))
+            cursor.execute("COMMIT")
+        except BaseException:
+            cursor.execute("ROLLBACK")
+            raise
+        return len(pendientes)
+
+    def _entradas_del_log(self, desde, hasta):
+        """Entradas de las líneas completas del log entre las posiciones desde y hasta"""
+        if hasta <= desde:
+            return
+        with open(self.ruta_log, "rb") as f:
+            f.seek(desde)
+            posicion, resto = desde, b""
+            while posicion + len(resto) < hasta:
+                bloque = f.read(min(BLOQUE_LECTURA, hasta - posicion - len(resto)))
+                if not bloque:
+                    break
+                lineas = (resto + bloque).split(b"\n")
+                resto = lineas.pop()
+                for linea in lineas:
+                    entrada = entrada_de_linea(posicion, linea + b"\n")
+                    if entrada is not None:
+                        yield entrada
+                    posicion += len(linea) + 1
+        # Una línea sin salto final está a medio escribir: se indexa en la próxima vuelta
+
+    def _consultar(self, consulta, parametros=()):
+        try:
+            return self.conexion.execute(consulta, parametros).fetchall()
+        except sqlite3.Error as e:
+            raise OSError(f"Error en el índice {self.ruta}: {e}") from e
+
+    def _leer_lineas(self, filas):
+        """(tramo, línea) de cada (posición, longitud, tramo), juntando las lecturas contiguas"""
+        resultado = []
+        with open(self.ruta_log, "rb") as f:
+            fin = None
+            for posicion, longitud, tramo in filas:
+                if posicion != fin:
+                    f.seek(posicion)
+                resultado.append((tramo, f.read(longitud).decode("utf-8", errors="replace").rstrip("\r\n")))
+                fin = posicion + longitud
+        return resultado
+
+    def eventos_de_vuelo(self, id_vuelo):
+        """(tramo, línea) de todos los eventos de un vuelo, en orden"""
+        filas = self._consultar("SELECT posicion, longitud, tramo FROM vuelos WHERE vuelo = ? "
+                                "ORDER BY posicion", (id_vuelo,))
+        return self._leer_lineas(filas)
+
+    def eventos_de_pista(self, id_pista, desde=None, hasta=None, tramo=None):
+        """(tramo, línea) de los eventos de una pista entre los minutos desde y hasta (incluidos)"""
+        consulta, parametros = "SELECT posicion, longitud, tramo FROM pistas WHERE pista = ?", [id_pista]
+        if tramo is not None:
+            consulta += " AND tramo = ?"
+            parametros.append(tramo)
+        if desde is not None:
+            consulta += " AND minuto >= ?"
+            parametros.append(desde)
+        if hasta is not None:
+            consulta += " AND minuto <= ?"
+            parametros.append(hasta)
+        filas = self._consultar(consulta + " ORDER BY posicion", parametros)
+        return self._leer_lineas(filas)
+
+    def eventos_entre(self, desde=None, hasta=None, tramo=None):
+        """(tramo, línea) de todas las líneas del log entre los minutos desde y hasta (incluidos)
+
+        Dentro de un tramo los minutos no bajan, así que el intervalo es un
+        trozo seguido del log: se lee de una vez desde el primer minuto
+        pedido hasta el siguiente al último.
+        """
+        if desde is not None and hasta is not None and desde > hasta:
+            return []
+        tamano = self._consultar("SELECT tamano FROM estado")[0][0]
+        desde = desde if desde is not None else -1
+        hasta = hasta if hasta is not None else float("inf")
+        tramos = [tramo] if tramo is not None else [
+            fila[0] for fila in self._consultar("SELECT DISTINCT tramo FROM minutos ORDER BY tramo")]
+        resultado = []
+        for numero in tramos:
+            inicio = self._consultar(
+                "SELECT MIN(posicion) FROM minutos WHERE tramo = ? AND minuto >= ? AND minuto <= ?",
+                (numero, desde, hasta))[0][0]
+            if inicio is None:
+                continue
+            # El trozo acaba en el siguiente minuto (o tramo) o al final de lo indexado
+            fin = self._consultar(
+                "SELECT MIN(posicion) FROM minutos WHERE posicion > ? AND (tramo > ? OR minuto > ?)",
+                (inicio, numero, hasta))[0][0]
+            with open(self.ruta_log, "rb") as f:
+                f.seek(inicio)
+                trozo = f.read((fin if fin is not None else tamano) - inicio)
+            resultado.extend((numero, linea) for linea in
+                             trozo.decode("utf-8", errors="replace").splitlines())
+        return resultado
+
+    def cerrar(self):
+        """Cierra la base del índice"""
+        self.conexion.close()
+
+def main(argumentos):
+    """Busca en eventos.log por vuelo, por pista o por minutos usando el índice"""
+    parser = argparse.ArgumentParser(description="Consulta eventos.log por vuelo, pista o minutos con su índice")
+    parser.add_argument("log", nargs="?", default="eventos.log", help="log de eventos (default eventos.log)")
+    parser.add_argument("--vuelo", help="eventos de un vuelo")
+    parser.add_argument("--pista", help="eventos de una pista (con --desde/--hasta, solo esos minutos)")
+    parser.add_argument("--desde", type=int, default=None, help="primer minuto")
+    parser.add_argument("--hasta", type=int, default=None, help="último minuto")
+    parser.add_argument("--tramo", type=int, default=None,
+                        help="tramo del log (el reloj vuelve a 0 al detener o en cada sesión; default todos)")
+    parser.add_argument("--indice", default=None, help=f"archivo del índice (default LOG{EXTENSION_INDICE})")
+    args = parser.parse_args(argumentos)
+
+    if not os.path.exists(args.log):
+        print(f"Archivo {args.log} no encontrado.")
+        return
+    indice = IndiceLog(args.log, args.indice)
+    nuevos = indice.ponerse_al_dia()
+    if nuevos:
+        print(f"Indexados {nuevos} eventos nuevos de {args.log}")
+    if args.vuelo:
+        eventos = indice.eventos_de_vuelo(args.vuelo)
+    elif args.pista:
+        eventos = indice.eventos_de_pista(args.pista, args.desde, args.hasta, args.tramo)
+    else:
+        eventos = indice.eventos_entre(args.desde, args.hasta, args.tramo)
+    for tramo, linea in eventos:
+        print(f"tramo {tramo}: {linea}")
+    print(f"{len(eventos)} eventos")
+    indice.cerrar()
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
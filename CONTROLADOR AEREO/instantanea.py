@@ -0,0 +1,167 @@
+import os
+import json
+import zlib
+import struct
+from array import array
+from operator import itemgetter
+
+# Formato de la instantánea:
+#   cabecera (MAGIA, versión, crc32 del cuerpo, longitud del cuerpo)
+#   cuerpo comprimido con zlib = secciones (longitud + bytes) en orden fijo:
+#     datos generales (JSON), IDs de vuelo (separados por \n), tipo y estado
+#     (índices en las tablas del JSON), ETA/ETD, prioridad, combustible,
+#     minuto de referencia del combustible y orden de consumo (-1 si no
+#     consume), y los IDs EN_COLA de cada tipo en el orden de la cola
+MAGIA = b"SIMAER"
+VERSION = 1
+CABECERA = struct.Struct("<6sHIQ")
+LONGITUD_SECCION = struct.Struct("<Q")
+# Compresión rápida: la instantánea se escribe durante la simulación
+NIVEL_COMPRESION = 1
+
+def _codificar_categorias(valores):
+    """Tabla de valores distintos e índices de cada valor en la tabla"""
+    tabla = list(dict.fromkeys(valores))
+    posicion = {valor: i for i, valor in enumerate(tabla)}
+    return tabla, array("H", map(posicion.__getitem__, valores)).tobytes()
+
+def _unir_ids(ids):
+    """IDs separados por saltos de línea (no pueden contener ninguno)"""
+    texto = "\n".join(ids)
+    if texto.count("\n") != max(0, len(ids) - 1):
+        raise ValueError("Los IDs no pueden contener saltos de línea")
+    return texto
+
+def _separar_ids(datos, cantidad):
+    """Inversa de _unir_ids"""
+    return datos.decode("utf-8").split("\n") if cantidad else []
+
+def _secciones(datos):
+    """Une las secciones con su longitud delante"""
+    partes = []
+    for seccion in datos:
+        partes.append(LONGITUD_SECCION.pack(len(seccion)))
+        partes.append(seccion)
+    return b"".join(partes)
+
+def _leer_secciones(cuerpo):
+    """Separa las secciones de un cuerpo ya descomprimido"""
+    secciones = []
+    posicion = 0
+    while posicion < len(cuerpo):
+        (longitud,) = LONGITUD_SECCION.unpack_from(cuerpo, posicion)
+        posicion += LONGITUD_SECCION.size
+        if posicion + longitud > len(cuerpo):
+            raise ValueError("Instantánea truncada")
+        secciones.append(cuerpo[posicion:posicion + longitud])
+        posicion += longitud
+    return secciones
+
+def _enteros(datos):
+    """Columna de enteros de 64 bits guardada con tobytes"""
+    columna = array("q")
+    columna.frombytes(datos)
+    return columna
+
+def serializar(estado):
+    """Convierte el estado del motor (ver MotorSimulacion.estado_completo) en bytes"""
+    vuelos = estado["vuelos"]
+    # Una columna por campo de la tupla de vuelo
+    ids, tipos, tiempos, prioridades, combustibles, estados = (list(map(itemgetter(i), vuelos))
+                                                              for i in range(6))
+    texto_ids = _unir_ids(ids)
+    tabla_tipos, codigos_tipos = _codificar_categorias(tipos)
+    tabla_estados, codigos_estados = _codificar_categorias(estados)
+
+    tipos_cola = list(estado["en_cola"])
+    general = dict(estado["general"], tipos=tabla_tipos, estados=tabla_estados,
+                   tipos_cola=tipos_cola, vuelos=len(vuelos))
+
+    secciones = [
+        json.dumps(general, ensure_ascii=False).encode("utf-8"),
+        texto_ids.encode("utf-8"),
+        codigos_tipos,
+        codigos_estados,
+        array("q", tiempos).tobytes(),
+        array("q", prioridades).tobytes(),
+        array("q", combustibles).tobytes(),
+        array("q", estado["referencias"]).tobytes(),
+        array("q", estado["ordenes"]).tobytes(),
+    ]
+    for tipo in tipos_cola:
+        secciones.append(_unir_ids(estado["en_cola"][tipo]).encode("utf-8"))
+
+    cuerpo = zlib.compress(_secciones(secciones), NIVEL_COMPRESION)
+    return CABECERA.pack(MAGIA, VERSION, zlib.crc32(cuerpo), len(cuerpo)) + cuerpo
+
+def deserializar(datos):
+    """Reconstruye el estado guardado por serializar
+
+    Lanza ValueError si el archivo no es una instantánea, es de otra
+    versión o está dañado (longitud o crc32 que no coinciden).
+    """
+    if len(datos) < CABECERA.size:
+        raise ValueError("Archivo demasiado corto para ser una instantánea")
+    magia, version, crc, longitud = CABECERA.unpack_from(datos)
+    if magia != MAGIA:
+        raise ValueError("El archivo no es una instantánea de la simulación")
+    if version != VERSION:
+        raise ValueError(f"Versión de instantánea {version} no soportada (se esperaba {VERSION})")
+    cuerpo = datos[CABECERA.size:]
+    if len(cuerpo) != longitud or zlib.crc32(cuerpo) != crc:
+        raise ValueError("Instantánea dañada: la suma de comprobación no coincide")
+    try:
+        return _decodificar(zlib.decompress(cuerpo))
+    except (zlib.error, struct.error, KeyError, IndexError, TypeError) as e:
+        raise ValueError(f"Instantánea dañada: {e}")
+
+def _decodificar(cuerpo):
+    """Estado a partir del cuerpo descomprimido"""
+    secciones = _leer_secciones(cuerpo)
+    general = json.loads(secciones[0].decode("utf-8"))
+    total = general.pop("vuelos")
+    tabla_tipos = general.pop("tipos")
+    tabla_estados = general.pop("estados")
+    tipos_cola = general.pop("tipos_cola")
+    if len(secciones) != 9 + len(tipos_cola):
+        raise ValueError("Instantánea incompleta")
+
+    ids = _separar_ids(secciones[1], total)
+    codigos_tipos = array("H")
+    codigos_tipos.frombytes(secciones[2])
+    codigos_estados = array("H")
+    codigos_estados.frombytes(secciones[3])
+    columnas = [_enteros(seccion) for seccion in secciones[4:9]]
+    if any(len(columna) != total for columna in [ids, codigos_tipos, codigos_estados] + columnas):
+        raise ValueError("Instantánea incompleta")
+    tiempos, prioridades, combustibles, referencias, ordenes = columnas
+
+    vuelos = list(zip(ids, map(tabla_tipos.__getitem__, codigos_tipos), tiempos, prioridades,
+                      combustibles, map(tabla_estados.__getitem__, codigos_estados)))
+    en_cola = {tipo: _separar_ids(seccion, len(seccion))
+               for tipo, seccion in zip(tipos_cola, secciones[9:])}
+    return {
+        "general": general,
+        "vuelos": vuelos,
+        "referencias": referencias,
+        "ordenes": ordenes,
+        "en_cola": en_cola,
+    }
+
+def escribir(archivo, estado):
+    """Guarda la instantánea de forma atómica (archivo temporal y os.replace)
+
+    Si el proceso se interrumpe a mitad, la instantánea anterior sigue
+    intacta; por eso sirve para el autoguardado periódico.
+    """
+    temporal = f"{archivo}.tmp"
+    with open(temporal, "wb") as f:
+        f.write(serializar(estado))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporal, archivo)
+
+def leer(archivo):
+    """Lee una instantánea escrita con escribir"""
+    with open(archivo, "rb") as f:
+        return deserializar(f.read())
@@ -0,0 +1,242 @@
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+
+# Estados de un vuelo
+ESTADOS = ["EN_COLA", "ASIGNADO", "COMPLETADO", "CANCELADO"]
+
+# Columnas de vuelos.csv (se usan si el archivo no trae cabecera reconocible)
+COLUMNAS_VUELOS = ["id_vuelo", "tipo", "eta", "etd", "prioridad", "combustible", "estado"]
+
+# Vuelos de cada lote al leer un CSV por partes: la memoria de la lectura
+# depende de este número y no del tamaño del archivo
+VUELOS_POR_LOTE = 10000
+
+# Bytes de cada trozo del CSV en la lectura en paralelo (unos 100.000 vuelos)
+TAMANO_TROZO = 4 * 1024 * 1024
+
+def columnas_de_cabecera(linea):
+    """(cabecera, columnas) de la primera línea de vuelos.csv
+
+    Las columnas se buscan por nombre, así que sirve tanto para vuelos.csv
+    (eta y etd por separado) como para el CSV que escribe guardar_estado
+    (una sola columna tiempo). Sin columna tipo se usan COLUMNAS_VUELOS.
+    """
+    cabecera = [c.strip().lower() for c in linea.split(",")] if linea else []
+    if "tipo" not in cabecera:
+        cabecera = COLUMNAS_VUELOS
+    return cabecera, {nombre: i for i, nombre in enumerate(cabecera)}
+
+def leer_vuelo(datos, cabecera, columnas):
+    """Tupla de vuelo con los campos de una línea, o None si la línea no es un vuelo
+
+    Lanza ValueError o IndexError si un campo numérico no es válido.
+    """
+    def campo(*nombres):
+        """Primer valor no vacío de las columnas indicadas"""
+        for nombre in nombres:
+            if nombre in columnas and datos[columnas[nombre]].strip():
+                return datos[columnas[nombre]].strip()
+        return ""
+
+    if len(datos) < len(cabecera):
+        return None
+
+    id_vuelo = campo("id_vuelo", "id")
+    tipo = campo("tipo").upper()
+
+    # Aterrizajes usan eta y despegues etd (o tiempo si no hay)
+    if tipo == "ATERRIZAJE":
+        tiempo_str = campo("eta", "tiempo")
+    else:
+        tiempo_str = campo("etd", "tiempo")
+
+    # Convertir a int, manejar campos vacíos
+    tiempo = int(tiempo_str) if tiempo_str else 0
+    prioridad_str = campo("prioridad")
+    prioridad = int(prioridad_str) if prioridad_str else 0
+
+    # Combustible - solo para aterrizajes
+    combustible_str = campo("combustible")
+    combustible = int(combustible_str) if combustible_str and tipo == "ATERRIZAJE" else 0
+
+    estado = campo("estado").upper() or "EN_COLA"
+
+    if tipo not in ["ATERRIZAJE", "DESPEGUE"]:
+        return None
+    if estado not in ESTADOS:
+        estado = "EN_COLA"
+    if prioridad not in [0, 1, 2]:
+        prioridad = 0
+
+    return (id_vuelo, tipo, tiempo, prioridad, combustible, estado)
+
+def leer_lotes_vuelos(lineas, avisar=None, vuelos_por_lote=VUELOS_POR_LOTE):
+    """Lotes (listas) de los vuelos válidos de vuelos.csv, leídos a medida que se piden
+
+    lineas es el archivo abierto (o cualquier iterable de líneas) y la
+    primera es la cabecera. Una línea con un campo no válido se salta y
+    el error se entrega a avisar(mensaje, nivel).
+    """
+    lineas = iter(lineas)
+    cabecera, columnas = columnas_de_cabecera(next(lineas, ""))
+    lote = []
+    for numero_linea, linea in enumerate(lineas, start=2):
+        datos = linea.strip().split(",")
+        try:
+            vuelo = leer_vuelo(datos, cabecera, columnas)
+        except (ValueError, IndexError) as e:
+            if avisar is not None:
+                avisar(f"Error en línea {numero_linea}: {e} - Datos: {datos}", "warning")
+            continue
+        if vuelo is None:
+            continue
+        lote.append(vuelo)
+        if len(lote) >= vuelos_por_lote:
+            yield lote
+            lote = []
+    if lote:
+        yield lote
+
+def leer_hasta_salto(f, tamano_bloque=64 * 1024):
+    """Bytes de f desde donde está hasta justo después del siguiente salto de línea
+
+    Como readline() de un archivo binario, pero con los mismos saltos que
+    reconoce open() en modo texto: \n, \r\n y \r solo. f queda justo
+    después del salto (o al final del archivo).
+    """
+    partes = []
+    while True:
+        datos = f.read(tamano_bloque)
+        if not datos:
+            return b"".join(partes)
+        saltos = [i for i in (datos.find(b"\n"), datos.find(b"\r")) if i != -1]
+        if not saltos:
+            partes.append(datos)
+            continue
+        fin = min(saltos) + 1
+        if datos[fin - 1:fin] == b"\r":
+            if fin == len(datos):
+                # El \n de un \r\n puede estar en el bloque siguiente
+                datos += f.read(1)
+            if datos[fin:fin + 1] == b"\n":
+                fin += 1
+        f.seek(fin - len(datos), os.SEEK_CUR)
+        partes.append(datos[:fin])
+        return b"".join(partes)
+
+def trozos_de_archivo(archivo, tamano_trozo=TAMANO_TROZO):
+    """(cabecera, trozos) de un CSV: la primera línea y las posiciones (inicio, fin) del resto
+
+    Cada trozo mide unos tamano_trozo bytes y termina justo después de un
+    salto de línea, así que ninguna línea queda partida entre dos trozos.
+    """
+    with open(archivo, "rb") as f:
+        cabecera = leer_hasta_salto(f).decode("utf-8")
+        inicio = f.tell()
+        final = os.fstat(f.fileno()).st_size
+        trozos = []
+        while inicio < final:
+            f.seek(min(inicio + tamano_trozo, final))
+            leer_hasta_salto(f)
+            fin = f.tell()
+            trozos.append((inicio, fin))
+            inicio = fin
+    return cabecera, trozos
+
+def leer_trozo_vuelos(archivo, inicio, fin, linea_cabecera):
+    """(vuelos, errores, lineas) de un trozo de vuelos.csv
+
+    Se ejecuta en los procesos de leer_lotes_vuelos_en_paralelo. Los
+    errores son (línea dentro del trozo empezando en 0, mensaje) y
+    lineas es cuántas líneas tiene el trozo, para numerar las del siguiente.
+    """
+    with open(archivo, "rb") as f:
+        f.seek(inicio)
+        texto = f.read(fin - inicio).decode("utf-8")
+    # Los mismos saltos de línea que reconoce open() en modo texto
+    lineas = texto.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+    if lineas[-1] == "":
+        lineas.pop()
+
+    cabecera, columnas = columnas_de_cabecera(linea_cabecera)
+    vuelos = []
+    errores = []
+    for numero_linea, linea in enumerate(lineas):
+        datos = linea.strip().split(",")
+        try:
+            vuelo = leer_vuelo(datos, cabecera, columnas)
+        except (ValueError, IndexError) as e:
+            errores.append((numero_linea, f"{e} - Datos: {datos}"))
+            continue
+        if vuelo is not None:
+            vuelos.append(vuelo)
+    return vuelos, errores, len(lineas)
+
+def leer_lotes_vuelos_en_paralelo(archivo, avisar=None, procesos=None, tamano_trozo=TAMANO_TROZO):
+    """Lo mismo que leer_lotes_vuelos, pero repartiendo los trozos del archivo entre procesos
+
+    Cada trozo (ver trozos_de_archivo) se valida en un proceso con
+    leer_vuelo y los lotes se entregan en el orden del archivo, con los
+    avisos y números de línea que daría leer_lotes_vuelos. Solo hay en
+    vuelo unos pocos trozos por proceso, así que la memoria no depende
+    del tamaño del archivo. procesos=None usa todos los núcleos.
+    """
+    cabecera, trozos = trozos_de_archivo(archivo, tamano_trozo)
+    procesos = min(procesos or os.cpu_count() or 1, len(trozos))
+    if procesos <= 1:
+        # Sin nada que repartir no compensa arrancar procesos
+        resultados = (leer_trozo_vuelos(archivo, inicio, fin, cabecera) for inicio, fin in trozos)
+        yield from lotes_de_resultados(resultados, avisar)
+        return
+
+    # spawn: el proceso que carga puede tener ya en marcha el hilo del log
+    with ProcessPoolExecutor(procesos, mp_context=multiprocessing.get_context("spawn")) as grupo:
+        pendientes = deque()
+        siguiente = 0
+
+        def resultados():
+            nonlocal siguiente
+            while pendientes or siguiente < len(trozos):
+                while siguiente < len(trozos) and len(pendientes) < 2 * procesos:
+                    inicio, fin = trozos[siguiente]
+                    pendientes.append(grupo.submit(leer_trozo_vuelos, archivo, inicio, fin, cabecera))
+                    siguiente += 1
+                yield pendientes.popleft().result()
+
+        try:
+            yield from lotes_de_resultados(resultados(), avisar)
+        finally:
+            for futuro in pendientes:
+                futuro.cancel()
+
+def lotes_de_resultados(resultados, avisar):
+    """Lotes de vuelos de los resultados de leer_trozo_vuelos, avisando de los errores en orden"""
+    primera_linea = 2
+    for vuelos, errores, lineas in resultados:
+        if avisar is not None:
+            for numero_linea, mensaje in errores:
+                avisar(f"Error en línea {primera_linea + numero_linea}: {mensaje}", "warning")
+        primera_linea += lineas
+        if vuelos:
+            yield vuelos
+
+def leer_pistas(lineas, avisar=None):
+    """Pistas de pistas.csv (la primera línea es la cabecera), leídas a medida que se piden"""
+    lineas = iter(lineas)
+    next(lineas, None)
+    for numero_linea, linea in enumerate(lineas, start=2):
+        try:
+            datos = linea.strip().split(",")
+            if len(datos) < 4:
+                continue
+            id_pista = datos[0].strip()
+            categoria = datos[1].strip().lower()
+            tiempo_uso = int(datos[2].strip())
+            habilitada = int(datos[3].strip())
+        except (ValueError, IndexError) as e:
+            if avisar is not None:
+                avisar(f"Error en pista línea {numero_linea}: {e}", "warning")
+            continue
+        yield (id_pista, categoria, tiempo_uso, habilitada, "LIBRE", None, 0)
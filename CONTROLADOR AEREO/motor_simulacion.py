@@ -0,0 +1,1453 @@
+import time
+import heapq
+
+from almacen_vuelos import AlmacenVuelos
+from asignacion_optima import planificar_asignacion, PESOS_PRIORIDAD
+from planificador_horizonte import planificar_horizonte, HORIZONTE_POR_DEFECTO
+from politicas_despacho import POLITICAS, POLITICA_PRIORIDAD, clave_prioridad
+import instantanea
+import diario
+from diario import Diario
+from historial import Historial
+from registro_eventos import RegistroEventos, DestinoTexto, DestinoJson, TAMANO_SEGMENTO, TIPO_MENSAJE
+from reproductor_log import ReproductorLog
+from indice_log import IndiceLog
+from lector_vuelos import VUELOS_POR_LOTE, leer_lotes_vuelos, leer_lotes_vuelos_en_paralelo, leer_pistas
+
+# Constantes para índices de la tupla de vuelo
+ID = 0
+TIPO = 1
+TIEMPO = 2
+PRIORIDAD = 3
+COMBUSTIBLE = 4
+ESTADO = 5
+
+# Constantes para índices de la tupla de pista
+PISTA_ID = 0
+PISTA_CATEGORIA = 1
+PISTA_TIEMPO_USO = 2
+PISTA_HABILITADA = 3
+PISTA_ESTADO = 4
+PISTA_VUELO_ACTUAL = 5
+PISTA_TIEMPO_LIBERACION = 6
+
+# Clases de combustible usadas por la cola de despacho
+DESPACHO_AGOTADO = 0   # Aterrizaje con combustible 0
+DESPACHO_VIVO = 1      # Aterrizaje con combustible > 0
+DESPACHO_DESPEGUE = 2  # Despegue (combustible fijo 999)
+
+# Modos de asignación de pistas en cada minuto
+ASIGNACION_VORAZ = "voraz"    # Pista a pista, el mejor vuelo de la cola de despacho
+ASIGNACION_OPTIMA = "optima"  # Emparejamiento óptimo de pistas libres y vuelos en cola
+ASIGNACION_HORIZONTE = "horizonte"  # Plan de huecos de pista para los próximos minutos
+MODOS_ASIGNACION = [ASIGNACION_VORAZ, ASIGNACION_OPTIMA, ASIGNACION_HORIZONTE]
+
+# Minutos antes de su ETA/ETD en que entra en cola un vuelo de abrir_vuelos_desde_csv
+ANTICIPACION_VUELOS = 0
+
+# Procesos con que cargar_vuelos_desde_csv lee el CSV (1 = en este proceso, None = todos los núcleos)
+PROCESOS_CARGA = 1
+
+# Instantánea binaria del estado completo (ver instantanea.py)
+ARCHIVO_INSTANTANEA = "simulacion.inst"
+
+# Diario de cambios sobre una instantánea base (ver diario.py)
+ARCHIVO_DIARIO = "simulacion.diario"
+
+# Destinos del log de eventos (ver registro_eventos.py)
+LOG_TEXTO = "texto"   # archivo_log: "[t=N] TIPO campo=valor", legible y lo que lee ReproductorLog
+LOG_JSON = "json"     # archivo_log_json: JSON Lines con rotación por tamaño y segmentos en gzip
+DESTINOS_LOG = [LOG_TEXTO, LOG_JSON]
+ARCHIVO_LOG_JSON = "eventos.jsonl"
+
+# Registros del diario: cada uno es (tipo, datos...) y aplicar_registro lo repite
+REGISTRO_MINUTO = "MINUTO"                  # (tipo,) avanzar_minuto: reloj, combustible y emergencias
+REGISTRO_SALTO = "SALTO"                    # (tipo, minutos)
+REGISTRO_ASIGNACION = "ASIGNACION"          # (tipo, id_vuelo, id_pista)
+REGISTRO_COMPLETADO = "COMPLETADO"          # (tipo, id_vuelo, id_pista)
+REGISTRO_ALTA = "ALTA"                      # (tipo, vuelo)
+REGISTRO_CANCELACION = "CANCELACION"        # (tipo, id_vuelo)
+REGISTRO_ESTADO = "ESTADO"                  # (tipo, id_vuelo, nuevo_estado)
+REGISTRO_PISTA_AGREGADA = "PISTA_AGREGADA"  # (tipo, pista)
+REGISTRO_PISTA_ACTUALIZADA = "PISTA_ACTUALIZADA"  # (tipo, pista)
+REGISTRO_POLITICA = "POLITICA"              # (tipo, nombre)
+REGISTRO_METRICAS = "METRICAS"              # (tipo,) reiniciar_metricas
+REGISTRO_DETENER = "DETENER"                # (tipo,)
+REGISTRO_LIMPIAR = "LIMPIAR"                # (tipo,)
+
+# Límite de seguridad para ejecutar(hasta_vaciar=True): una semana simulada
+LIMITE_HASTA_VACIAR = 7 * 24 * 60
+
+# Vuelos y pistas de ejemplo cuando no existen los CSV
+VUELOS_EJEMPLO = [
+    ("IB101", "ATERRIZAJE", 5, 0, 20, "EN_COLA"),
+    ("IB202", "ATERRIZAJE", 1, 0, 18, "EN_COLA"),
+    ("UX303", "DESPEGUE", 1, 0, 0, "EN_COLA"),
+    ("VY404", "DESPEGUE", 5, 0, 0, "EN_COLA"),
+    ("AF505", "ATERRIZAJE", 8, 0, 5, "EN_COLA")
+]
+PISTAS_EJEMPLO = [
+    ("R1", "larga", 3, 1, "LIBRE", None, 0),
+    ("R2", "estandar", 3, 1, "LIBRE", None, 0)
+]
+
+def avisar_por_consola(mensaje, nivel="info"):
+    """Aviso por defecto del motor: se imprime tal cual"""
+    print(mensaje)
+
+def percentil_espera(esperas, percentil):
+    """Percentil (por rango) de un histograma espera -> número de vuelos"""
+    total = sum(esperas.values())
+    if total == 0:
+        return 0
+    rango = max(1, -(-total * percentil // 100))
+    acumulado = 0
+    for espera in sorted(esperas):
+        acumulado += esperas[espera]
+        if acumulado >= rango:
+            return espera
+    return max(esperas)
+
+class MotorSimulacion:
+    """Estado y minuto a minuto de la simulación, compartido por consola y GUI
+
+    Guarda el almacén de vuelos y pistas, el reloj, la cola de despacho y
+    las métricas. Las interfaces solo leen el estado, llaman a estos
+    métodos y muestran lo que devuelven; los avisos de carga y guardado
+    se entregan a la función avisar(mensaje, nivel), con nivel 'info',
+    'success', 'warning' o 'danger'.
+    """
+
+    def __init__(self, avisar=avisar_por_consola, registro_activo=True, archivo_log="eventos.log",
+                 destinos_log=(LOG_TEXTO,), archivo_log_json=ARCHIVO_LOG_JSON):
+        self.avisar = avisar
+        # Permite desactivar el log de eventos en ejecuciones masivas
+        self.registro_activo = registro_activo
+        self.archivo_log = archivo_log
+        # Dónde se escriben los eventos (ver DESTINOS_LOG) y tamaño de los segmentos JSON
+        self.destinos_log = list(destinos_log)
+        self.archivo_log_json = archivo_log_json
+        self.tamano_segmento_log = TAMANO_SEGMENTO
+        # Indexar archivo_log por vuelo, pista y minuto a la vez que se escribe
+        # (ver indice_log.py). Apagado, la escritura va el doble de rápida y
+        # consultar_log indexa lo que falte en la primera consulta
+        self.indexar_log = False
+        # Escritor en segundo plano del log (se crea con el primer evento)
+        self.registro_eventos = None
+        self.configuracion_log = None
+        # Diario de cambios (None = desactivado, ver activar_diario)
+        self.diario = None
+        # Versiones del estado por minuto (None = desactivado, ver activar_historial)
+        self.historial = None
+
+        self.reloj_simulado = 0
+        # Aterrizajes EN_COLA consumen combustible; con <= 5 pasan a emergencia
+        self.almacen = AlmacenVuelos(estados_consumo=("EN_COLA",), reglas_prioridad=((5, 2),))
+
+        # Vistas sobre el almacén (se actualizan solas al modificarlo)
+        self.vuelos = self.almacen.vuelos
+        self.pistas = self.almacen.pistas
+        self.flujo_aterrizaje = self.almacen.flujo_aterrizaje
+        self.flujo_despegue = self.almacen.flujo_despegue
+
+        # Cola de despacho persistente (ver obtener_siguiente_vuelo)
+        self.despacho_grupos = {}         # (prioridad, clase, retrasado) -> heap de entradas
+        self.despacho_entradas = {}       # id_vuelo -> grupo
+        self.despacho_transiciones = []   # heap de (minuto, id_vuelo) con cambios de grupo pendientes
+        # Aterrizajes retrasados con combustible ordenados por ETA (ver candidatos_por_peso);
+        # grupo -> heap de (ETA, agotamiento, id_vuelo), solo de los grupos ya pedidos
+        self.despacho_por_espera = {}
+
+        # Métricas de la ejecución en curso (ver ejecutar)
+        self.metricas = {}
+        self.reiniciar_metricas()
+
+        # Política de despacho del modo voraz (ver politicas_despacho.py)
+        self.politica_despacho = POLITICA_PRIORIDAD
+        # Cola de las demás políticas: heap de (clave, id_vuelo) del minuto indicado
+        self.despacho_politica = []
+        self.despacho_politica_minuto = None
+
+        # Modo de asignación de pistas (ver MODOS_ASIGNACION)
+        self.modo_asignacion = ASIGNACION_VORAZ
+        # Minutos que cubre el plan en el modo ASIGNACION_HORIZONTE
+        self.horizonte_planificacion = HORIZONTE_POR_DEFECTO
+
+        # Vuelos de abrir_vuelos_desde_csv que aún no han entrado en cola
+        self.vuelos_pendientes = None     # iterador de los que quedan por leer (None = ninguno)
+        self.siguiente_pendiente = None   # el siguiente, ya leído
+        self.archivo_pendientes = None
+        self.pendientes_cargados = 0
+        self.anticipacion_vuelos = ANTICIPACION_VUELOS
+        self.procesos_carga = PROCESOS_CARGA
+
+        # Autoguardado de la instantánea cada autoguardado_cada minutos simulados (0 = no)
+        self.autoguardado_archivo = ARCHIVO_INSTANTANEA
+        self.autoguardado_cada = 0
+        self.ultimo_autoguardado = 0
+
+    # ---------- Log y carga ----------
+
+    def registrar_evento(self, tipo_evento, id_vuelo=None, id_pista=None, **extra):
+        """Registra un evento con sus campos: minuto, tipo, vuelo, pista y extra
+
+        El evento va al búfer de RegistroEventos, que lo escribe por lotes
+        desde otro hilo (ver vaciar_log) en cada destino de destinos_log:
+        eventos.log en texto y/o el log JSON, que rota y se comprime.
+        """
+        if not self.registro_activo:
+            return
+        registro = self.registro_eventos
+        configuracion = (tuple(self.destinos_log), self.archivo_log, self.archivo_log_json,
+                         self.tamano_segmento_log, self.indexar_log)
+        if registro is None or configuracion != self.configuracion_log:
+            # Primer evento o se cambió de archivo o de destinos
+            self.cerrar_log()
+            registro = self.registro_eventos = RegistroEventos(self.crear_destinos_log())
+            self.configuracion_log = configuracion
+        registro.escribir((self.reloj_simulado, tipo_evento, id_vuelo, id_pista, extra or None))
+        if registro.error is not None:
+            self.avisar(f"Error al escribir en log: {registro.tomar_error()}", "danger")
+
+    def registrar_log(self, mensaje):
+        """Registra un mensaje de texto libre en el log de eventos"""
+        self.registrar_evento(TIPO_MENSAJE, texto=mensaje)
+
+    def crear_destinos_log(self):
+        """Destinos de RegistroEventos según destinos_log"""
+        destinos = []
+        if LOG_TEXTO in self.destinos_log:
+            indice = None
+            if self.indexar_log:
+                try:
+                    indice = IndiceLog(self.archivo_log)
+                except OSError as e:
+                    self.avisar(f"El log {self.archivo_log} se escribirá sin índice: {e}", "warning")
+            destinos.append(DestinoTexto(self.archivo_log, indice))
+        if LOG_JSON in self.destinos_log:
+            try:
+                destinos.append(DestinoJson(self.archivo_log_json, self.tamano_segmento_log))
+            except OSError as e:
+                self.avisar(f"No se pudo abrir el log {self.archivo_log_json}: {e}", "danger")
+        return destinos
+
+    def consultar_log(self, id_vuelo=None, id_pista=None, desde=None, hasta=None, tramo=None):
+        """Líneas de archivo_log de un vuelo, de una pista o de unos minutos, usando su índice
+
+        Devuelve una lista de (tramo, línea): los eventos de id_vuelo si se
+        indica, si no los de id_pista entre los minutos desde y hasta, y si
+        tampoco, todas las líneas de esos minutos. tramo limita la búsqueda
+        a un tramo del log (por defecto todos). Antes de buscar se indexan
+        las líneas que falten, todas si indexar_log está apagado.
+        """
+        # Los últimos eventos pueden estar aún en el búfer del log
+        self.vaciar_log()
+        try:
+            indice = IndiceLog(self.archivo_log)
+            try:
+                indice.ponerse_al_dia()
+                if id_vuelo is not None:
+                    return indice.eventos_de_vuelo(id_vuelo)
+                if id_pista is not None:
+                    return indice.eventos_de_pista(id_pista, desde, hasta, tramo)
+                return indice.eventos_entre(desde, hasta, tramo)
+            finally:
+                indice.cerrar()
+        except OSError as e:
+            self.avisar(f"No se pudo consultar el log {self.archivo_log}: {e}", "danger")
+            return []
+
+    def vaciar_log(self):
+        """Espera a que todos los eventos registrados estén en el archivo de log"""
+        if self.registro_eventos is not None:
+            self.registro_eventos.vaciar()
+
+    def cerrar_log(self):
+        """Escribe los eventos pendientes y termina el hilo escritor del log"""
+        if self.registro_eventos is not None:
+            self.registro_eventos.cerrar()
+            error = self.registro_eventos.tomar_error()
+            self.registro_eventos = None
+            self.configuracion_log = None
+            if error is not None:
+                self.avisar(f"Error al escribir en log: {error}", "danger")
+
+    def cargar_vuelos_desde_csv(self, archivo="vuelos.csv"):
+        """Carga los vuelos desde un archivo CSV
+
+        El archivo se lee por lotes (ver lector_vuelos.py) y cada vuelo
+        pasa directamente al almacén, sin guardar antes todas las líneas.
+        Con procesos_carga distinto de 1 los trozos del archivo se validan
+        en varios procesos a la vez; el resultado es el mismo.
+        """
+        self.cerrar_vuelos_pendientes()
+        try:
+            with open(archivo, "r", encoding="utf-8") as f:
+                if self.procesos_carga == 1:
+                    lotes = leer_lotes_vuelos(f, self.avisar)
+                else:
+                    lotes = leer_lotes_vuelos_en_paralelo(archivo, self.avisar, self.procesos_carga)
+                duplicados = self.almacen.reemplazar_vuelos(self.registrar_vuelos_en_cola(lotes))
+            cargados = len(self.vuelos) + len(duplicados)
+            self.avisar(f"Cargados {cargados} vuelos desde {archivo}", "success")
+            self.registrar_evento("CARGA_INICIAL", vuelos=cargados, pistas=len(self.pistas))
+
+        except FileNotFoundError:
+            self.avisar(f"Archivo {archivo} no encontrado.", "info")
+            # Crear algunos vuelos de ejemplo si no existe el archivo
+            duplicados = self.almacen.reemplazar_vuelos(self.registrar_vuelos_en_cola([VUELOS_EJEMPLO]))
+
+        for vuelo in duplicados:
+            self.avisar(f"Vuelo {vuelo[ID]} descartado: ID repetido", "warning")
+        # Se sustituyen todos los vuelos: más barato empezar una base nueva que anotarlos
+        self.compactar_diario()
+        self.registrar_version()
+        return list(self.vuelos)
+
+    def registrar_vuelos_en_cola(self, lotes):
+        """Vuelos de los lotes, uno a uno, registrando en el log que entran en cola"""
+        for lote in lotes:
+            for vuelo in lote:
+                self.registrar_evento("EN_COLA", vuelo[ID], tipo=vuelo[TIPO])
+                yield vuelo
+
+    def abrir_vuelos_desde_csv(self, archivo="vuelos.csv", vuelos_por_lote=VUELOS_POR_LOTE):
+        """Carga los vuelos de un CSV a medida que avanza el reloj, para horarios enormes
+
+        Sustituye los vuelos actuales y da de alta los del archivo cuando el
+        reloj llega a su ETA/ETD (menos anticipacion_vuelos), así que la
+        simulación empieza sin haber leído el archivo y en memoria solo hay
+        un lote de vuelos por entrar. El CSV debe venir ordenado por
+        ETA/ETD: un vuelo fuera de orden entra cuando se lee. Los vuelos que
+        faltan por leer no pasan a instantáneas, diario ni bifurcaciones.
+        Devuelve False si el archivo no existe.
+        """
+        self.cerrar_vuelos_pendientes()
+        try:
+            f = open(archivo, "r", encoding="utf-8")
+        except FileNotFoundError:
+            self.avisar(f"Archivo {archivo} no encontrado.", "info")
+            return False
+
+        self.almacen.reemplazar_vuelos([])
+        self.reconstruir_cola_despacho()
+        self.compactar_diario()
+        self.vuelos_pendientes = self.leer_vuelos_pendientes(f, vuelos_por_lote)
+        self.siguiente_pendiente = next(self.vuelos_pendientes, None)
+        self.archivo_pendientes = archivo
+        self.pendientes_cargados = 0
+        # Los que ya tocan entran juntos, como una carga de CSV
+        cargados = self.alimentar_vuelos()
+        self.registrar_evento("CARGA_INICIAL", vuelos=cargados, pistas=len(self.pistas))
+        self.registrar_version()
+        return True
+
+    def leer_vuelos_pendientes(self, f, vuelos_por_lote):
+        """Vuelos del archivo abierto f, uno a uno; lo cierra al terminar"""
+        with f:
+            for lote in leer_lotes_vuelos(f, self.avisar, vuelos_por_lote):
+                yield from lote
+
+    def alimentar_vuelos(self):
+        """Da de alta los vuelos pendientes que entran en cola en el próximo minuto
+
+        Se llama al final de cada minuto (y de cada salto): el vuelo queda
+        en cola para el minuto de su ETA/ETD menos anticipacion_vuelos.
+        Devuelve cuántos vuelos entraron.
+        """
+        if self.siguiente_pendiente is None:
+            return 0
+        limite = self.reloj_simulado + 1 + self.anticipacion_vuelos
+        dados = 0
+        while self.siguiente_pendiente is not None and self.siguiente_pendiente[TIEMPO] <= limite:
+            vuelo = self.siguiente_pendiente
+            if self.dar_de_alta_vuelo(vuelo):
+                self.registrar_evento("EN_COLA", vuelo[ID], tipo=vuelo[TIPO])
+                dados += 1
+            else:
+                self.avisar(f"Vuelo {vuelo[ID]} descartado: ID repetido", "warning")
+            self.pendientes_cargados += 1
+            self.siguiente_pendiente = next(self.vuelos_pendientes, None)
+        if self.siguiente_pendiente is None:
+            self.avisar(f"Cargados {self.pendientes_cargados} vuelos desde {self.archivo_pendientes}", "success")
+            self.cerrar_vuelos_pendientes()
+        return dados
+
+    def cerrar_vuelos_pendientes(self):
+        """Deja de cargar los vuelos de abrir_vuelos_desde_csv que no han entrado"""
+        if self.vuelos_pendientes is not None:
+            self.vuelos_pendientes.close()
+        self.vuelos_pendientes = None
+        self.siguiente_pendiente = None
+
+    def cargar_pistas_desde_csv(self, archivo="pistas.csv"):
+        """Carga información de pistas desde archivo CSV"""
+        try:
+            with open(archivo, "r", encoding="utf-8") as f:
+                pistas_cargadas = list(leer_pistas(f, self.avisar))
+
+            self.avisar(f"Cargadas {len(pistas_cargadas)} pistas desde {archivo}", "success")
+
+        except FileNotFoundError:
+            self.avisar(f"Archivo {archivo} no encontrado.", "info")
+            # Pistas por defecto
+            pistas_cargadas = list(PISTAS_EJEMPLO)
+
+        duplicadas = self.almacen.reemplazar_pistas(pistas_cargadas)
+        for pista in duplicadas:
+            self.avisar(f"Pista {pista[PISTA_ID]} descartada: ID repetido", "warning")
+        self.compactar_diario()
+        self.registrar_version()
+        return list(self.pistas)
+
+    def guardar_estado(self, archivo_vuelos="vuelos_actualizado.csv", archivo_pistas="pistas_actualizado.csv"):
+        """Guarda vuelos y pistas en CSV (se pueden volver a cargar)"""
+        with open(archivo_vuelos, "w", encoding="utf-8") as f:
+            f.write("id_vuelo,tipo,tiempo,prioridad,combustible,estado\n")
+            for vuelo in self.vuelos:
+                f.write(f"{vuelo[ID]},{vuelo[TIPO]},{vuelo[TIEMPO]},{vuelo[PRIORIDAD]},{vuelo[COMBUSTIBLE]},{vuelo[ESTADO]}\n")
+
+        with open(archivo_pistas, "w", encoding="utf-8") as f:
+            f.write("id_pista,categoria,tiempo_uso,habilitada\n")
+            for pista in self.pistas:
+                f.write(f"{pista[PISTA_ID]},{pista[PISTA_CATEGORIA]},{pista[PISTA_TIEMPO_USO]},{pista[PISTA_HABILITADA]}\n")
+
+        self.registrar_evento("ESTADO_GUARDADO")
+
+    def estado_completo(self):
+        """Todo el estado necesario para seguir la simulación donde se dejó
+
+        Además de vuelos y pistas incluye el reloj, la ocupación de las
+        pistas, el combustible con su minuto de referencia y su orden de
+        consumo, el orden de las colas,
+        la configuración y las métricas. La cola de despacho no se guarda:
+        se reconstruye a partir de los flujos.
+        """
+        vuelos, referencias, ordenes, en_cola = self.almacen.exportar_vuelos()
+        metricas = dict(self.metricas)
+        # Los histogramas van como pares (JSON no admite claves enteras)
+        metricas["esperas"] = list(metricas["esperas"].items())
+        metricas["esperas_por_tipo"] = {tipo: list(esperas.items())
+                                        for tipo, esperas in metricas["esperas_por_tipo"].items()}
+        return {
+            "general": {
+                "reloj_simulado": self.reloj_simulado,
+                "reloj_almacen": self.almacen.reloj,
+                "contador_consumo": self.almacen.contador_consumo,
+                "modo_asignacion": self.modo_asignacion,
+                "politica_despacho": self.politica_despacho,
+                "horizonte_planificacion": self.horizonte_planificacion,
+                "pistas": [list(pista) for pista in self.pistas],
+                "metricas": metricas,
+            },
+            "vuelos": vuelos,
+            "referencias": referencias,
+            "ordenes": ordenes,
+            "en_cola": en_cola,
+        }
+
+    def restaurar_estado_completo(self, estado):
+        """Sustituye todo el estado por uno de estado_completo"""
+        general = estado["general"]
+        if general["politica_despacho"] not in POLITICAS:
+            raise ValueError(f"Política de despacho desconocida: {general['politica_despacho']}")
+        if general["modo_asignacion"] not in MODOS_ASIGNACION:
+            raise ValueError(f"Modo de asignación desconocido: {general['modo_asignacion']}")
+
+        self.cerrar_vuelos_pendientes()
+        self.almacen.reemplazar_pistas([tuple(pista) for pista in general["pistas"]])
+        self.almacen.restaurar_vuelos(estado["vuelos"], estado["referencias"], estado["ordenes"],
+                                      estado["en_cola"], general["reloj_almacen"], general["contador_consumo"])
+        self.reloj_simulado = general["reloj_simulado"]
+        self.ultimo_autoguardado = self.reloj_simulado
+        self.modo_asignacion = general["modo_asignacion"]
+        self.cambiar_politica_despacho(general["politica_despacho"])
+        self.horizonte_planificacion = general["horizonte_planificacion"]
+
+        self.reiniciar_metricas()
+        metricas = general["metricas"]
+        self.metricas.update(metricas)
+        self.metricas["esperas"] = {espera: n for espera, n in metricas["esperas"]}
+        self.metricas["esperas_por_tipo"] = {tipo: {espera: n for espera, n in esperas}
+                                             for tipo, esperas in metricas["esperas_por_tipo"].items()}
+        self.reconstruir_cola_despacho()
+        self.compactar_diario()
+        self.registrar_version()
+
+    def guardar_instantanea(self, archivo=ARCHIVO_INSTANTANEA):
+        """Guarda el estado completo en una instantánea binaria (ver instantanea.py)"""
+        instantanea.escribir(archivo, self.estado_completo())
+        self.registrar_evento("INSTANTANEA_GUARDADA", archivo=archivo)
+
+    def cargar_instantanea(self, archivo=ARCHIVO_INSTANTANEA):
+        """Restaura el estado completo de una instantánea
+
+        Devuelve True si se cargó. Si el archivo no existe, es de otra
+        versión o está dañado, avisa y deja el estado como estaba.
+        """
+        try:
+            estado = instantanea.leer(archivo)
+            vuelos = len(estado["vuelos"])
+            self.restaurar_estado_completo(estado)
+        except FileNotFoundError:
+            self.avisar(f"Archivo {archivo} no encontrado.", "info")
+            return False
+        except (ValueError, KeyError, TypeError) as e:
+            self.avisar(f"No se pudo cargar la instantánea {archivo}: {e}", "danger")
+            return False
+        self.avisar(f"Instantánea cargada desde {archivo}: minuto {self.reloj_simulado}, "
+                    f"{vuelos} vuelos, {len(self.pistas)} pistas", "success")
+        self.registrar_evento("INSTANTANEA_CARGADA", archivo=archivo)
+        return True
+
+    def autoguardar_si_toca(self):
+        """Guarda la instantánea si pasaron autoguardado_cada minutos desde la anterior"""
+        if not self.autoguardado_cada or self.reloj_simulado - self.ultimo_autoguardado < self.autoguardado_cada:
+            return
+        self.ultimo_autoguardado = self.reloj_simulado
+        try:
+            self.guardar_instantanea(self.autoguardado_archivo)
+        except OSError as e:
+            self.avisar(f"Error en el autoguardado: {e}", "warning")
+
+    def cargar_desde_log(self, archivo=None, minuto=None, tramo=None):
+        """Sitúa la simulación en un minuto de un log de eventos sin volver a simularla
+
+        Los vuelos y pistas ya cargados (los CSV con que empezó la sesión
+        del log) aportan los datos que el log no guarda: ETA/ETD,
+        prioridad, combustible y tiempo de uso de las pistas. minuto y
+        tramo son los de ReproductorLog.estado_en (por defecto el final
+        del log). Las métricas no se reconstruyen. Devuelve True si se cargó.
+        """
+        archivo = archivo or self.archivo_log
+        # Los últimos eventos pueden estar aún en el búfer del log
+        self.vaciar_log()
+        reproductor = ReproductorLog(archivo, self.vuelos, self.pistas)
+        try:
+            estado = reproductor.estado_en(minuto, tramo)
+        except FileNotFoundError:
+            self.avisar(f"Archivo {archivo} no encontrado.", "info")
+            return False
+        except (OSError, ValueError) as e:
+            self.avisar(f"No se pudo leer el log {archivo}: {e}", "danger")
+            return False
+
+        vuelos, pistas = estado.tuplas(reproductor.vuelos_base)
+        self.cerrar_vuelos_pendientes()
+        self.almacen.reemplazar_pistas(pistas)
+        self.almacen.reemplazar_vuelos(vuelos)
+        self.reloj_simulado = estado.minuto
+        self.ultimo_autoguardado = self.reloj_simulado
+        self.reconstruir_cola_despacho()
+        self.compactar_diario()
+        self.registrar_version()
+
+        self.avisar(f"Estado reconstruido desde {archivo}: minuto {estado.minuto} del tramo {estado.tramo} "
+                    f"({reproductor.eventos} eventos, {len(vuelos)} vuelos, {len(pistas)} pistas)", "success")
+        self.registrar_evento("LOG_REPRODUCIDO", archivo=archivo, minuto=estado.minuto, tramo=estado.tramo)
+        return True
+
+    # ---------- Diario de cambios ----------
+
+    def anotar(self, *registro):
+        """Anota un cambio del estado en el diario, si está activado"""
+        if self.diario is not None:
+            self.diario.anotar(registro)
+
+    def activar_diario(self, archivo=ARCHIVO_DIARIO):
+        """Empieza a anotar los cambios, con el estado actual como base del diario"""
+        self.cerrar_diario()
+        self.diario = Diario(archivo)
+        self.diario.compactar(self.estado_completo())
+        self.registrar_evento("DIARIO_ACTIVADO", archivo=archivo)
+
+    def compactar_diario(self):
+        """Pasa todo el estado a la base del diario y lo deja vacío"""
+        if self.diario is None:
+            return
+        try:
+            self.diario.compactar(self.estado_completo())
+        except OSError as e:
+            self.avisar(f"Error al compactar el diario: {e}", "warning")
+
+    def compactar_diario_si_toca(self):
+        """Compacta si el diario tiene más registros que vuelos hay en el almacén"""
+        if self.diario is None:
+            return
+        if self.diario.registros >= max(diario.COMPACTACION_MINIMA, len(self.vuelos)):
+            self.compactar_diario()
+        else:
+            self.diario.sincronizar_si_toca()
+
+    def sincronizar_diario(self):
+        """Escribe en disco los cambios pendientes del diario"""
+        if self.diario is not None:
+            self.diario.sincronizar()
+
+    def cerrar_diario(self):
+        """Escribe lo pendiente y deja de anotar cambios"""
+        if self.diario is not None:
+            self.diario.cerrar()
+            self.diario = None
+
+    def recuperar_diario(self, archivo=ARCHIVO_DIARIO):
+        """Restaura la base del diario y repite sus cambios
+
+        Devuelve True si se recuperó. Si falta la base o está dañada, avisa
+        y deja el estado como estaba. No activa el diario: después hay que
+        llamar a activar_diario, que empieza una base nueva con lo recuperado.
+        """
+        try:
+            estado, registros = diario.recuperar(archivo)
+        except FileNotFoundError:
+            self.avisar(f"Archivo {diario.archivo_base(archivo)} no encontrado.", "info")
+            return False
+        except (OSError, ValueError) as e:
+            self.avisar(f"No se pudo recuperar el diario {archivo}: {e}", "danger")
+            return False
+
+        self.cerrar_diario()
+        # Repetir los cambios sin volver a anotarlos ni escribirlos en el log
+        registro_activo, autoguardado_cada = self.registro_activo, self.autoguardado_cada
+        self.registro_activo, self.autoguardado_cada = False, 0
+        try:
+            self.restaurar_estado_completo(estado)
+            for registro in registros:
+                self.aplicar_registro(registro)
+        finally:
+            self.registro_activo, self.autoguardado_cada = registro_activo, autoguardado_cada
+        self.reconstruir_cola_despacho()
+        self.registrar_version()
+
+        self.avisar(f"Diario recuperado desde {archivo}: minuto {self.reloj_simulado}, "
+                    f"{len(registros)} cambios sobre la base", "success")
+        self.registrar_evento("DIARIO_RECUPERADO", archivo=archivo, cambios=len(registros))
+        return True
+
+    # ---------- Historial de versiones ----------
+
+    def activar_historial(self):
+        """Empieza a guardar una versión del estado por minuto, a partir del actual
+
+        Cada versión solo copia lo que cambió desde la anterior (ver
+        historial.py); con version_en y bifurcar se puede consultar o
+        continuar cualquier minuto ya simulado.
+        """
+        self.historial = Historial()
+        self.almacen.seguir_cambios()
+        self.registrar_version()
+
+    def desactivar_historial(self):
+        """Deja de guardar versiones y libera las guardadas"""
+        self.historial = None
+        self.almacen.seguir_cambios(False)
+
+    def registrar_version(self):
+        """Guarda la versión del estado actual, si el historial está activado"""
+        if self.historial is not None:
+            self.historial.registrar(self)
+
+    def registrar_cambios_a_mano(self):
+        """Pasa a la versión del minuto actual los cambios hechos después de registrarla
+
+        Se llama antes de mover el reloj: sin esto, los minutos de un salto
+        sin eventos se calcularían desplazando la versión de antes del cambio.
+        """
+        if self.historial is not None and self.historial.hay_cambios(self):
+            self.registrar_version()
+
+    def version_en(self, minuto=None, tramo=None):
+        """Versión del estado en un minuto ya simulado (ver Historial.version_en)
+
+        Lanza ValueError si el historial no está activado o el minuto no
+        está en el tramo.
+        """
+        if self.historial is None:
+            raise ValueError("El historial de versiones no está activado")
+        return self.historial.version_en(minuto, tramo)
+
+    def bifurcar(self, minuto=None, tramo=None):
+        """Motor nuevo que continúa la simulación desde un minuto del historial
+
+        La copia no escribe en el log de eventos ni tiene diario ni
+        historial, y sus métricas empiezan a cero; este motor no cambia.
+        """
+        version = self.version_en(minuto, tramo)
+        motor = MotorSimulacion(avisar=self.avisar, registro_activo=False)
+        motor.restaurar_estado_completo(version.estado_completo())
+        return motor
+
+    def volver_a_version(self, minuto=None, tramo=None):
+        """Sustituye el estado por el de un minuto del historial y sigue desde ahí
+
+        Empieza un tramo nuevo del historial; las métricas vuelven a cero.
+        """
+        version = self.version_en(minuto, tramo)
+        self.restaurar_estado_completo(version.estado_completo())
+        self.registrar_evento("HISTORIAL_RESTAURADO", minuto=version.minuto, tramo=version.tramo)
+
+    def aplicar_registro(self, registro):
+        """Repite un cambio anotado en el diario (ver los REGISTRO_*)"""
+        tipo = registro[0]
+        if tipo == REGISTRO_MINUTO:
+            # Lo mismo que avanzar_minuto antes de liberar y asignar (que tienen sus registros)
+            self.reloj_simulado += 1
+            self.consumir_combustible()
+            self.actualizar_prioridades_combustible()
+        elif tipo == REGISTRO_SALTO:
+            self.saltar_minutos(registro[1])
+        elif tipo == REGISTRO_ASIGNACION:
+            self.ocupar_pista(registro[2], self.almacen.obtener_vuelo(registro[1]))
+        elif tipo == REGISTRO_COMPLETADO:
+            self.completar_vuelo(registro[1], registro[2])
+        elif tipo == REGISTRO_ALTA:
+            self.dar_de_alta_vuelo(tuple(registro[1]))
+        elif tipo == REGISTRO_CANCELACION:
+            self.cancelar_vuelo(registro[1])
+        elif tipo == REGISTRO_ESTADO:
+            self.cambiar_estado_vuelo(registro[1], registro[2])
+        elif tipo == REGISTRO_PISTA_AGREGADA:
+            self.agregar_pista(tuple(registro[1]))
+        elif tipo == REGISTRO_PISTA_ACTUALIZADA:
+            self.actualizar_pista(tuple(registro[1]))
+        elif tipo == REGISTRO_POLITICA:
+            self.cambiar_politica_despacho(registro[1])
+        elif tipo == REGISTRO_METRICAS:
+            self.reiniciar_metricas()
+        elif tipo == REGISTRO_DETENER:
+            self.detener()
+        elif tipo == REGISTRO_LIMPIAR:
+            self.limpiar()
+        else:
+            raise ValueError(f"Registro de diario desconocido: {tipo}")
+
+    # ---------- Altas, cancelaciones y cambios ----------
+
+    def inicializar_flujos(self):
+        """Inicializa los flujos de aterrizaje y despegue
+
+        Los flujos son vistas del almacén, así que solo hay que reconstruir
+        la cola de despacho a partir de ellos. Solo hace falta tras cargar
+        vuelos en bloque: las altas y cancelaciones sueltas la actualizan
+        de forma incremental (ver dar_de_alta_vuelo).
+        """
+        self.reconstruir_cola_despacho()
+
+    def dar_de_alta_vuelo(self, vuelo):
+        """Agrega un vuelo al almacén y a la cola de despacho en O(log n)
+
+        Devuelve False si ya existía un vuelo con ese ID.
+        """
+        if not self.almacen.agregar_vuelo(vuelo):
+            return False
+        self.anotar(REGISTRO_ALTA, vuelo)
+        self.encolar_en_despacho(vuelo[ID])
+        return True
+
+    def agregar_pista(self, pista):
+        """Agrega una pista nueva; devuelve False si ya existía una con ese ID"""
+        if not self.almacen.agregar_pista(pista):
+            return False
+        self.anotar(REGISTRO_PISTA_AGREGADA, pista)
+        self.registrar_evento("PISTA_AGREGADA", id_pista=pista[PISTA_ID], categoria=pista[PISTA_CATEGORIA],
+                              tiempo_uso=pista[PISTA_TIEMPO_USO], habilitada=pista[PISTA_HABILITADA])
+        return True
+
+    def actualizar_pista(self, pista):
+        """Sustituye una pista (habilitarla, deshabilitarla, cambiar su categoría...)"""
+        if not self.almacen.actualizar_pista(pista):
+            return False
+        self.anotar(REGISTRO_PISTA_ACTUALIZADA, pista)
+        self.registrar_evento("PISTA_MODIFICADA", id_pista=pista[PISTA_ID], categoria=pista[PISTA_CATEGORIA],
+                              tiempo_uso=pista[PISTA_TIEMPO_USO], habilitada=pista[PISTA_HABILITADA],
+                              estado=pista[PISTA_ESTADO])
+        return True
+
+    def liberar_pista(self, id_pista):
+        """Deja una pista LIBRE y sin vuelo"""
+        pista = self.almacen.obtener_pista(id_pista)
+        if pista is None:
+            return False
+        self.almacen.actualizar_pista((
+            pista[PISTA_ID],
+            pista[PISTA_CATEGORIA],
+            pista[PISTA_TIEMPO_USO],
+            pista[PISTA_HABILITADA],
+            "LIBRE",
+            None,
+            0
+        ))
+        return True
+
+    def cancelar_vuelo(self, id_vuelo):
+        """Cancela un vuelo y libera su pista si la tenía
+
+        Devuelve el ID de la pista liberada (o None). Lanza ValueError si el
+        vuelo no existe o ya está completado.
+        """
+        vuelo_actual = self.almacen.obtener_vuelo(id_vuelo)
+        if vuelo_actual is None:
+            raise ValueError("No se encontró el vuelo")
+        if vuelo_actual[ESTADO] == "COMPLETADO":
+            raise ValueError("No se puede cancelar un vuelo completado")
+
+        self.anotar(REGISTRO_CANCELACION, id_vuelo)
+        pista_liberada = None
+        if vuelo_actual[ESTADO] == "ASIGNADO":
+            # Liberar la pista si estaba asignado
+            pista = self.almacen.pista_del_vuelo(id_vuelo)
+            if pista is not None:
+                self.liberar_pista(pista[PISTA_ID])
+                pista_liberada = pista[PISTA_ID]
+
+        self.almacen.cambiar_estado_vuelo(id_vuelo, "CANCELADO")
+        # Retirar de la cola de despacho (sus entradas se descartan al salir)
+        self.encolar_en_despacho(id_vuelo)
+        self.registrar_evento("CANCELACION", id_vuelo)
+        return pista_liberada
+
+    def cambiar_estado_vuelo(self, id_vuelo, nuevo_estado):
+        """Cambia el estado de un vuelo a mano y lo reubica en la cola de despacho"""
+        if not self.almacen.cambiar_estado_vuelo(id_vuelo, nuevo_estado):
+            return False
+        self.anotar(REGISTRO_ESTADO, id_vuelo, nuevo_estado)
+        self.encolar_en_despacho(id_vuelo)
+        self.registrar_evento("ESTADO_MODIFICADO", id_vuelo, estado=nuevo_estado)
+        return True
+
+    def detener(self):
+        """Vuelve el reloj a 0 y deja todas las pistas libres"""
+        self.anotar(REGISTRO_DETENER)
+        # Con el minuto en que se detiene: los últimos minutos sin eventos
+        # también cuentan para el combustible al reproducir el log
+        self.registrar_evento("DETENER")
+        self.reloj_simulado = 0
+        self.ultimo_autoguardado = 0
+        for pista in list(self.pistas):
+            self.liberar_pista(pista[PISTA_ID])
+        # Los minutos programados en la cola de despacho dependen del reloj
+        self.reconstruir_cola_despacho()
+        self.registrar_version()
+
+    def limpiar(self):
+        """Borra vuelos, pistas, cola de despacho y métricas"""
+        self.anotar(REGISTRO_LIMPIAR)
+        self.cerrar_vuelos_pendientes()
+        self.reloj_simulado = 0
+        self.ultimo_autoguardado = 0
+        self.almacen.limpiar()
+        self.reconstruir_cola_despacho()
+        self.reiniciar_metricas()
+        self.registrar_version()
+
+    # ---------- Cola de despacho ----------
+
+    def _grupo_despacho(self, vuelo):
+        """Calcula el grupo (prioridad, clase, retrasado) de un vuelo en este minuto"""
+        if vuelo[TIPO] == "DESPEGUE":
+            clase = DESPACHO_DESPEGUE
+        elif vuelo[COMBUSTIBLE] <= 0:
+            clase = DESPACHO_AGOTADO
+        else:
+            clase = DESPACHO_VIVO
+        return (vuelo[PRIORIDAD], clase, self.reloj_simulado > vuelo[TIEMPO])
+
+    def encolar_en_despacho(self, id_vuelo):
+        """Inserta (o reubica) un vuelo EN_COLA en la cola de despacho
+
+        Dentro de cada grupo la clave es fija mientras el vuelo no cambie de grupo:
+        el combustible baja 1 por minuto para todos los aterrizajes en cola, así
+        que basta con ordenar por el minuto en que se agota (combustible + reloj).
+        """
+        vuelo = self.almacen.obtener_vuelo(id_vuelo)
+        if vuelo is None or vuelo[ESTADO] != "EN_COLA":
+            self.despacho_entradas.pop(id_vuelo, None)
+            return
+
+        if self.despacho_politica_minuto == self.reloj_simulado:
+            # La cola de la política de este minuto ya está hecha: añadir el vuelo
+            clave = POLITICAS[self.politica_despacho](vuelo, self.reloj_simulado)
+            heapq.heappush(self.despacho_politica, (clave, id_vuelo))
+
+        grupo = self._grupo_despacho(vuelo)
+        if self.despacho_entradas.get(id_vuelo) == grupo:
+            return
+        self.despacho_entradas[id_vuelo] = grupo
+
+        clave, transiciones = self._entrada_despacho(vuelo, grupo)
+        heapq.heappush(self.despacho_grupos.setdefault(grupo, []), clave)
+        por_espera = self.despacho_por_espera.get(grupo)
+        if por_espera is not None:
+            heapq.heappush(por_espera, self._clave_por_espera(vuelo))
+        for transicion in transiciones:
+            heapq.heappush(self.despacho_transiciones, transicion)
+
+    def _clave_despacho(self, vuelo, grupo):
+        """Clave del vuelo en el heap de su grupo: (agotamiento, ETA/ETD si va retrasado, id)"""
+        _, clase, retrasado = grupo
+        return (vuelo[COMBUSTIBLE] + self.reloj_simulado if clase == DESPACHO_VIVO else 0,
+                vuelo[TIEMPO] if retrasado else 0,
+                vuelo[ID])
+
+    def _clave_por_espera(self, vuelo):
+        """Clave de un aterrizaje retrasado con combustible en el orden de planificar_asignacion"""
+        return (vuelo[TIEMPO], vuelo[COMBUSTIBLE] + self.reloj_simulado, vuelo[ID])
+
+    def _entrada_despacho(self, vuelo, grupo):
+        """Clave del vuelo en el heap de su grupo y (minuto, id_vuelo) de sus cambios de grupo"""
+        clave = self._clave_despacho(vuelo, grupo)
+
+        # Cambios de grupo que dependen solo del reloj
+        transiciones = []
+        if not grupo[2]:
+            transiciones.append((vuelo[TIEMPO] + 1, vuelo[ID]))
+        if grupo[1] == DESPACHO_VIVO:
+            transiciones.append((clave[0], vuelo[ID]))
+        return clave, transiciones
+
+    def _entrada_vigente(self, clave, grupo, por_espera=False):
+        """El vuelo de una entrada del heap de un grupo si la entrada sigue valiendo, o None
+
+        Un vuelo cancelado no gasta combustible: si vuelve a la cola, su
+        agotamiento es otro y la entrada que dejó en el grupo ya no vale,
+        aunque el grupo sea el mismo. Con por_espera la entrada es del heap
+        por ETA del grupo (ver candidatos_por_peso).
+        """
+        vuelo = self.almacen.obtener_vuelo(clave[2])
+        if vuelo is None or vuelo[ESTADO] != "EN_COLA" or vuelo[PRIORIDAD] != grupo[0]:
+            return None
+        vigente = self._clave_por_espera(vuelo) if por_espera else self._clave_despacho(vuelo, grupo)
+        return vuelo if vigente == clave else None
+
+    def reconstruir_cola_despacho(self):
+        """Reconstruye la cola de despacho a partir de los flujos actuales
+
+        Las entradas son las mismas que daría encolar_en_despacho vuelo a
+        vuelo, pero se añaden en bloque y cada heap se ordena una sola vez.
+        Se repite aquí el cálculo de _grupo_despacho y _entrada_despacho
+        para no hacer dos llamadas por vuelo al restaurar colas enormes.
+        """
+        self.despacho_grupos.clear()
+        self.despacho_entradas.clear()
+        self.despacho_transiciones.clear()
+        self.despacho_por_espera.clear()
+        self.despacho_politica_minuto = None
+
+        reloj = self.reloj_simulado
+        grupos = self.despacho_grupos
+        entradas = self.despacho_entradas
+        transiciones = self.despacho_transiciones
+        for flujo in (self.flujo_aterrizaje, self.flujo_despegue):
+            for vuelo in flujo:
+                id_vuelo = vuelo[ID]
+                tiempo = vuelo[TIEMPO]
+                if vuelo[TIPO] == "DESPEGUE":
+                    clase, agotamiento = DESPACHO_DESPEGUE, 0
+                elif vuelo[COMBUSTIBLE] <= 0:
+                    clase, agotamiento = DESPACHO_AGOTADO, 0
+                else:
+                    clase, agotamiento = DESPACHO_VIVO, vuelo[COMBUSTIBLE] + reloj
+                    transiciones.append((agotamiento, id_vuelo))
+                retrasado = reloj > tiempo
+                if retrasado:
+                    clave = (agotamiento, tiempo, id_vuelo)
+                else:
+                    clave = (agotamiento, 0, id_vuelo)
+                    transiciones.append((tiempo + 1, id_vuelo))
+                grupo = (vuelo[PRIORIDAD], clase, retrasado)
+                entradas[id_vuelo] = grupo
+                heap = grupos.get(grupo)
+                if heap is None:
+                    heap = grupos[grupo] = []
+                heap.append(clave)
+        for heap in grupos.values():
+            heapq.heapify(heap)
+        heapq.heapify(transiciones)
+
+    def _procesar_transiciones_despacho(self):
+        """Mueve de grupo los vuelos cuyo atraso o combustible cambió de tramo"""
+        while self.despacho_transiciones and self.despacho_transiciones[0][0] <= self.reloj_simulado:
+            _, id_vuelo = heapq.heappop(self.despacho_transiciones)
+            if id_vuelo in self.despacho_entradas:
+                self.encolar_en_despacho(id_vuelo)
+
+    def _cabeza_grupo(self, grupo, heap):
+        """Devuelve el mejor vuelo válido de un grupo, descartando entradas obsoletas"""
+        while heap:
+            id_vuelo = heap[0][2]
+            if self.despacho_entradas.get(id_vuelo) == grupo:
+                vuelo = self._entrada_vigente(heap[0], grupo)
+                if vuelo is not None:
+                    return vuelo
+                # El vuelo cambió fuera de la cola: reubicarlo o retirarlo
+                self.despacho_entradas.pop(id_vuelo, None)
+                heapq.heappop(heap)
+                self.encolar_en_despacho(id_vuelo)
+                continue
+            heapq.heappop(heap)
+        return None
+
+    def cambiar_politica_despacho(self, nombre):
+        """Elige la política de despacho del modo voraz (ver politicas_despacho.POLITICAS)"""
+        if nombre not in POLITICAS:
+            raise ValueError(f"Política de despacho desconocida: {nombre}")
+        self.anotar(REGISTRO_POLITICA, nombre)
+        self.politica_despacho = nombre
+        self.despacho_politica_minuto = None
+
+    def _siguiente_por_politica(self):
+        """Mejor vuelo en cola según una política distinta de la de prioridad
+
+        La clave de estas políticas puede cambiar con el reloj, así que la
+        cola se ordena una vez por minuto (heap de todos los vuelos en cola)
+        y cada decisión del mismo minuto solo descarta cabezas obsoletas.
+        """
+        self._procesar_transiciones_despacho()
+        clave = POLITICAS[self.politica_despacho]
+        if self.despacho_politica_minuto != self.reloj_simulado:
+            self.despacho_politica = [(clave(vuelo, self.reloj_simulado), vuelo[ID])
+                                      for flujo in (self.flujo_aterrizaje, self.flujo_despegue)
+                                      for vuelo in flujo]
+            heapq.heapify(self.despacho_politica)
+            self.despacho_politica_minuto = self.reloj_simulado
+
+        heap = self.despacho_politica
+        while heap:
+            clave_cabeza, id_vuelo = heap[0]
+            vuelo = self.almacen.obtener_vuelo(id_vuelo)
+            # Se descarta si salió de la cola o cambió desde que se insertó
+            if vuelo is not None and vuelo[ESTADO] == "EN_COLA" and clave(vuelo, self.reloj_simulado) == clave_cabeza:
+                return vuelo
+            heapq.heappop(heap)
+        return None
+
+    def obtener_siguiente_vuelo(self):
+        """Selecciona el próximo vuelo según la política de despacho
+
+        Con POLITICA_PRIORIDAD el orden es prioridad (desc), combustible (asc),
+        atraso (desc), id (asc). Cada grupo de la cola mantiene su mejor vuelo
+        en la cabeza del heap, así que solo hay que comparar las cabezas en
+        lugar de reordenar todo. Las demás políticas usan _siguiente_por_politica.
+        """
+        if POLITICAS[self.politica_despacho] is not clave_prioridad:
+            return self._siguiente_por_politica()
+
+        self._procesar_transiciones_despacho()
+
+        mejor = None
+        mejor_clave = None
+        for grupo, heap in list(self.despacho_grupos.items()):
+            cabeza = self._cabeza_grupo(grupo, heap)
+            if cabeza is None:
+                if not heap:
+                    del self.despacho_grupos[grupo]
+                    self.despacho_por_espera.pop(grupo, None)
+                continue
+            # Clave real de ordenación (ver politicas_despacho.clave_prioridad)
+            clave = clave_prioridad(cabeza, self.reloj_simulado)
+            if mejor_clave is None or clave < mejor_clave:
+                mejor, mejor_clave = cabeza, clave
+
+        return mejor
+
+    def _primeros_del_grupo(self, grupo, heap, cantidad, por_espera=False):
+        """Devuelve hasta 'cantidad' vuelos válidos de un grupo, en orden, sin sacarlos
+
+        Recorre el heap como un árbol (los hijos de i están en 2i+1 y 2i+2)
+        con una frontera ordenada, así que solo se visitan las entradas que
+        preceden a las elegidas. Con por_espera, heap es el heap por ETA del
+        grupo (ver candidatos_por_peso).
+        """
+        elegidos = []
+        vistos = set()
+        frontera = [(heap[0], 0)] if heap else []
+        while frontera and len(elegidos) < cantidad:
+            clave, indice = heapq.heappop(frontera)
+            id_vuelo = clave[2]
+            if id_vuelo not in vistos and self.despacho_entradas.get(id_vuelo) == grupo:
+                vuelo = self._entrada_vigente(clave, grupo, por_espera)
+                if vuelo is not None:
+                    elegidos.append(vuelo)
+                    vistos.add(id_vuelo)
+            for hijo in (2 * indice + 1, 2 * indice + 2):
+                if hijo < len(heap):
+                    heapq.heappush(frontera, (heap[hijo], hijo))
+        return elegidos
+
+    def candidatos_de_despacho(self, cantidad):
+        """Los primeros 'cantidad' vuelos de cada grupo de la cola de despacho
+
+        Incluye a todos los vuelos que pueden recibir alguno de 'cantidad'
+        huecos de pista, sin recorrer la cola entera.
+        """
+        self._procesar_transiciones_despacho()
+        candidatos = []
+        for grupo, heap in list(self.despacho_grupos.items()):
+            # Descartar las entradas obsoletas de la cabeza antes de recorrer
+            if self._cabeza_grupo(grupo, heap) is None:
+                continue
+            candidatos.extend(self._primeros_del_grupo(grupo, heap, cantidad))
+        return candidatos
+
+    def candidatos_por_peso(self, cantidad):
+        """Los primeros 'cantidad' vuelos de cada grupo por peso de espera (ver planificar_asignacion)
+
+        Dentro de un grupo el peso solo depende del atraso, así que el orden
+        de la cola de despacho ya sirve, salvo en los aterrizajes retrasados
+        con combustible: la cola los ordena antes por combustible. Para esos
+        grupos se guarda aparte un heap por ETA, que se crea la primera vez
+        que se pide y luego se mantiene al encolar.
+        """
+        self._procesar_transiciones_despacho()
+        candidatos = []
+        for grupo, heap in list(self.despacho_grupos.items()):
+            if self._cabeza_grupo(grupo, heap) is None:
+                continue
+            if grupo[1] != DESPACHO_VIVO or not grupo[2]:
+                candidatos.extend(self._primeros_del_grupo(grupo, heap, cantidad))
+                continue
+            por_espera = self.despacho_por_espera.get(grupo)
+            if por_espera is None:
+                por_espera = self.despacho_por_espera[grupo] = [
+                    (clave[1], clave[0], clave[2]) for clave in heap
+                    if self.despacho_entradas.get(clave[2]) == grupo]
+                heapq.heapify(por_espera)
+            # Descartar las entradas de la cabeza de vuelos que ya no están en el grupo
+            while por_espera and self.despacho_entradas.get(por_espera[0][2]) != grupo:
+                heapq.heappop(por_espera)
+            candidatos.extend(self._primeros_del_grupo(grupo, por_espera, cantidad, por_espera=True))
+        return candidatos
+
+    # ---------- Asignación de pistas ----------
+
+    def asignar_pista_a_vuelo(self, vuelo):
+        """Asigna una pista disponible a un vuelo
+
+        El almacén mantiene, por clase de vuelo (aterrizaje normal, emergencia
+        o despegue), las pistas libres compatibles; la primera en el orden de
+        la lista de pistas sale sin recorrerlas (ver pista_es_compatible).
+        """
+        return self.almacen.pista_libre_para(vuelo)
+
+    def asignar_pistas_voraz(self):
+        """Asigna pista a pista el mejor vuelo de la cola de despacho
+
+        Devuelve la lista de (vuelo, id_pista) asignados.
+        """
+        asignaciones = []
+        for pista in self.almacen.pistas_libres():
+            siguiente_vuelo = self.obtener_siguiente_vuelo()
+            if siguiente_vuelo:
+                pista_asignada = self.asignar_pista_a_vuelo(siguiente_vuelo)
+                if pista_asignada:
+                    self.ocupar_pista(pista_asignada, siguiente_vuelo)
+                    asignaciones.append((siguiente_vuelo, pista_asignada))
+        return asignaciones
+
+    def asignar_pistas_optimo(self):
+        """Asigna todas las pistas libres de una vez minimizando la espera ponderada
+
+        Resuelve el emparejamiento entre pistas libres y vuelos en cola
+        (ver asignacion_optima.py) y ocupa las pistas elegidas. Por clase de
+        vuelo solo pueden entrar tantos vuelos como pistas libres, así que los
+        candidatos salen de la cabeza de cada grupo de la cola de despacho y
+        el coste no depende del tamaño de la cola. Devuelve la lista de
+        (vuelo, id_pista) asignados.
+        """
+        pistas_libres = self.almacen.pistas_libres()
+        if not pistas_libres:
+            return []
+        candidatos = self.candidatos_por_peso(len(pistas_libres))
+        asignaciones = planificar_asignacion(pistas_libres, candidatos, self.reloj_simulado)
+        for vuelo, id_pista in asignaciones:
+            self.ocupar_pista(id_pista, vuelo)
+        return asignaciones
+
+    def umbral_emergencia(self):
+        """Combustible con el que un aterrizaje pasa a prioridad 2, o None"""
+        for umbral, prioridad in self.almacen.reglas_prioridad:
+            if prioridad == 2:
+                return umbral
+        return None
+
+    def asignar_pistas_horizonte(self):
+        """Asigna las pistas libres según un plan de huecos para los próximos minutos
+
+        Planifica horizonte_planificacion minutos (ver planificador_horizonte.py)
+        teniendo en cuenta cuándo se liberan las pistas ocupadas y qué
+        aterrizajes van a entrar en emergencia, y ocupa solo los huecos de este
+        minuto. Los candidatos salen de la cola de despacho, que se mantiene
+        al dar de alta o cancelar vuelos, así que el coste no depende del
+        tamaño de la cola. Devuelve la lista de (vuelo, id_pista) asignados.
+        """
+        if not self.almacen.hay_pistas_libres():
+            return []
+        pistas_plan = []
+        for pista in self.pistas:
+            if pista[PISTA_HABILITADA] != 1:
+                continue
+            disponible = self.reloj_simulado if pista[PISTA_ESTADO] == "LIBRE" else pista[PISTA_TIEMPO_LIBERACION]
+            pistas_plan.append((pista[PISTA_ID], pista[PISTA_CATEGORIA], pista[PISTA_TIEMPO_USO], disponible))
+        # Cota de huecos del horizonte: uno por pista y minuto
+        candidatos = self.candidatos_de_despacho(len(pistas_plan) * (self.horizonte_planificacion + 1))
+        plan = planificar_horizonte(pistas_plan, candidatos, self.reloj_simulado,
+                                    self.horizonte_planificacion, self.umbral_emergencia())
+        asignaciones = []
+        for minuto, id_pista, vuelo in plan:
+            if minuto > self.reloj_simulado:
+                break
+            self.ocupar_pista(id_pista, vuelo)
+            asignaciones.append((vuelo, id_pista))
+        return asignaciones
+
+    def ocupar_pista(self, id_pista, vuelo):
+        """Marca una pista como ocupada por un vuelo"""
+        pista = self.almacen.obtener_pista(id_pista)
+        if pista is None:
+            return False
+
+        self.anotar(REGISTRO_ASIGNACION, vuelo[ID], id_pista)
+        tiempo_liberacion = self.reloj_simulado + pista[PISTA_TIEMPO_USO]
+        pista_actualizada = (
+            pista[PISTA_ID],
+            pista[PISTA_CATEGORIA],
+            pista[PISTA_TIEMPO_USO],
+            pista[PISTA_HABILITADA],
+            "OCUPADA",
+            vuelo[ID],
+            tiempo_liberacion
+        )
+        self.almacen.actualizar_pista(pista_actualizada)
+
+        # Actualizar estado del vuelo (los flujos son vistas del almacén)
+        self.actualizar_estado_vuelo(vuelo[ID], "ASIGNADO")
+
+        espera = max(0, self.reloj_simulado - vuelo[TIEMPO])
+        self.metricas["asignaciones"] += 1
+        self.metricas["esperas"][espera] = self.metricas["esperas"].get(espera, 0) + 1
+        esperas_tipo = self.metricas["esperas_por_tipo"].setdefault(vuelo[TIPO], {})
+        esperas_tipo[espera] = esperas_tipo.get(espera, 0) + 1
+        self.metricas["espera_ponderada"] += espera * PESOS_PRIORIDAD.get(vuelo[PRIORIDAD], 1)
+        self.metricas["ocupacion_pistas"] += pista[PISTA_TIEMPO_USO]
+        if vuelo[TIPO] == "ATERRIZAJE" and vuelo[COMBUSTIBLE] <= 0:
+            self.metricas["sin_combustible"] += 1
+
+        self.registrar_evento("ASIGNACION", vuelo[ID], id_pista, tipo=vuelo[TIPO])
+        return True
+
+    def actualizar_estado_vuelo(self, id_vuelo, nuevo_estado):
+        """Actualiza el estado de un vuelo"""
+        self.almacen.cambiar_estado_vuelo(id_vuelo, nuevo_estado)
+
+    # ---------- Minuto a minuto ----------
+
+    def consumir_combustible(self, minutos=1):
+        """Reduce el combustible de los vuelos en espera de aterrizaje
+
+        El almacén calcula el combustible a partir del tiempo transcurrido,
+        así que basta con avanzar su reloj: no se recorre ningún vuelo.
+        """
+        self.almacen.avanzar_reloj(minutos)
+
+    def actualizar_prioridades_combustible(self):
+        """Actualiza prioridades por combustible crítico"""
+        for id_vuelo in self.almacen.promover_por_combustible():
+            # Reubicar en la cola de despacho con la nueva prioridad
+            self.encolar_en_despacho(id_vuelo)
+            self.metricas["emergencias"] += 1
+            self.registrar_evento("EMERGENCIA", id_vuelo, prioridad=2, motivo="combustible<=5")
+
+    def liberar_pistas_completadas(self):
+        """Libera pistas cuyo tiempo de ocupación ha expirado
+
+        Devuelve la lista de (id_vuelo, id_pista) completados.
+        """
+        completados = []
+        # Solo las pistas OCUPADA cuya liberación ya llegó (heap del almacén)
+        for pista in self.almacen.pistas_a_liberar(self.reloj_simulado):
+            self.completar_vuelo(pista[PISTA_VUELO_ACTUAL], pista[PISTA_ID])
+            completados.append((pista[PISTA_VUELO_ACTUAL], pista[PISTA_ID]))
+
+        return completados
+
+    def completar_vuelo(self, id_vuelo, id_pista):
+        """Marca un vuelo como COMPLETADO y libera su pista"""
+        self.anotar(REGISTRO_COMPLETADO, id_vuelo, id_pista)
+        self.actualizar_estado_vuelo(id_vuelo, "COMPLETADO")
+        self.liberar_pista(id_pista)
+        self.metricas["completados"] += 1
+        self.registrar_evento("COMPLETADO", id_vuelo, id_pista)
+
+    def avanzar_minuto(self):
+        """Avanza un minuto en la simulación
+
+        Devuelve (completados, asignaciones): los (id_vuelo, id_pista) que
+        liberaron pista y los (vuelo, id_pista) asignados en este minuto.
+        """
+        self.registrar_cambios_a_mano()
+        self.anotar(REGISTRO_MINUTO)
+        self.reloj_simulado += 1
+
+        # 1. Consumir combustible
+        self.consumir_combustible()
+
+        # 2. Actualizar prioridades por combustible crítico
+        self.actualizar_prioridades_combustible()
+
+        # 3. Liberar pistas completadas
+        completados = self.liberar_pistas_completadas()
+
+        # 4. Asignar nuevos vuelos a pistas libres
+        if self.modo_asignacion == ASIGNACION_OPTIMA:
+            asignaciones = self.asignar_pistas_optimo()
+        elif self.modo_asignacion == ASIGNACION_HORIZONTE:
+            asignaciones = self.asignar_pistas_horizonte()
+        else:
+            asignaciones = self.asignar_pistas_voraz()
+
+        # 5. Vuelos de abrir_vuelos_desde_csv que entran en cola
+        self.alimentar_vuelos()
+
+        self.autoguardar_si_toca()
+        self.compactar_diario_si_toca()
+        self.registrar_version()
+        return completados, asignaciones
+
+    def _proximo_umbral_combustible(self):
+        """Minuto en que el próximo aterrizaje en cola llega a combustible <= 5"""
+        vencimiento = self.almacen.proximo_vencimiento()
+        if vencimiento is None:
+            return None
+        # El almacén lleva su propio reloj de consumo: se traduce al de la simulación
+        return max(self.reloj_simulado + vencimiento - self.almacen.reloj, self.reloj_simulado + 1)
+
+    def proximo_minuto_relevante(self):
+        """Devuelve el próximo minuto en el que puede cambiar el estado, o None
+
+        Solo puede pasar algo cuando se libera una pista, cuando un aterrizaje
+        cruza el umbral de combustible o cuando hay pistas libres y vuelos en
+        cola. La ETA/ETD no bloquea el despacho, solo desempata el orden, y eso
+        ya se calcula al despachar. Con abrir_vuelos_desde_csv también cuenta
+        el minuto en que entra el siguiente vuelo pendiente.
+        """
+        if self.almacen.hay_pistas_libres() and self.obtener_siguiente_vuelo() is not None:
+            return self.reloj_simulado + 1
+
+        candidatos = []
+        liberacion = self.almacen.proxima_liberacion()
+        if liberacion is not None:
+            candidatos.append(max(liberacion, self.reloj_simulado + 1))
+        umbral = self._proximo_umbral_combustible()
+        if umbral is not None:
+            candidatos.append(umbral)
+        if self.siguiente_pendiente is not None:
+            # Entra al final del minuto anterior (ver alimentar_vuelos)
+            candidatos.append(max(self.siguiente_pendiente[TIEMPO] - self.anticipacion_vuelos,
+                                  self.reloj_simulado + 1))
+
+        return min(candidatos) if candidatos else None
+
+    def saltar_minutos(self, minutos):
+        """Avanza el reloj varios minutos en los que no ocurre ningún evento"""
+        if minutos <= 0:
+            return
+        self.registrar_cambios_a_mano()
+        self.anotar(REGISTRO_SALTO, minutos)
+        self.reloj_simulado += minutos
+        self.consumir_combustible(minutos)
+        self.alimentar_vuelos()
+        self.autoguardar_si_toca()
+        self.compactar_diario_si_toca()
+        self.registrar_version()
+
+    def avanzar_por_eventos(self, minutos):
+        """Avanza N minutos saltando directamente al siguiente minuto relevante
+
+        El resultado es el mismo que llamar N veces a avanzar_minuto, pero los
+        minutos sin eventos se resuelven de una vez. Devuelve cuántos minutos
+        se simularon uno a uno.
+        """
+        objetivo = self.reloj_simulado + minutos
+        simulados = 0
+
+        while self.reloj_simulado < objetivo:
+            proximo = self.proximo_minuto_relevante()
+            if proximo is None or proximo > objetivo:
+                self.saltar_minutos(objetivo - self.reloj_simulado)
+                break
+            self.saltar_minutos(proximo - 1 - self.reloj_simulado)
+            self.avanzar_minuto()
+            simulados += 1
+
+        return simulados
+
+    # ---------- Ejecución sin interfaz ----------
+
+    def reiniciar_metricas(self):
+        """Pone a cero las métricas de ejecución"""
+        self.anotar(REGISTRO_METRICAS)
+        self.metricas["asignaciones"] = 0
+        self.metricas["completados"] = 0
+        self.metricas["emergencias"] = 0
+        self.metricas["esperas"] = {}  # minutos de espera -> número de vuelos asignados con esa espera
+        self.metricas["esperas_por_tipo"] = {"ATERRIZAJE": {}, "DESPEGUE": {}}  # el mismo histograma por tipo
+        self.metricas["espera_ponderada"] = 0  # suma de espera x peso de la prioridad (PESOS_PRIORIDAD)
+        self.metricas["sin_combustible"] = 0   # aterrizajes asignados con el combustible agotado
+        self.metricas["ocupacion_pistas"] = 0  # minutos de pista reservados por las asignaciones
+
+    def simulacion_vacia(self):
+        """Indica si no quedan vuelos en cola, pistas ocupadas ni vuelos por entrar"""
+        return (len(self.flujo_aterrizaje) == 0 and len(self.flujo_despegue) == 0
+                and self.almacen.proxima_liberacion() is None and self.siguiente_pendiente is None)
+
+    def ejecutar(self, minutos=None, hasta_vaciar=False):
+        """Ejecuta la simulación sin imprimir ni esperar y devuelve un resumen
+
+        Con minutos avanza exactamente ese número de minutos. Con
+        hasta_vaciar=True avanza hasta que no quedan vuelos en cola ni pistas
+        ocupadas; minutos actúa entonces como límite (por defecto
+        LIMITE_HASTA_VACIAR). Los minutos sin eventos se saltan de golpe.
+        """
+        if minutos is None and not hasta_vaciar:
+            raise ValueError("Indique minutos o hasta_vaciar=True")
+
+        self.reiniciar_metricas()
+        inicio_reloj = self.reloj_simulado
+        inicio = time.perf_counter()
+        simulados = 0
+
+        if hasta_vaciar:
+            limite = inicio_reloj + (minutos if minutos is not None else LIMITE_HASTA_VACIAR)
+            while not self.simulacion_vacia() and self.reloj_simulado < limite:
+                proximo = self.proximo_minuto_relevante()
+                if proximo is None:
+                    break
+                simulados += self.avanzar_por_eventos(min(proximo, limite) - self.reloj_simulado)
+        else:
+            simulados = self.avanzar_por_eventos(minutos)
+
+        metricas = self.metricas
+        esperas = metricas["esperas"]
+        asignaciones = metricas["asignaciones"]
+        # Minutos de pista disponibles en el periodo simulado
+        capacidad = (sum(1 for pista in self.pistas if pista[PISTA_HABILITADA])
+                     * (self.reloj_simulado - inicio_reloj))
+        return {
+            "minuto_inicial": inicio_reloj,
+            "minuto_final": self.reloj_simulado,
+            "minutos_con_eventos": simulados,
+            "asignaciones": asignaciones,
+            "completados": metricas["completados"],
+            "emergencias": metricas["emergencias"],
+            "sin_combustible": metricas["sin_combustible"],
+            "en_cola": len(self.flujo_aterrizaje) + len(self.flujo_despegue),
+            "vacia": self.simulacion_vacia(),
+            "espera_media": (sum(e * n for e, n in esperas.items()) / asignaciones) if asignaciones else 0.0,
+            "espera_ponderada_media": (metricas["espera_ponderada"] / asignaciones) if asignaciones else 0.0,
+            "espera_p50": percentil_espera(esperas, 50),
+            "espera_p95": percentil_espera(esperas, 95),
+            "espera_p99": percentil_espera(esperas, 99),
+            "espera_maxima": max(esperas) if esperas else 0,
+            "utilizacion_pistas": (metricas["ocupacion_pistas"] / capacidad) if capacidad else 0.0,
+            "segundos": time.perf_counter() - inicio,
+        }
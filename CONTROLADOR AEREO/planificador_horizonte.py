@@ -0,0 +1,132 @@
+import heapq
+
+from almacen_vuelos import (CATEGORIAS_COMPATIBLES, CONSUMO_POR_MINUTO,
+                            clase_de_vuelo, categoria_compatible)
+from asignacion_optima import PESOS_PRIORIDAD
+
+# Constantes para índices de la tupla de vuelo (mismas que en sistema_vuelos.py)
+ID = 0
+TIPO = 1
+TIEMPO = 2
+PRIORIDAD = 3
+COMBUSTIBLE = 4
+
+PRIORIDAD_EMERGENCIA = 2
+
+# Minutos que cubre el plan por defecto
+HORIZONTE_POR_DEFECTO = 15
+# Coste de cada minuto que un aterrizaje espera con el combustible agotado
+PESO_SIN_COMBUSTIBLE = 100
+
+def prevision_combustible(vuelo, reloj, umbral_emergencia):
+    """Minutos en que un aterrizaje pasa a emergencia y agota el combustible
+
+    Devuelve (emergencia, agotamiento); None en lo que no aplica (despegues,
+    o sin regla de emergencia por combustible).
+    """
+    if vuelo[TIPO] != "ATERRIZAJE":
+        return None, None
+    agotamiento = reloj - (-vuelo[COMBUSTIBLE] // CONSUMO_POR_MINUTO)
+    if vuelo[PRIORIDAD] >= PRIORIDAD_EMERGENCIA:
+        return reloj, agotamiento
+    if umbral_emergencia is None:
+        return None, agotamiento
+    return reloj + max(0, -(-(vuelo[COMBUSTIBLE] - umbral_emergencia) // CONSUMO_POR_MINUTO)), agotamiento
+
+def vuelo_en_minuto(vuelo, minuto, emergencia):
+    """Tupla del vuelo con la prioridad que tendrá en ese minuto"""
+    if emergencia is not None and minuto >= emergencia and vuelo[PRIORIDAD] < PRIORIDAD_EMERGENCIA:
+        return vuelo[:PRIORIDAD] + (PRIORIDAD_EMERGENCIA,) + vuelo[COMBUSTIBLE:]
+    return vuelo
+
+def coste_en_minuto(vuelo, minuto, emergencia, agotamiento):
+    """Coste de que el vuelo empiece a usar la pista en ese minuto
+
+    Espera ponderada por la prioridad que tendrá entonces, más un recargo
+    por cada minuto que lleve con el combustible agotado.
+    """
+    prioridad = vuelo_en_minuto(vuelo, minuto, emergencia)[PRIORIDAD]
+    coste = PESOS_PRIORIDAD.get(prioridad, 1) * max(0, minuto - vuelo[TIEMPO])
+    if agotamiento is not None and minuto > agotamiento:
+        coste += PESO_SIN_COMBUSTIBLE * (minuto - agotamiento)
+    return coste
+
+def planificar_horizonte(pistas, candidatos, reloj, horizonte=HORIZONTE_POR_DEFECTO,
+                         umbral_emergencia=5):
+    """Reparte los huecos de pista de los próximos minutos entre los vuelos en cola
+
+    pistas: tuplas (id_pista, categoria, tiempo_uso, minuto_disponible) de
+    las pistas habilitadas, en el orden de la lista de pistas.
+    candidatos: tuplas de vuelo EN_COLA con el combustible actual.
+
+    Cada pista ofrece un hueco cada tiempo_uso minutos desde que queda
+    libre hasta reloj + horizonte. Los vuelos se recorren de mayor a menor
+    coste de un minuto más de espera al final del horizonte (así cuentan
+    la ETA, la emergencia y el agotamiento que lleguen antes), desempatando
+    con el orden de despacho, y cada uno toma el hueco compatible de menor
+    coste; a igualdad, el de la pista que sirve a menos clases de vuelo
+    (las cortas se reservan para aterrizajes normales) y el más temprano.
+    La compatibilidad se evalúa con la clase que tendrá el vuelo en el
+    minuto del hueco.
+
+    Devuelve el plan como lista de (minuto, id_pista, vuelo) ordenada por
+    minuto; solo se ejecutan los huecos del minuto actual y el resto se
+    vuelve a planificar en el siguiente.
+    """
+    fin = reloj + horizonte
+
+    # Huecos libres por categoría: heap de (minuto, tiempo_uso, orden, id_pista)
+    huecos = {}
+    for orden, (id_pista, categoria, tiempo_uso, disponible) in enumerate(pistas):
+        heap = huecos.setdefault(categoria, [])
+        minuto = max(disponible, reloj)
+        while minuto <= fin:
+            heap.append((minuto, tiempo_uso, orden, id_pista))
+            # Un tiempo de uso no positivo se trata como un minuto
+            minuto += max(1, tiempo_uso)
+    for heap in huecos.values():
+        heapq.heapify(heap)
+    clases_admitidas = {categoria: sum(1 for clase in CATEGORIAS_COMPATIBLES
+                                       if categoria_compatible(categoria, clase))
+                        for categoria in huecos}
+
+    previsiones = {vuelo[ID]: prevision_combustible(vuelo, reloj, umbral_emergencia)
+                   for vuelo in candidatos}
+
+    def clave_plan(vuelo):
+        """Coste marginal de esperar al final del horizonte y clave de despacho"""
+        emergencia, agotamiento = previsiones[vuelo[ID]]
+        marginal = (coste_en_minuto(vuelo, fin + 1, emergencia, agotamiento)
+                    - coste_en_minuto(vuelo, fin, emergencia, agotamiento))
+        combustible = 999 if vuelo[TIPO] == "DESPEGUE" else vuelo[COMBUSTIBLE]
+        return (-marginal, -vuelo[PRIORIDAD], combustible, -max(0, reloj - vuelo[TIEMPO]), vuelo[ID])
+
+    plan = []
+    pendientes = sum(len(heap) for heap in huecos.values())
+    for vuelo in sorted(candidatos, key=clave_plan):
+        if pendientes == 0:
+            break
+        emergencia, agotamiento = previsiones[vuelo[ID]]
+        mejor = None
+        mejor_opcion = None
+        for categoria, heap in huecos.items():
+            if not heap:
+                continue
+            # La cabeza es el hueco más temprano: con el coste creciente en
+            # el tiempo, es el mejor de la categoría
+            minuto, tiempo_uso, orden, _ = heap[0]
+            clase = clase_de_vuelo(vuelo_en_minuto(vuelo, minuto, emergencia))
+            if clase is None or not categoria_compatible(categoria, clase):
+                continue
+            opcion = (coste_en_minuto(vuelo, minuto, emergencia, agotamiento),
+                      clases_admitidas[categoria], minuto, tiempo_uso, orden)
+            if mejor_opcion is None or opcion < mejor_opcion:
+                mejor, mejor_opcion = categoria, opcion
+        if mejor is None:
+            continue
+        minuto, _, orden, id_pista = heapq.heappop(huecos[mejor])
+        pendientes -= 1
+        plan.append((minuto, orden, id_pista, vuelo))
+
+    plan.sort(key=lambda reserva: reserva[:2])
+    return [(minuto, id_pista, vuelo) for minuto, _, id_pista, vuelo in plan]
@@ -0,0 +1,84 @@
+from asignacion_optima import peso_espera
+
+# Constantes para índices de la tupla de vuelo (mismas que en sistema_vuelos.py)
+ID = 0
+TIPO = 1
+TIEMPO = 2
+PRIORIDAD = 3
+COMBUSTIBLE = 4
+
+# Combustible ficticio de los despegues en las claves que ordenan por combustible
+COMBUSTIBLE_DESPEGUE = 999
+# Combustible con el que la política de combustible trata a un aterrizaje como emergencia
+UMBRAL_COMBUSTIBLE = 5
+# Minutos de espera con los que la política de envejecimiento sube un nivel de prioridad
+PASO_ENVEJECIMIENTO = 10
+PRIORIDAD_MAXIMA = 2
+
+# Políticas de despacho incluidas
+POLITICA_PRIORIDAD = "prioridad"            # Prioridad, combustible, atraso (la de siempre)
+POLITICA_FIFO = "fifo"                      # Por ETA/ETD, sin mirar prioridad ni combustible
+POLITICA_COMBUSTIBLE = "combustible"        # Emergencias de combustible primero (la antigua de la GUI)
+POLITICA_ESPERA_PONDERADA = "espera_ponderada"  # Mayor peso de prioridad x (1 + atraso)
+POLITICA_ENVEJECIMIENTO = "envejecimiento"  # La prioridad sube con la espera
+
+def combustible_de_orden(vuelo):
+    """Combustible con el que se ordena un vuelo (fijo para los despegues)"""
+    return COMBUSTIBLE_DESPEGUE if vuelo[TIPO] == "DESPEGUE" else vuelo[COMBUSTIBLE]
+
+def clave_prioridad(vuelo, reloj):
+    """Prioridad (desc), combustible (asc), atraso (desc), id (asc)"""
+    atraso = max(0, reloj - vuelo[TIEMPO])
+    return (-vuelo[PRIORIDAD], combustible_de_orden(vuelo), -atraso, vuelo[ID])
+
+def clave_fifo(vuelo, reloj):
+    """Primero el de ETA/ETD más temprana"""
+    return (vuelo[TIEMPO], vuelo[ID])
+
+def clave_combustible(vuelo, reloj):
+    """Aterrizajes con combustible <= UMBRAL_COMBUSTIBLE primero (menos combustible antes);
+    el resto por prioridad (desc), combustible (asc) y ETA/ETD"""
+    if vuelo[TIPO] == "ATERRIZAJE" and vuelo[COMBUSTIBLE] <= UMBRAL_COMBUSTIBLE:
+        return (0, vuelo[COMBUSTIBLE], vuelo[TIEMPO], vuelo[ID])
+    return (1, -vuelo[PRIORIDAD], combustible_de_orden(vuelo), vuelo[TIEMPO], vuelo[ID])
+
+def clave_espera_ponderada(vuelo, reloj):
+    """Mayor coste de seguir esperando primero (ver asignacion_optima.peso_espera)
+
+    El peso crece con el atraso, así que un despegue retrasado acaba
+    adelantando a los aterrizajes recién llegados.
+    """
+    return (-peso_espera(vuelo, reloj), combustible_de_orden(vuelo), vuelo[ID])
+
+def clave_envejecimiento(vuelo, reloj):
+    """La prioridad sube un nivel cada PASO_ENVEJECIMIENTO minutos de atraso,
+    hasta PRIORIDAD_MAXIMA, y a igual prioridad sale antes el que más espera
+
+    Así un despegue retrasado no queda siempre detrás de los aterrizajes por
+    su combustible ficticio. Los aterrizajes con combustible <=
+    UMBRAL_COMBUSTIBLE van siempre delante, de menos a más combustible.
+    """
+    atraso = max(0, reloj - vuelo[TIEMPO])
+    if vuelo[TIPO] == "ATERRIZAJE" and vuelo[COMBUSTIBLE] <= UMBRAL_COMBUSTIBLE:
+        return (0, vuelo[COMBUSTIBLE], -atraso, vuelo[ID])
+    prioridad = min(PRIORIDAD_MAXIMA, vuelo[PRIORIDAD] + atraso // PASO_ENVEJECIMIENTO)
+    return (1, -prioridad, -atraso, combustible_de_orden(vuelo), vuelo[ID])
+
+# Nombre de la política -> clave(vuelo, reloj); sale primero el vuelo de menor clave
+POLITICAS = {
+    POLITICA_PRIORIDAD: clave_prioridad,
+    POLITICA_FIFO: clave_fifo,
+    POLITICA_COMBUSTIBLE: clave_combustible,
+    POLITICA_ESPERA_PONDERADA: clave_espera_ponderada,
+    POLITICA_ENVEJECIMIENTO: clave_envejecimiento,
+}
+
+def registrar_politica(nombre, clave):
+    """Añade (o sustituye) una política de despacho
+
+    clave(vuelo, reloj) recibe la tupla del vuelo EN_COLA con el combustible
+    actual y el minuto de la simulación, y devuelve algo comparable: sale
+    primero el vuelo de menor clave. Debe depender solo del vuelo y del
+    reloj, no del resto de la cola.
+    """
+    POLITICAS[nombre] = clave
@@ -0,0 +1,288 @@
+import os
+import gzip
+import json
+import atexit
+import shutil
+import threading
+
+# Líneas acumuladas antes de despertar al hilo escritor
+LINEAS_POR_LOTE = 1000
+# Segundos máximos que una línea espera en memoria antes de escribirse
+SEGUNDOS_POR_LOTE = 0.5
+# Líneas pendientes a partir de las cuales escribir espera al hilo (contrapresión)
+MAXIMO_PENDIENTES = 100000
+
+# Bytes a partir de los cuales el log JSON pasa a un segmento nuevo
+TAMANO_SEGMENTO = 64 * 1024 * 1024
+# Compresión de los segmentos cerrados (6: casi lo que 9 y bastante más rápido)
+NIVEL_GZIP = 6
+
+# Índices de la tupla de evento (minuto, tipo, id_vuelo, id_pista, extra); extra
+# es un dict campo -> valor con el resto de datos (o None)
+EVENTO_MINUTO = 0
+EVENTO_VUELO = 2    # id del vuelo o None
+EVENTO_PISTA = 3    # id de la pista o None
+
+# Tipo de los mensajes de texto libre (el texto va en extra["texto"])
+TIPO_MENSAJE = "MENSAJE"
+# Eventos cuya pista se escribe como "id=" en el log de texto
+EVENTOS_DE_PISTA = ("PISTA_AGREGADA", "PISTA_MODIFICADA")
+
+# Codificador JSON reutilizado (json.dumps con opciones crea uno en cada llamada)
+_codificador_json = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"), default=str)
+
+# Registros abiertos, para vaciarlos al salir del programa
+_abiertos = set()
+_cerrojo_abiertos = threading.Lock()
+
+def cerrar_todos():
+    """Escribe lo pendiente de todos los registros abiertos y los cierra"""
+    with _cerrojo_abiertos:
+        abiertos = list(_abiertos)
+    for registro in abiertos:
+        registro.cerrar()
+
+# Al terminar el programa (también por una excepción no capturada) no se pierde nada
+atexit.register(cerrar_todos)
+
+def texto_evento(evento):
+    """Línea de eventos.log de un evento: "[t=N] TIPO id_vuelo=.. pista=.. campo=valor ..." """
+    minuto, tipo, id_vuelo, id_pista, extra = evento
+    if tipo == TIPO_MENSAJE:
+        return f"[t={minuto}] {extra['texto']}\n"
+    partes = [f"[t={minuto}] {tipo}"]
+    if id_vuelo is not None:
+        partes.append(f"id_vuelo={id_vuelo}")
+    if id_pista is not None:
+        partes.append(f"{'id' if tipo in EVENTOS_DE_PISTA else 'pista'}={id_pista}")
+    if extra:
+        partes.extend(f"{campo}={valor}" for campo, valor in extra.items())
+    return " ".join(partes) + "\n"
+
+def json_evento(evento):
+    """Línea JSON de un evento: {"t", "tipo", "vuelo", "pista", "extra"}"""
+    minuto, tipo, id_vuelo, id_pista, extra = evento
+    return _codificador_json.encode({"t": minuto, "tipo": tipo, "vuelo": id_vuelo, "pista": id_pista,
+                                     "extra": extra or {}}) + "\n"
+
+def archivo_segmento(archivo, numero):
+    """Nombre del segmento cerrado número numero de un log JSON (sin el .gz)"""
+    base, extension = os.path.splitext(archivo)
+    return f"{base}.{numero:06d}{extension}"
+
+def segmentos(archivo):
+    """(número, ruta) de los segmentos cerrados de un log JSON, en orden"""
+    base, extension = os.path.splitext(os.path.abspath(archivo))
+    carpeta, prefijo = os.path.split(base)
+    encontrados = {}
+    for nombre in os.listdir(carpeta or "."):
+        if not nombre.startswith(prefijo + "."):
+            continue
+        numero = nombre[len(prefijo) + 1:].split(".")[0]
+        sufijo = nombre[len(prefijo) + 1 + len(numero):]
+        if numero.isdigit() and sufijo in (extension, extension + ".gz"):
+            # Si hay las dos versiones manda la comprimida (la otra quedó a medias)
+            if sufijo.endswith(".gz") or int(numero) not in encontrados:
+                encontrados[int(numero)] = os.path.join(carpeta, nombre)
+    return sorted(encontrados.items())
+
+def leer_eventos(archivo):
+    """Eventos (tuplas) de un log JSON: primero los segmentos cerrados y luego el activo"""
+    rutas = [ruta for _, ruta in segmentos(archivo)]
+    if os.path.exists(archivo):
+        rutas.append(archivo)
+    for ruta in rutas:
+        abrir = gzip.open if ruta.endswith(".gz") else open
+        with abrir(ruta, "rt", encoding="utf-8") as f:
+            for linea in f:
+                datos = json.loads(linea)
+                yield (datos["t"], datos["tipo"], datos["vuelo"], datos["pista"], datos["extra"])
+
+class DestinoTexto:
+    """eventos.log legible, una línea "[t=N] TIPO campo=valor ..." por evento
+
+    Con indice (un IndiceLog, ver indice_log.py) anota además la posición
+    de cada línea escrita, con su minuto, vuelo y pista.
+    """
+
+    def __init__(self, archivo, indice=None):
+        self.archivo = archivo
+        # El hilo escribe más tarde: la ruta relativa se resuelve ahora
+        self.ruta = os.path.abspath(archivo)
+        self.indice = indice
+
+    def escribir(self, eventos):
+        lineas = [texto_evento(evento).encode("utf-8") for evento in eventos]
+        with open(self.ruta, "ab") as f:
+            posicion = f.tell()
+            f.write(b"".join(lineas))
+        if self.indice is not None:
+            entradas = []
+            for evento, linea in zip(eventos, lineas):
+                entradas.append((posicion, len(linea), evento[EVENTO_MINUTO], evento[EVENTO_VUELO],
+                                 evento[EVENTO_PISTA]))
+                posicion += len(linea)
+            self.indice.anotar(entradas)
+
+    def cerrar(self):
+        """Cierra el índice; lo que se escriba después se indexa en la próxima consulta"""
+        if self.indice is not None:
+            self.indice.cerrar()
+            self.indice = None
+
+class DestinoJson:
+    """Log JSON Lines que rota por tamaño y comprime con gzip los segmentos cerrados
+
+    Los eventos se añaden a archivo; cuando pasa de tamano_segmento bytes
+    se renombra a base.NNNNNN.jsonl, se comprime a base.NNNNNN.jsonl.gz y
+    se empieza un archivo nuevo. Un segmento que quedó sin comprimir (el
+    programa se cortó a medias) se comprime al abrir el log otra vez.
+    """
+
+    def __init__(self, archivo, tamano_segmento=TAMANO_SEGMENTO):
+        self.archivo = archivo
+        self.ruta = os.path.abspath(archivo)
+        self.tamano_segmento = tamano_segmento
+        self.tamano = os.path.getsize(self.ruta) if os.path.exists(self.ruta) else 0
+        existentes = segmentos(self.ruta)
+        self.siguiente = existentes[-1][0] + 1 if existentes else 1
+        for _, ruta in existentes:
+            if not ruta.endswith(".gz"):
+                self._comprimir(ruta)
+
+    def escribir(self, eventos):
+        lineas = []
+        for evento in eventos:
+            if self.tamano >= self.tamano_segmento:
+                if lineas:
+                    self._escribir_lineas(lineas)
+                    lineas = []
+                self._rotar()
+            linea = json_evento(evento).encode("utf-8")
+            lineas.append(linea)
+            self.tamano += len(linea)
+        if lineas:
+            self._escribir_lineas(lineas)
+
+    def _escribir_lineas(self, lineas):
+        with open(self.ruta, "ab") as f:
+            f.write(b"".join(lineas))
+
+    def _rotar(self):
+        cerrado = archivo_segmento(self.ruta, self.siguiente)
+        os.replace(self.ruta, cerrado)
+        self.siguiente += 1
+        self.tamano = 0
+        self._comprimir(cerrado)
+
+    def _comprimir(self, ruta):
+        # Se comprime a un temporal: el .gz solo existe si está completo
+        temporal = ruta + ".gz.tmp"
+        with open(ruta, "rb") as origen, gzip.open(temporal, "wb", compresslevel=NIVEL_GZIP) as destino:
+            shutil.copyfileobj(origen, destino)
+        os.replace(temporal, ruta + ".gz")
+        os.remove(ruta)
+
+    def cerrar(self):
+        """No queda nada abierto entre escrituras"""
+
+class RegistroEventos:
+    """Log de eventos con búfer en memoria y un hilo que lo escribe por lotes
+
+    escribir() solo añade el evento (tupla, ver EVENTO_*) al búfer; el hilo
+    escritor pasa el lote a cada destino (DestinoTexto, DestinoJson) cuando
+    hay LINEAS_POR_LOTE eventos o pasan SEGUNDOS_POR_LOTE segundos, así que
+    también el formato se hace fuera del hilo de la simulación. Si el búfer
+    llega a MAXIMO_PENDIENTES eventos, escribir() espera a que el hilo lo
+    vacíe. vaciar() espera a que todo esté en los archivos (antes de
+    leerlos) y cerrar() además termina el hilo. Los errores de escritura
+    se guardan para que los recoja tomar_error() desde el hilo que escribe
+    los eventos; si aun así el hilo terminara, escribir() y vaciar() no se
+    quedan esperándolo. Se puede usar desde varios hilos.
+    """
+
+    def __init__(self, destinos, lineas_por_lote=LINEAS_POR_LOTE,
+                 segundos_por_lote=SEGUNDOS_POR_LOTE, maximo_pendientes=MAXIMO_PENDIENTES):
+        self.destinos = list(destinos)
+        self.lineas_por_lote = lineas_por_lote
+        self.segundos_por_lote = segundos_por_lote
+        self.maximo_pendientes = maximo_pendientes
+        self.pendientes = []
+        self.escribiendo = False    # el hilo tiene un lote fuera del búfer
+        self.urgente = False        # vaciar() espera: escribir sin esperar al lote
+        self.cerrado = False
+        self.error = None
+        self.condicion = threading.Condition()
+        self.hilo = threading.Thread(target=self._escribir_en_segundo_plano, daemon=True)
+        self.hilo.start()
+        with _cerrojo_abiertos:
+            _abiertos.add(self)
+
+    def escribir(self, evento):
+        """Añade un evento al búfer"""
+        with self.condicion:
+            if self.cerrado:
+                # Después de cerrar se escribe directamente
+                self._escribir_lote([evento])
+                return
+            if not self.hilo.is_alive():
+                # El hilo escritor terminó sin cerrar: se escribe aquí lo que dejó
+                lote, self.pendientes = self.pendientes + [evento], []
+                self._escribir_lote(lote)
+                return
+            while len(self.pendientes) >= self.maximo_pendientes and self.hilo.is_alive():
+                self.condicion.wait(self.segundos_por_lote)
+            self.pendientes.append(evento)
+            if len(self.pendientes) == self.lineas_por_lote:
+                self.condicion.notify_all()
+
+    def _escribir_lote(self, lote):
+        for destino in self.destinos:
+            try:
+                destino.escribir(lote)
+            except Exception as e:
+                # Cualquier error (también de formato) se guarda: el hilo no debe morir
+                self.error = e
+
+    def _escribir_en_segundo_plano(self):
+        while True:
+            with self.condicion:
+                if not (self.cerrado or self.urgente or len(self.pendientes) >= self.lineas_por_lote):
+                    self.condicion.wait(self.segundos_por_lote)
+                lote, self.pendientes = self.pendientes, []
+                self.urgente = False
+                self.escribiendo = bool(lote)
+                cerrado = self.cerrado
+                # Despierta a quien espera por el búfer lleno
+                self.condicion.notify_all()
+            if lote:
+                self._escribir_lote(lote)
+                with self.condicion:
+                    self.escribiendo = False
+                    self.condicion.notify_all()
+            elif cerrado:
+                return
+
+    def vaciar(self):
+        """Espera a que todos los eventos escritos hasta ahora estén en los archivos"""
+        with self.condicion:
+            while (self.pendientes or self.escribiendo) and self.hilo.is_alive():
+                self.urgente = True
+                self.condicion.notify_all()
+                self.condicion.wait(self.segundos_por_lote)
+
+    def tomar_error(self):
+        """Último error de escritura (y lo olvida), o None"""
+        error, self.error = self.error, None
+        return error
+
+    def cerrar(self):
+        """Escribe lo pendiente, termina el hilo escritor y cierra los destinos"""
+        with self.condicion:
+            self.cerrado = True
+            self.condicion.notify_all()
+        self.hilo.join()
+        for destino in self.destinos:
+            destino.cerrar()
+        with _cerrojo_abiertos:
+            _abiertos.discard(self)
@@ -0,0 +1,190 @@
+import sys
+import math
+import time
+import argparse
+import statistics
+from multiprocessing import Pool, cpu_count
+
+import motor_simulacion as ms
+from generador_vuelos import GeneradorVuelos
+from politicas_despacho import POLITICAS, POLITICA_PRIORIDAD
+
+REPLICAS = 1000
+# Vuelos generados en cada réplica y minutos en que se reparten sus ETA/ETD
+# (como generar_vuelos_automaticos: entre el minuto actual y 10 minutos después)
+VUELOS_POR_REPLICA = 40
+VENTANA = 10
+NIVEL_CONFIANZA = 0.95
+# Réplicas que ejecuta cada proceso antes de sustituirlo por uno nuevo
+# (la memoria de un proceso no crece con el número total de réplicas)
+TAREAS_POR_PROCESO = 500
+
+# Métricas de ejecutar() que se agregan entre réplicas
+METRICAS_REPLICA = ["espera_media", "espera_p95", "espera_maxima", "utilizacion_pistas",
+                    "emergencias", "sin_combustible", "minuto_final"]
+# Métricas enteras de las que además se guarda el histograma (percentiles de cola)
+METRICAS_HISTOGRAMA = ["emergencias", "sin_combustible"]
+
+# Configuración de las réplicas de este proceso (ver iniciar_proceso)
+configuracion = {}
+
+def iniciar_proceso(config):
+    """Guarda la configuración común en el proceso (se envía una sola vez)"""
+    configuracion.clear()
+    configuracion.update(config)
+
+def ejecutar_replica(semilla):
+    """Simula una réplica hasta vaciar la cola y devuelve sus métricas
+
+    El motor se crea y se descarta en cada réplica y solo se devuelve una
+    tupla de números (en el orden de METRICAS_REPLICA), así la memoria por
+    réplica depende del número de vuelos y no del número de réplicas.
+    """
+    motor = ms.MotorSimulacion(registro_activo=False)
+    motor.modo_asignacion = configuracion["modo"]
+    motor.cambiar_politica_despacho(configuracion["politica"])
+    motor.almacen.reemplazar_pistas(configuracion["pistas"])
+    # Mismo reparto que generar_vuelos_automaticos, con la semilla de la réplica
+    generador = GeneradorVuelos(semilla=semilla, dispersion_eta=configuracion["ventana"])
+    motor.almacen.reemplazar_vuelos(generador.generar_lote(configuracion["vuelos"]))
+    motor.inicializar_flujos()
+    resultado = motor.ejecutar(hasta_vaciar=True)
+    return tuple(resultado[nombre] for nombre in METRICAS_REPLICA)
+
+class Acumulador:
+    """Media y varianza en una pasada (Welford), sin guardar las muestras"""
+
+    def __init__(self, histograma=False):
+        self.n = 0
+        self.media = 0.0
+        self.m2 = 0.0
+        self.minimo = None
+        self.maximo = None
+        # valor -> número de réplicas (solo para métricas enteras)
+        self.histograma = {} if histograma else None
+
+    def agregar(self, valor):
+        self.n += 1
+        delta = valor - self.media
+        self.media += delta / self.n
+        self.m2 += delta * (valor - self.media)
+        self.minimo = valor if self.minimo is None else min(self.minimo, valor)
+        self.maximo = valor if self.maximo is None else max(self.maximo, valor)
+        if self.histograma is not None:
+            self.histograma[valor] = self.histograma.get(valor, 0) + 1
+
+    def desviacion(self):
+        return math.sqrt(self.m2 / (self.n - 1)) if self.n > 1 else 0.0
+
+    def intervalo(self, nivel=NIVEL_CONFIANZA):
+        """Intervalo de confianza de la media (aproximación normal)"""
+        if self.n < 2:
+            return self.media, self.media
+        z = statistics.NormalDist().inv_cdf(0.5 + nivel / 2)
+        margen = z * self.desviacion() / math.sqrt(self.n)
+        return self.media - margen, self.media + margen
+
+def intervalo_proporcion(exitos, n, nivel=NIVEL_CONFIANZA):
+    """Intervalo de Wilson de una proporción (válido también cerca de 0 y 1)"""
+    if n == 0:
+        return 0.0, 0.0
+    z = statistics.NormalDist().inv_cdf(0.5 + nivel / 2)
+    p = exitos / n
+    centro = (p + z * z / (2 * n)) / (1 + z * z / n)
+    margen = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / (1 + z * z / n)
+    return max(0.0, centro - margen), min(1.0, centro + margen)
+
+def ejecutar_replicas(replicas, config, procesos=None, semilla_base=0):
+    """Ejecuta las réplicas en un pool de procesos y agrega sus métricas
+
+    La réplica i usa la semilla semilla_base + i, así el resultado no
+    depende del número de procesos. Los resultados se agregan según llegan
+    (en orden de réplica) y no se guardan: devuelve un Acumulador por
+    métrica y el número de réplicas con algún aterrizaje sin combustible.
+    """
+    acumuladores = {nombre: Acumulador(histograma=nombre in METRICAS_HISTOGRAMA)
+                    for nombre in METRICAS_REPLICA}
+    semillas = range(semilla_base, semilla_base + replicas)
+    procesos = procesos or cpu_count()
+
+    if procesos == 1:
+        iniciar_proceso(config)
+        resultados = map(ejecutar_replica, semillas)
+        pool = None
+    else:
+        pool = Pool(procesos, initializer=iniciar_proceso, initargs=(config,),
+                    maxtasksperchild=TAREAS_POR_PROCESO)
+        # Lotes de varias réplicas por envío para repartir el coste de la comunicación
+        resultados = pool.imap(ejecutar_replica, semillas,
+                               chunksize=max(1, min(50, replicas // (procesos * 8))))
+
+    con_agotamiento = 0
+    try:
+        for valores in resultados:
+            for nombre, valor in zip(METRICAS_REPLICA, valores):
+                acumuladores[nombre].agregar(valor)
+            if valores[METRICAS_REPLICA.index("sin_combustible")] > 0:
+                con_agotamiento += 1
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+    return acumuladores, con_agotamiento
+
+def main():
+    """Réplicas Monte Carlo del tráfico generado con intervalos de confianza"""
+    parser = argparse.ArgumentParser(
+        description="Réplicas Monte Carlo independientes de la simulación con tráfico aleatorio")
+    parser.add_argument("--replicas", type=int, default=REPLICAS, help=f"número de réplicas (default {REPLICAS})")
+    parser.add_argument("--vuelos", type=int, default=VUELOS_POR_REPLICA,
+                        help=f"vuelos por réplica (default {VUELOS_POR_REPLICA})")
+    parser.add_argument("--ventana", type=int, default=VENTANA,
+                        help=f"minutos en que se reparten las ETA/ETD (default {VENTANA})")
+    parser.add_argument("--pistas", default="pistas.csv", help="CSV de pistas (default pistas.csv)")
+    parser.add_argument("--procesos", type=int, default=None, help="procesos del pool (default: todos los núcleos)")
+    parser.add_argument("--semilla", type=int, default=0, help="semilla de la primera réplica (default 0)")
+    parser.add_argument("--asignacion", choices=ms.MODOS_ASIGNACION, default=ms.ASIGNACION_VORAZ,
+                        help="modo de asignación de pistas (default voraz)")
+    parser.add_argument("--politica", choices=list(POLITICAS), default=POLITICA_PRIORIDAD,
+                        help=f"política de despacho del modo voraz (default {POLITICA_PRIORIDAD})")
+    args = parser.parse_args(sys.argv[1:])
+    if args.replicas < 1:
+        parser.error("--replicas debe ser al menos 1")
+
+    motor = ms.MotorSimulacion(registro_activo=False)
+    motor.cargar_pistas_desde_csv(args.pistas)
+    config = {
+        "pistas": list(motor.pistas),
+        "vuelos": args.vuelos,
+        "ventana": args.ventana,
+        "modo": args.asignacion,
+        "politica": args.politica,
+    }
+    procesos = args.procesos or cpu_count()
+
+    print(f"{args.replicas} réplicas x {args.vuelos} vuelos, {len(config['pistas'])} pistas, "
+          f"modo {args.asignacion}, {procesos} procesos")
+    inicio = time.perf_counter()
+    acumuladores, con_agotamiento = ejecutar_replicas(args.replicas, config, procesos, args.semilla)
+    segundos = time.perf_counter() - inicio
+
+    print(f"\n{'MÉTRICA':<20} {'MEDIA':>9} {f'IC {NIVEL_CONFIANZA:.0%}':>21} {'DESV.':>8} "
+          f"{'MÍN':>8} {'MÁX':>8} {'P95':>6} {'P99':>6}")
+    for nombre in METRICAS_REPLICA:
+        a = acumuladores[nombre]
+        bajo, alto = a.intervalo()
+        if a.histograma is not None:
+            p95 = ms.percentil_espera(a.histograma, 95)
+            p99 = ms.percentil_espera(a.histograma, 99)
+        else:
+            p95 = p99 = "-"
+        print(f"{nombre:<20} {a.media:>9.3f} {f'[{bajo:.3f}, {alto:.3f}]':>21} {a.desviacion():>8.3f} "
+              f"{a.minimo:>8.3f} {a.maximo:>8.3f} {p95:>6} {p99:>6}")
+
+    bajo, alto = intervalo_proporcion(con_agotamiento, args.replicas)
+    print(f"\nRéplicas con algún aterrizaje sin combustible: {con_agotamiento}/{args.replicas} "
+          f"({con_agotamiento / args.replicas:.2%}, IC {NIVEL_CONFIANZA:.0%} [{bajo:.2%}, {alto:.2%}])")
+    print(f"{segundos:.2f} s ({args.replicas / segundos:.1f} réplicas/s)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,332 @@
+import re
+import sys
+import argparse
+from bisect import bisect_right
+
+# Línea de eventos.log: "[t=N] TIPO clave=valor clave=valor ..."
+PATRON_LINEA = re.compile(r"^\[t=(-?\d+)\] (\S+) ?(.*)$")
+PATRON_CAMPO = re.compile(r"(\w+)=(\S*)")
+# Formatos libres de versiones anteriores del log
+PATRON_CANCELACION = re.compile(r"Vuelo (\S+) cancelado")
+PATRON_PISTA_MODIFICADA = re.compile(r"Pista (\S+) (habilitada|deshabilitada|cambiada a categoría: (\S+))")
+
+# Punto de control cada tantos eventos (o cada tantos como vuelos haya, si
+# son más): la copia del estado cuesta lo que el número de vuelos, así que
+# repartida entre los eventos sale a un coste constante por evento
+EVENTOS_POR_PUNTO = 5000
+
+# Campos de un vuelo durante la reproducción
+VUELO_TIPO = 0
+VUELO_ESTADO = 1
+VUELO_EMERGENCIA = 2   # True tras un evento EMERGENCIA
+VUELO_ALTA = 3         # minuto (continuo, ver Reproduccion.continuo) en que entró en cola
+VUELO_SALIDA = 4       # minuto (continuo) en que salió de la cola, o None si sigue en ella
+
+# Campos de una pista durante la reproducción (mismo orden que la tupla de pista)
+PISTA_CATEGORIA = 0
+PISTA_TIEMPO_USO = 1
+PISTA_HABILITADA = 2
+PISTA_ESTADO = 3
+PISTA_VUELO_ACTUAL = 4   # seguido del minuto de liberación
+PISTA_ASIGNACION = 6   # minuto de la asignación en curso (para deducir tiempo_uso)
+
+# Pista que aparece en el log sin haberse cargado ni agregado (el tiempo de
+# uso se deduce del primer COMPLETADO)
+CATEGORIA_DESCONOCIDA = "larga"
+PISTA_DESCONOCIDA = (CATEGORIA_DESCONOCIDA, None, 1, "LIBRE", None, 0, 0)
+
+def leer_evento(linea):
+    """(minuto, tipo, campos, texto) de una línea del log, o None si no es un evento"""
+    coincidencia = PATRON_LINEA.match(linea)
+    if coincidencia is None:
+        return None
+    texto = coincidencia.group(3)
+    return int(coincidencia.group(1)), coincidencia.group(2), dict(PATRON_CAMPO.findall(texto)), texto
+
+class Reproduccion:
+    """Estado de vuelos y pistas que se va reconstruyendo evento a evento
+
+    El log no trae todos los datos: la ETA/ETD, la prioridad y el
+    combustible salen de los vuelos base (los CSV con que se cargó la
+    simulación) y, si no están, del propio evento (ALTA_MANUAL los trae)
+    o de valores por defecto. Los vuelos de ALTA_AUTOMATICA no aparecen
+    hasta que se asignan o se cancelan, porque el log solo trae el resumen.
+    """
+
+    def __init__(self, pistas_base=()):
+        self.tramo = 0          # se incrementa cada vez que el reloj vuelve atrás (detener o nueva sesión)
+        self.minuto = 0         # minuto del último evento
+        self.continuo = 0       # minutos transcurridos sin volver atrás (reloj del combustible)
+        self.vuelos = {}        # id_vuelo -> tupla VUELO_*
+        self.pistas = {}        # id_pista -> tupla PISTA_*
+        self.cargados = []      # EN_COLA seguidos (una carga de CSV acaba en CARGA_INICIAL)
+        self.campos_alta = {}   # id_vuelo -> (tiempo, prioridad, combustible) de ALTA_MANUAL
+        for pista in pistas_base:
+            self.pistas[pista[0]] = (pista[1], pista[2], pista[3], "LIBRE", None, 0, 0)
+
+    def copiar(self):
+        """Copia para un punto de control (las tuplas se comparten)"""
+        copia = Reproduccion()
+        copia.tramo, copia.minuto, copia.continuo = self.tramo, self.minuto, self.continuo
+        copia.vuelos = dict(self.vuelos)
+        copia.pistas = dict(self.pistas)
+        copia.cargados = list(self.cargados)
+        copia.campos_alta = dict(self.campos_alta)
+        return copia
+
+    def avanzar_reloj(self, minuto):
+        """Sitúa el reloj en el minuto de un evento (si vuelve atrás empieza un tramo)"""
+        if minuto < self.minuto:
+            self.tramo += 1
+            # detener() y una sesión nueva dejan todas las pistas libres
+            for id_pista, pista in self.pistas.items():
+                self.pistas[id_pista] = pista[:PISTA_ESTADO] + ("LIBRE", None, 0, 0)
+            # El reloj vuelve a 0 y desde ahí sigue contando
+            self.continuo += minuto
+        else:
+            self.continuo += minuto - self.minuto
+        self.minuto = minuto
+
+    def _liberar_pista_de(self, id_vuelo):
+        for id_pista, pista in self.pistas.items():
+            if pista[PISTA_VUELO_ACTUAL] == id_vuelo:
+                self.pistas[id_pista] = pista[:PISTA_ESTADO] + ("LIBRE", None, 0, 0)
+
+    def _cambiar_vuelo(self, id_vuelo, tipo, estado):
+        anterior = self.vuelos.get(id_vuelo)
+        if anterior is None:
+            self.vuelos[id_vuelo] = (tipo, estado, False, self.continuo, self.continuo)
+            return
+        salida = anterior[VUELO_SALIDA]
+        if salida is None:
+            # Deja la cola: el combustible no baja desde aquí
+            salida = self.continuo
+        self.vuelos[id_vuelo] = (tipo or anterior[VUELO_TIPO], estado, anterior[VUELO_EMERGENCIA],
+                                 anterior[VUELO_ALTA], salida)
+
+    def aplicar(self, minuto, tipo, campos, texto):
+        """Aplica un evento ya leído con leer_evento"""
+        self.avanzar_reloj(minuto)
+
+        if tipo in ("EN_COLA", "ALTA_MANUAL"):
+            id_vuelo = campos.get("id_vuelo")
+            self.vuelos[id_vuelo] = (campos.get("tipo"), "EN_COLA", False, self.continuo, None)
+            if tipo == "EN_COLA":
+                self.cargados.append(id_vuelo)
+            elif "prioridad" in campos:
+                self.campos_alta[id_vuelo] = (int(campos["tiempo"]), int(campos["prioridad"]),
+                                              int(campos["combustible"]))
+        elif tipo == "CARGA_INICIAL":
+            # Una carga de CSV sustituye todos los vuelos por los recién puestos EN_COLA
+            cargados = set(self.cargados)
+            self.vuelos = {id_vuelo: vuelo for id_vuelo, vuelo in self.vuelos.items() if id_vuelo in cargados}
+        elif tipo == "ASIGNACION":
+            id_vuelo, id_pista = campos.get("id_vuelo"), campos.get("pista")
+            self._cambiar_vuelo(id_vuelo, campos.get("tipo"), "ASIGNADO")
+            pista = self.pistas.get(id_pista, PISTA_DESCONOCIDA)
+            tiempo_uso = pista[PISTA_TIEMPO_USO]
+            liberacion = minuto + tiempo_uso if tiempo_uso is not None else 0
+            self.pistas[id_pista] = pista[:PISTA_ESTADO] + ("OCUPADA", id_vuelo, liberacion, minuto)
+        elif tipo == "COMPLETADO":
+            id_vuelo, id_pista = campos.get("id_vuelo"), campos.get("pista")
+            self._cambiar_vuelo(id_vuelo, None, "COMPLETADO")
+            pista = self.pistas.get(id_pista)
+            if pista is not None and pista[PISTA_VUELO_ACTUAL] == id_vuelo:
+                tiempo_uso = pista[PISTA_TIEMPO_USO]
+                if tiempo_uso is None:
+                    # Pista desconocida: su tiempo de uso es lo que duró la operación
+                    tiempo_uso = minuto - pista[PISTA_ASIGNACION]
+                self.pistas[id_pista] = (pista[PISTA_CATEGORIA], tiempo_uso, pista[PISTA_HABILITADA],
+                                         "LIBRE", None, 0, 0)
+        elif tipo == "ESTADO_MODIFICADO":
+            id_vuelo, estado = campos.get("id_vuelo"), campos.get("estado")
+            vuelo = self.vuelos.get(id_vuelo)
+            if estado == "EN_COLA" and vuelo is not None and vuelo[VUELO_SALIDA] is not None:
+                # Vuelve a la cola: el combustible sigue bajando donde se quedó
+                self.vuelos[id_vuelo] = vuelo[:VUELO_ESTADO] + (estado, vuelo[VUELO_EMERGENCIA],
+                                        self.continuo - (vuelo[VUELO_SALIDA] - vuelo[VUELO_ALTA]), None)
+            else:
+                self._cambiar_vuelo(id_vuelo, None, estado)
+        elif tipo == "EMERGENCIA":
+            vuelo = self.vuelos.get(campos.get("id_vuelo"))
+            if vuelo is not None:
+                self.vuelos[campos["id_vuelo"]] = vuelo[:VUELO_EMERGENCIA] + (True,) + vuelo[VUELO_ALTA:]
+        elif tipo == "CANCELACION":
+            coincidencia = PATRON_CANCELACION.search(texto)
+            id_vuelo = campos.get("id_vuelo") or (coincidencia.group(1) if coincidencia else None)
+            if id_vuelo is not None:
+                self._liberar_pista_de(id_vuelo)
+                self._cambiar_vuelo(id_vuelo, None, "CANCELADO")
+        elif tipo == "PISTA_AGREGADA":
+            self.pistas[campos.get("id")] = (campos.get("categoria", CATEGORIA_DESCONOCIDA),
+                                             int(campos["tiempo_uso"]) if "tiempo_uso" in campos else None,
+                                             int(campos.get("habilitada", 1)), "LIBRE", None, 0, 0)
+        elif tipo == "PISTA_MODIFICADA":
+            self._modificar_pista(campos, texto)
+        if tipo != "EN_COLA":
+            self.cargados = []
+
+    def _modificar_pista(self, campos, texto):
+        if "id" in campos:
+            pista = self.pistas.get(campos["id"], PISTA_DESCONOCIDA)
+            estado = campos.get("estado", pista[PISTA_ESTADO])
+            ocupacion = pista[PISTA_VUELO_ACTUAL:] if estado == "OCUPADA" else (None, 0, 0)
+            self.pistas[campos["id"]] = (campos.get("categoria", pista[PISTA_CATEGORIA]),
+                                         int(campos["tiempo_uso"]) if "tiempo_uso" in campos else pista[PISTA_TIEMPO_USO],
+                                         int(campos.get("habilitada", pista[PISTA_HABILITADA])), estado) + ocupacion
+            return
+        # Formato anterior: "Pista R1 habilitada", "Pista R1 cambiada a categoría: corta"...
+        coincidencia = PATRON_PISTA_MODIFICADA.search(texto)
+        if coincidencia is None or coincidencia.group(1) not in self.pistas:
+            return
+        id_pista = coincidencia.group(1)
+        pista = self.pistas[id_pista]
+        if coincidencia.group(3):
+            self.pistas[id_pista] = (coincidencia.group(3),) + pista[PISTA_TIEMPO_USO:]
+        elif coincidencia.group(2) == "habilitada":
+            self.pistas[id_pista] = pista[:PISTA_HABILITADA] + (1,) + pista[PISTA_ESTADO:]
+        else:
+            self.pistas[id_pista] = pista[:PISTA_HABILITADA] + (0, "LIBRE", None, 0, 0)
+
+    def tuplas(self, vuelos_base=None):
+        """Vuelos y pistas en el formato del motor (listas de tuplas)
+
+        vuelos_base (id_vuelo -> tupla de vuelo) da la ETA/ETD, la
+        prioridad y el combustible inicial; el combustible de los
+        aterrizajes se descuenta por los minutos que pasaron en cola.
+        """
+        vuelos_base = vuelos_base or {}
+        vuelos = []
+        for id_vuelo, (tipo, estado, emergencia, alta, salida) in self.vuelos.items():
+            base = vuelos_base.get(id_vuelo)
+            if base is not None:
+                tiempo, prioridad, combustible = base[2], base[3], base[4]
+            else:
+                tiempo, prioridad, combustible = self.campos_alta.get(id_vuelo, (alta, 0, 0))
+            if tipo == "ATERRIZAJE":
+                combustible = max(0, combustible - ((self.continuo if salida is None else salida) - alta))
+            if emergencia:
+                prioridad = 2
+            vuelos.append((id_vuelo, tipo, tiempo, prioridad, combustible if tipo == "ATERRIZAJE" else 0, estado))
+        pistas = [(id_pista, pista[PISTA_CATEGORIA], pista[PISTA_TIEMPO_USO] or 0) + pista[PISTA_HABILITADA:PISTA_ASIGNACION]
+                  for id_pista, pista in self.pistas.items()]
+        return vuelos, pistas
+
+class ReproductorLog:
+    """Reconstruye el estado de vuelos y pistas en cualquier minuto de un log
+
+    indexar() lee el log una vez, línea a línea (sirve para logs de
+    cualquier tamaño), y guarda puntos de control: una copia del estado y
+    la posición en el archivo. estado_en() parte del último punto anterior
+    al minuto pedido y solo lee los eventos que faltan, así que cada
+    consulta cuesta como mucho un intervalo entre puntos, no todo el log.
+
+    El minuto se cuenta dentro de un tramo: el reloj vuelve a 0 con
+    detener() y en cada sesión nueva, y cada vuelta empieza un tramo.
+    """
+
+    def __init__(self, archivo, vuelos_base=(), pistas_base=(), eventos_por_punto=EVENTOS_POR_PUNTO):
+        self.archivo = archivo
+        self.vuelos_base = {vuelo[0]: vuelo for vuelo in vuelos_base}
+        self.pistas_base = list(pistas_base)
+        self.eventos_por_punto = eventos_por_punto
+        self.claves = []        # (tramo, minuto) de cada punto de control, en orden
+        self.puntos = []        # (posición en el archivo, Reproduccion)
+        self.tramos = []        # (minuto inicial, minuto final) de cada tramo
+        self.eventos = 0
+
+    def indexar(self):
+        """Lee todo el log y guarda los puntos de control"""
+        estado = Reproduccion(self.pistas_base)
+        self.claves, self.puntos, self.tramos = [(0, 0)], [(0, estado.copiar())], []
+        self.eventos = 0
+        pendientes = self.eventos_por_punto
+        posicion = 0
+        with open(self.archivo, "rb") as f:
+            for linea in f:
+                posicion += len(linea)
+                evento = leer_evento(linea.decode("utf-8", errors="replace"))
+                if evento is None:
+                    continue
+                tramo = estado.tramo
+                estado.aplicar(*evento)
+                if not self.tramos or estado.tramo != tramo:
+                    self.tramos.append((estado.minuto, estado.minuto))
+                self.tramos[-1] = (self.tramos[-1][0], estado.minuto)
+                self.eventos += 1
+                pendientes -= 1
+                if pendientes <= 0:
+                    self.claves.append((estado.tramo, estado.minuto))
+                    self.puntos.append((posicion, estado.copiar()))
+                    pendientes = max(self.eventos_por_punto, len(estado.vuelos))
+        return self.eventos
+
+    def estado_en(self, minuto=None, tramo=None):
+        """Reproducción al final del minuto indicado (por defecto el último) del tramo (por defecto el último)"""
+        if not self.tramos:
+            self.indexar()
+        if tramo is None:
+            tramo = len(self.tramos) - 1 if self.tramos else 0
+        if minuto is None:
+            minuto = self.tramos[tramo][1] if tramo < len(self.tramos) else 0
+        objetivo = (tramo, minuto)
+
+        posicion, estado = self.puntos[bisect_right(self.claves, objetivo) - 1]
+        estado = estado.copiar()
+        with open(self.archivo, "rb") as f:
+            f.seek(posicion)
+            for linea in f:
+                evento = leer_evento(linea.decode("utf-8", errors="replace"))
+                if evento is None:
+                    continue
+                # El evento es de un tramo posterior si el reloj vuelve atrás
+                tramo_evento = estado.tramo + (1 if evento[0] < estado.minuto else 0)
+                if (tramo_evento, evento[0]) > objetivo:
+                    break
+                estado.aplicar(*evento)
+        # Minutos sin eventos hasta el pedido (cuentan para el combustible)
+        if estado.tramo == tramo and minuto > estado.minuto:
+            estado.avanzar_reloj(minuto)
+        return estado
+
+    def tuplas_en(self, minuto=None, tramo=None):
+        """(vuelos, pistas) en el formato del motor al final del minuto indicado"""
+        return self.estado_en(minuto, tramo).tuplas(self.vuelos_base)
+
+def main(argumentos):
+    """Muestra el estado de vuelos y pistas en un minuto de un log de eventos"""
+    parser = argparse.ArgumentParser(description="Reconstruye el estado de la simulación a partir de eventos.log")
+    parser.add_argument("log", nargs="?", default="eventos.log", help="log de eventos (default eventos.log)")
+    parser.add_argument("--minuto", type=int, default=None, help="minuto a reconstruir (default el último)")
+    parser.add_argument("--tramo", type=int, default=None,
+                        help="tramo del log (el reloj vuelve a 0 al detener o en cada sesión; default el último)")
+    parser.add_argument("--vuelos", help="CSV de vuelos con que empezó la sesión (ETA/ETD, prioridad, combustible)")
+    parser.add_argument("--pistas", help="CSV de pistas con que empezó la sesión (categoría y tiempo de uso)")
+    args = parser.parse_args(argumentos)
+
+    vuelos_base, pistas_base = [], []
+    if args.vuelos or args.pistas:
+        # Import local: el motor usa este módulo para cargar_desde_log
+        from motor_simulacion import MotorSimulacion
+        motor = MotorSimulacion(registro_activo=False)
+        if args.pistas:
+            pistas_base = motor.cargar_pistas_desde_csv(args.pistas)
+        if args.vuelos:
+            vuelos_base = motor.cargar_vuelos_desde_csv(args.vuelos)
+
+    reproductor = ReproductorLog(args.log, vuelos_base, pistas_base)
+    reproductor.indexar()
+    for numero, (inicio, fin) in enumerate(reproductor.tramos):
+        print(f"Tramo {numero}: minutos {inicio}-{fin}")
+    estado = reproductor.estado_en(args.minuto, args.tramo)
+    vuelos, pistas = estado.tuplas(reproductor.vuelos_base)
+    print(f"\nEstado al final del minuto {estado.minuto} (tramo {estado.tramo}):")
+    for estado_vuelo in ("EN_COLA", "ASIGNADO", "COMPLETADO", "CANCELADO"):
+        ids = [vuelo[0] for vuelo in vuelos if vuelo[5] == estado_vuelo]
+        print(f"  {estado_vuelo}: {len(ids)} {' '.join(ids[:10])}{' ...' if len(ids) > 10 else ''}")
+    for pista in pistas:
+        ocupacion = f" con {pista[5]} hasta el minuto {pista[6]}" if pista[4] == "OCUPADA" else ""
+        print(f"  Pista {pista[0]} ({pista[1]}): {pista[4]}{ocupacion}")
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
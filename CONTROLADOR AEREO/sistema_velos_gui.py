@@ -1,10 +1,12 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 import os
-import csv
 from datetime import datetime
-import threading
-import time
+
+from almacen_vuelos import pista_es_compatible
+from motor_simulacion import MotorSimulacion, ARCHIVO_INSTANTANEA, ARCHIVO_DIARIO
+from lector_vuelos import ESTADOS
+from politicas_despacho import POLITICAS
 
 # Define constantes numéricas para acceder a los elementos de la tupla de vuelos
 # Estas constantes hacen el código más legible
@@ -24,8 +26,11 @@ PISTA_ESTADO = 4      # Índice 4: Estado (LIBRE/OCUPADA/DESHABILITADA)
 PISTA_VUELO_ACTUAL = 5 # Índice 5: ID del vuelo que está usando la pista
 PISTA_TIEMPO_FIN = 6  # Índice 6: Minuto en que termina el uso
 
-# Lista de estados posibles que puede tener un vuelo
-ESTADOS = ["EN_COLA", "ASIGNANDO", "EN_PISTA", "COMPLETADO", "CANCELADO"]
+# Prefijo de los avisos del motor en el área de texto, según su nivel
+ICONOS_AVISO = {'success': "✅", 'info': "📝", 'warning': "⚠️", 'danger': "❌"}
+
+# Cada cuánto se escriben en el diario los cambios hechos con la simulación pausada
+MILISEGUNDOS_SINCRONIZAR_DIARIO = 1000
 
 # Define la clase principal que maneja toda la aplicación
 class SistemaVuelosGUI:
@@ -40,18 +45,20 @@ class SistemaVuelosGUI:
         # Configura el color de fondo de la ventana
         self.root.configure(bg='#f0f0f0')
         
-        # Inicializa una lista vacía para almacenar los vuelos
-        self.vuelos = []
-        # Inicializa una lista vacía para almacenar las pistas
-        self.pistas = []
-        # Inicializa el reloj de simulación en 0 minutos
-        self.reloj_simulado = 0
+        # Motor de la simulación, el mismo que usa sistema_vuelos.py
+        # (estado, carga de CSV, cola de despacho y minuto a minuto);
+        # sus avisos se muestran en el área de texto
+        self.motor = MotorSimulacion(avisar=self.mostrar_aviso)
+        # Almacén central de vuelos y pistas indexado por ID
+        self.almacen = self.motor.almacen
+        # Vista de los vuelos del almacén (se actualiza sola)
+        self.vuelos = self.motor.vuelos
+        # Vista de las pistas del almacén (se actualiza sola)
+        self.pistas = self.motor.pistas
         # Bandera que indica si la simulación está activa o no
         self.simulacion_activa = False
-        # Variable para almacenar el hilo de simulación
-        self.hilo_simulacion = None
-        # Diccionario para llevar registro del tiempo restante en pista de cada vuelo
-        self.tiempo_en_pista = {}  # Diccionario para rastrear tiempo en pista
+        # Siguiente minuto programado con root.after (None = ninguno)
+        self.minuto_programado = None
         
         # Llama al método para configurar los estilos visuales
         self.setup_styles()
@@ -61,6 +68,9 @@ class SistemaVuelosGUI:
         
         # Llama al método para cargar datos iniciales desde archivos CSV
         self.cargar_datos_iniciales()
+        
+        # Programa la escritura periódica del diario de cambios
+        self.root.after(MILISEGUNDOS_SINCRONIZAR_DIARIO, self.sincronizar_diario)
     
     # Método para configurar los estilos visuales de la interfaz
     def setup_styles(self):
@@ -186,6 +196,34 @@ class SistemaVuelosGUI:
         # Crea etiqueta explicativa
         ttk.Label(sim_frame, text="segundos/minuto").pack(side=tk.LEFT, padx=5)
         
+        # Crea etiqueta y combobox para elegir la política de despacho
+        ttk.Label(sim_frame, text="Política de despacho:").pack(side=tk.LEFT, padx=(20, 5))
+        self.politica_var = tk.StringVar(value=self.motor.politica_despacho)
+        politica_combo = ttk.Combobox(sim_frame, textvariable=self.politica_var,
+                                      values=list(POLITICAS),
+                                      state="readonly", width=18)
+        politica_combo.pack(side=tk.LEFT, padx=5)
+        # Al elegir otra política se aplica desde el siguiente minuto
+        politica_combo.bind("<<ComboboxSelected>>", self.cambiar_politica)
+        
+        # Crea un frame para recorrer los minutos ya simulados (historial de versiones)
+        historial_frame = ttk.LabelFrame(main_frame, text="Historial", padding="5")
+        historial_frame.grid(row=4, column=0, columnspan=2, pady=(10, 0), sticky=(tk.W, tk.E))
+        
+        # Etiqueta con el tramo del historial que recorre la barra
+        self.historial_label = ttk.Label(historial_frame, text="Tramo 0:")
+        self.historial_label.pack(side=tk.LEFT, padx=5)
+        # Barra con los minutos del tramo actual (de su primer minuto al último simulado)
+        self.historial_scale = tk.Scale(historial_frame, from_=0, to=0, orient=tk.HORIZONTAL,
+                                        resolution=1, length=600, label="Minuto")
+        self.historial_scale.pack(side=tk.LEFT, padx=5, fill=tk.X, expand=True)
+        # Muestra el minuto elegido al arrastrar la barra o al soltarla
+        self.historial_scale.bind("<B1-Motion>", self.mostrar_historial)
+        self.historial_scale.bind("<ButtonRelease-1>", self.mostrar_historial)
+        # Botón para seguir la simulación desde el minuto elegido
+        ttk.Button(historial_frame, text="⏪ Continuar desde aquí",
+                   command=self.continuar_desde_historial).pack(side=tk.LEFT, padx=5)
+        
         # Configura etiquetas (tags) para formatear texto en el widget Text
         self.text_info.tag_configure('title', font=('Helvetica', 12, 'bold'), foreground=self.colors['primary'])
         self.text_info.tag_configure('header', font=('Helvetica', 10, 'bold'), foreground=self.colors['secondary'])
@@ -203,11 +241,23 @@ class SistemaVuelosGUI:
     def cargar_datos_iniciales(self):
         """Cargar datos iniciales desde archivos CSV"""
         try:
+            # Intenta cargar pistas desde el archivo pistas.csv
+            # (antes que los vuelos, igual que la consola)
+            pistas_cargadas = self.cargar_pistas_desde_csv("pistas.csv")
+            
             # Intenta cargar vuelos desde el archivo vuelos.csv
             vuelos_cargados = self.cargar_vuelos_desde_csv("vuelos.csv")
             
-            # Intenta cargar pistas desde el archivo pistas.csv
-            pistas_cargadas = self.cargar_pistas_desde_csv("pistas.csv")
+            # Si quedó el diario de una sesión anterior, ofrece continuarla
+            if os.path.exists(ARCHIVO_DIARIO) and messagebox.askyesno(
+                    "Recuperar sesión", f"Se encontró el diario {ARCHIVO_DIARIO} de una sesión anterior. "
+                                        "¿Desea recuperar esa simulación?"):
+                if self.motor.recuperar_diario(ARCHIVO_DIARIO):
+                    vuelos_cargados, pistas_cargadas = self.vuelos, self.pistas
+            # Desde aquí cada cambio se anota en el diario
+            self.motor.activar_diario(ARCHIVO_DIARIO)
+            # Y cada minuto simulado guarda una versión del estado para la barra de historial
+            self.motor.activar_historial()
             
             # Actualiza la barra de estado
             self.actualizar_status()
@@ -221,169 +271,40 @@ class SistemaVuelosGUI:
             # Si hay error, muestra mensaje de advertencia
             self.text_info.insert(tk.END, f"⚠️ Error al cargar datos: {str(e)}\n", 'warning')
     
+    # El reloj de la simulación lo lleva el motor
+    @property
+    def reloj_simulado(self):
+        """Minuto actual de la simulación"""
+        return self.motor.reloj_simulado
+    
+    # Método que recibe los avisos del motor (carga, guardado, errores)
+    def mostrar_aviso(self, mensaje, nivel="info"):
+        """Muestra un aviso del motor en el área de texto"""
+        self.text_info.insert(tk.END, f"{ICONOS_AVISO.get(nivel, '')} {mensaje}\n", nivel)
+    
     # Método para cargar vuelos desde archivo CSV
     def cargar_vuelos_desde_csv(self, archivo="vuelos.csv"):
-        """Carga los vuelos desde un archivo CSV"""
-        # Inicializa lista para vuelos cargados
-        vuelos_cargados = []
+        """Carga los vuelos desde un archivo CSV y prepara la cola de despacho"""
         try:
-            # Verifica si el archivo existe
-            if os.path.exists(archivo):
-                # Abre el archivo en modo lectura con codificación UTF-8
-                with open(archivo, "r", encoding="utf-8") as f:
-                    # Crea un lector de CSV que usa la primera fila como encabezados
-                    reader = csv.DictReader(f)
-                    # Itera por cada fila del archivo
-                    for row in reader:
-                        try:
-                            # Obtiene el ID del vuelo, buscando en diferentes nombres de columna
-                            id_vuelo = row.get('id_vuelo', row.get('id', '')).strip()
-                            # Obtiene el tipo de vuelo y lo convierte a mayúsculas
-                            tipo = row.get('tipo', '').strip().upper()
-                            
-                            # Maneja los tiempos según el tipo de vuelo
-                            if tipo == "ATERRIZAJE":
-                                # Para aterrizajes, busca ETA (Estimated Time of Arrival)
-                                tiempo_str = row.get('eta', row.get('tiempo', '0')).strip()
-                                # Convierte a entero, si hay valor
-                                tiempo = int(tiempo_str) if tiempo_str else 0
-                            else:
-                                # Para despegues, busca ETD (Estimated Time of Departure)
-                                tiempo_str = row.get('etd', row.get('tiempo', '0')).strip()
-                                tiempo = int(tiempo_str) if tiempo_str else 0
-                            
-                            # Obtiene la prioridad y convierte a entero
-                            prioridad_str = row.get('prioridad', '0').strip()
-                            prioridad = int(prioridad_str) if prioridad_str else 0
-                            
-                            # Obtiene el combustible (solo para aterrizajes)
-                            combustible_str = row.get('combustible', '0').strip()
-                            combustible = int(combustible_str) if combustible_str and tipo == "ATERRIZAJE" else 0
-                            
-                            # Obtiene el estado, por defecto "EN_COLA"
-                            estado = row.get('estado', 'EN_COLA').strip().upper()
-                            # Verifica que el estado sea válido
-                            if estado not in ESTADOS:
-                                estado = "EN_COLA"
-                            
-                            # Valida que la prioridad sea 0, 1 o 2
-                            if prioridad not in [0, 1, 2]:
-                                prioridad = 0
-                            
-                            # Crea la tupla con los datos del vuelo
-                            vuelo = (id_vuelo, tipo, tiempo, prioridad, combustible, estado)
-                            # Agrega el vuelo a la lista
-                            vuelos_cargados.append(vuelo)
-                            
-                        except (ValueError, KeyError) as e:
-                            # Si hay error en una fila, muestra advertencia
-                            self.text_info.insert(tk.END, f"⚠️ Error en fila: {str(e)}\n", 'warning')
-                            
-                # Muestra mensaje de éxito con cantidad de vuelos cargados
-                self.text_info.insert(tk.END, f"✅ Cargados {len(vuelos_cargados)} vuelos desde {archivo}\n", 'success')
-            else:
-                # Si el archivo no existe, crea datos de ejemplo
-                self.text_info.insert(tk.END, f"📝 Archivo {archivo} no encontrado, creando datos de ejemplo\n", 'info')
-                # Crea una lista de vuelos de ejemplo
-                vuelos_cargados = [
-                    ("IB101", "ATERRIZAJE", 5, 0, 20, "EN_COLA"),
-                    ("IB202", "ATERRIZAJE", 1, 0, 18, "EN_COLA"),
-                    ("UX303", "DESPEGUE", 1, 0, 0, "EN_COLA"),
-                    ("VY404", "DESPEGUE", 5, 0, 0, "EN_COLA"),
-                    ("AF505", "ATERRIZAJE", 8, 0, 5, "EN_COLA")
-                ]
-                
+            # El motor lee las columnas por nombre y descarta IDs repetidos
+            vuelos_cargados = self.motor.cargar_vuelos_desde_csv(archivo)
         except Exception as e:
             # Si hay error general, muestra mensaje de error
             self.text_info.insert(tk.END, f"❌ Error al cargar vuelos: {str(e)}\n", 'danger')
-            # Devuelve lista vacía en caso de error
             vuelos_cargados = []
-            
-        # Asigna la lista de vuelos al atributo de la clase
-        self.vuelos = vuelos_cargados
-        # Retorna la lista de vuelos cargados
+        # Reconstruye la cola de despacho con los vuelos cargados
+        self.motor.inicializar_flujos()
         return vuelos_cargados
     
     # Método para cargar pistas desde archivo CSV
     def cargar_pistas_desde_csv(self, archivo="pistas.csv"):
         """Carga información de pistas desde archivo CSV con el formato correcto"""
-        # Inicializa lista para pistas cargadas
-        pistas_cargadas = []
         try:
-            # Verifica si el archivo existe
-            if os.path.exists(archivo):
-                # Abre el archivo en modo lectura
-                with open(archivo, "r", encoding="utf-8") as f:
-                    # Crea un objeto para detectar si el archivo tiene encabezado
-                    sniffer = csv.Sniffer()
-                    # Lee una muestra del archivo (primeros 1024 bytes)
-                    sample = f.read(1024)
-                    # Vuelve al inicio del archivo
-                    f.seek(0)
-                    
-                    # Verifica si el archivo tiene encabezado
-                    if sniffer.has_header(sample):
-                        # Si tiene encabezado, usa DictReader
-                        reader = csv.DictReader(f)
-                        # Itera por cada fila
-                        for row in reader:
-                            try:
-                                # Obtiene datos de la pista
-                                id_pista = row.get('id_pista', '').strip()
-                                categoria = row.get('categoria', 'estandar').strip()
-                                tiempo_uso = int(row.get('tiempo_uso', '3').strip())
-                                habilitada = int(row.get('habilitada', '1').strip())
-                                
-                                # Crea la tupla de pista con estado inicial "LIBRE"
-                                pista = (id_pista, categoria, tiempo_uso, habilitada, "LIBRE", None, None)
-                                # Agrega la pista a la lista
-                                pistas_cargadas.append(pista)
-                                
-                            except (ValueError, KeyError) as e:
-                                # Muestra error si hay problema con una fila
-                                self.text_info.insert(tk.END, f"⚠️ Error en fila de pista: {str(e)}\n", 'warning')
-                    else:
-                        # Si no tiene encabezado, lee como lista simple
-                        f.seek(0)
-                        reader = csv.reader(f)
-                        for row in reader:
-                            # Verifica que la fila tenga al menos 4 elementos
-                            if len(row) >= 4:  # id_pista, categoria, tiempo_uso, habilitada
-                                try:
-                                    # Obtiene datos por posición
-                                    id_pista = row[0].strip()
-                                    categoria = row[1].strip()
-                                    tiempo_uso = int(row[2].strip())
-                                    habilitada = int(row[3].strip())
-                                    
-                                    # Crea la tupla de pista
-                                    pista = (id_pista, categoria, tiempo_uso, habilitada, "LIBRE", None, None)
-                                    pistas_cargadas.append(pista)
-                                    
-                                except (ValueError, IndexError) as e:
-                                    # Muestra error si hay problema
-                                    self.text_info.insert(tk.END, f"⚠️ Error en fila: {row} - {str(e)}\n", 'warning')
-                            
-                # Muestra mensaje de éxito
-                self.text_info.insert(tk.END, f"✅ Cargadas {len(pistas_cargadas)} pistas desde {archivo}\n", 'success')
-            else:
-                # Si el archivo no existe, crea pistas por defecto
-                self.text_info.insert(tk.END, f"📝 Archivo {archivo} no encontrado, creando pistas por defecto\n", 'info')
-                # Crea pistas por defecto (R1 y R2 como especificaste)
-                pistas_cargadas = [
-                    ("R1", "larga", 3, 1, "LIBRE", None, None),
-                    ("R2", "estandar", 3, 1, "LIBRE", None, None)
-                ]
-                
+            return self.motor.cargar_pistas_desde_csv(archivo)
         except Exception as e:
             # Si hay error general, muestra mensaje
             self.text_info.insert(tk.END, f"❌ Error al cargar pistas: {str(e)}\n", 'danger')
-            pistas_cargadas = []
-            
-        # Asigna la lista de pistas al atributo de la clase
-        self.pistas = pistas_cargadas
-        # Retorna la lista de pistas cargadas
-        return pistas_cargadas
+            return []
     
     # Método para actualizar la barra de estado
     def actualizar_status(self):
@@ -404,6 +325,76 @@ class SistemaVuelosGUI:
         self.status_label.config(
             text=f"✅ Sistema operativo | Tiempo: {self.reloj_simulado} min | Vuelos: {vuelos_total} | En cola: {vuelos_en_cola} | Pistas: {pistas_total} (Libres: {pistas_libres}){estado_simulacion}"
         )
+        # Ajusta la barra de historial a los minutos ya simulados
+        self.actualizar_historial()
+    
+    # Método para ajustar la barra de historial al tramo actual
+    def actualizar_historial(self):
+        """Ajusta el rango de la barra de historial a los minutos registrados"""
+        if self.motor.historial is None:
+            return
+        # Con la simulación parada, los cambios hechos a mano pasan a la versión del minuto actual
+        if not self.simulacion_activa:
+            self.motor.registrar_version()
+        primero, ultimo = self.motor.historial.minutos_del_tramo()
+        self.historial_scale.config(from_=primero, to=ultimo)
+        self.historial_label.config(text=f"Tramo {len(self.motor.historial.tramos) - 1}:")
+    
+    # Método para mostrar el estado de un minuto pasado elegido en la barra
+    def mostrar_historial(self, event=None):
+        """Muestra pistas y vuelos del minuto elegido en la barra de historial"""
+        minuto = self.historial_scale.get()
+        try:
+            # Versión del minuto en el tramo actual (búsqueda binaria, sin simular nada)
+            version = self.motor.version_en(minuto)
+        except ValueError as e:
+            self.mostrar_aviso(str(e), "warning")
+            return
+        
+        # Borra el contenido actual y muestra el minuto elegido
+        self.text_info.delete(1.0, tk.END)
+        self.text_info.insert(tk.END, f"🕘 HISTORIAL: MINUTO {version.minuto} DEL TRAMO {version.tramo} "
+                                      f"(actual: {self.reloj_simulado})\n\n", 'title')
+        
+        # Resumen de vuelos por estado
+        self.text_info.insert(tk.END, "📊 VUELOS POR ESTADO:\n", 'header')
+        for estado in ESTADOS:
+            self.text_info.insert(tk.END, f"  • {estado}: {version.conteo.get(estado, 0)}\n")
+        
+        # Estado de cada pista con el vuelo que la ocupaba en ese minuto
+        self.text_info.insert(tk.END, "\n🛬 PISTAS:\n", 'header')
+        for pista in version.pistas:
+            if pista[PISTA_HABILITADA] == 0:
+                self.text_info.insert(tk.END, f"  {pista[PISTA_ID]:<6} 🔴 DESHAB.\n", 'pista_deshabilitada')
+            elif pista[PISTA_ESTADO] == "OCUPADA":
+                vuelo = version.vuelo_de_pista(pista[PISTA_ID])
+                detalle = f"{vuelo[ID]} ({vuelo[TIPO]}, prioridad {vuelo[PRIORIDAD]})" if vuelo else "---"
+                self.text_info.insert(tk.END, f"  {pista[PISTA_ID]:<6} 🟡 OCUPADA por {detalle} "
+                                              f"hasta minuto {pista[PISTA_TIEMPO_FIN]}\n", 'pista_ocupada')
+            else:
+                self.text_info.insert(tk.END, f"  {pista[PISTA_ID]:<6} 🟢 LIBRE\n", 'pista_libre')
+    
+    # Método para volver a un minuto pasado y seguir la simulación desde ahí
+    def continuar_desde_historial(self):
+        """Sustituye el estado por el del minuto elegido en la barra de historial"""
+        # No se puede cambiar el estado con la simulación en marcha
+        if self.simulacion_activa:
+            messagebox.showwarning("Advertencia", "Pause la simulación antes de volver a un minuto anterior")
+            return
+        minuto = self.historial_scale.get()
+        if not messagebox.askyesno("Continuar desde el historial",
+                                   f"¿Desea volver al minuto {minuto} y continuar la simulación desde ahí? "
+                                   "Las métricas se reiniciarán."):
+            return
+        try:
+            self.motor.volver_a_version(minuto)
+        except ValueError as e:
+            messagebox.showerror("Error", str(e))
+            return
+        # La política de despacho es la que había en ese minuto
+        self.politica_var.set(self.motor.politica_despacho)
+        self.text_info.insert(tk.END, f"⏪ Simulación situada en el minuto {minuto}\n", 'info')
+        self.actualizar_status()
     
     # Método para mostrar la lista de vuelos
     def mostrar_vuelos(self):
@@ -456,10 +447,8 @@ class SistemaVuelosGUI:
                 estado_tag = 'success'  # Verde para completado
             elif vuelo[ESTADO] == "CANCELADO":
                 estado_tag = 'danger'   # Rojo para cancelado
-            elif vuelo[ESTADO] == "EN_PISTA":
+            elif vuelo[ESTADO] == "ASIGNADO":
                 estado_tag = 'warning'  # Naranja para en pista
-            elif vuelo[ESTADO] == "ASIGNANDO":
-                estado_tag = 'info'     # Azul oscuro para asignando
             else:
                 estado_tag = 'info'     # Color normal para otros estados
             
@@ -485,18 +474,15 @@ class SistemaVuelosGUI:
                     self.text_info.insert(tk.END, f"  ⚠️  {vuelo[ID]}: {vuelo[COMBUSTIBLE]} min - CRÍTICO\n", 'critico')
         
         # Filtra vuelos que están actualmente en pista
-        vuelos_en_pista = [v for v in self.vuelos if v[ESTADO] == "EN_PISTA"]
+        vuelos_en_pista = [v for v in self.vuelos if v[ESTADO] == "ASIGNADO"]
         if vuelos_en_pista:
             self.text_info.insert(tk.END, f"\n🛬 VUELOS EN PISTA:\n", 'header')
             for vuelo in vuelos_en_pista:
-                # Obtiene tiempo restante del diccionario (0 si no existe)
-                tiempo_restante = self.tiempo_en_pista.get(vuelo[ID], 0)
                 # Busca en qué pista está este vuelo
-                pista_asignada = None
-                for pista in self.pistas:
-                    if pista[PISTA_VUELO_ACTUAL] == vuelo[ID]:
-                        pista_asignada = pista[PISTA_ID]
-                        break
+                pista = self.almacen.pista_del_vuelo(vuelo[ID])
+                pista_asignada = pista[PISTA_ID] if pista else None
+                # Tiempo restante hasta que la pista quede libre
+                tiempo_restante = max(0, pista[PISTA_TIEMPO_FIN] - self.reloj_simulado) if pista else 0
                 
                 # Muestra información del vuelo en pista
                 if pista_asignada:
@@ -683,7 +669,7 @@ class SistemaVuelosGUI:
                         return
                     
                     # Verifica si ya existe una pista con ese ID
-                    if any(p[PISTA_ID] == id_pista for p in self.pistas):
+                    if self.almacen.existe_pista(id_pista):
                         messagebox.showerror("Error", f"Ya existe una pista con ID {id_pista}")
                         return
                     
@@ -693,8 +679,8 @@ class SistemaVuelosGUI:
                     habilitada = int(habilitada_var.get().split(" - ")[0])  # Extrae número del texto
                     
                     # Crea nueva tupla de pista
-                    nueva_pista = (id_pista, categoria, tiempo_uso, habilitada, "LIBRE", None, None)
-                    self.pistas.append(nueva_pista)  # Agrega a la lista
+                    nueva_pista = (id_pista, categoria, tiempo_uso, habilitada, "LIBRE", None, 0)
+                    self.motor.agregar_pista(nueva_pista)  # Agrega al almacén (y al diario)
                     
                     # Muestra mensaje de éxito
                     self.text_info.insert(tk.END, f"✅ Pista {id_pista} agregada exitosamente\n", 'success')
@@ -729,34 +715,33 @@ class SistemaVuelosGUI:
             valores = tree.item(item, 'values')
             id_pista = valores[0]  # ID está en primera columna
             
-            # Busca la pista en la lista
-            for i, pista in enumerate(self.pistas):
-                if pista[PISTA_ID] == id_pista:
-                    # Cambia estado de habilitada (1->0 o 0->1)
-                    nueva_habilitada = 0 if pista[PISTA_HABILITADA] == 1 else 1
-                    
-                    # Verifica que no se pueda deshabilitar pista ocupada
-                    if nueva_habilitada == 0 and pista[PISTA_ESTADO] == "OCUPADA":
-                        messagebox.showwarning("Advertencia", "No se puede deshabilitar una pista ocupada")
-                        return
-                    
-                    # Actualiza la pista en la lista
-                    self.pistas[i] = (
-                        pista[PISTA_ID],
-                        pista[PISTA_CATEGORIA],
-                        pista[PISTA_TIEMPO_USO],
-                        nueva_habilitada,
-                        "DESHABILITADA" if nueva_habilitada == 0 else "LIBRE",
-                        None,
-                        None
-                    )
-                    
-                    # Muestra mensaje de acción realizada
-                    accion = "deshabilitada" if nueva_habilitada == 0 else "habilitada"
-                    self.text_info.insert(tk.END, f"✅ Pista {id_pista} {accion}\n", 'success')
-                    self.actualizar_status()  # Actualiza barra de estado
-                    actualizar_treeview()  # Actualiza treeview
-                    break
+            # Busca la pista en el almacén
+            pista = self.almacen.obtener_pista(id_pista)
+            if pista is not None:
+                # Cambia estado de habilitada (1->0 o 0->1)
+                nueva_habilitada = 0 if pista[PISTA_HABILITADA] == 1 else 1
+                
+                # Verifica que no se pueda deshabilitar pista ocupada
+                if nueva_habilitada == 0 and pista[PISTA_ESTADO] == "OCUPADA":
+                    messagebox.showwarning("Advertencia", "No se puede deshabilitar una pista ocupada")
+                    return
+                
+                # Actualiza la pista en el almacén (y la anota en el diario)
+                self.motor.actualizar_pista((
+                    pista[PISTA_ID],
+                    pista[PISTA_CATEGORIA],
+                    pista[PISTA_TIEMPO_USO],
+                    nueva_habilitada,
+                    "DESHABILITADA" if nueva_habilitada == 0 else "LIBRE",
+                    None,
+                    0
+                ))
+                
+                # Muestra mensaje de acción realizada
+                accion = "deshabilitada" if nueva_habilitada == 0 else "habilitada"
+                self.text_info.insert(tk.END, f"✅ Pista {id_pista} {accion}\n", 'success')
+                self.actualizar_status()  # Actualiza barra de estado
+                actualizar_treeview()  # Actualiza treeview
         
         # Función interna para liberar pista ocupada (emergencia)
         def liberar_pista():
@@ -772,51 +757,25 @@ class SistemaVuelosGUI:
             valores = tree.item(item, 'values')
             id_pista = valores[0]
             
-            # Busca la pista en la lista
-            for i, pista in enumerate(self.pistas):
-                if pista[PISTA_ID] == id_pista:
-                    # Verifica que la pista esté ocupada
-                    if pista[PISTA_ESTADO] != "OCUPADA":
-                        messagebox.showinfo("Información", "La pista no está ocupada")
-                        return
+            # Busca la pista en el almacén
+            pista = self.almacen.obtener_pista(id_pista)
+            if pista is not None:
+                # Verifica que la pista esté ocupada
+                if pista[PISTA_ESTADO] != "OCUPADA":
+                    messagebox.showinfo("Información", "La pista no está ocupada")
+                    return
+                
+                # Pide confirmación al usuario
+                if messagebox.askyesno("Confirmar", f"¿Liberar pista {id_pista}? Esto cancelará el vuelo {pista[PISTA_VUELO_ACTUAL]}"):
+                    # Obtiene ID del vuelo que está usando la pista
+                    vuelo_id = pista[PISTA_VUELO_ACTUAL]
+                    # Cancela el vuelo y libera la pista (estado LIBRE, sin vuelo)
+                    self.motor.cancelar_vuelo(vuelo_id)
                     
-                    # Pide confirmación al usuario
-                    if messagebox.askyesno("Confirmar", f"¿Liberar pista {id_pista}? Esto cancelará el vuelo {pista[PISTA_VUELO_ACTUAL]}"):
-                        # Obtiene ID del vuelo que está usando la pista
-                        vuelo_id = pista[PISTA_VUELO_ACTUAL]
-                        # Busca y cancela el vuelo
-                        for j, vuelo in enumerate(self.vuelos):
-                            if vuelo[ID] == vuelo_id:
-                                self.vuelos[j] = (
-                                    vuelo[ID],
-                                    vuelo[TIPO],
-                                    vuelo[TIEMPO],
-                                    vuelo[PRIORIDAD],
-                                    vuelo[COMBUSTIBLE],
-                                    "CANCELADO"
-                                )
-                                break
-                        
-                        # Libera la pista (estado LIBRE, sin vuelo)
-                        self.pistas[i] = (
-                            pista[PISTA_ID],
-                            pista[PISTA_CATEGORIA],
-                            pista[PISTA_TIEMPO_USO],
-                            pista[PISTA_HABILITADA],
-                            "LIBRE",
-                            None,
-                            None
-                        )
-                        
-                        # Elimina del registro de tiempos en pista
-                        if vuelo_id in self.tiempo_en_pista:
-                            del self.tiempo_en_pista[vuelo_id]
-                        
-                        # Muestra mensaje de acción
-                        self.text_info.insert(tk.END, f"⚠️ Pista {id_pista} liberada. Vuelo {vuelo_id} cancelado\n", 'warning')
-                        self.actualizar_status()  # Actualiza barra de estado
-                        actualizar_treeview()  # Actualiza treeview
-                    break
+                    # Muestra mensaje de acción
+                    self.text_info.insert(tk.END, f"⚠️ Pista {id_pista} liberada. Vuelo {vuelo_id} cancelado\n", 'warning')
+                    self.actualizar_status()  # Actualiza barra de estado
+                    actualizar_treeview()  # Actualiza treeview
         
         # Crea botones de acción en el diálogo principal
         ttk.Button(action_frame, text="➕ Agregar Pista", command=agregar_pista, width=20).pack(side=tk.LEFT, padx=5)
@@ -916,7 +875,7 @@ class SistemaVuelosGUI:
                     return
                 
                 # Verifica si el vuelo ya existe
-                if any(v[ID] == id_vuelo for v in self.vuelos):
+                if self.almacen.existe_vuelo(id_vuelo):
                     messagebox.showerror("Error", f"Ya existe un vuelo con ID {id_vuelo}")
                     return
                 
@@ -939,7 +898,9 @@ class SistemaVuelosGUI:
                 
                 # Crea nueva tupla de vuelo
                 nuevo_vuelo = (id_vuelo, tipo, tiempo, prioridad, combustible, "EN_COLA")
-                self.vuelos.append(nuevo_vuelo)  # Agrega a la lista
+                self.motor.dar_de_alta_vuelo(nuevo_vuelo)  # Agrega al almacén y a la cola de despacho
+                self.motor.registrar_evento("ALTA_MANUAL", id_vuelo, tipo=tipo, tiempo=tiempo,
+                                            prioridad=prioridad, combustible=combustible)
                 
                 # Muestra mensaje de éxito
                 self.text_info.insert(tk.END, f"✅ Vuelo {id_vuelo} agregado exitosamente\n", 'success')
@@ -1008,18 +969,13 @@ class SistemaVuelosGUI:
                 messagebox.showerror("Error", "Seleccione un vuelo")
                 return
             
-            # Busca el vuelo por ID
-            for i, vuelo in enumerate(self.vuelos):
-                if vuelo[ID] == id_vuelo:
-                    # Actualiza solo el estado, manteniendo otros datos
-                    self.vuelos[i] = (vuelo[ID], vuelo[TIPO], vuelo[TIEMPO], 
-                                     vuelo[PRIORIDAD], vuelo[COMBUSTIBLE], nuevo_estado)
-                    
-                    # Muestra mensaje de éxito
-                    self.text_info.insert(tk.END, f"✅ Vuelo {id_vuelo} actualizado a: {nuevo_estado}\n", 'success')
-                    self.actualizar_status()  # Actualiza barra de estado
-                    dialog.destroy()  # Cierra diálogo
-                    return
+            # Actualiza solo el estado, manteniendo otros datos
+            if self.motor.cambiar_estado_vuelo(id_vuelo, nuevo_estado):
+                # Muestra mensaje de éxito
+                self.text_info.insert(tk.END, f"✅ Vuelo {id_vuelo} actualizado a: {nuevo_estado}\n", 'success')
+                self.actualizar_status()  # Actualiza barra de estado
+                dialog.destroy()  # Cierra diálogo
+                return
             
             # Si no encuentra el vuelo, muestra error
             messagebox.showerror("Error", f"Vuelo {id_vuelo} no encontrado")
@@ -1081,36 +1037,17 @@ class SistemaVuelosGUI:
             
             # Pide confirmación al usuario
             if messagebox.askyesno("Confirmar", f"¿Está seguro de cancelar el vuelo {id_vuelo}?"):
-                # Busca el vuelo por ID
-                for i, vuelo in enumerate(self.vuelos):
-                    if vuelo[ID] == id_vuelo:
-                        # Actualiza estado a CANCELADO
-                        self.vuelos[i] = (vuelo[ID], vuelo[TIPO], vuelo[TIEMPO], 
-                                         vuelo[PRIORIDAD], vuelo[COMBUSTIBLE], "CANCELADO")
-                        
-                        # Si estaba en pista, libera la pista
-                        for j, pista in enumerate(self.pistas):
-                            if pista[PISTA_VUELO_ACTUAL] == id_vuelo:
-                                self.pistas[j] = (
-                                    pista[PISTA_ID],
-                                    pista[PISTA_CATEGORIA],
-                                    pista[PISTA_TIEMPO_USO],
-                                    pista[PISTA_HABILITADA],
-                                    "LIBRE",
-                                    None,
-                                    None
-                                )
-                                break
-                        
-                        # Elimina del registro de tiempos en pista
-                        if id_vuelo in self.tiempo_en_pista:
-                            del self.tiempo_en_pista[id_vuelo]
-                        
-                        # Muestra mensaje de éxito
-                        self.text_info.insert(tk.END, f"✅ Vuelo {id_vuelo} ha sido cancelado\n", 'success')
-                        self.actualizar_status()  # Actualiza barra de estado
-                        dialog.destroy()  # Cierra diálogo
-                        return
+                try:
+                    # Actualiza estado a CANCELADO y, si estaba en pista, libera la pista
+                    self.motor.cancelar_vuelo(id_vuelo)
+                except ValueError as e:
+                    messagebox.showerror("Error", str(e))
+                    return
+                
+                # Muestra mensaje de éxito
+                self.text_info.insert(tk.END, f"✅ Vuelo {id_vuelo} ha sido cancelado\n", 'success')
+                self.actualizar_status()  # Actualiza barra de estado
+                dialog.destroy()  # Cierra diálogo
         
         # Crea frame para botones
         button_frame = ttk.Frame(dialog)
@@ -1241,7 +1178,7 @@ class SistemaVuelosGUI:
                 self.text_info.insert(tk.END, f"\n⚡ VUELOS EN EMERGENCIA (PRIORIDAD MÁXIMA):\n", 'emergencia')
                 # Muestra solo los primeros 5 para no saturar
                 for vuelo in emergencias[:5]:
-                    estado_emergencia = "EN PISTA" if vuelo[ESTADO] == "EN_PISTA" else "EN COLA"
+                    estado_emergencia = "EN PISTA" if vuelo[ESTADO] == "ASIGNADO" else "EN COLA"
                     self.text_info.insert(tk.END, f"  {vuelo[ID]}: {vuelo[COMBUSTIBLE]} min - {estado_emergencia}\n", 'emergencia')
         
         # Estadísticas de pistas
@@ -1261,55 +1198,55 @@ class SistemaVuelosGUI:
         self.text_info.insert(tk.END, f"  • {len([v for v in self.vuelos if v[ESTADO] == 'EN_COLA'])} vuelos en espera\n")
         self.text_info.insert(tk.END, f"  • {len([v for v in self.vuelos if v[ESTADO] == 'COMPLETADO'])} vuelos completados\n")
         self.text_info.insert(tk.END, f"  • {len([v for v in self.vuelos if v[PRIORIDAD] == 2])} vuelos de emergencia\n")
-        self.text_info.insert(tk.END, f"  • {len([v for v in self.vuelos if v[ESTADO] == 'EN_PISTA'])} vuelos en pista\n")
+        self.text_info.insert(tk.END, f"  • {len([v for v in self.vuelos if v[ESTADO] == 'ASIGNADO'])} vuelos en pista\n")
+    
+    # Método que escribe en disco los cambios pendientes del diario
+    def sincronizar_diario(self):
+        """Escribe los cambios pendientes del diario y vuelve a programarse"""
+        try:
+            self.motor.sincronizar_diario()
+        except OSError as e:
+            self.mostrar_aviso(f"Error al escribir el diario: {e}", "warning")
+        self.root.after(MILISEGUNDOS_SINCRONIZAR_DIARIO, self.sincronizar_diario)
     
     # Método para guardar el estado actual en archivos CSV
     def guardar_estado(self):
         """Guardar el estado actual en archivos CSV"""
         try:
-            # Guarda vuelos en archivo CSV
-            with open("vuelos_actualizado.csv", "w", encoding="utf-8", newline='') as f:
-                writer = csv.writer(f)
-                # Escribe encabezado
-                writer.writerow(['id_vuelo', 'tipo', 'tiempo', 'prioridad', 'combustible', 'estado'])
-                # Escribe cada vuelo
-                for vuelo in self.vuelos:
-                    writer.writerow(vuelo)
-            
-            # Guarda pistas (solo datos básicos, no estado dinámico)
-            with open("pistas_actualizado.csv", "w", encoding="utf-8", newline='') as f:
-                writer = csv.writer(f)
-                writer.writerow(['id_pista', 'categoria', 'tiempo_uso', 'habilitada'])
-                for pista in self.pistas:
-                    writer.writerow([
-                        pista[PISTA_ID],
-                        pista[PISTA_CATEGORIA],
-                        pista[PISTA_TIEMPO_USO],
-                        pista[PISTA_HABILITADA]
-                    ])
+            # Guarda vuelos y pistas con el formato que el motor vuelve a cargar
+            self.motor.guardar_estado()
+            # Y la simulación completa (reloj, pistas ocupadas, colas y métricas)
+            self.motor.guardar_instantanea()
             
             # Muestra mensaje de éxito
             self.text_info.insert(tk.END, f"✅ Estado guardado correctamente\n", 'success')
             self.text_info.insert(tk.END, f"  • vuelos_actualizado.csv\n")
             self.text_info.insert(tk.END, f"  • pistas_actualizado.csv\n")
+            self.text_info.insert(tk.END, f"  • {ARCHIVO_INSTANTANEA}\n")
             
         except Exception as e:
             messagebox.showerror("Error", f"Error al guardar estado: {str(e)}")
     
     # Método para abrir diálogo de carga de archivo
     def cargar_archivo_dialog(self):
-        """Diálogo para cargar archivo CSV"""
+        """Diálogo para cargar archivo CSV o una instantánea de la simulación"""
         # Abre diálogo para seleccionar archivo
         archivo = filedialog.askopenfilename(
-            title="Seleccionar archivo CSV",
-            filetypes=[("CSV files", "*.csv"), ("All files", "*.*")]
+            title="Seleccionar archivo CSV o instantánea",
+            filetypes=[("CSV files", "*.csv"), ("Instantáneas", "*.inst"), ("All files", "*.*")]
         )
         
         # Si se seleccionó un archivo
         if archivo:
             try:
+                # Las instantáneas sustituyen todo el estado de la simulación
+                if archivo.lower().endswith(".inst"):
+                    if self.simulacion_activa:
+                        messagebox.showwarning("Advertencia", "Pause la simulación antes de cargar una instantánea")
+                    elif self.motor.cargar_instantanea(archivo):
+                        self.actualizar_status()
                 # Detecta tipo de archivo por nombre
-                if "vuelo" in archivo.lower():
+                elif "vuelo" in archivo.lower():
                     vuelos_cargados = self.cargar_vuelos_desde_csv(archivo)
                     self.text_info.insert(tk.END, f"✅ Vuelos cargados desde: {archivo}\n", 'success')
                     self.actualizar_status()
@@ -1358,9 +1295,9 @@ class SistemaVuelosGUI:
         self.text_info.insert(tk.END, "• Las pistas registran qué vuelo las usa y hasta qué minuto\n")
         self.text_info.insert(tk.END, "• Las pistas pueden estar LIBRE, OCUPADA o DESHABILITADA\n")
         
-        # Crea y ejecuta hilo para simulación (evita bloquear interfaz)
-        self.hilo_simulacion = threading.Thread(target=self.ejecutar_simulacion, daemon=True)
-        self.hilo_simulacion.start()
+        # Los minutos se ejecutan en el bucle de tkinter (ver ejecutar_simulacion)
+        self.cancelar_minuto_programado()
+        self.minuto_programado = self.root.after(0, self.ejecutar_simulacion)
         
         # Actualiza barra de estado
         self.actualizar_status()
@@ -1375,6 +1312,7 @@ class SistemaVuelosGUI:
         
         # Pausa simulación
         self.simulacion_activa = False
+        self.cancelar_minuto_programado()
         self.text_info.insert(tk.END, "⏸️ SIMULACIÓN PAUSADA\n\n", 'info')
         self.actualizar_status()
     
@@ -1383,196 +1321,76 @@ class SistemaVuelosGUI:
         """Detener completamente la simulación"""
         # Detiene simulación
         self.simulacion_activa = False
-        self.reloj_simulado = 0  # Reinicia reloj
-        
-        # Reinicia estados de todas las pistas
-        for i in range(len(self.pistas)):
-            self.pistas[i] = (
-                self.pistas[i][PISTA_ID],
-                self.pistas[i][PISTA_CATEGORIA],
-                self.pistas[i][PISTA_TIEMPO_USO],
-                self.pistas[i][PISTA_HABILITADA],
-                "LIBRE",
-                None,
-                None
-            )
-        
-        # Limpia diccionario de tiempos en pista
-        self.tiempo_en_pista.clear()
+        self.cancelar_minuto_programado()
+        # Reinicia reloj y estados de todas las pistas
+        self.motor.detener()
         
         # Muestra mensaje
         self.text_info.delete(1.0, tk.END)
         self.text_info.insert(tk.END, "⏹️ SIMULACIÓN DETENIDA - Estados reiniciados\n\n", 'info')
         self.actualizar_status()
     
-    # Método que ejecuta la simulación en un hilo separado
+    # Método que ejecuta un minuto de la simulación y programa el siguiente
     def ejecutar_simulacion(self):
-        """Ejecutar la simulación dinámica en un hilo separado"""
-        # Bucle principal de simulación
-        while self.simulacion_activa:
-            try:
-                # Obtiene velocidad configurada (segundos por minuto simulado)
-                velocidad = float(self.velocidad_var.get())
-                
-                # Ejecuta un minuto de simulación
-                self.avanzar_minuto_simulacion()
-                
-                # Actualiza la interfaz en el hilo principal (tkinter no es thread-safe)
-                self.root.after(0, self.mostrar_vuelos)
-                
-                # Espera según la velocidad configurada
-                time.sleep(velocidad)
-                
-            except Exception as e:
-                print(f"Error en simulación: {e}")
-                break
+        """Ejecutar un minuto de la simulación dinámica y programar el siguiente
+
+        Se ejecuta en el bucle de tkinter, igual que los diálogos: tkinter
+        no es thread-safe y los diálogos cambian el mismo motor, así que
+        ningún minuto puede ir a la vez que ellos.
+        """
+        self.minuto_programado = None
+        if not self.simulacion_activa:
+            return
+        try:
+            # Obtiene velocidad configurada (segundos por minuto simulado)
+            velocidad = float(self.velocidad_var.get())
+            
+            # Ejecuta un minuto de simulación
+            self.avanzar_minuto_simulacion()
+            self.mostrar_vuelos()
+            
+        except Exception as e:
+            print(f"Error en simulación: {e}")
+            return
+        
+        # Programa el siguiente minuto según la velocidad configurada
+        self.minuto_programado = self.root.after(int(velocidad * 1000), self.ejecutar_simulacion)
+    
+    # Método que anula el minuto que estaba programado
+    def cancelar_minuto_programado(self):
+        """Cancela el siguiente minuto programado, si lo hay"""
+        if self.minuto_programado is not None:
+            self.root.after_cancel(self.minuto_programado)
+            self.minuto_programado = None
+    
+    # Método para cambiar la política de despacho desde el combobox
+    def cambiar_politica(self, event=None):
+        """Aplica la política de despacho seleccionada"""
+        self.motor.cambiar_politica_despacho(self.politica_var.get())
+        self.text_info.insert(tk.END, f"🔀 Política de despacho: {self.politica_var.get()}\n", 'info')
     
     # Método que avanza un minuto en la simulación
     def avanzar_minuto_simulacion(self):
         """Avanzar un minuto en la simulación dinámica"""
-        # Incrementa reloj simulado
-        self.reloj_simulado += 1
-        
-        # 1. Consumir combustible de vuelos en espera de aterrizaje
-        for i, vuelo in enumerate(self.vuelos):
-            if vuelo[TIPO] == "ATERRIZAJE" and vuelo[ESTADO] in ["EN_COLA", "ASIGNANDO"]:
-                # Reduce combustible en 1 minuto (no menor a 0)
-                nuevo_combustible = max(0, vuelo[COMBUSTIBLE] - 1)
-                # Determina nueva prioridad según combustible
-                nueva_prioridad = vuelo[PRIORIDAD]
-                if nuevo_combustible <= 5:
-                    nueva_prioridad = 2  # EMERGENCIA - Prioridad máxima
-                elif nuevo_combustible <= 15 and nueva_prioridad < 1:
-                    nueva_prioridad = 1  # Alta prioridad
-                
-                # Actualiza vuelo con nuevo combustible y prioridad
-                self.vuelos[i] = (vuelo[ID], vuelo[TIPO], vuelo[TIEMPO], 
-                                 nueva_prioridad, nuevo_combustible, vuelo[ESTADO])
-        
-        # 2. Liberar pistas cuyo tiempo ha expirado
-        for i, pista in enumerate(self.pistas):
-            if pista[PISTA_ESTADO] == "OCUPADA" and pista[PISTA_TIEMPO_FIN] is not None:
-                if self.reloj_simulado >= pista[PISTA_TIEMPO_FIN]:
-                    # Vuelo que está usando la pista
-                    vuelo_id = pista[PISTA_VUELO_ACTUAL]
-                    
-                    # Marca vuelo como completado
-                    for j, vuelo in enumerate(self.vuelos):
-                        if vuelo[ID] == vuelo_id:
-                            self.vuelos[j] = (vuelo[ID], vuelo[TIPO], vuelo[TIEMPO], 
-                                             vuelo[PRIORIDAD], vuelo[COMBUSTIBLE], "COMPLETADO")
-                            break
-                    
-                    # Libera pista (estado LIBRE, sin vuelo)
-                    self.pistas[i] = (
-                        pista[PISTA_ID],
-                        pista[PISTA_CATEGORIA],
-                        pista[PISTA_TIEMPO_USO],
-                        pista[PISTA_HABILITADA],
-                        "LIBRE",
-                        None,
-                        None
-                    )
-                    
-                    # Elimina del registro de tiempos
-                    if vuelo_id in self.tiempo_en_pista:
-                        del self.tiempo_en_pista[vuelo_id]
-                    
-                    # Muestra mensaje en interfaz
-                    self.root.after(0, lambda vid=vuelo_id: 
-                                   self.text_info.insert(tk.END, 
-                                   f"✅ Vuelo {vid} completó operación en pista\n", 'success'))
-        
-        # 3. Asignar vuelos a pistas libres (PRIORIDAD: EMERGENCIA primero)
-        pistas_libres = [p for p in self.pistas if p[PISTA_ESTADO] == "LIBRE" and p[PISTA_HABILITADA] == 1]
-        
-        for pista in pistas_libres:
-            # Busca vuelos en cola
-            vuelos_en_cola = [v for v in self.vuelos if v[ESTADO] == "EN_COLA"]
-            if not vuelos_en_cola:
-                break
-            
-            # PRIORIDAD 1: Vuelos con combustible ≤5 minutos (EMERGENCIA)
-            emergencias = [v for v in vuelos_en_cola if v[COMBUSTIBLE] <= 5]
-            
-            if emergencias:
-                # Ordena emergencias por combustible (menos combustible primero)
-                emergencias.sort(key=lambda x: (x[COMBUSTIBLE], x[TIEMPO]))
-                vuelo_a_asignar = emergencias[0]
-            else:
-                # PRIORIDAD 2: Otros vuelos por prioridad normal
-                vuelos_en_cola.sort(key=lambda x: (-x[PRIORIDAD], 
-                                                  x[COMBUSTIBLE] if x[TIPO] == "ATERRIZAJE" else 999,
-                                                  x[TIEMPO]))
-                vuelo_a_asignar = vuelos_en_cola[0]
-            
-            # Verifica compatibilidad de pista con vuelo
-            if self.pista_es_compatible(pista, vuelo_a_asignar):
-                # Cambia estado del vuelo a ASIGNANDO (intermedio)
-                for i, v in enumerate(self.vuelos):
-                    if v[ID] == vuelo_a_asignar[ID]:
-                        self.vuelos[i] = (v[ID], v[TIPO], v[TIEMPO], 
-                                         v[PRIORIDAD], v[COMBUSTIBLE], "ASIGNANDO")
-                        break
-                
-                # Calcula minuto en que terminará el uso de la pista
-                tiempo_fin = self.reloj_simulado + pista[PISTA_TIEMPO_USO]
-                
-                # Ocupa la pista
-                pista_index = self.pistas.index(pista)
-                self.pistas[pista_index] = (
-                    pista[PISTA_ID],
-                    pista[PISTA_CATEGORIA],
-                    pista[PISTA_TIEMPO_USO],
-                    pista[PISTA_HABILITADA],
-                    "OCUPADA",
-                    vuelo_a_asignar[ID],
-                    tiempo_fin
-                )
-                
-                # Registra tiempo en pista
-                self.tiempo_en_pista[vuelo_a_asignar[ID]] = pista[PISTA_TIEMPO_USO]
-                
-                # Programa cambio a EN_PISTA después de 1 segundo (simula 1 minuto de asignación)
-                self.root.after(1000, lambda vid=vuelo_a_asignar[ID]: 
-                               self.cambiar_a_en_pista(vid))
-                
-                # Muestra mensaje de asignación
-                self.root.after(0, lambda vid=vuelo_a_asignar[ID], pid=pista[PISTA_ID]: 
-                               self.text_info.insert(tk.END, 
-                               f"🛬 Vuelo {vid} asignado a pista {pid} hasta minuto {tiempo_fin}\n", 'info'))
-    
-    # Método para cambiar estado de vuelo de ASIGNANDO a EN_PISTA
-    def cambiar_a_en_pista(self, vuelo_id):
-        """Cambia el estado de un vuelo de ASIGNANDO a EN_PISTA"""
-        # Busca el vuelo y cambia su estado
-        for i, vuelo in enumerate(self.vuelos):
-            if vuelo[ID] == vuelo_id and vuelo[ESTADO] == "ASIGNANDO":
-                self.vuelos[i] = (vuelo[ID], vuelo[TIPO], vuelo[TIEMPO], 
-                                 vuelo[PRIORIDAD], vuelo[COMBUSTIBLE], "EN_PISTA")
-                break
+        # El motor consume combustible, libera pistas y asigna vuelos
+        # (las mismas reglas y el mismo orden de despacho que la consola)
+        completados, asignaciones = self.motor.avanzar_minuto()
+        
+        # Muestra en la interfaz los vuelos que terminaron su operación
+        for vuelo_id, _ in completados:
+            self.text_info.insert(tk.END, f"✅ Vuelo {vuelo_id} completó operación en pista\n", 'success')
+        
+        # Muestra los vuelos asignados y hasta qué minuto ocupan la pista
+        for vuelo, id_pista in asignaciones:
+            tiempo_fin = self.almacen.obtener_pista(id_pista)[PISTA_TIEMPO_FIN]
+            self.text_info.insert(tk.END, 
+                                  f"🛬 Vuelo {vuelo[ID]} asignado a pista {id_pista} hasta minuto {tiempo_fin}\n", 'info')
     
     # Método para verificar compatibilidad entre pista y vuelo
     def pista_es_compatible(self, pista, vuelo):
         """Verifica si una pista es compatible con un tipo de vuelo"""
-        # Pista deshabilitada no es compatible con ningún vuelo
-        if pista[PISTA_HABILITADA] == 0:
-            return False
-            
-        categoria = pista[PISTA_CATEGORIA]
-        
-        # Reglas de compatibilidad según tipo de vuelo
-        if vuelo[TIPO] == "DESPEGUE":
-            # Despegues requieren pistas estándar o largas
-            return categoria in ["estandar", "larga"]
-        elif vuelo[TIPO] == "ATERRIZAJE":
-            if vuelo[PRIORIDAD] == 2:  # Emergencia
-                # Emergencias requieren pistas largas o estándar
-                return categoria in ["larga", "estandar"]
-            else:
-                # Aterrizajes normales pueden usar cualquier pista
-                return True
-        return False
+        # Mismas reglas que la consola (tabla de categorías por clase de vuelo)
+        return pista_es_compatible(pista, vuelo)
     
     # Método para limpiar todos los datos
     def limpiar_datos(self):
@@ -1581,12 +1399,10 @@ class SistemaVuelosGUI:
         if messagebox.askyesno("Confirmar", "¿Está seguro de limpiar todos los datos? Esta acción no se puede deshacer."):
             # Detiene simulación si está activa
             self.simulacion_activa = False
-            self.reloj_simulado = 0
+            self.cancelar_minuto_programado()
             
-            # Limpia todas las listas y diccionarios
-            self.vuelos = []
-            self.pistas = []
-            self.tiempo_en_pista.clear()
+            # Limpia vuelos, pistas, reloj y cola de despacho del motor
+            self.motor.limpiar()
             self.text_info.delete(1.0, tk.END)
             self.text_info.insert(tk.END, "🗑️ Todos los datos han sido eliminados\n", 'info')
             self.actualizar_status()
@@ -1637,6 +1453,11 @@ class SistemaVuelosGUI:
    • Habilitar/deshabilitar pistas existentes
    • Liberar pistas ocupadas (emergencia)
 
+🕘 HISTORIAL:
+   • La barra de historial recorre los minutos ya simulados
+   • Al moverla se muestran las pistas y los vuelos de ese minuto
+   • "Continuar desde aquí" vuelve a ese minuto y sigue simulando
+
 🎯 OBJETIVO DEL SISTEMA:
    • Gestionar eficientemente 2 pistas (R1 y R2)
    • Priorizar vuelos de emergencia
@@ -1654,14 +1475,13 @@ class SistemaVuelosGUI:
         if messagebox.askyesno("Salir", "¿Desea salir del sistema?"):
             # Detiene simulación si está activa
             self.simulacion_activa = False
+            self.cancelar_minuto_programado()
             
-            # Espera a que el hilo termine (timeout de 1 segundo)
-            if self.hilo_simulacion and self.hilo_simulacion.is_alive():
-                self.hilo_simulacion.join(timeout=1)
-            
-            # Intenta guardar estado automáticamente
+            # El estado ya está en el diario: solo falta escribir los últimos cambios
+            # (guardar los CSV completos es el botón Guardar Estado)
             try:
-                self.guardar_estado()
+                self.motor.cerrar_diario()
+                self.motor.cerrar_log()
             except:
                 pass  # Si falla, no impide la salida
             
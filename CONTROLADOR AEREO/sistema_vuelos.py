@@ -1,6 +1,15 @@
 import os
+import sys
 import time
-import random
+import argparse
+
+from motor_simulacion import (MotorSimulacion, ASIGNACION_VORAZ, MODOS_ASIGNACION,
+                              ARCHIVO_INSTANTANEA, ARCHIVO_DIARIO,
+                              LOG_TEXTO, DESTINOS_LOG, ARCHIVO_LOG_JSON)
+from planificador_horizonte import HORIZONTE_POR_DEFECTO
+from politicas_despacho import POLITICAS, POLITICA_PRIORIDAD
+from generador_vuelos import GeneradorVuelos
+from asignador_ids import AsignadorIds
 
 # Constantes para índices
 ID = 0
@@ -19,144 +28,26 @@ PISTA_ESTADO = 4
 PISTA_VUELO_ACTUAL = 5
 PISTA_TIEMPO_LIBERACION = 6
 
-ESTADOS = ["EN_COLA", "ASIGNADO", "COMPLETADO", "CANCELADO"]
-CATEGORIAS_PISTAS = ["corta", "estandar", "larga"]
-AEROLINEAS = ["IB", "UX", "VY", "AF", "BA", "LH", "AA", "DL", "TK", "EK"]
-
-# Variables globales
-reloj_simulado = 0
-vuelos = []
-pistas = []
-flujo_aterrizaje = []
-flujo_despegue = []
-
-# ========== FUNCIONES BASE (Carga y Simulación) ==========
+# Vuelos generados que se listan uno a uno al generar en lote
+MAXIMO_MOSTRADOS = 20
 
-def registrar_log(mensaje, archivo="eventos.log"):
-    """Registra un evento en el archivo de log"""
-    try:
-        with open(archivo, "a", encoding="utf-8") as f:
-            f.write(f"[t={reloj_simulado}] {mensaje}\n")
-    except Exception as e:
-        print(f"Error al escribir en log: {e}")
+# Motor de la simulación (estado, carga y minuto a minuto, ver motor_simulacion.py)
+motor = MotorSimulacion()
 
-def cargar_vuelos_desde_csv(archivo="vuelos.csv"):
-    """Carga los vuelos desde un archivo CSV - CORREGIDO para tu formato"""
-    global vuelos
-    vuelos_cargados = []
-    try:
-        with open(archivo, "r", encoding="utf-8") as f:
-            lineas = f.readlines()
-            
-        for numero_linea, linea in enumerate(lineas[1:], start=2):
-            try:
-                datos = linea.strip().split(",")
-                if len(datos) < 7:  # Ahora son 7 columnas
-                    continue
-                
-                id_vuelo = datos[0].strip()
-                tipo = datos[1].strip().upper()
-                
-                # Manejar eta/etd - CORREGIDO
-                if tipo == "ATERRIZAJE":
-                    tiempo_str = datos[2].strip()  # eta
-                    etd_str = datos[3].strip()     # etd (vacío para aterrizajes)
-                else:  # DESPEGUE
-                    tiempo_str = datos[3].strip()  # etd  
-                    eta_str = datos[2].strip()     # eta (vacío para despegues)
-                
-                # Convertir a int, manejar campos vacíos
-                tiempo = int(tiempo_str) if tiempo_str else 0
-                prioridad = int(datos[4].strip()) if datos[4].strip() else 0
-                
-                # Combustible - solo para aterrizajes
-                combustible_str = datos[5].strip()
-                combustible = int(combustible_str) if combustible_str and tipo == "ATERRIZAJE" else 0
-                
-                estado = datos[6].strip().upper() if len(datos) > 6 else "EN_COLA"
-                
-                if tipo not in ["ATERRIZAJE", "DESPEGUE"]:
-                    continue
-                if estado not in ESTADOS:
-                    estado = "EN_COLA"
-                if prioridad not in [0, 1, 2]:
-                    prioridad = 0
-                
-                vuelo = (id_vuelo, tipo, tiempo, prioridad, combustible, estado)
-                vuelos_cargados.append(vuelo)
-                registrar_log(f"EN_COLA id_vuelo={id_vuelo} tipo={tipo}")
-                
-            except (ValueError, IndexError) as e:
-                print(f"Error en línea {numero_linea}: {e} - Datos: {datos}")
-                
-        print(f"Cargados {len(vuelos_cargados)} vuelos desde {archivo}")
-        registrar_log(f"CARGA_INICIAL vuelos={len(vuelos_cargados)} pistas={len(pistas)}")
-        
-    except FileNotFoundError:
-        print(f"Archivo {archivo} no encontrado.")
-        # Crear algunos vuelos de ejemplo si no existe el archivo
-        vuelos_cargados = [
-            ("IB101", "ATERRIZAJE", 5, 0, 20, "EN_COLA"),
-            ("IB202", "ATERRIZAJE", 1, 0, 18, "EN_COLA"),
-            ("UX303", "DESPEGUE", 1, 0, 0, "EN_COLA"),
-            ("VY404", "DESPEGUE", 5, 0, 0, "EN_COLA"),
-            ("AF505", "ATERRIZAJE", 8, 0, 5, "EN_COLA")
-        ]
-        for vuelo in vuelos_cargados:
-            registrar_log(f"EN_COLA id_vuelo={vuelo[ID]} tipo={vuelo[TIPO]}")
-    
-    vuelos = vuelos_cargados
-    return vuelos_cargados
+# Accesos directos al estado del motor (vistas que se actualizan solas)
+almacen = motor.almacen
+vuelos = motor.vuelos
+pistas = motor.pistas
+flujo_aterrizaje = motor.flujo_aterrizaje
+flujo_despegue = motor.flujo_despegue
+metricas = motor.metricas
 
-def cargar_pistas_desde_csv(archivo="pistas.csv"):
-    """Carga información de pistas desde archivo CSV"""
-    global pistas
-    pistas_cargadas = []
-    try:
-        with open(archivo, "r", encoding="utf-8") as f:
-            lineas = f.readlines()
-            
-        for numero_linea, linea in enumerate(lineas[1:], start=2):
-            try:
-                datos = linea.strip().split(",")
-                if len(datos) >= 4:
-                    id_pista = datos[0].strip()
-                    categoria = datos[1].strip().lower()
-                    tiempo_uso = int(datos[2].strip())
-                    habilitada = int(datos[3].strip())
-                    
-                    pista = (
-                        id_pista,
-                        categoria,
-                        tiempo_uso,
-                        habilitada,
-                        "LIBRE",
-                        None,
-                        0
-                    )
-                    pistas_cargadas.append(pista)
-                    
-            except (ValueError, IndexError) as e:
-                print(f"Error en pista línea {numero_linea}: {e}")
-                
-        print(f"Cargadas {len(pistas_cargadas)} pistas desde {archivo}")
-        
-    except FileNotFoundError:
-        print(f"Archivo {archivo} no encontrado.")
-        # Pistas por defecto
-        pistas_cargadas = [
-            ("R1", "larga", 3, 1, "LIBRE", None, 0),
-            ("R2", "estandar", 3, 1, "LIBRE", None, 0)
-        ]
-    
-    pistas = pistas_cargadas
-    return pistas_cargadas
+# IDs de vuelo sin repetir y generador de vuelos aleatorios
+# (main_sin_menu los vuelve a crear con --semilla)
+asignador_ids = AsignadorIds(existe=almacen.existe_vuelo)
+generador = GeneradorVuelos(asignar_ids=asignador_ids.asignar)
 
-def inicializar_flujos():
-    """Inicializa los flujos de aterrizaje y despegue"""
-    global flujo_aterrizaje, flujo_despegue
-    flujo_aterrizaje = [v for v in vuelos if v[TIPO] == "ATERRIZAJE" and v[ESTADO] == "EN_COLA"]
-    flujo_despegue = [v for v in vuelos if v[TIPO] == "DESPEGUE" and v[ESTADO] == "EN_COLA"]
+# ========== FUNCIONES DE CONSULTA ==========
 
 def mostrar_vuelos():
     """Muestra todos los vuelos"""
@@ -193,188 +84,23 @@ def mostrar_pistas():
 
 # ========== FUNCIONES DE SIMULACIÓN ==========
 
-def obtener_siguiente_vuelo():
-    """Selecciona el próximo vuelo según política de prioridades"""
-    candidatos = []
-    
-    # Añadir aterrizajes
-    for vuelo in flujo_aterrizaje:
-        if vuelo[ESTADO] == "EN_COLA":
-            atraso = max(0, reloj_simulado - vuelo[TIEMPO])
-            # Prioridad, combustible (menos es más urgente), atraso, id
-            candidatos.append((vuelo, -vuelo[PRIORIDAD], vuelo[COMBUSTIBLE], atraso, vuelo[ID]))
-    
-    # Añadir despegues
-    for vuelo in flujo_despegue:
-        if vuelo[ESTADO] == "EN_COLA":
-            atraso = max(0, reloj_simulado - vuelo[TIEMPO])
-            # Prioridad, combustible fijo (999 para que vayan después), atraso, id
-            candidatos.append((vuelo, -vuelo[PRIORIDAD], 999, atraso, vuelo[ID]))
-    
-    if not candidatos:
-        return None
-    
-    # Ordenar por: prioridad (desc), combustible (asc), atraso (desc), id (asc)
-    candidatos.sort(key=lambda x: (x[1], x[2], -x[3], x[4]))
-    
-    return candidatos[0][0]
-
-def pista_es_compatible(pista, vuelo):
-    """Verifica si una pista es compatible con un tipo de vuelo"""
-    if pista[PISTA_HABILITADA] == 0:
-        return False
-        
-    if vuelo[TIPO] == "DESPEGUE":
-        return pista[PISTA_CATEGORIA] in ["estandar", "larga"]
-    elif vuelo[TIPO] == "ATERRIZAJE":
-        if vuelo[PRIORIDAD] == 2:  # Emergencia
-            return pista[PISTA_CATEGORIA] in ["larga", "estandar"]
-        else:
-            return True
-    return False
-
-def asignar_pista_a_vuelo(vuelo):
-    """Asigna una pista disponible a un vuelo"""
-    pistas_disponibles = []
-    for pista in pistas:
-        if (pista[PISTA_ESTADO] == "LIBRE" and 
-            pista[PISTA_HABILITADA] == 1 and
-            pista_es_compatible(pista, vuelo)):
-            pistas_disponibles.append(pista)
-    
-    if not pistas_disponibles:
-        return None
-    
-    return pistas_disponibles[0][PISTA_ID]
-
-def ocupar_pista(id_pista, vuelo):
-    """Marca una pista como ocupada por un vuelo"""
-    global reloj_simulado
-    
-    for i, pista in enumerate(pistas):
-        if pista[PISTA_ID] == id_pista:
-            tiempo_liberacion = reloj_simulado + pista[PISTA_TIEMPO_USO]
-            pista_actualizada = (
-                pista[PISTA_ID],
-                pista[PISTA_CATEGORIA],
-                pista[PISTA_TIEMPO_USO],
-                pista[PISTA_HABILITADA],
-                "OCUPADA",
-                vuelo[ID],
-                tiempo_liberacion
-            )
-            pistas[i] = pista_actualizada
-            
-            # Actualizar estado del vuelo en los flujos
-            actualizar_estado_vuelo(vuelo[ID], "ASIGNADO")
-            
-            registrar_log(f"ASIGNACION id_vuelo={vuelo[ID]} pista={id_pista} tipo={vuelo[TIPO]}")
-            return True
-    
-    return False
-
-def actualizar_estado_vuelo(id_vuelo, nuevo_estado):
-    """Actualiza el estado de un vuelo"""
-    global vuelos, flujo_aterrizaje, flujo_despegue
-    
-    # Actualizar en lista principal de vuelos
-    for i, vuelo in enumerate(vuelos):
-        if vuelo[ID] == id_vuelo:
-            vuelos[i] = (vuelo[ID], vuelo[TIPO], vuelo[TIEMPO], 
-                         vuelo[PRIORIDAD], vuelo[COMBUSTIBLE], nuevo_estado)
-            break
-    
-    # Actualizar en flujos
-    for i, vuelo in enumerate(flujo_aterrizaje):
-        if vuelo[ID] == id_vuelo:
-            flujo_aterrizaje[i] = (vuelo[ID], vuelo[TIPO], vuelo[TIEMPO], 
-                                  vuelo[PRIORIDAD], vuelo[COMBUSTIBLE], nuevo_estado)
-            break
-    
-    for i, vuelo in enumerate(flujo_despegue):
-        if vuelo[ID] == id_vuelo:
-            flujo_despegue[i] = (vuelo[ID], vuelo[TIPO], vuelo[TIEMPO], 
-                                vuelo[PRIORIDAD], vuelo[COMBUSTIBLE], nuevo_estado)
-            break
-
-def consumir_combustible():
-    """Reduce el combustible de los vuelos en espera de aterrizaje"""
-    for i, vuelo in enumerate(flujo_aterrizaje):
-        if vuelo[ESTADO] == "EN_COLA":
-            nuevo_combustible = max(0, vuelo[COMBUSTIBLE] - 1)
-            flujo_aterrizaje[i] = (vuelo[ID], vuelo[TIPO], vuelo[TIEMPO], 
-                                  vuelo[PRIORIDAD], nuevo_combustible, vuelo[ESTADO])
-
-def actualizar_prioridades_combustible():
-    """Actualiza prioridades por combustible crítico"""
-    for i, vuelo in enumerate(flujo_aterrizaje):
-        if vuelo[COMBUSTIBLE] <= 5 and vuelo[PRIORIDAD] < 2:
-            # Actualizar en flujo
-            flujo_aterrizaje[i] = (vuelo[ID], vuelo[TIPO], vuelo[TIEMPO], 
-                                  2, vuelo[COMBUSTIBLE], vuelo[ESTADO])
-            # Actualizar en lista principal
-            actualizar_estado_vuelo(vuelo[ID], vuelo[ESTADO])
-            registrar_log(f"EMERGENCIA id_vuelo={vuelo[ID]} prioridad=2 motivo=combustible<=5")
-
-def liberar_pistas_completadas():
-    """Libera pistas cuyo tiempo de ocupación ha expirado"""
-    liberadas = 0
-    for i, pista in enumerate(pistas):
-        if (pista[PISTA_ESTADO] == "OCUPADA" and 
-            pista[PISTA_TIEMPO_LIBERACION] <= reloj_simulado):
-            
-            # Marcar vuelo como COMPLETADO
-            actualizar_estado_vuelo(pista[PISTA_VUELO_ACTUAL], "COMPLETADO")
-            
-            # Liberar pista
-            pistas[i] = (
-                pista[PISTA_ID],
-                pista[PISTA_CATEGORIA],
-                pista[PISTA_TIEMPO_USO],
-                pista[PISTA_HABILITADA],
-                "LIBRE",
-                None,
-                0
-            )
-            liberadas += 1
-            registrar_log(f"COMPLETADO id_vuelo={pista[PISTA_VUELO_ACTUAL]} pista={pista[PISTA_ID]}")
-    
-    return liberadas
-
-def avanzar_minuto():
-    """Avanza un minuto en la simulación"""
-    global reloj_simulado
-    
-    reloj_simulado += 1
-    print(f"\n--- Minuto {reloj_simulado} ---")
-    
-    # 1. Consumir combustible
-    consumir_combustible()
-    
-    # 2. Actualizar prioridades por combustible crítico
-    actualizar_prioridades_combustible()
-    
-    # 3. Liberar pistas completadas
-    liberadas = liberar_pistas_completadas()
-    if liberadas > 0:
-        print(f" {liberadas} pista(s) liberada(s)")
-    
-    # 4. Asignar nuevos vuelos a pistas libres
-    pistas_libres = [p for p in pistas if p[PISTA_ESTADO] == "LIBRE" and p[PISTA_HABILITADA] == 1]
+def avanzar_minuto(mostrar=True):
+    """Avanza un minuto en la simulación (ver MotorSimulacion.avanzar_minuto)"""
+    completados, asignaciones = motor.avanzar_minuto()
+    if not mostrar:
+        return
     
-    for pista in pistas_libres:
-        siguiente_vuelo = obtener_siguiente_vuelo()
-        if siguiente_vuelo:
-            pista_asignada = asignar_pista_a_vuelo(siguiente_vuelo)
-            if pista_asignada:
-                ocupar_pista(pista_asignada, siguiente_vuelo)
-                print(f" Vuelo {siguiente_vuelo[ID]} asignado a pista {pista_asignada}")
+    print(f"\n--- Minuto {motor.reloj_simulado} ---")
+    if completados:
+        print(f" {len(completados)} pista(s) liberada(s)")
+    for vuelo, pista_asignada in asignaciones:
+        print(f" Vuelo {vuelo[ID]} asignado a pista {pista_asignada}")
     
     mostrar_estado_actual()
 
 def mostrar_estado_actual():
     """Muestra el estado actual de la simulación"""
-    print(f"\nEstado actual (Minuto {reloj_simulado}):")
+    print(f"\nEstado actual (Minuto {motor.reloj_simulado}):")
     
     # Pistas
     print("Pistas:")
@@ -400,15 +126,11 @@ def mostrar_estado_actual():
 # ========== FUNCIONES DE GESTIÓN EXPANDIDAS ==========
 
 def generar_id_vuelo():
-    """Genera un ID de vuelo aleatorio"""
-    aerolinea = random.choice(AEROLINEAS)
-    numero = random.randint(100, 999)
-    return f"{aerolinea}{numero}"
+    """Genera un ID de vuelo que no está en uso"""
+    return asignador_ids.siguiente()
 
 def agregar_vuelo_manual():
     """Permite agregar un vuelo manualmente"""
-    global vuelos
-    
     print("\n--- AGREGAR VUELO MANUAL ---")
     
     try:
@@ -418,7 +140,7 @@ def agregar_vuelo_manual():
             print(f"ID generado: {id_vuelo}")
         
         # Verificar si el ID ya existe
-        if any(v[ID] == id_vuelo for v in vuelos):
+        if almacen.existe_vuelo(id_vuelo):
             print("Error: Ya existe un vuelo con ese ID")
             return
         
@@ -455,57 +177,56 @@ def agregar_vuelo_manual():
         estado = "EN_COLA"
         
         nuevo_vuelo = (id_vuelo, tipo, tiempo, prioridad, combustible, estado)
-        vuelos.append(nuevo_vuelo)
-        inicializar_flujos()
+        motor.dar_de_alta_vuelo(nuevo_vuelo)
         
         mensaje = f"Vuelo {id_vuelo} agregado manualmente - {tipo}"
         print(f"\n✓ {mensaje}")
-        registrar_log(f"ALTA_MANUAL id_vuelo={id_vuelo} tipo={tipo}")
+        motor.registrar_evento("ALTA_MANUAL", id_vuelo, tipo=tipo, tiempo=tiempo,
+                               prioridad=prioridad, combustible=combustible)
         
     except ValueError:
         print("Error: Los campos numéricos deben ser números enteros válidos")
     except Exception as e:
         print(f"Error al agregar vuelo: {e}")
 
-def generar_vuelos_automaticos(cantidad=5):
-    """Genera vuelos automáticamente"""
-    global vuelos
-    
-    print(f"\n--- GENERANDO {cantidad} VUELOS ALEATORIOS ---")
-    
-    for i in range(cantidad):
-        id_vuelo = generar_id_vuelo()
-        tipo = random.choice(["ATERRIZAJE", "DESPEGUE"])
-        tiempo = random.randint(reloj_simulado, reloj_simulado + 10)
-        prioridad = random.choices([0, 1, 2], weights=[80, 15, 5])[0]
-        
-        if tipo == "ATERRIZAJE":
-            combustible = random.randint(5, 45)
-        else:
-            combustible = 0
-            
-        estado = "EN_COLA"
-        
-        nuevo_vuelo = (id_vuelo, tipo, tiempo, prioridad, combustible, estado)
-        vuelos.append(nuevo_vuelo)
-        
-        print(f"✓ {id_vuelo}: {tipo} en minuto {tiempo}, prioridad {prioridad}")
-        registrar_log(f"ALTA_AUTOMATICA id_vuelo={id_vuelo} tipo={tipo}")
-    
-    inicializar_flujos()
-    print(f"\n✓ Se generaron {cantidad} vuelos automáticamente")
+def generar_vuelos_automaticos(cantidad=5, mostrar=True):
+    """Genera vuelos automáticamente
+
+    Los vuelos salen en lotes del generador (ver generador_vuelos.py) y se
+    registra una sola línea de log con el resumen del alta.
+    """
+    if mostrar:
+        print(f"\n--- GENERANDO {cantidad} VUELOS ALEATORIOS ---")
+    
+    generados = 0
+    aterrizajes = 0
+    for lote in generador.generar(cantidad, motor.reloj_simulado):
+        for vuelo in lote:
+            motor.dar_de_alta_vuelo(vuelo)
+            if vuelo[TIPO] == "ATERRIZAJE":
+                aterrizajes += 1
+            if mostrar and generados < MAXIMO_MOSTRADOS:
+                print(f"✓ {vuelo[ID]}: {vuelo[TIPO]} en minuto {vuelo[TIEMPO]}, prioridad {vuelo[PRIORIDAD]}")
+            generados += 1
+    
+    if generados > 0:
+        motor.registrar_evento("ALTA_AUTOMATICA", cantidad=generados, aterrizajes=aterrizajes,
+                               despegues=generados - aterrizajes)
+    
+    if mostrar:
+        if generados > MAXIMO_MOSTRADOS:
+            print(f"  ... y {generados - MAXIMO_MOSTRADOS} más")
+        print(f"\n✓ Se generaron {generados} vuelos automáticamente")
 
 def agregar_pista_manual():
     """Permite agregar una pista manualmente"""
-    global pistas
-    
     print("\n--- AGREGAR PISTA MANUAL ---")
     
     try:
         id_pista = input("ID de la pista (ej: R3): ").strip().upper()
         
         # Verificar si la pista ya existe
-        if any(p[PISTA_ID] == id_pista for p in pistas):
+        if almacen.existe_pista(id_pista):
             print("Error: Ya existe una pista con ese ID")
             return
         
@@ -533,11 +254,10 @@ def agregar_pista_manual():
             None,
             0
         )
-        pistas.append(nueva_pista)
+        motor.agregar_pista(nueva_pista)
         
         mensaje = f"Pista {id_pista} agregada - Categoría: {categoria}"
         print(f"\n✓ {mensaje}")
-        registrar_log(f"PISTA_AGREGADA id={id_pista} categoria={categoria}")
         
     except ValueError:
         print("Error: El tiempo de uso debe ser un número entero")
@@ -546,8 +266,6 @@ def agregar_pista_manual():
 
 def gestionar_estado_pistas():
     """Permite habilitar/deshabilitar pistas"""
-    global pistas
-    
     print("\n--- GESTIONAR ESTADO DE PISTAS ---")
     
     if not pistas:
@@ -560,18 +278,11 @@ def gestionar_estado_pistas():
         id_pista = input("\nID de la pista a modificar: ").strip().upper()
         
         # Buscar la pista
-        pista_index = -1
-        for i, pista in enumerate(pistas):
-            if pista[PISTA_ID] == id_pista:
-                pista_index = i
-                break
-        
-        if pista_index == -1:
+        pista_actual = almacen.obtener_pista(id_pista)
+        if pista_actual is None:
             print("Error: No se encontró la pista")
             return
         
-        pista_actual = pistas[pista_index]
-        
         print(f"\nPista {id_pista} actualmente: {'HABILITADA' if pista_actual[PISTA_HABILITADA] == 1 else 'DESHABILITADA'}")
         print("\n1. Habilitar pista")
         print("2. Deshabilitar pista")
@@ -630,17 +341,14 @@ def gestionar_estado_pistas():
             print("Opción no válida")
             return
         
-        pistas[pista_index] = nueva_pista
+        motor.actualizar_pista(nueva_pista)
         print(f"✓ {mensaje}")
-        registrar_log(f"PISTA_MODIFICADA {mensaje}")
         
     except Exception as e:
         print(f"Error al modificar pista: {e}")
 
 def cancelar_vuelo():
     """Permite cancelar un vuelo"""
-    global vuelos
-    
     print("\n--- CANCELAR VUELO ---")
     
     if not vuelos:
@@ -651,58 +359,21 @@ def cancelar_vuelo():
     
     id_vuelo = input("\nID del vuelo a cancelar: ").strip().upper()
     
-    # Buscar el vuelo
-    vuelo_index = -1
-    for i, vuelo in enumerate(vuelos):
-        if vuelo[ID] == id_vuelo:
-            vuelo_index = i
-            break
-    
-    if vuelo_index == -1:
-        print("Error: No se encontró el vuelo")
-        return
-    
-    vuelo_actual = vuelos[vuelo_index]
-    
-    if vuelo_actual[ESTADO] == "COMPLETADO":
-        print("Error: No se puede cancelar un vuelo completado")
+    try:
+        # El motor libera la pista y retira el vuelo de la cola de despacho
+        pista_liberada = motor.cancelar_vuelo(id_vuelo)
+    except ValueError as e:
+        print(f"Error: {e}")
         return
     
-    if vuelo_actual[ESTADO] == "ASIGNADO":
-        # Liberar la pista si estaba asignado
-        for i, pista in enumerate(pistas):
-            if pista[PISTA_VUELO_ACTUAL] == id_vuelo:
-                pistas[i] = (
-                    pista[PISTA_ID],
-                    pista[PISTA_CATEGORIA],
-                    pista[PISTA_TIEMPO_USO],
-                    pista[PISTA_HABILITADA],
-                    "LIBRE",
-                    None,
-                    0
-                )
-                print(f"✓ Pista {pista[PISTA_ID]} liberada")
-    
-    # Actualizar estado del vuelo
-    vuelos[vuelo_index] = (
-        vuelo_actual[ID],
-        vuelo_actual[TIPO],
-        vuelo_actual[TIEMPO],
-        vuelo_actual[PRIORIDAD],
-        vuelo_actual[COMBUSTIBLE],
-        "CANCELADO"
-    )
-    
-    inicializar_flujos()
-    
-    mensaje = f"Vuelo {id_vuelo} cancelado"
-    print(f"✓ {mensaje}")
-    registrar_log(f"CANCELACION {mensaje}")
+    if pista_liberada is not None:
+        print(f"✓ Pista {pista_liberada} liberada")
+    print(f"✓ Vuelo {id_vuelo} cancelado")
 
 def mostrar_estadisticas():
     """Muestra estadísticas en tiempo real"""
     print("\n--- ESTADÍSTICAS EN TIEMPO REAL ---")
-    print(f"Reloj simulado: {reloj_simulado} min")
+    print(f"Reloj simulado: {motor.reloj_simulado} min")
     
     # Estadísticas de vuelos
     total_vuelos = len(vuelos)
@@ -753,7 +424,7 @@ def generar_informe():
     try:
         with open("informe.log", "w", encoding="utf-8") as f:
             f.write("RESUMEN\n")
-            f.write(f"- Tiempo simulado (min): {reloj_simulado}\n")
+            f.write(f"- Tiempo simulado (min): {motor.reloj_simulado}\n")
             
             # Estadísticas reales
             vuelos_completados = [v for v in vuelos if v[ESTADO] == "COMPLETADO"]
@@ -786,22 +457,12 @@ def generar_informe():
         return False
 
 def guardar_estado():
-    """Guarda el estado actual en archivos CSV"""
+    """Guarda el estado actual en archivos CSV y en la instantánea completa"""
     try:
-        # Guardar vuelos
-        with open("vuelos_actualizado.csv", "w", encoding="utf-8") as f:
-            f.write("id_vuelo,tipo,tiempo,prioridad,combustible,estado\n")
-            for vuelo in vuelos:
-                f.write(f"{vuelo[ID]},{vuelo[TIPO]},{vuelo[TIEMPO]},{vuelo[PRIORIDAD]},{vuelo[COMBUSTIBLE]},{vuelo[ESTADO]}\n")
-        
-        # Guardar pistas
-        with open("pistas_actualizado.csv", "w", encoding="utf-8") as f:
-            f.write("id_pista,categoria,tiempo_uso,habilitada\n")
-            for pista in pistas:
-                f.write(f"{pista[PISTA_ID]},{pista[PISTA_CATEGORIA]},{pista[PISTA_TIEMPO_USO]},{pista[PISTA_HABILITADA]}\n")
-        
+        motor.guardar_estado()
         print("✓ Estado guardado en 'vuelos_actualizado.csv' y 'pistas_actualizado.csv'")
-        registrar_log("ESTADO_GUARDADO")
+        motor.guardar_instantanea()
+        print(f"✓ Simulación completa guardada en '{ARCHIVO_INSTANTANEA}' (reloj, pistas ocupadas y colas)")
         
     except Exception as e:
         print(f"Error al guardar estado: {e}")
@@ -813,7 +474,7 @@ def mostrar_menu():
     print("\n" + "="*60)
     print("===== SISTEMA DE SIMULACIÓN AÉREA - MENÚ COMPLETO =====")
     print("="*60)
-    print(f"Reloj actual: {reloj_simulado} min | Vuelos: {len(vuelos)} | Pistas: {len(pistas)}")
+    print(f"Reloj actual: {motor.reloj_simulado} min | Vuelos: {len(vuelos)} | Pistas: {len(pistas)}")
     print("\n--- GESTIÓN DE VUELOS ---")
     print("1. Mostrar todos los vuelos")
     print("2. Agregar vuelo manualmente")
@@ -839,16 +500,25 @@ def mostrar_menu():
 
 def main():
     """Función principal del programa"""
-    global reloj_simulado
-    
     # Carga automática al iniciar
-    cargar_pistas_desde_csv()
-    cargar_vuelos_desde_csv()
-    inicializar_flujos()
+    motor.cargar_pistas_desde_csv()
+    motor.cargar_vuelos_desde_csv()
+    motor.inicializar_flujos()
+    
+    # Si quedó el diario de una sesión anterior, se puede continuar donde se dejó
+    if os.path.exists(ARCHIVO_DIARIO):
+        respuesta = input(f"Se encontró el diario '{ARCHIVO_DIARIO}' de una sesión anterior. "
+                          "¿Recuperarla? (S/n): ").strip().lower()
+        if respuesta != "n":
+            motor.recuperar_diario()
+    # Desde aquí cada cambio se anota en el diario
+    motor.activar_diario()
     
-    registrar_log("Sistema iniciado")
+    motor.registrar_log("Sistema iniciado")
     
     while True:
+        # Los cambios de la opción anterior quedan escritos en disco
+        motor.sincronizar_diario()
         mostrar_menu()
         opcion = input("\nSeleccione una opción (1-14): ").strip()
             
@@ -875,9 +545,16 @@ def main():
         elif opcion == "9":
             try:
                 n = int(input("¿Cuántos minutos avanzar? "))
-                for i in range(n):
-                    avanzar_minuto()
-                    time.sleep(0.3)
+                por_eventos = input("¿Saltar los minutos sin eventos? (s/N): ").strip().lower() == "s"
+                if por_eventos:
+                    inicio = motor.reloj_simulado
+                    simulados = motor.avanzar_por_eventos(n)
+                    print(f"\n✓ Avance del minuto {inicio} al {motor.reloj_simulado} ({simulados} minutos con eventos)")
+                    mostrar_estado_actual()
+                else:
+                    for i in range(n):
+                        avanzar_minuto()
+                        time.sleep(0.3)
             except ValueError:
                 print("Error: Ingrese un número válido")
         elif opcion == "10":
@@ -889,12 +566,117 @@ def main():
         elif opcion == "13":
             guardar_estado()
         elif opcion == "14":
-            guardar_estado()
-            registrar_log("Sistema finalizado")
-            print("\n¡Hasta luego! Estado guardado automáticamente.")
+            # El estado ya está en el diario: solo falta escribir los últimos cambios
+            motor.cerrar_diario()
+            motor.registrar_log("Sistema finalizado")
+            motor.cerrar_log()
+            print(f"\n¡Hasta luego! Estado guardado en el diario '{ARCHIVO_DIARIO}' "
+                  "(la opción 13 exporta los CSV).")
             break
         else:
             print("Opción no válida. Por favor, seleccione 1-14")
 
+def main_sin_menu(argumentos):
+    """Modo no interactivo: carga los datos, simula y muestra el resumen"""
+    global asignador_ids, generador
+    parser = argparse.ArgumentParser(
+        description="Simulación de control aéreo sin menú ni pausas")
+    parser.add_argument("--vuelos", default="vuelos.csv", help="CSV de vuelos (default vuelos.csv)")
+    parser.add_argument("--pistas", default="pistas.csv", help="CSV de pistas (default pistas.csv)")
+    parser.add_argument("--vuelos-en-flujo", action="store_true",
+                        help="leer el CSV de vuelos por lotes a medida que avanza el reloj (CSV ordenado por ETA/ETD)")
+    parser.add_argument("--anticipacion", type=int, default=0, metavar="MINUTOS",
+                        help="con --vuelos-en-flujo, minutos antes de su ETA/ETD en que entra en cola cada vuelo")
+    parser.add_argument("--procesos", type=int, default=1, metavar="N",
+                        help="procesos con que leer el CSV de vuelos (0 = todos los núcleos, default 1)")
+    parser.add_argument("--semilla", type=int, default=None, help="semilla de números aleatorios")
+    parser.add_argument("--generar", type=int, default=0, help="vuelos aleatorios a añadir a los cargados")
+    horizonte = parser.add_mutually_exclusive_group(required=True)
+    horizonte.add_argument("--minutos", type=int, help="minutos a simular")
+    horizonte.add_argument("--hasta-vaciar", action="store_true",
+                           help="simular hasta que no queden vuelos en cola ni pistas ocupadas")
+    parser.add_argument("--asignacion", choices=MODOS_ASIGNACION, default=ASIGNACION_VORAZ,
+                        help="modo de asignación de pistas (default voraz)")
+    parser.add_argument("--politica", choices=list(POLITICAS), default=POLITICA_PRIORIDAD,
+                        help=f"política de despacho del modo voraz (default {POLITICA_PRIORIDAD})")
+    parser.add_argument("--horizonte", type=int, default=HORIZONTE_POR_DEFECTO,
+                        help=f"minutos que planifica el modo horizonte (default {HORIZONTE_POR_DEFECTO})")
+    parser.add_argument("--sin-log", action="store_true", help="no escribir eventos.log")
+    parser.add_argument("--log", choices=DESTINOS_LOG, action="append", default=None,
+                        help=f"destino del log de eventos; se puede repetir (default {LOG_TEXTO})")
+    parser.add_argument("--log-json", metavar="ARCHIVO", default=ARCHIVO_LOG_JSON,
+                        help=f"log JSON Lines de eventos (default {ARCHIVO_LOG_JSON})")
+    parser.add_argument("--segmento-log", type=int, default=None, metavar="MB",
+                        help="tamaño a partir del cual el log JSON rota y comprime el segmento")
+    parser.add_argument("--indexar-log", action="store_true",
+                        help="indexar eventos.log por vuelo, pista y minuto al escribirlo (ver indice_log.py)")
+    parser.add_argument("--restaurar", metavar="ARCHIVO",
+                        help="continuar desde una instantánea en lugar de cargar los CSV")
+    parser.add_argument("--instantanea", metavar="ARCHIVO", default=None,
+                        help=f"guardar la instantánea al terminar (y al autoguardar, default {ARCHIVO_INSTANTANEA})")
+    parser.add_argument("--autoguardado", type=int, default=0, metavar="MINUTOS",
+                        help="guardar la instantánea cada MINUTOS minutos simulados")
+    parser.add_argument("--desde-log", metavar="ARCHIVO",
+                        help="empezar en el estado reconstruido de un log de eventos (sobre los CSV cargados)")
+    parser.add_argument("--minuto-log", type=int, default=None,
+                        help="minuto del log en que empezar (default el último)")
+    parser.add_argument("--tramo-log", type=int, default=None,
+                        help="tramo del log (el reloj vuelve a 0 al detener o en cada sesión; default el último)")
+    parser.add_argument("--diario", metavar="ARCHIVO",
+                        help="anotar los cambios en un diario; si ya existe, continuar desde él")
+    args = parser.parse_args(argumentos)
+    
+    motor.registro_activo = not args.sin_log
+    motor.destinos_log = args.log or [LOG_TEXTO]
+    motor.archivo_log_json = args.log_json
+    motor.indexar_log = args.indexar_log
+    if args.segmento_log is not None:
+        motor.tamano_segmento_log = args.segmento_log * 1024 * 1024
+    motor.modo_asignacion = args.asignacion
+    motor.cambiar_politica_despacho(args.politica)
+    motor.horizonte_planificacion = args.horizonte
+    asignador_ids = AsignadorIds(semilla=args.semilla, existe=almacen.existe_vuelo)
+    generador = GeneradorVuelos(semilla=args.semilla, asignar_ids=asignador_ids.asignar)
+    
+    if args.restaurar:
+        # La instantánea trae también el modo, la política y el horizonte con que se guardó
+        if not motor.cargar_instantanea(args.restaurar):
+            sys.exit(1)
+    elif args.diario and os.path.exists(args.diario):
+        if not motor.recuperar_diario(args.diario):
+            sys.exit(1)
+    else:
+        motor.cargar_pistas_desde_csv(args.pistas)
+        if args.vuelos_en_flujo:
+            motor.anticipacion_vuelos = args.anticipacion
+            if not motor.abrir_vuelos_desde_csv(args.vuelos):
+                sys.exit(1)
+        else:
+            motor.procesos_carga = args.procesos or None
+            motor.cargar_vuelos_desde_csv(args.vuelos)
+        motor.inicializar_flujos()
+        if args.desde_log and not motor.cargar_desde_log(args.desde_log, args.minuto_log, args.tramo_log):
+            sys.exit(1)
+    motor.autoguardado_archivo = args.instantanea or ARCHIVO_INSTANTANEA
+    motor.autoguardado_cada = args.autoguardado
+    if args.diario:
+        motor.activar_diario(args.diario)
+    if args.generar > 0:
+        generar_vuelos_automaticos(args.generar, mostrar=False)
+    
+    resultado = motor.ejecutar(minutos=args.minutos, hasta_vaciar=args.hasta_vaciar)
+    if args.instantanea:
+        motor.guardar_instantanea(args.instantanea)
+    motor.cerrar_diario()
+    motor.cerrar_log()
+    for clave, valor in resultado.items():
+        if isinstance(valor, float):
+            valor = f"{valor:.3f}"
+        print(f"{clave}: {valor}")
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    # Con argumentos se ejecuta sin menú (ver main_sin_menu --help)
+    if len(sys.argv) > 1:
+        main_sin_menu(sys.argv[1:])
+    else:
+        main()
\ No newline at end of file
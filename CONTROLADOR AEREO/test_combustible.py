@@ -0,0 +1,74 @@
+import random
+import unittest
+
+from almacen_vuelos import AlmacenVuelos, ID, TIPO, PRIORIDAD, COMBUSTIBLE, ESTADO
+from generador_vuelos import GeneradorVuelos, ids_correlativos
+
+MINUTOS = 120
+UMBRAL = 5
+
+def barrer_minuto(almacen):
+    """Como antes del modelo por tiempo: resta un minuto a cada aterrizaje en cola y
+    pasa a prioridad 2 los que quedan con combustible <= UMBRAL, en el orden de la cola"""
+    for vuelo in almacen.flujo_aterrizaje:
+        almacen.actualizar_vuelo(vuelo[:COMBUSTIBLE] + (max(0, vuelo[COMBUSTIBLE] - 1),) + vuelo[ESTADO:])
+    promovidos = []
+    for vuelo in almacen.flujo_aterrizaje:
+        if vuelo[COMBUSTIBLE] <= UMBRAL and vuelo[PRIORIDAD] < 2:
+            almacen.actualizar_vuelo(vuelo[:PRIORIDAD] + (2,) + vuelo[COMBUSTIBLE:])
+            promovidos.append(vuelo[ID])
+    return promovidos
+
+class TestCombustible(unittest.TestCase):
+    """El combustible calculado por tiempo debe ser el de restar un minuto a cada vuelo"""
+
+    def test_mismo_combustible_y_emergencias_que_barriendo(self):
+        por_tiempo = AlmacenVuelos(reglas_prioridad=((UMBRAL, 2),))
+        # Sin consumo ni reglas propias: todo lo hace barrer_minuto
+        barriendo = AlmacenVuelos(estados_consumo=(), reglas_prioridad=())
+        generador = GeneradorVuelos(semilla=6, combustible_minimo=1, combustible_maximo=60,
+                                    asignar_ids=ids_correlativos("CB"))
+        aleatorio = random.Random(6)
+        # Llegada a la cola en otro orden que el de los IDs: las emergencias van por llegada
+        vuelos = generador.generar_lote(300)
+        aleatorio.shuffle(vuelos)
+        por_tiempo.reemplazar_vuelos(vuelos)
+        barriendo.reemplazar_vuelos(vuelos)
+        emergencias = 0
+
+        for minuto in range(MINUTOS):
+            # Cambios entre minutos: cancelar, volver a la cola, altas y combustible a mano
+            sorteo = aleatorio.random()
+            en_cola = [vuelo[ID] for vuelo in barriendo.flujo_aterrizaje]
+            if sorteo < 0.2 and en_cola:
+                id_vuelo = aleatorio.choice(en_cola)
+                for almacen in (por_tiempo, barriendo):
+                    almacen.cambiar_estado_vuelo(id_vuelo, "CANCELADO")
+            elif sorteo < 0.4:
+                cancelados = [vuelo[ID] for vuelo in barriendo.vuelos if vuelo[ESTADO] == "CANCELADO"]
+                if cancelados:
+                    id_vuelo = aleatorio.choice(cancelados)
+                    for almacen in (por_tiempo, barriendo):
+                        almacen.cambiar_estado_vuelo(id_vuelo, "EN_COLA")
+            elif sorteo < 0.5:
+                for vuelo in generador.generar_lote(3):
+                    por_tiempo.agregar_vuelo(vuelo)
+                    barriendo.agregar_vuelo(vuelo)
+            elif sorteo < 0.6 and en_cola:
+                vuelo = barriendo.obtener_vuelo(aleatorio.choice(en_cola))
+                vuelo = vuelo[:COMBUSTIBLE] + (aleatorio.randint(0, 20),) + vuelo[ESTADO:]
+                por_tiempo.actualizar_vuelo(vuelo)
+                barriendo.actualizar_vuelo(vuelo)
+
+            por_tiempo.avanzar_reloj()
+            promovidos = por_tiempo.promover_por_combustible()
+            self.assertEqual(promovidos, barrer_minuto(barriendo), f"minuto {minuto}")
+            self.assertEqual(list(por_tiempo.vuelos), list(barriendo.vuelos), f"minuto {minuto}")
+            emergencias += len(promovidos)
+
+        # Que el escenario llegue a agotar combustible y a promover vuelos
+        self.assertGreater(emergencias, 0)
+        self.assertIn(0, {vuelo[COMBUSTIBLE] for vuelo in barriendo.vuelos if vuelo[TIPO] == "ATERRIZAJE"})
+
+if __name__ == "__main__":
+    unittest.main()
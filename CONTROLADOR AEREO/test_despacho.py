@@ -0,0 +1,87 @@
+import random
+import unittest
+
+import motor_simulacion as ms
+from generador_vuelos import GeneradorVuelos, ids_correlativos
+
+def crear_motor(pistas, vuelos):
+    motor = ms.MotorSimulacion(avisar=lambda mensaje, nivel="info": None, registro_activo=False)
+    motor.almacen.reemplazar_pistas(pistas)
+    motor.almacen.reemplazar_vuelos(vuelos)
+    motor.inicializar_flujos()
+    return motor
+
+def siguiente_ordenando(motor):
+    """El vuelo que debe salir según clave_prioridad, ordenando toda la cola"""
+    cola = list(motor.flujo_aterrizaje) + list(motor.flujo_despegue)
+    return min(cola, key=lambda vuelo: ms.clave_prioridad(vuelo, motor.reloj_simulado), default=None)
+
+class TestColaDespacho(unittest.TestCase):
+    """La cola de despacho por grupos debe dar el mismo vuelo que ordenar toda la cola"""
+
+    def test_vuelo_cancelado_que_vuelve_a_la_cola(self):
+        # Sin pistas habilitadas: los dos aterrizajes se quedan en cola
+        motor = crear_motor([("R1", "larga", 3, 0, "LIBRE", None, 0)],
+                            [("A", "ATERRIZAJE", 100, 0, 40, "EN_COLA"),
+                             ("B", "ATERRIZAJE", 100, 0, 45, "EN_COLA")])
+        motor.cancelar_vuelo("A")
+        for _ in range(10):
+            motor.avanzar_minuto()
+        # A no gastó combustible mientras estaba cancelado: ahora B tiene menos
+        motor.cambiar_estado_vuelo("A", "EN_COLA")
+        self.assertEqual(motor.obtener_siguiente_vuelo()[ms.ID], "B")
+
+    def test_mismo_orden_que_ordenando(self):
+        for semilla in range(4):
+            with self.subTest(semilla=semilla):
+                self.comprobar_orden(semilla)
+
+    def comprobar_orden(self, semilla):
+        """Cancelaciones, vuelos que vuelven a la cola y altas entre minuto y minuto"""
+        generador = GeneradorVuelos(semilla=semilla, dispersion_eta=200, asignar_ids=ids_correlativos("DV"))
+        motor = crear_motor([("R1", "larga", 4, 1, "LIBRE", None, 0), ("R2", "estandar", 3, 1, "LIBRE", None, 0)],
+                            generador.generar_lote(400))
+        aleatorio = random.Random(semilla)
+        for _ in range(300):
+            sorteo = aleatorio.random()
+            if sorteo < 0.3:
+                en_cola = [vuelo[ms.ID] for vuelo in motor.vuelos if vuelo[ms.ESTADO] == "EN_COLA"]
+                if en_cola:
+                    motor.cancelar_vuelo(aleatorio.choice(en_cola))
+            elif sorteo < 0.6:
+                cancelados = [vuelo[ms.ID] for vuelo in motor.vuelos if vuelo[ms.ESTADO] == "CANCELADO"]
+                if cancelados:
+                    motor.cambiar_estado_vuelo(aleatorio.choice(cancelados), "EN_COLA")
+            elif sorteo < 0.7:
+                for vuelo in generador.generar_lote(3, motor.reloj_simulado):
+                    motor.dar_de_alta_vuelo(vuelo)
+            self.assertEqual(motor.obtener_siguiente_vuelo(), siguiente_ordenando(motor),
+                             f"minuto {motor.reloj_simulado}")
+            motor.avanzar_minuto()
+
+    def test_modo_optimo_con_candidatos_de_la_cola(self):
+        """El modo óptimo debe asignar lo mismo que planificando con toda la cola"""
+        generador = GeneradorVuelos(semilla=5, dispersion_eta=100, asignar_ids=ids_correlativos("DO"))
+        vuelos = generador.generar_lote(800)
+        pistas = [(f"R{i}", categoria, 2 + i % 3, 1, "LIBRE", None, 0)
+                  for i, categoria in enumerate(["larga", "estandar", "corta"] * 3)]
+        motor = crear_motor(pistas, vuelos)
+        toda_la_cola = crear_motor(pistas, vuelos)
+        toda_la_cola.candidatos_por_peso = lambda cantidad: (list(toda_la_cola.flujo_aterrizaje)
+                                                             + list(toda_la_cola.flujo_despegue))
+        aleatorio = random.Random(5)
+        for m in (motor, toda_la_cola):
+            m.modo_asignacion = ms.ASIGNACION_OPTIMA
+        for _ in range(200):
+            if aleatorio.random() < 0.2:
+                en_cola = [vuelo[ms.ID] for vuelo in motor.vuelos if vuelo[ms.ESTADO] == "EN_COLA"]
+                if en_cola:
+                    id_vuelo = aleatorio.choice(en_cola)
+                    motor.cancelar_vuelo(id_vuelo)
+                    toda_la_cola.cancelar_vuelo(id_vuelo)
+            self.assertEqual(motor.avanzar_minuto(), toda_la_cola.avanzar_minuto(),
+                             f"minuto {motor.reloj_simulado}")
+        self.assertEqual(list(motor.vuelos), list(toda_la_cola.vuelos))
+
+if __name__ == "__main__":
+    unittest.main()
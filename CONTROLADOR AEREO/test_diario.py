@@ -0,0 +1,95 @@
+import os
+import random
+import tempfile
+import unittest
+
+import diario
+import motor_simulacion as ms
+from generador_vuelos import GeneradorVuelos, ids_correlativos
+
+PISTAS = [("R1", "larga", 4, 1, "LIBRE", None, 0), ("R2", "estandar", 3, 1, "LIBRE", None, 0),
+          ("R3", "corta", 2, 1, "LIBRE", None, 0)]
+
+def crear_motor():
+    return ms.MotorSimulacion(avisar=lambda mensaje, nivel="info": None, registro_activo=False)
+
+def simular_con_diario(archivo, minutos, compactar_en=None):
+    """Simulación con el diario activado y cambios a mano entre minuto y minuto"""
+    motor = crear_motor()
+    motor.almacen.reemplazar_pistas(PISTAS)
+    generador = GeneradorVuelos(semilla=9, dispersion_eta=150, asignar_ids=ids_correlativos("DI"))
+    motor.almacen.reemplazar_vuelos(generador.generar_lote(300))
+    motor.inicializar_flujos()
+    motor.activar_diario(archivo)
+    aleatorio = random.Random(9)
+    for minuto in range(minutos):
+        if minuto == compactar_en:
+            motor.compactar_diario()
+        sorteo = aleatorio.random()
+        if sorteo < 0.2:
+            en_cola = [vuelo[ms.ID] for vuelo in motor.vuelos if vuelo[ms.ESTADO] == "EN_COLA"]
+            motor.cancelar_vuelo(aleatorio.choice(en_cola))
+        elif sorteo < 0.3:
+            cancelados = [vuelo[ms.ID] for vuelo in motor.vuelos if vuelo[ms.ESTADO] == "CANCELADO"]
+            if cancelados:
+                motor.cambiar_estado_vuelo(aleatorio.choice(cancelados), "EN_COLA")
+        elif sorteo < 0.45:
+            for vuelo in generador.generar_lote(3, motor.reloj_simulado):
+                motor.dar_de_alta_vuelo(vuelo)
+        elif sorteo < 0.5:
+            pista = aleatorio.choice(list(motor.pistas))
+            motor.actualizar_pista(pista[:3] + (1 - pista[3],) + pista[4:])
+        elif sorteo < 0.55:
+            motor.cambiar_politica_despacho(aleatorio.choice(list(ms.POLITICAS)))
+        motor.avanzar_minuto()
+    return motor
+
+class TestDiario(unittest.TestCase):
+    """Recuperar el diario debe dejar el estado que tenía el motor al cortarse"""
+
+    def setUp(self):
+        self.carpeta = tempfile.TemporaryDirectory()
+        self.archivo = os.path.join(self.carpeta.name, "simulacion.diario")
+
+    def tearDown(self):
+        self.carpeta.cleanup()
+
+    def comprobar_recuperacion(self, vivo):
+        # Lo que quedó en disco, sin cerrar el diario (como si el proceso se cortara)
+        vivo.sincronizar_diario()
+        recuperado = crear_motor()
+        self.assertTrue(recuperado.recuperar_diario(self.archivo))
+
+        self.assertEqual(recuperado.reloj_simulado, vivo.reloj_simulado)
+        self.assertEqual(list(recuperado.vuelos), list(vivo.vuelos))
+        self.assertEqual(list(recuperado.pistas), list(vivo.pistas))
+        self.assertEqual(list(recuperado.flujo_aterrizaje), list(vivo.flujo_aterrizaje))
+        self.assertEqual(list(recuperado.flujo_despegue), list(vivo.flujo_despegue))
+        self.assertEqual(recuperado.politica_despacho, vivo.politica_despacho)
+        self.assertEqual(recuperado.metricas, vivo.metricas)
+        # Y la simulación sigue igual
+        for _ in range(100):
+            self.assertEqual(recuperado.avanzar_minuto(), vivo.avanzar_minuto())
+        vivo.cerrar_diario()
+
+    def test_recuperar_sin_compactar(self):
+        vivo = simular_con_diario(self.archivo, 120)
+        self.assertGreater(vivo.diario.registros, 0)
+        self.comprobar_recuperacion(vivo)
+
+    def test_recuperar_tras_compactar(self):
+        vivo = simular_con_diario(self.archivo, 120, compactar_en=70)
+        self.comprobar_recuperacion(vivo)
+
+    def test_ultima_linea_a_medias(self):
+        vivo = simular_con_diario(self.archivo, 60)
+        vivo.sincronizar_diario()
+        generacion, registros = diario.leer(self.archivo)
+        # El proceso se cortó escribiendo un registro: se descarta esa línea
+        with open(self.archivo, "a", encoding="utf-8") as f:
+            f.write('["ALTA",["DIX0001","ATERR')
+        self.assertEqual(diario.leer(self.archivo), (generacion, registros))
+        vivo.cerrar_diario()
+
+if __name__ == "__main__":
+    unittest.main()
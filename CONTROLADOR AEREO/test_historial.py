@@ -0,0 +1,90 @@
+import random
+import unittest
+
+import motor_simulacion as ms
+from generador_vuelos import GeneradorVuelos, ids_correlativos
+
+MINUTOS = 200
+# Pistas largas de usar: casi siempre están todas ocupadas y el reloj por eventos salta
+PISTAS = [("R1", "larga", 5, 1, "LIBRE", None, 0), ("R2", "estandar", 4, 1, "LIBRE", None, 0),
+          ("R3", "corta", 6, 1, "LIBRE", None, 0)]
+
+def crear_motor():
+    motor = ms.MotorSimulacion(avisar=lambda mensaje, nivel="info": None, registro_activo=False)
+    motor.almacen.reemplazar_pistas(PISTAS)
+    generador = GeneradorVuelos(semilla=3, dispersion_eta=MINUTOS, asignar_ids=ids_correlativos("HV"))
+    motor.almacen.reemplazar_vuelos(generador.generar_lote(120))
+    motor.inicializar_flujos()
+    motor.activar_historial()
+    return motor
+
+def cambios_a_mano(motor, aleatorio, altas):
+    """Cancelaciones, altas, cambios de estado, de pista y de política como los de la GUI"""
+    sorteo = aleatorio.random()
+    if sorteo < 0.3:
+        en_cola = [vuelo[ms.ID] for vuelo in motor.vuelos if vuelo[ms.ESTADO] == "EN_COLA"]
+        if en_cola:
+            motor.cancelar_vuelo(aleatorio.choice(en_cola))
+    elif sorteo < 0.4:
+        for vuelo in altas.generar_lote(2, motor.reloj_simulado):
+            motor.dar_de_alta_vuelo(vuelo)
+    elif sorteo < 0.45:
+        cancelados = [vuelo[ms.ID] for vuelo in motor.vuelos if vuelo[ms.ESTADO] == "CANCELADO"]
+        if cancelados:
+            motor.cambiar_estado_vuelo(aleatorio.choice(cancelados), "EN_COLA")
+    elif sorteo < 0.5:
+        pista = aleatorio.choice(list(motor.pistas))
+        motor.actualizar_pista(pista[:3] + (1 - pista[3],) + pista[4:])
+    elif sorteo < 0.55:
+        motor.cambiar_politica_despacho(aleatorio.choice(list(ms.POLITICAS)))
+
+def simular(por_eventos):
+    """Los mismos cambios a mano en los mismos minutos, minuto a minuto o con el reloj por eventos"""
+    motor = crear_motor()
+    aleatorio = random.Random(5)
+    altas = GeneradorVuelos(semilla=4, asignar_ids=ids_correlativos("HA"))
+    simulados = 0
+    while motor.reloj_simulado < MINUTOS:
+        cambios_a_mano(motor, aleatorio, altas)
+        # Hasta el siguiente cambio a mano: los minutos de en medio pueden caer en un salto
+        minutos = min(aleatorio.randint(1, 8), MINUTOS - motor.reloj_simulado)
+        if por_eventos:
+            simulados += motor.avanzar_por_eventos(minutos)
+        else:
+            for _ in range(minutos):
+                motor.avanzar_minuto()
+            simulados += minutos
+    return motor, simulados
+
+class TestHistorial(unittest.TestCase):
+    """El historial del reloj por eventos debe ser el del bucle minuto a minuto"""
+
+    def test_version_en_con_saltos_tras_cambios_a_mano(self):
+        minuto_a_minuto, _ = simular(por_eventos=False)
+        por_eventos, simulados = simular(por_eventos=True)
+        # Que el escenario tenga saltos y cancelaciones
+        self.assertLess(simulados, MINUTOS)
+        self.assertIn("CANCELADO", {vuelo[ms.ESTADO] for vuelo in minuto_a_minuto.vuelos})
+
+        for minuto in range(MINUTOS + 1):
+            esperado = minuto_a_minuto.version_en(minuto)
+            version = por_eventos.version_en(minuto)
+            self.assertEqual(version.minuto, minuto)
+            self.assertEqual(version.estado_completo(), esperado.estado_completo(), f"minuto {minuto}")
+            self.assertEqual({estado: n for estado, n in version.conteo.items() if n},
+                             {estado: n for estado, n in esperado.conteo.items() if n}, f"minuto {minuto}")
+
+    def test_bifurcar_tras_un_salto(self):
+        minuto_a_minuto, _ = simular(por_eventos=False)
+        por_eventos, _ = simular(por_eventos=True)
+        for minuto in range(0, MINUTOS, 7):
+            esperado = minuto_a_minuto.bifurcar(minuto)
+            bifurcado = por_eventos.bifurcar(minuto)
+            self.assertEqual(list(bifurcado.vuelos), list(esperado.vuelos), f"minuto {minuto}")
+            self.assertEqual(list(bifurcado.pistas), list(esperado.pistas), f"minuto {minuto}")
+            # Y al continuar desde ahí se simula lo mismo
+            for _ in range(10):
+                self.assertEqual(bifurcado.avanzar_minuto(), esperado.avanzar_minuto())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+import os
+import random
+import tempfile
+import unittest
+
+import motor_simulacion as ms
+from generador_vuelos import GeneradorVuelos, ids_correlativos
+from indice_log import IndiceLog, EXTENSION_INDICE
+from reproductor_log import leer_evento
+
+PISTAS = [("R1", "larga", 4, 1, "LIBRE", None, 0), ("R2", "estandar", 3, 1, "LIBRE", None, 0),
+          ("R3", "corta", 2, 1, "LIBRE", None, 0)]
+
+def simular_sesion(archivo_log, semilla, indexar_log):
+    """Una sesión que escribe en archivo_log, con cambios a mano y detener a mitad"""
+    motor = ms.MotorSimulacion(avisar=lambda mensaje, nivel="info": None, archivo_log=archivo_log)
+    motor.indexar_log = indexar_log
+    for pista in PISTAS:
+        motor.agregar_pista(pista)
+    generador = GeneradorVuelos(semilla=semilla, dispersion_eta=60, asignar_ids=ids_correlativos(f"I{semilla}"))
+    motor.almacen.reemplazar_vuelos(generador.generar_lote(150))
+    motor.inicializar_flujos()
+    aleatorio = random.Random(semilla)
+    for paso in range(80):
+        if paso == 40:
+            motor.detener()
+        sorteo = aleatorio.random()
+        if sorteo < 0.2:
+            en_cola = [vuelo[ms.ID] for vuelo in motor.vuelos if vuelo[ms.ESTADO] == "EN_COLA"]
+            if en_cola:
+                motor.cancelar_vuelo(aleatorio.choice(en_cola))
+        elif sorteo < 0.3:
+            pista = aleatorio.choice(list(motor.pistas))
+            motor.actualizar_pista(pista[:3] + (1 - pista[3],) + pista[4:])
+        motor.avanzar_minuto()
+    motor.cerrar_log()
+
+def leer_todo(archivo_log):
+    """(tramo, minuto, vuelo, pista, línea) de cada evento, leyendo el log entero"""
+    eventos, tramo, ultimo = [], 0, None
+    with open(archivo_log, encoding="utf-8") as f:
+        for linea in f:
+            evento = leer_evento(linea)
+            if evento is None:
+                continue
+            minuto, tipo, campos, _ = evento
+            if ultimo is not None and minuto < ultimo:
+                tramo += 1
+            ultimo = minuto
+            # Los eventos de alta y cambio de pista la llevan en id=
+            id_pista = campos.get("id") if tipo in ("PISTA_AGREGADA", "PISTA_MODIFICADA") else campos.get("pista")
+            eventos.append((tramo, minuto, campos.get("id_vuelo"), id_pista, linea.rstrip("\r\n")))
+    return eventos
+
+def en_intervalo(evento, desde, hasta, tramo):
+    return ((tramo is None or evento[0] == tramo) and (desde is None or evento[1] >= desde)
+            and (hasta is None or evento[1] <= hasta))
+
+class TestIndiceLog(unittest.TestCase):
+    """Las consultas con el índice deben dar las mismas líneas que leyendo todo el log"""
+
+    def setUp(self):
+        self.carpeta = tempfile.TemporaryDirectory()
+        self.archivo_log = os.path.join(self.carpeta.name, "eventos.log")
+        # Dos sesiones (cuatro tramos): la primera indexa al escribir y la segunda no
+        simular_sesion(self.archivo_log, 1, indexar_log=True)
+        simular_sesion(self.archivo_log, 2, indexar_log=False)
+        self.eventos = leer_todo(self.archivo_log)
+
+    def tearDown(self):
+        self.carpeta.cleanup()
+
+    def comprobar(self, indice):
+        self.assertEqual(len({evento[0] for evento in self.eventos}), 4)
+        for id_vuelo in sorted({evento[2] for evento in self.eventos if evento[2] is not None}):
+            self.assertEqual(indice.eventos_de_vuelo(id_vuelo),
+                             [(e[0], e[4]) for e in self.eventos if e[2] == id_vuelo], id_vuelo)
+
+        aleatorio = random.Random(3)
+        intervalos = [(None, None, None), (None, None, 2), (0, 0, 0), (12, 5, None), (30, None, 1),
+                      (None, 25, 3), (500, None, None)]
+        for _ in range(30):
+            desde = aleatorio.randint(0, 45)
+            intervalos.append((desde, desde + aleatorio.randint(0, 20), aleatorio.choice((None, 0, 1, 2, 3))))
+        for desde, hasta, tramo in intervalos:
+            with self.subTest(desde=desde, hasta=hasta, tramo=tramo):
+                esperado = [e for e in self.eventos if en_intervalo(e, desde, hasta, tramo)]
+                self.assertEqual(indice.eventos_entre(desde, hasta, tramo), [(e[0], e[4]) for e in esperado])
+                for id_pista, *_ in PISTAS:
+                    self.assertEqual(indice.eventos_de_pista(id_pista, desde, hasta, tramo),
+                                     [(e[0], e[4]) for e in esperado if e[3] == id_pista], id_pista)
+
+    def test_indice_escrito_y_puesto_al_dia(self):
+        indice = IndiceLog(self.archivo_log)
+        try:
+            # La primera sesión ya está indexada; la segunda se indexa ahora
+            pendientes = indice.ponerse_al_dia()
+            self.assertGreater(pendientes, 0)
+            self.assertLess(pendientes, len(self.eventos))
+            self.comprobar(indice)
+        finally:
+            indice.cerrar()
+
+    def test_indice_desde_cero(self):
+        os.remove(self.archivo_log + EXTENSION_INDICE)
+        indice = IndiceLog(self.archivo_log)
+        try:
+            self.assertEqual(indice.ponerse_al_dia(), len(self.eventos))
+            self.comprobar(indice)
+        finally:
+            indice.cerrar()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+import os
+import random
+import tempfile
+import unittest
+
+import motor_simulacion as ms
+from generador_vuelos import GeneradorVuelos, ids_correlativos
+
+PISTAS = [("R1", "larga", 4, 1, "LIBRE", None, 0), ("R2", "estandar", 3, 1, "LIBRE", None, 0),
+          ("R3", "corta", 2, 1, "LIBRE", None, 0), ("R4", "larga", 5, 0, "LIBRE", None, 0)]
+
+def crear_motor():
+    return ms.MotorSimulacion(avisar=lambda mensaje, nivel="info": None, registro_activo=False)
+
+def motor_a_mitad(modo, politica):
+    """Motor con 60 minutos simulados y cancelaciones, vueltas a la cola y altas por el camino"""
+    motor = crear_motor()
+    motor.almacen.reemplazar_pistas(PISTAS)
+    generador = GeneradorVuelos(semilla=8, dispersion_eta=150, asignar_ids=ids_correlativos("IN"))
+    aleatorio = random.Random(8)
+    # Llegada a la cola en otro orden que el de los IDs
+    vuelos = generador.generar_lote(400)
+    aleatorio.shuffle(vuelos)
+    motor.almacen.reemplazar_vuelos(vuelos)
+    motor.inicializar_flujos()
+    motor.modo_asignacion = modo
+    motor.cambiar_politica_despacho(politica)
+    for _ in range(60):
+        if aleatorio.random() < 0.3:
+            en_cola = [vuelo[ms.ID] for vuelo in motor.vuelos if vuelo[ms.ESTADO] == "EN_COLA"]
+            motor.cancelar_vuelo(aleatorio.choice(en_cola))
+        if aleatorio.random() < 0.2:
+            cancelados = [vuelo[ms.ID] for vuelo in motor.vuelos if vuelo[ms.ESTADO] == "CANCELADO"]
+            if cancelados:
+                motor.cambiar_estado_vuelo(aleatorio.choice(cancelados), "EN_COLA")
+        if aleatorio.random() < 0.3:
+            for vuelo in generador.generar_lote(2, motor.reloj_simulado):
+                motor.dar_de_alta_vuelo(vuelo)
+        motor.avanzar_minuto()
+    return motor
+
+class TestInstantanea(unittest.TestCase):
+    """Tras cargar una instantánea la simulación debe seguir igual que sin guardarla"""
+
+    def setUp(self):
+        self.carpeta = tempfile.TemporaryDirectory()
+        self.archivo = os.path.join(self.carpeta.name, "simulacion.inst")
+
+    def tearDown(self):
+        self.carpeta.cleanup()
+
+    def comprobar(self, modo, politica):
+        original = motor_a_mitad(modo, politica)
+        original.guardar_instantanea(self.archivo)
+        restaurado = crear_motor()
+        self.assertTrue(restaurado.cargar_instantanea(self.archivo))
+        self.assertEqual(restaurado.reloj_simulado, original.reloj_simulado)
+        self.assertEqual(restaurado.modo_asignacion, modo)
+        self.assertEqual(restaurado.politica_despacho, politica)
+        # También el orden de llegada a las colas, que no está en las tuplas
+        self.assertEqual(list(restaurado.flujo_aterrizaje), list(original.flujo_aterrizaje))
+        self.assertEqual(list(restaurado.flujo_despegue), list(original.flujo_despegue))
+
+        for _ in range(150):
+            self.assertEqual(restaurado.avanzar_minuto(), original.avanzar_minuto(),
+                             f"minuto {original.reloj_simulado}")
+        self.assertEqual(list(restaurado.vuelos), list(original.vuelos))
+        self.assertEqual(list(restaurado.pistas), list(original.pistas))
+        self.assertEqual(restaurado.metricas, original.metricas)
+
+    def test_modos_de_asignacion(self):
+        for modo in ms.MODOS_ASIGNACION:
+            with self.subTest(modo=modo):
+                self.comprobar(modo, ms.POLITICA_PRIORIDAD)
+
+    def test_politicas_de_despacho(self):
+        for politica in ms.POLITICAS:
+            with self.subTest(politica=politica):
+                self.comprobar(ms.ASIGNACION_VORAZ, politica)
+
+    def test_instantanea_danada(self):
+        motor_a_mitad(ms.ASIGNACION_VORAZ, ms.POLITICA_PRIORIDAD).guardar_instantanea(self.archivo)
+        with open(self.archivo, "r+b") as f:
+            f.seek(-10, os.SEEK_END)
+            f.write(b"\0" * 10)
+        motor = motor_a_mitad(ms.ASIGNACION_VORAZ, ms.POLITICA_PRIORIDAD)
+        antes = list(motor.vuelos)
+        self.assertFalse(motor.cargar_instantanea(self.archivo))
+        self.assertEqual(list(motor.vuelos), antes)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import os
+import random
+import tempfile
+import unittest
+
+import motor_simulacion as ms
+from generador_vuelos import GeneradorVuelos, ids_correlativos
+from lector_vuelos import leer_lotes_vuelos, leer_lotes_vuelos_en_paralelo
+
+CABECERA = "id_vuelo,tipo,eta,etd,prioridad,combustible,estado"
+# Campos no válidos (avisan), líneas que no son vuelos (se saltan sin aviso) y valores fuera de rango
+LINEAS_RARAS = ["LP_MAL1,ATERRIZAJE,abc,,1,10,EN_COLA", "LP_MAL2,DESPEGUE,,12,x,,EN_COLA",
+                "LP_MAL3,ATERRIZAJE,5,,0,mucho,EN_COLA", "", "   ", "LP_RARO,PLANEADOR,1,,0,0,EN_COLA",
+                "LP_CORTA,ATERRIZAJE", "LP_PRIO,despegue,,7,9,,volando", "LP_MAL4,ATERRIZAJE,7.5,,0,3,"]
+
+def lineas_csv(cabecera=True):
+    """Líneas de un vuelos.csv con vuelos válidos y las LINEAS_RARAS repartidas"""
+    generador = GeneradorVuelos(semilla=5, asignar_ids=ids_correlativos("LP"))
+    lineas = [CABECERA] if cabecera else []
+    for id_vuelo, tipo, tiempo, prioridad, combustible, estado in generador.generar_lote(300):
+        if tipo == "ATERRIZAJE":
+            lineas.append(f"{id_vuelo},{tipo},{tiempo},,{prioridad},{combustible},{estado}")
+        else:
+            lineas.append(f"{id_vuelo},{tipo},,{tiempo},{prioridad},,{estado}")
+    aleatorio = random.Random(5)
+    for linea in LINEAS_RARAS * 3:
+        lineas.insert(aleatorio.randint(1, len(lineas)), linea)
+    return lineas
+
+def leer(lectura):
+    """(vuelos, avisos) de una lectura por lotes que avisa con avisar"""
+    avisos = []
+    vuelos = [vuelo for lote in lectura(lambda mensaje, nivel="info": avisos.append((mensaje, nivel)))
+              for vuelo in lote]
+    return vuelos, avisos
+
+class TestLecturaParalela(unittest.TestCase):
+    """La lectura en paralelo debe dar los mismos vuelos y avisos que la lectura en serie"""
+
+    def setUp(self):
+        self.carpeta = tempfile.TemporaryDirectory()
+        self.archivo = os.path.join(self.carpeta.name, "vuelos.csv")
+
+    def tearDown(self):
+        self.carpeta.cleanup()
+
+    def escribir(self, lineas, salto="\n", salto_final=True):
+        with open(self.archivo, "w", encoding="utf-8", newline="") as f:
+            f.write(salto.join(lineas) + (salto if salto_final else ""))
+
+    def comprobar(self, procesos=(1, 3), tamanos=(1, 97, 4096)):
+        with open(self.archivo, encoding="utf-8") as f:
+            en_serie = leer(lambda avisar: leer_lotes_vuelos(f, avisar, vuelos_por_lote=50))
+        self.assertTrue(en_serie[0])
+        for numero in procesos:
+            for tamano in tamanos:
+                with self.subTest(procesos=numero, tamano_trozo=tamano):
+                    self.assertEqual(leer(lambda avisar: leer_lotes_vuelos_en_paralelo(
+                        self.archivo, avisar, numero, tamano_trozo=tamano)), en_serie)
+        return en_serie
+
+    def test_saltos_de_linea(self):
+        for salto in ("\n", "\r\n", "\r"):
+            with self.subTest(salto=repr(salto)):
+                self.escribir(lineas_csv(), salto)
+                vuelos, avisos = self.comprobar()
+                # Avisan las cuatro líneas con campos no válidos, con su número de línea
+                self.assertEqual(len(avisos), 4 * 3)
+
+    def test_sin_salto_final_ni_cabecera(self):
+        self.escribir(lineas_csv(), salto_final=False)
+        self.comprobar(procesos=(1,))
+        self.escribir(lineas_csv(cabecera=False), "\r\n")
+        self.comprobar(procesos=(1,))
+
+    def test_carga_del_motor(self):
+        self.escribir(lineas_csv(), "\r\n")
+        cargas = []
+        for procesos in (1, 2):
+            motor = ms.MotorSimulacion(avisar=lambda mensaje, nivel="info": None, registro_activo=False)
+            motor.procesos_carga = procesos
+            motor.cargar_vuelos_desde_csv(self.archivo)
+            cargas.append((list(motor.vuelos), list(motor.flujo_aterrizaje), list(motor.flujo_despegue)))
+        self.assertEqual(cargas[0], cargas[1])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,149 @@
+import os
+import random
+import shutil
+import tempfile
+import unittest
+
+import sistema_vuelos
+import sistema_velos_gui
+from motor_simulacion import MotorSimulacion, ESTADO
+
+VUELOS = 300
+MINUTOS = 150
+PISTAS = ("id_pista,categoria,tiempo_uso,habilitada\n"
+          "R1,larga,3,1\nR2,estandar,2,1\nR3,corta,2,1\nR4,larga,4,0\n")
+
+class RaizFalsa:
+    """Lo que usa la GUI de la ventana de tkinter: after sin bucle de eventos
+
+    Los minutos programados se ejecutan a mano con ejecutar_siguiente.
+    """
+
+    def __init__(self):
+        self.programados = {}
+        self.ultimo_id = 0
+
+    def after(self, milisegundos, funcion):
+        self.ultimo_id += 1
+        self.programados[self.ultimo_id] = funcion
+        return self.ultimo_id
+
+    def after_cancel(self, id_programado):
+        del self.programados[id_programado]
+
+    def ejecutar_siguiente(self):
+        funcion = self.programados.pop(min(self.programados))
+        funcion()
+
+class WidgetFalso:
+    """Área de texto, etiqueta o variable de tkinter que no muestra nada"""
+
+    def __init__(self, valor=""):
+        self.valor = valor
+
+    def insert(self, *argumentos):
+        pass
+
+    def delete(self, *argumentos):
+        pass
+
+    def config(self, **opciones):
+        pass
+
+    def get(self):
+        return self.valor
+
+def crear_gui(archivo_log):
+    """SistemaVuelosGUI con los widgets que usa la simulación sustituidos por WidgetFalso"""
+    gui = sistema_velos_gui.SistemaVuelosGUI.__new__(sistema_velos_gui.SistemaVuelosGUI)
+    gui.root = RaizFalsa()
+    gui.text_info = WidgetFalso()
+    gui.status_label = WidgetFalso()
+    gui.velocidad_var = WidgetFalso("0")
+    gui.motor = MotorSimulacion(avisar=gui.mostrar_aviso, archivo_log=archivo_log)
+    gui.almacen = gui.motor.almacen
+    gui.vuelos = gui.motor.vuelos
+    gui.pistas = gui.motor.pistas
+    gui.simulacion_activa = False
+    gui.minuto_programado = None
+    return gui
+
+class TestConsolaYGui(unittest.TestCase):
+    """La consola y la GUI usan el mismo motor: el mismo escenario debe dar el mismo resultado"""
+
+    def setUp(self):
+        self.carpeta = tempfile.mkdtemp()
+        self.archivo_vuelos = os.path.join(self.carpeta, "vuelos.csv")
+        self.archivo_pistas = os.path.join(self.carpeta, "pistas.csv")
+        aleatorio = random.Random(7)
+        with open(self.archivo_vuelos, "w", encoding="utf-8") as f:
+            f.write("id_vuelo,tipo,eta,etd,prioridad,combustible,estado\n")
+            for i in range(VUELOS):
+                tiempo = aleatorio.randint(0, MINUTOS // 2)
+                prioridad = aleatorio.choices([0, 1, 2], weights=[80, 15, 5])[0]
+                if aleatorio.random() < 0.5:
+                    combustible = aleatorio.randint(5, 45)
+                    f.write(f"GV{i:06d},ATERRIZAJE,{tiempo},,{prioridad},{combustible},EN_COLA\n")
+                else:
+                    f.write(f"GV{i:06d},DESPEGUE,,{tiempo},{prioridad},,EN_COLA\n")
+            # Líneas que el cargador descarta o corrige
+            f.write("MALO1,ATERRIZAJE,x,,0,10,EN_COLA\nMALO2,OTRO,1,,0,,EN_COLA\nGV000000,DESPEGUE,,3,9,,RARO\n")
+        with open(self.archivo_pistas, "w", encoding="utf-8") as f:
+            f.write(PISTAS)
+
+    def tearDown(self):
+        shutil.rmtree(self.carpeta)
+
+    def leer_log(self, motor):
+        motor.cerrar_log()
+        with open(motor.archivo_log, encoding="utf-8") as f:
+            return f.read()
+
+    def simular_en_consola(self):
+        """Como main() de sistema_vuelos.py y la opción de avanzar un minuto"""
+        motor = sistema_vuelos.motor
+        motor.archivo_log = os.path.join(self.carpeta, "consola.log")
+        motor.avisar = lambda mensaje, nivel="info": None
+        motor.cargar_pistas_desde_csv(self.archivo_pistas)
+        motor.cargar_vuelos_desde_csv(self.archivo_vuelos)
+        motor.inicializar_flujos()
+        for _ in range(MINUTOS):
+            sistema_vuelos.avanzar_minuto(mostrar=False)
+        return motor
+
+    def simular_en_gui(self):
+        """Como cargar_datos_iniciales e iniciar_simulacion de sistema_velos_gui.py"""
+        gui = crear_gui(os.path.join(self.carpeta, "gui.log"))
+        gui.cargar_pistas_desde_csv(self.archivo_pistas)
+        gui.cargar_vuelos_desde_csv(self.archivo_vuelos)
+        gui.simulacion_activa = True
+        gui.minuto_programado = gui.root.after(0, gui.ejecutar_simulacion)
+        for _ in range(MINUTOS):
+            # Cada minuto deja programado el siguiente, y solo ese
+            self.assertEqual(len(gui.root.programados), 1)
+            gui.root.ejecutar_siguiente()
+        gui.simulacion_activa = False
+        gui.cancelar_minuto_programado()
+        self.assertEqual(gui.root.programados, {})
+        return gui.motor
+
+    def test_mismo_estado_y_log(self):
+        consola = self.simular_en_consola()
+        gui = self.simular_en_gui()
+
+        self.assertEqual(consola.reloj_simulado, MINUTOS)
+        self.assertEqual(gui.reloj_simulado, MINUTOS)
+        self.assertEqual(list(consola.vuelos), list(gui.vuelos))
+        self.assertEqual(list(consola.pistas), list(gui.pistas))
+        self.assertEqual(consola.metricas, gui.metricas)
+        # Que el escenario pase por todos los estados y no se quede en la carga
+        estados = {vuelo[ESTADO] for vuelo in consola.vuelos}
+        self.assertIn("COMPLETADO", estados)
+        self.assertIn("EN_COLA", estados)
+
+        log_consola = self.leer_log(consola)
+        self.assertIn("ASIGNACION", log_consola)
+        self.assertEqual(log_consola, self.leer_log(gui))
+
+if __name__ == "__main__":
+    unittest.main()
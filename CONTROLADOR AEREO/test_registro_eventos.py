@@ -0,0 +1,73 @@
+import os
+import sqlite3
+import tempfile
+import threading
+import unittest
+
+from indice_log import IndiceLog
+from registro_eventos import RegistroEventos, DestinoTexto
+
+class DestinoRoto:
+    """Destino que falla con un error que no es de disco"""
+
+    def __init__(self):
+        self.eventos = []
+
+    def escribir(self, eventos):
+        if any(evento == "roto" for evento in eventos):
+            raise ValueError("evento sin formato")
+        self.eventos.extend(eventos)
+
+    def cerrar(self):
+        pass
+
+class TestRegistroEventos(unittest.TestCase):
+    """El hilo escritor no debe morir ni dejar esperando a quien escribe"""
+
+    def test_error_que_no_es_de_disco(self):
+        destino = DestinoRoto()
+        registro = RegistroEventos([destino], lineas_por_lote=1, segundos_por_lote=0.01)
+        registro.escribir("roto")
+        registro.vaciar()
+        self.assertIsInstance(registro.tomar_error(), ValueError)
+        # El hilo sigue vivo y los siguientes eventos llegan
+        registro.escribir("bien")
+        registro.vaciar()
+        self.assertTrue(registro.hilo.is_alive())
+        self.assertEqual(destino.eventos, ["bien"])
+        registro.cerrar()
+
+    def test_hilo_escritor_terminado(self):
+        destino = DestinoRoto()
+        registro = RegistroEventos([destino], lineas_por_lote=100, segundos_por_lote=0.01, maximo_pendientes=2)
+        # Un hilo que ya terminó en lugar del escritor
+        registro.hilo = threading.Thread(target=lambda: None)
+        registro.hilo.start()
+        registro.hilo.join()
+        hecho = threading.Event()
+
+        def escribir():
+            for i in range(5):
+                registro.escribir(i)
+            registro.vaciar()
+            hecho.set()
+
+        threading.Thread(target=escribir, daemon=True).start()
+        self.assertTrue(hecho.wait(5), "escribir() o vaciar() se quedaron esperando al hilo")
+        self.assertEqual(destino.eventos, [0, 1, 2, 3, 4])
+
+    def test_cerrar_cierra_el_indice(self):
+        with tempfile.TemporaryDirectory() as carpeta:
+            indice = IndiceLog(os.path.join(carpeta, "eventos.log"))
+            registro = RegistroEventos([DestinoTexto(indice.archivo_log, indice)])
+            registro.escribir((0, "ALTA", "V1", None, None))
+            registro.cerrar()
+            with self.assertRaises(sqlite3.ProgrammingError):
+                indice.conexion.execute("SELECT 1")
+            # Después de cerrar se sigue escribiendo, sin índice
+            registro.escribir((1, "ALTA", "V2", None, None))
+            with open(indice.archivo_log, encoding="utf-8") as f:
+                self.assertEqual(len(f.readlines()), 2)
+
+if __name__ == "__main__":
+    unittest.main()
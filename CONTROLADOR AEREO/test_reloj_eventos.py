@@ -0,0 +1,74 @@
+import os
+import tempfile
+import unittest
+
+import motor_simulacion as ms
+from generador_vuelos import GeneradorVuelos, ids_correlativos
+
+MINUTOS = 400
+# Pistas largas de usar y pocos vuelos: hay minutos sin nada que hacer
+PISTAS = [("R1", "larga", 6, 1, "LIBRE", None, 0), ("R2", "estandar", 5, 1, "LIBRE", None, 0),
+          ("R3", "estandar", 4, 1, "LIBRE", None, 0)]
+
+def generar_vuelos():
+    generador = GeneradorVuelos(semilla=2, dispersion_eta=MINUTOS, asignar_ids=ids_correlativos("RE"))
+    return generador.generar_lote(60)
+
+def crear_motor(modo, politica, archivo_vuelos=None):
+    """Motor con los vuelos cargados, o leyéndolos de archivo_vuelos a medida que avanza el reloj"""
+    motor = ms.MotorSimulacion(avisar=lambda mensaje, nivel="info": None, registro_activo=False)
+    motor.almacen.reemplazar_pistas(PISTAS)
+    if archivo_vuelos is None:
+        motor.almacen.reemplazar_vuelos(generar_vuelos())
+        motor.inicializar_flujos()
+    else:
+        motor.abrir_vuelos_desde_csv(archivo_vuelos, vuelos_por_lote=7)
+    motor.modo_asignacion = modo
+    motor.cambiar_politica_despacho(politica)
+    return motor
+
+class TestRelojEventos(unittest.TestCase):
+    """avanzar_por_eventos debe dar lo mismo que avanzar_minuto minuto a minuto"""
+
+    def comprobar(self, modo, politica, archivo_vuelos=None):
+        minuto_a_minuto = crear_motor(modo, politica, archivo_vuelos)
+        por_eventos = crear_motor(modo, politica, archivo_vuelos)
+        for _ in range(MINUTOS):
+            minuto_a_minuto.avanzar_minuto()
+        simulados = 0
+        # En tramos de distinta longitud, como la consola y la GUI
+        for tramo in (1, 7, 50, 3, 139, 200):
+            simulados += por_eventos.avanzar_por_eventos(tramo)
+        self.assertLess(simulados, MINUTOS)
+
+        self.assertEqual(por_eventos.reloj_simulado, minuto_a_minuto.reloj_simulado)
+        self.assertEqual(list(por_eventos.vuelos), list(minuto_a_minuto.vuelos))
+        self.assertEqual(list(por_eventos.pistas), list(minuto_a_minuto.pistas))
+        self.assertEqual(por_eventos.metricas, minuto_a_minuto.metricas)
+        self.assertIn("COMPLETADO", {vuelo[ms.ESTADO] for vuelo in minuto_a_minuto.vuelos})
+
+    def test_modos_de_asignacion(self):
+        for modo in ms.MODOS_ASIGNACION:
+            with self.subTest(modo=modo):
+                self.comprobar(modo, ms.POLITICA_PRIORIDAD)
+
+    def test_politicas_de_despacho(self):
+        for politica in ms.POLITICAS:
+            with self.subTest(politica=politica):
+                self.comprobar(ms.ASIGNACION_VORAZ, politica)
+
+    def test_vuelos_que_entran_con_el_reloj(self):
+        with tempfile.TemporaryDirectory() as carpeta:
+            archivo = os.path.join(carpeta, "vuelos.csv")
+            with open(archivo, "w", encoding="utf-8") as f:
+                f.write("id_vuelo,tipo,eta,etd,prioridad,combustible,estado\n")
+                for id_vuelo, tipo, tiempo, prioridad, combustible, estado in sorted(generar_vuelos(),
+                                                                                     key=lambda v: v[ms.TIEMPO]):
+                    if tipo == "ATERRIZAJE":
+                        f.write(f"{id_vuelo},{tipo},{tiempo},,{prioridad},{combustible},{estado}\n")
+                    else:
+                        f.write(f"{id_vuelo},{tipo},,{tiempo},{prioridad},,{estado}\n")
+            self.comprobar(ms.ASIGNACION_VORAZ, ms.POLITICA_PRIORIDAD, archivo)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+import os
+import random
+import tempfile
+import unittest
+
+import motor_simulacion as ms
+from generador_vuelos import GeneradorVuelos, ids_correlativos
+from reproductor_log import ReproductorLog
+
+MINUTOS = 90
+PISTAS = [("R1", "larga", 4, 1, "LIBRE", None, 0), ("R2", "estandar", 3, 1, "LIBRE", None, 0),
+          ("R3", "corta", 2, 1, "LIBRE", None, 0)]
+
+def escribir_csv(archivo, vuelos):
+    with open(archivo, "w", encoding="utf-8") as f:
+        f.write("id_vuelo,tipo,eta,etd,prioridad,combustible,estado\n")
+        for id_vuelo, tipo, tiempo, prioridad, combustible, estado in vuelos:
+            if tipo == "ATERRIZAJE":
+                f.write(f"{id_vuelo},{tipo},{tiempo},,{prioridad},{combustible},{estado}\n")
+            else:
+                f.write(f"{id_vuelo},{tipo},,{tiempo},{prioridad},,{estado}\n")
+
+def crear_motor(archivo_log=None):
+    """Motor con las pistas cargadas, escribiendo el log en archivo_log si se indica"""
+    motor = ms.MotorSimulacion(avisar=lambda mensaje, nivel="info": None, registro_activo=archivo_log is not None,
+                               archivo_log=archivo_log)
+    motor.almacen.reemplazar_pistas(PISTAS)
+    return motor
+
+def simular_grabando(motor, archivo_vuelos, modo, minutos_con_cambios=MINUTOS):
+    """Simula con cambios a mano y detener a mitad, y devuelve el estado del
+    motor al final de cada minuto: (tramo, minuto) -> (vuelos, pistas)
+
+    Los cambios a mano se hacen solo en los primeros minutos_con_cambios pasos.
+    """
+    generador = GeneradorVuelos(semilla=4, dispersion_eta=120, asignar_ids=ids_correlativos("RL"))
+    aleatorio = random.Random(4)
+    escribir_csv(archivo_vuelos, generador.generar_lote(250))
+    motor.cargar_vuelos_desde_csv(archivo_vuelos)
+    motor.modo_asignacion = modo
+    estados = {}
+    tramo = 0
+    for paso in range(MINUTOS):
+        if paso == MINUTOS // 2:
+            motor.detener()
+            tramo += 1
+        sorteo = aleatorio.random() if paso < minutos_con_cambios else 1
+        if sorteo < 0.2:
+            en_cola = [vuelo[ms.ID] for vuelo in motor.vuelos if vuelo[ms.ESTADO] == "EN_COLA"]
+            motor.cancelar_vuelo(aleatorio.choice(en_cola))
+        elif sorteo < 0.3:
+            cancelados = [vuelo[ms.ID] for vuelo in motor.vuelos if vuelo[ms.ESTADO] == "CANCELADO"]
+            if cancelados:
+                motor.cambiar_estado_vuelo(aleatorio.choice(cancelados), "EN_COLA")
+        elif sorteo < 0.45:
+            # Como la consola: el alta manual se registra con sus campos
+            for vuelo in generador.generar_lote(2, motor.reloj_simulado):
+                motor.dar_de_alta_vuelo(vuelo)
+                motor.registrar_evento("ALTA_MANUAL", vuelo[ms.ID], tipo=vuelo[ms.TIPO], tiempo=vuelo[ms.TIEMPO],
+                                       prioridad=vuelo[ms.PRIORIDAD], combustible=vuelo[ms.COMBUSTIBLE])
+        elif sorteo < 0.5:
+            pista = aleatorio.choice(list(motor.pistas))
+            motor.actualizar_pista(pista[:3] + (1 - pista[3],) + pista[4:])
+        estados[(tramo, motor.reloj_simulado)] = (list(motor.vuelos), list(motor.pistas))
+        motor.avanzar_minuto()
+    estados[(tramo, motor.reloj_simulado)] = (list(motor.vuelos), list(motor.pistas))
+    return estados
+
+class TestReproductorLog(unittest.TestCase):
+    """El estado reconstruido desde eventos.log debe ser el que tenía el motor"""
+
+    def setUp(self):
+        self.carpeta = tempfile.TemporaryDirectory()
+        self.archivo_log = os.path.join(self.carpeta.name, "eventos.log")
+        self.archivo_vuelos = os.path.join(self.carpeta.name, "vuelos.csv")
+
+    def tearDown(self):
+        self.carpeta.cleanup()
+
+    def comprobar(self, modo):
+        motor = crear_motor(self.archivo_log)
+        estados = simular_grabando(motor, self.archivo_vuelos, modo)
+        motor.cerrar_log()
+        # Los datos que el log no guarda salen del CSV, como en cargar_desde_log
+        base = crear_motor()
+        base.cargar_vuelos_desde_csv(self.archivo_vuelos)
+        # Pocos eventos por punto de control: las consultas parten de puntos distintos
+        reproductor = ReproductorLog(self.archivo_log, base.vuelos, base.pistas, eventos_por_punto=50)
+        reproductor.indexar()
+        claves = list(estados)
+        random.Random(4).shuffle(claves)
+        for tramo, minuto in claves:
+            vuelos, pistas = reproductor.tuplas_en(minuto, tramo)
+            self.assertEqual(sorted(vuelos), sorted(estados[(tramo, minuto)][0]), f"tramo {tramo}, minuto {minuto}")
+            self.assertEqual(sorted(pistas), sorted(estados[(tramo, minuto)][1]), f"tramo {tramo}, minuto {minuto}")
+
+    def test_modos_de_asignacion(self):
+        for modo in ms.MODOS_ASIGNACION:
+            with self.subTest(modo=modo):
+                self.comprobar(modo)
+                os.remove(self.archivo_log)
+
+    def test_seguir_desde_el_log(self):
+        # Sin cambios a mano tras el minuto de arranque, que el log reproducido no trae
+        motor = crear_motor(self.archivo_log)
+        simular_grabando(motor, self.archivo_vuelos, ms.ASIGNACION_VORAZ, minutos_con_cambios=60)
+        motor.vaciar_log()
+        continuado = crear_motor()
+        continuado.cargar_vuelos_desde_csv(self.archivo_vuelos)
+        self.assertTrue(continuado.cargar_desde_log(self.archivo_log, minuto=60 - MINUTOS // 2, tramo=1))
+        while continuado.reloj_simulado < motor.reloj_simulado:
+            continuado.avanzar_minuto()
+        self.assertEqual(list(continuado.vuelos), list(motor.vuelos))
+        self.assertEqual(list(continuado.pistas), list(motor.pistas))
+        motor.cerrar_log()
+
+if __name__ == "__main__":
+    unittest.main()